@@ -0,0 +1,26 @@
+import unittest
+
+import discord
+
+from src.client_profile import CLIENT_PROFILES, FULL_PROFILE, TRIMMED_PROFILE
+
+
+class ClientProfileTests(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for the ClientProfile class and the built-in profiles.
+    """
+
+    async def test_profiles_start_a_client(self) -> None:
+        for name, profile in CLIENT_PROFILES.items():
+            with self.subTest(profile=name):
+                client = discord.Client(**profile.client_options())
+                self.assertEqual(client.intents, profile.intents)
+                await client.close()
+
+    def test_trimmed_profile(self) -> None:
+        self.assertEqual(TRIMMED_PROFILE.intents, discord.Intents(guilds=True, members=True))
+        self.assertFalse(TRIMMED_PROFILE.member_cache_flags.joined)
+        self.assertFalse(TRIMMED_PROFILE.chunk_guilds_at_startup)
+        self.assertIsNone(TRIMMED_PROFILE.max_messages)
+
+        self.assertEqual(FULL_PROFILE.intents, discord.Intents.all())
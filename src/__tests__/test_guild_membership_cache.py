@@ -0,0 +1,80 @@
+import asyncio
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from types import SimpleNamespace
+
+import discord
+
+from src.guild_membership_cache import GuildMembershipCache
+
+
+class FakeGuild:
+    """
+    Stands in for a discord.Guild whose members are not cached by the client, as with the trimmed client profile.
+    """
+
+    def __init__(self, guild_id: int, member_ids: list[int], chunked: bool = False) -> None:
+        self.id = guild_id
+        self.chunked = chunked
+        self.cached_members = [SimpleNamespace(id=member_id) for member_id in member_ids] if chunked else []
+        self.requested_members = [SimpleNamespace(id=member_id) for member_id in member_ids]
+        self.chunk_requests = 0
+        self.error: Exception | None = None
+
+    @property
+    def members(self) -> list:
+        return self.cached_members
+
+    async def chunk(self, *, cache: bool = True) -> list:
+        assert not cache
+        self.chunk_requests += 1
+        await asyncio.sleep(0.01)
+        if self.error is not None:
+            raise self.error
+
+        return self.requested_members
+
+
+class FetchMethodTests(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for the GuildMembershipCache.fetch() method.
+    """
+
+    def setUp(self) -> None:
+        self.cache = GuildMembershipCache()
+
+    async def test_requests_members_once(self) -> None:
+        guild = FakeGuild(1, [10, 20])
+
+        results = await asyncio.gather(self.cache.fetch(guild), self.cache.fetch(guild))
+        self.assertEqual(results, [{'10', '20'}, {'10', '20'}])
+        self.assertIn(1, self.cache)
+
+        self.assertEqual(guild.chunk_requests, 1)
+
+        self.cache.add_member(1, '30')
+        self.assertEqual(await self.cache.fetch(guild), {'10', '20', '30'})
+        self.assertEqual(guild.chunk_requests, 1)
+
+    async def test_reads_chunked_guilds(self) -> None:
+        guild = FakeGuild(1, [10, 20], chunked=True)
+
+        self.assertEqual(await self.cache.fetch(guild), {'10', '20'})
+        self.assertEqual(guild.chunk_requests, 0)
+
+    async def test_request_fails(self) -> None:
+        guild = FakeGuild(1, [10, 20])
+        guild.error = discord.ClientException('Intents.members must be enabled to use this.')
+
+        with redirect_stdout(StringIO()):
+            self.assertEqual(await self.cache.fetch(guild), set())
+        self.assertNotIn(1, self.cache)
+
+    async def test_request_times_out(self) -> None:
+        guild = FakeGuild(1, [10, 20])
+        self.cache.chunk_timeout = 0.001
+
+        with redirect_stdout(StringIO()):
+            self.assertEqual(await self.cache.fetch(guild), set())
+        self.assertNotIn(1, self.cache)
@@ -0,0 +1,151 @@
+import asyncio
+import os
+import tempfile
+from types import SimpleNamespace
+
+from src.controllers.lobby_controller import LobbyController
+from src.database import AsyncDatabaseWrapper, DatabaseWrapper, PRODUCTION_PROFILE, create_connection
+from src.lobby_locator import LobbyLocator
+from src.steam import CatalogueSnapshot
+from src.steam.__tests__.test_async_steam_api_handler import FakeServerTestCase
+
+
+class LobbyLocatorTestCase(FakeServerTestCase):
+    """
+    Base test case that builds a LobbyLocator against a database file and a FakeSteamServer, without logging in.
+    """
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.snapshot = CatalogueSnapshot(os.path.join(self.directory.name, 'app_list.catalogue'))
+
+        self.writer = DatabaseWrapper(
+            create_connection(os.path.join(self.directory.name, 'lobby_locator.db'), PRODUCTION_PROFILE,
+                              check_same_thread=False)
+        )
+        self.writer.migrate()
+        self.database = AsyncDatabaseWrapper(self.writer, readers=1)
+
+    async def asyncTearDown(self) -> None:
+        await self.database.close()
+        self.writer.connection.close()
+        await super().asyncTearDown()
+        self.directory.cleanup()
+
+    def create_bot(self) -> LobbyLocator:
+        return LobbyLocator(None, self.database, self.steam_api, self.snapshot)
+
+
+class WarmUpTests(LobbyLocatorTestCase):
+    """
+    Test cases for syncing the Steam app list in the background, with the LobbyLocator.refresh_catalogue() method.
+    """
+
+    async def test_empty_database_waits_for_the_sync(self) -> None:
+        bot = self.create_bot()
+        self.assertFalse(bot.catalogue_ready.is_set())
+
+        await bot.refresh_catalogue()
+        self.assertTrue(bot.catalogue_ready.is_set())
+        self.assertEqual(await self.database.get_game_title(20), 'app_20')
+        self.assertIsNotNone(self.writer.catalogue)
+
+    async def test_populated_database_is_ready_from_the_start(self) -> None:
+        self.writer.update_steam_apps_table({10: 'app_10'})
+        self.assertTrue(self.create_bot().catalogue_ready.is_set())
+
+    async def test_steam_is_down_on_the_first_start(self) -> None:
+        await self.server.close()
+        bot = self.create_bot()
+
+        await bot.refresh_catalogue()
+        self.assertFalse(bot.catalogue_ready.is_set())
+
+    async def test_snapshot_stands_in_for_steam(self) -> None:
+        # A snapshot applied to another database, then Steam going down.
+        await self.steam_api.download_app_list(self.snapshot)
+        self.snapshot.mark_applied()
+        await self.server.close()
+
+        bot = self.create_bot()
+        await bot.refresh_catalogue()
+        self.assertTrue(bot.catalogue_ready.is_set())
+        self.assertEqual(await self.database.get_game_title(10), 'app_10')
+
+    async def test_library_scanned_before_the_first_sync_is_searchable(self) -> None:
+        self.server.status_overrides['/ISteamApps/GetAppList/v0002'] = 404
+        self.writer.set_steam_user_id('1', '76561198103635351')
+        bot = self.create_bot()
+
+        # Scanning the library while the app list can not be downloaded, then syncing it once Steam is back.
+        await bot.refresh_catalogue()
+        await bot.bulk_library_scan.scan_all()
+        self.assertEqual(bot.title_index.search('app_20'), [])
+
+        del self.server.status_overrides['/ISteamApps/GetAppList/v0002']
+        await bot.refresh_catalogue()
+        self.assertTrue(bot.catalogue_ready.is_set())
+        self.assertIn((20, 'app_20'), bot.title_index.search('app_20'))
+        self.assertEqual(await self.database.find_owners([20]), ['1'])
+
+
+class MemberEventTests(LobbyLocatorTestCase):
+    """
+    Test cases for keeping the guild membership cache current from the gateway member events.
+    """
+
+    async def test_raw_member_remove(self) -> None:
+        bot = self.create_bot()
+        bot.guild_members.set(1, ['10', '20'])
+        user = {'id': '20', 'username': 'user20', 'discriminator': '0', 'avatar': None}
+
+        # Sending the events through the client's parsers, as the gateway does. The guild is not in the client's cache,
+        # and neither are its members, as with the trimmed client profile.
+        bot._connection.parse_guild_member_remove({'guild_id': '1', 'user': user})
+        await asyncio.sleep(0.01)
+        self.assertEqual(bot.guild_members.get(SimpleNamespace(id=1, members=[])), {'10'})
+
+
+class LibraryScanTests(LobbyLocatorTestCase):
+    """
+    Test cases for resuming the bulk library scan, with the LobbyLocator.resume_library_scan() task.
+    """
+
+    async def test_resumes_unfinished_scan(self) -> None:
+        self.writer.set_steam_user_id('1', '76561198103635351')
+        self.writer.start_library_scan()
+        bot = self.create_bot()
+
+        await bot.resume_library_scan()
+        await bot._library_scan_task
+        self.assertIsNone(await self.database.get_library_scan())
+
+    async def test_no_scan_to_resume(self) -> None:
+        bot = self.create_bot()
+
+        await bot.resume_library_scan()
+        self.assertIsNone(bot._library_scan_task)
+
+
+class FindCommandTests(LobbyLocatorTestCase):
+    """
+    Test cases for finding the owners of games, with the LobbyController.find_command() method.
+    """
+
+    async def test_titles_listed_on_steam(self) -> None:
+        self.writer.set_steam_user_id('1', '76561198103635351')
+        bot = self.create_bot()
+        bot.guild_members.set(1, ['1'])
+        await bot.refresh_catalogue()
+        await bot.bulk_library_scan.scan_all()
+
+        result = await LobbyController(bot).find_command(SimpleNamespace(id=1, members=[]), ['APP_10', 'app_20'])
+        self.assertEqual(result, ([], ['1'], ['app_10', 'app_20']))
+
+    async def test_unknown_title(self) -> None:
+        bot = self.create_bot()
+        await bot.refresh_catalogue()
+
+        result = await LobbyController(bot).find_command(SimpleNamespace(id=1, members=[]), ['app_99'])
+        self.assertEqual(result, (['app_99'], [], []))
@@ -0,0 +1,55 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from src.startup_profile import LAZY_MODULES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StartupProfileTests(unittest.TestCase):
+    """
+    Test cases for the cold start of the bot, profiled in a fresh interpreter by the startup_profile module.
+    """
+
+    def test_cold_start_budget(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            env_path = os.path.join(directory, '.env')
+            report_path = os.path.join(directory, 'startup_profile.json')
+            with open(env_path, 'w') as file:
+                file.write(
+                    'DISCORD_BOT_TOKEN=token\n'
+                    'STEAM_API_KEY=key\n'
+                    f'DB_CONNECTION_STRING={os.path.join(directory, "lobby_locator.db")}\n'
+                    f'CATALOGUE_SNAPSHOT_PATH={os.path.join(directory, "steam_app_list.catalogue")}\n'
+                )
+
+            result = subprocess.run(
+                [sys.executable, '-m', 'src.startup_profile', '--env-file', env_path, '--output', report_path],
+                cwd=ROOT,
+                capture_output=True,
+                text=True,
+                timeout=120
+            )
+            self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+
+            with open(report_path, encoding='utf-8') as file:
+                report = json.load(file)
+
+        self.assertEqual(
+            [phase['name'] for phase in report['phases']],
+            ['imports', 'environment', 'database connection', 'schema migration', 'indexes', 'cogs']
+        )
+        self.assertEqual([cog['name'] for cog in report['cogs']], ['src.cogs.lobby', 'src.cogs.steam'])
+
+        # Every package is imported once, through src, and the modules only needed on first use are not imported.
+        modules = {timing['module'] for timing in report['imports']}
+        self.assertEqual(len(modules), report['modules_imported'])
+        self.assertIn('src.database', modules)
+        self.assertNotIn('database', modules)
+        self.assertNotIn('steam', modules)
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, modules)
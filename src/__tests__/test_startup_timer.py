@@ -0,0 +1,109 @@
+import builtins
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from src.startup_timer import ImportTimer, StartupTimer
+
+
+class StartupTimerTests(unittest.TestCase):
+    """
+    Test cases for the StartupTimer class.
+    """
+
+    def setUp(self) -> None:
+        self.now = 100.0
+        self.timer = StartupTimer(clock=lambda: self.now)
+
+    def test_phases(self) -> None:
+        with self.timer.phase('database'):
+            self.now += 0.25
+
+        self.now += 1.0
+        self.assertEqual(self.timer.mark('discord login'), 1.0)
+
+        with self.assertRaises(RuntimeError):
+            with self.timer.phase('catalogue sync'):
+                self.now += 2.0
+                raise RuntimeError
+
+        self.assertEqual(self.timer.phases, [('database', 0.25), ('discord login', 1.0), ('catalogue sync', 2.0)])
+        self.assertEqual(self.timer.elapsed(), 3.25)
+        self.assertEqual(
+            self.timer.report(),
+            'Startup timings: database 250ms, discord login 1000ms, catalogue sync 2000ms; 3.25s since start.'
+        )
+
+    def test_mark_from_start(self) -> None:
+        self.now += 0.5
+        self.assertEqual(self.timer.mark('environment'), 0.5)
+        self.assertEqual(self.timer.report(), 'Startup timings: environment 500ms; 0.50s since start.')
+
+    def test_no_phases(self) -> None:
+        self.assertEqual(self.timer.report(), 'Startup timings: no phases; 0.00s since start.')
+
+    def test_report_as_json(self) -> None:
+        with self.timer.phase('cogs'):
+            with self.timer.cog('src.cogs.lobby'):
+                self.now += 0.125
+
+        with tempfile.TemporaryDirectory() as directory:
+            self.timer.report_path = os.path.join(directory, 'startup_profile.json')
+            with redirect_stdout(StringIO()):
+                self.timer.finish()
+
+            with open(self.timer.report_path, encoding='utf-8') as file:
+                self.assertEqual(json.load(file), {
+                    'elapsed_seconds': 0.125,
+                    'phases': [{'name': 'cogs', 'seconds': 0.125}],
+                    'cogs': [{'name': 'src.cogs.lobby', 'seconds': 0.125}]
+                })
+
+
+class ImportTimerTests(unittest.TestCase):
+    """
+    Test cases for the ImportTimer class.
+    """
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        for name, source in [
+            ('timed_parent', 'import time\ntime.sleep(0.02)\nimport timed_child\n'),
+            ('timed_child', 'import time\ntime.sleep(0.05)\n')
+        ]:
+            with open(os.path.join(self.directory.name, f'{name}.py'), 'w') as file:
+                file.write(source)
+
+        sys.path.insert(0, self.directory.name)
+
+    def tearDown(self) -> None:
+        sys.path.remove(self.directory.name)
+        for name in ['timed_parent', 'timed_child']:
+            sys.modules.pop(name, None)
+        self.directory.cleanup()
+
+    def test_times_first_imports(self) -> None:
+        original_import = builtins.__import__
+        import_timer = ImportTimer()
+        import_timer.install()
+        try:
+            import timed_parent
+            import timed_parent
+        finally:
+            import_timer.uninstall()
+
+        self.assertIs(builtins.__import__, original_import)
+        self.assertNotIn('time', import_timer.imports)
+
+        parent_self, parent_cumulative = import_timer.imports['timed_parent']
+        child_self, child_cumulative = import_timer.imports['timed_child']
+        self.assertGreaterEqual(child_self, 0.05)
+        self.assertEqual(child_self, child_cumulative)
+        self.assertGreaterEqual(parent_self, 0.02)
+        self.assertLess(parent_self, 0.05)
+        self.assertAlmostEqual(parent_cumulative, parent_self + child_cumulative, delta=0.001)
+        self.assertEqual([name for name, _, _ in import_timer.slowest(2)], ['timed_child', 'timed_parent'])
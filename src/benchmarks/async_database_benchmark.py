@@ -0,0 +1,167 @@
+"""
+Benchmarks the response time of interactions while a large catalogue sync runs, with every query run on the event
+loop, as before the AsyncDatabaseWrapper class, and with queries run on the database threads.
+
+Each interaction looks up a user's Steam ID, then the owners of a few games among the members of a guild, as the
+/lobby find command does. Interactions arrive at a fixed interval, and their response time is measured from arrival,
+so time spent waiting for the event loop counts against them.
+
+Usage: python -m src.benchmarks.async_database_benchmark [--users 20000] [--rows 1000000] [--catalogue 500000]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+from src.benchmarks.ownership_lookup_benchmark import populate
+from src.database import PRODUCTION_PROFILE, AsyncDatabaseWrapper, CatalogueSync, DatabaseWrapper, create_connection
+
+
+def generate_catalogue(apps: int, batch_size: int, revision: int) -> List[List[Tuple[int, str]]]:
+    """
+    Generates the batches of a catalogue, renaming a tenth of the titles in each revision, so every sync writes.
+    """
+
+    catalogue = [(steam_app_id, f'app_{steam_app_id}_{revision if steam_app_id % 10 == revision % 10 else 0}')
+                 for steam_app_id in range(apps)]
+    return [catalogue[start:start + batch_size] for start in range(0, apps, batch_size)]
+
+
+async def run_interactions(
+        interact: Callable[[], Awaitable[None]],
+        interval: float,
+        is_syncing: Callable[[], bool]
+) -> List[float]:
+    """
+    Starts an interaction every interval seconds until the sync is done.
+
+    :return: The response time of every interaction, in milliseconds.
+    """
+
+    loop = asyncio.get_running_loop()
+    latencies: List[float] = []
+
+    async def respond(arrived: float) -> None:
+        await interact()
+        latencies.append((loop.time() - arrived) * 1000)
+
+    pending = []
+    next_arrival = loop.time()
+    while is_syncing():
+        pending.append(asyncio.create_task(respond(next_arrival)))
+        next_arrival += interval
+        await asyncio.sleep(max(0.0, next_arrival - loop.time()))
+
+    await asyncio.gather(*pending)
+    return latencies
+
+
+async def measure(
+        sync: Callable[[], Awaitable[None]],
+        interact: Callable[[], Awaitable[None]],
+        interval: float
+) -> Dict[str, float]:
+    """
+    Runs a sync with interactions arriving throughout, returning the p50, p99 and maximum response time in
+    milliseconds, and the duration of the sync in seconds.
+    """
+
+    is_syncing = True
+    start = time.perf_counter()
+
+    async def run_sync() -> float:
+        nonlocal is_syncing
+        try:
+            await sync()
+            return time.perf_counter() - start
+        finally:
+            is_syncing = False
+
+    duration, latencies = await asyncio.gather(run_sync(), run_interactions(interact, interval, lambda: is_syncing))
+
+    percentiles = statistics.quantiles(latencies, n=100, method='inclusive')
+    return {'p50': percentiles[49], 'p99': percentiles[98], 'max': max(latencies), 'sync': duration}
+
+
+async def benchmark(path: str, args: argparse.Namespace) -> None:
+    database = DatabaseWrapper(create_connection(path, PRODUCTION_PROFILE, check_same_thread=False))
+    database.load_ownership_index()
+    async_database = AsyncDatabaseWrapper(database)
+
+    rng = random.Random(2)
+    members = {str(user) for user in rng.sample(range(args.users), min(5000, args.users))}
+    steam_app_ids = [0, 1, 2]
+
+    async def interact_on_loop() -> None:
+        database.get_steam_id(str(rng.randrange(args.users)))
+        database.find_owners(steam_app_ids, members)
+
+    async def interact_on_threads() -> None:
+        await async_database.get_steam_id(str(rng.randrange(args.users)))
+        await async_database.find_owners(steam_app_ids, members)
+
+    async def sync_on_loop(revision: int) -> None:
+        catalogue_sync = CatalogueSync(database.connection)
+        for steam_apps in generate_catalogue(args.catalogue, args.batch_size, revision):
+            catalogue_sync.stage(steam_apps)
+            # Yielding between batches, as streaming the app list from Steam would.
+            await asyncio.sleep(0)
+        catalogue_sync.apply()
+
+    async def sync_on_threads(revision: int) -> None:
+        catalogue_sync = CatalogueSync(database.connection)
+        for steam_apps in generate_catalogue(args.catalogue, args.batch_size, revision):
+            await async_database.run_write(lambda _: catalogue_sync.stage(steam_apps))
+        await async_database.run_write(lambda _: catalogue_sync.apply())
+
+    # Syncing once first, so both runs rename titles rather than the first inserting the whole catalogue.
+    await sync_on_loop(0)
+
+    for name, sync, interact in [
+        ('on the event loop', sync_on_loop, interact_on_loop),
+        ('on database threads', sync_on_threads, interact_on_threads)
+    ]:
+        for revision in range(1, args.runs + 1):
+            result = await measure(lambda: sync(revision), interact, args.interval / 1000)
+            print(
+                f'{name:>19}: sync {result["sync"]:.1f}s, response p50 {result["p50"]:.2f}ms, '
+                f'p99 {result["p99"]:.2f}ms, max {result["max"]:.2f}ms'
+            )
+
+    await async_database.close()
+    database.connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmarks interaction response time during a catalogue sync.')
+    parser.add_argument('--users', type=int, default=20000, help='The number of registered users.')
+    parser.add_argument('--rows', type=int, default=1000000, help='The number of ownership rows to generate.')
+    parser.add_argument('--apps', type=int, default=50000, help='The number of owned apps to generate.')
+    parser.add_argument('--catalogue', type=int, default=500000, help='The number of apps in each catalogue sync.')
+    parser.add_argument('--batch-size', type=int, default=5000, help='The number of apps staged at a time.')
+    parser.add_argument('--interval', type=float, default=10, help='Milliseconds between interactions.')
+    parser.add_argument('--runs', type=int, default=2, help='The number of syncs measured for each strategy.')
+    parser.add_argument('--database', help='The database file to use, reused if it already exists.')
+    args = parser.parse_args()
+
+    path = args.database or os.path.join(tempfile.mkdtemp(), 'async_database_benchmark.db')
+    if not os.path.exists(path):
+        database = DatabaseWrapper(create_connection(path))
+        database.migrate()
+
+        print(f'Generating {args.users} users and {args.rows} ownership rows into {path}...')
+        populate(database, args.users, args.rows, args.apps)
+        database.save_ownership_index()
+        database.connection.close()
+
+    asyncio.run(benchmark(path, args))
+
+
+# Import guard.
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmarks the throughput of a bulk library scan against a local fake Steam server at increasing concurrency.
+
+The fake server answers each GetOwnedGames request after a fixed latency, standing in for the round trip to Steam, and
+the rate limiter is configured generously so the concurrency is the only limit. In production the throughput is also
+capped by the rate configured for the endpoint and the connection limit of the Steam API handler.
+
+Usage: python -m src.benchmarks.bulk_library_scan_benchmark [--users 500] [--latency 50] [--concurrency 1 4 16 64]
+"""
+
+import argparse
+import asyncio
+import random
+
+from src.database import AsyncDatabaseWrapper, DatabaseWrapper, create_connection
+from src.steam import AsyncSteamAPIHandler, BulkLibraryScan, RateLimiter
+from src.steam.__tests__.fake_steam_server import FakeSteamServer
+
+
+async def benchmark(args: argparse.Namespace) -> None:
+    rng = random.Random(5)
+    server = FakeSteamServer(latency=args.latency / 1000)
+    server.owned_games = {
+        str(steam_id): rng.sample(range(args.apps), rng.randint(0, args.games)) for steam_id in range(args.users)
+    }
+    api_root = await server.start()
+
+    for concurrency in args.concurrency:
+        database = DatabaseWrapper(create_connection(':memory:', check_same_thread=False))
+        database.migrate()
+        database.update_steam_apps_table({steam_app_id: f'app_{steam_app_id}' for steam_app_id in range(args.apps)})
+        for steam_id in range(args.users):
+            database.set_steam_user_id(str(steam_id), str(steam_id))
+        async_database = AsyncDatabaseWrapper(database)
+
+        # Raising the connection limit with the concurrency, so the session pool does not cap the scan.
+        steam_api = AsyncSteamAPIHandler(
+            'benchmark_key',
+            api_root=api_root,
+            connection_limit=max(20, concurrency),
+            rate_limiter=RateLimiter({'/IPlayerService/GetOwnedGames/v0001/': (100000.0, 100000.0)})
+        )
+
+        bulk_scan = BulkLibraryScan(steam_api, async_database, concurrency, on_progress=lambda _: None)
+        progress = await bulk_scan.scan_all()
+        print(
+            f'concurrency {concurrency:>3}: {progress.scanned} libraries in {progress.elapsed:.2f}s, '
+            f'{progress.rate:.1f} libraries/s, {server.max_in_flight} requests in flight at most'
+        )
+
+        server.max_in_flight = 0
+        await steam_api.close()
+        await async_database.close()
+        database.connection.close()
+
+    await server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmarks bulk library scan throughput at increasing concurrency.')
+    parser.add_argument('--users', type=int, default=500, help='The number of registered users.')
+    parser.add_argument('--apps', type=int, default=5000, help='The number of apps in the catalogue.')
+    parser.add_argument('--games', type=int, default=200, help='The largest number of games in a library.')
+    parser.add_argument('--latency', type=float, default=50, help='Milliseconds the server takes to answer.')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 64], help='The concurrencies to run.')
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args))
+
+
+# Import guard.
+if __name__ == '__main__':
+    main()
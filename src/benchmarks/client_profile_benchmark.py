@@ -0,0 +1,266 @@
+"""
+Benchmarks the memory and gateway event throughput of the Discord client under each client profile, on a simulated
+large guild. Each profile runs in a fresh interpreter, so the resident set sizes are comparable. The guild arrives as
+Discord sends it to the profile: with the online members and their presences if the profile has the presences intent,
+followed by every member in chunks if the profile chunks guilds at startup. A stream of gateway events then follows,
+of which only those the profile's intents subscribe to are sent, as Discord filters the rest out.
+
+For profiles that do not chunk guilds at startup, the members are then requested as the first lookup of the guild
+does, with GuildMembershipCache.fetch() keeping only their IDs.
+
+Usage: python -m src.benchmarks.client_profile_benchmark [--members 100000] [--events 200000]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import resource
+import subprocess
+import sys
+import time
+from typing import Any, Dict, Iterator, Tuple
+
+from src.client_profile import CLIENT_PROFILES, ClientProfile
+from src.guild_membership_cache import GuildMembershipCache
+
+GUILD_ID = 1046992676865720420
+BOT_ID = 1000
+
+EVENT_INTENTS: Dict[str, str] = {
+    'PRESENCE_UPDATE': 'presences',
+    'MESSAGE_CREATE': 'guild_messages',
+    'TYPING_START': 'guild_typing',
+    'GUILD_MEMBER_ADD': 'members'
+}
+"""
+The intent each simulated gateway event needs to be sent.
+"""
+
+EVENT_WEIGHTS: Tuple[int, ...] = (80, 15, 4, 1)
+"""
+The share of each simulated gateway event, in the order of EVENT_INTENTS. Presence updates dominate on large guilds.
+"""
+
+
+def resident_set_size() -> int:
+    """
+    :return: The resident set size of this process in bytes, from /proc where available, the peak otherwise.
+    """
+
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def user(user_id: int) -> Dict[str, Any]:
+    return {'id': str(user_id), 'username': f'user{user_id}', 'discriminator': '0', 'avatar': None}
+
+
+def member(user_id: int) -> Dict[str, Any]:
+    return {
+        'user': user(user_id),
+        'roles': [],
+        'joined_at': '2023-01-01T00:00:00+00:00',
+        'deaf': False,
+        'mute': False
+    }
+
+
+def presence(user_id: int, rng: random.Random) -> Dict[str, Any]:
+    return {
+        'user': {'id': str(user_id)},
+        'guild_id': str(GUILD_ID),
+        'status': rng.choice(['online', 'idle', 'dnd']),
+        'activities': [{'name': 'Portal 2', 'type': 0}],
+        'client_status': {'desktop': 'online'}
+    }
+
+
+def generate_events(count: int, members: int, rng: random.Random) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Generates a stream of gateway events on the guild, from random members.
+    """
+
+    for index in range(count):
+        event = rng.choices(list(EVENT_INTENTS), EVENT_WEIGHTS)[0]
+        user_id = BOT_ID + 1 + rng.randrange(members)
+
+        if event == 'PRESENCE_UPDATE':
+            yield event, presence(user_id, rng)
+        elif event == 'MESSAGE_CREATE':
+            yield event, {
+                'id': str(10 ** 15 + index),
+                'channel_id': '1',
+                'guild_id': str(GUILD_ID),
+                'author': user(user_id),
+                'member': {'roles': [], 'joined_at': '2023-01-01T00:00:00+00:00', 'deaf': False, 'mute': False},
+                'content': 'Anyone up for a round of Portal 2?',
+                'timestamp': '2024-01-01T00:00:00+00:00',
+                'edited_timestamp': None,
+                'tts': False,
+                'mention_everyone': False,
+                'mentions': [],
+                'mention_roles': [],
+                'attachments': [],
+                'embeds': [],
+                'pinned': False,
+                'type': 0
+            }
+        elif event == 'TYPING_START':
+            yield event, {
+                'channel_id': '1',
+                'guild_id': str(GUILD_ID),
+                'user_id': str(user_id),
+                'timestamp': 1700000000,
+                'member': member(user_id)
+            }
+        else:
+            yield event, dict(member(BOT_ID + 1 + members + index), guild_id=str(GUILD_ID))
+
+
+def send_member_chunks(state, members: int, nonce: str) -> None:
+    """
+    Sends every member of the guild to a chunk request, a thousand members a chunk, as Discord sends them.
+    """
+
+    chunk_count = (members + 999) // 1000
+    for chunk_index in range(chunk_count):
+        first_id = BOT_ID + 1 + chunk_index * 1000
+        state.parse_guild_members_chunk({
+            'guild_id': str(GUILD_ID),
+            'members': [member(user_id) for user_id in range(first_id, min(first_id + 1000, BOT_ID + 1 + members))],
+            'chunk_index': chunk_index,
+            'chunk_count': chunk_count,
+            'nonce': nonce
+        })
+
+
+async def run_profile(profile: ClientProfile, members: int, events: int) -> Dict[str, Any]:
+    """
+    Feeds a simulated large guild and a stream of gateway events into a client with the profile.
+
+    :return: The resident set size after each stage, the events sent and the events processed per second.
+    """
+
+    import discord
+    from discord.state import ChunkRequest
+
+    rng = random.Random(5)
+    loop = asyncio.get_running_loop()
+    baseline = resident_set_size()
+
+    client = discord.Client(**profile.client_options())
+    state = client._connection
+    state.dispatch = lambda event, *args: None
+    state.user = discord.ClientUser(state=state, data=user(BOT_ID))
+
+    # Answering member requests straight from the simulated guild, rather than over the gateway.
+    async def chunk_guild(guild: discord.Guild, *, wait: bool = True, cache: bool | None = None) -> list:
+        request = ChunkRequest(guild.id, loop, state._get_guild, cache=bool(cache or state.member_cache_flags.joined))
+        state._chunk_requests[guild.id] = request
+        future = request.get_future()
+        send_member_chunks(state, members, request.nonce)
+        return await future
+
+    state.chunk_guild = chunk_guild
+
+    # Sending the guild, with the online members and their presences where the profile has the presences intent.
+    online = range(BOT_ID + 1, BOT_ID + 1 + members // 10) if profile.intents.presences else range(0)
+    state._add_guild_from_data({
+        'id': str(GUILD_ID),
+        'name': 'Large guild',
+        'owner_id': str(BOT_ID),
+        'member_count': members + 1,
+        'large': True,
+        'roles': [{
+            'id': str(GUILD_ID), 'name': '@everyone', 'permissions': '0', 'position': 0,
+            'colors': {'primary_color': 0, 'secondary_color': None, 'tertiary_color': None}
+        }],
+        'channels': [{'id': '1', 'type': 0, 'name': 'general', 'position': 0, 'permission_overwrites': []}],
+        'members': [member(BOT_ID)] + [member(user_id) for user_id in online],
+        'presences': [presence(user_id, rng) for user_id in online],
+        'emojis': [],
+        'stickers': [],
+        'features': []
+    })
+    guild = state._get_guild(GUILD_ID)
+
+    # Chunking the guild as the client does at startup.
+    if profile.chunk_guilds_at_startup:
+        await guild.chunk()
+
+    connected = resident_set_size()
+
+    # Sending the events the profile subscribes to, generating them a batch at a time outside of the timing.
+    events_sent = 0
+    elapsed = 0.0
+    generator = generate_events(events, members, rng)
+    for _ in range(0, events, 1000):
+        batch = [(event, data) for event, data in itertools.islice(generator, 1000)
+                 if getattr(profile.intents, EVENT_INTENTS[event])]
+
+        start = time.perf_counter()
+        for event, data in batch:
+            state.parsers[event](data)
+        elapsed += time.perf_counter() - start
+        events_sent += len(batch)
+
+    del batch
+    after_events = resident_set_size()
+
+    # Requesting the members, as the first lookup of the guild does where the client does not cache them.
+    lookup_seconds = 0.0
+    if not guild.chunked:
+        start = time.perf_counter()
+        await GuildMembershipCache().fetch(guild)
+        lookup_seconds = time.perf_counter() - start
+
+    return {
+        'connected_mib': (connected - baseline) / 2 ** 20,
+        'after_events_mib': (after_events - baseline) / 2 ** 20,
+        'after_lookup_mib': (resident_set_size() - baseline) / 2 ** 20,
+        'cached_members': len(guild.members),
+        'events_sent': events_sent,
+        'events_per_second': events_sent / elapsed if elapsed else 0.0,
+        'event_seconds': elapsed,
+        'first_lookup_seconds': lookup_seconds
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmarks the memory and event throughput of each client profile.')
+    parser.add_argument('--members', type=int, default=100000, help='The number of members in the simulated guild.')
+    parser.add_argument('--events', type=int, default=200000, help='The number of gateway events to simulate.')
+    parser.add_argument('--profile', choices=list(CLIENT_PROFILES), help='Run a single profile, printing JSON.')
+    args = parser.parse_args()
+
+    if args.profile:
+        print(json.dumps(asyncio.run(run_profile(CLIENT_PROFILES[args.profile], args.members, args.events))))
+        return
+
+    print(f'A guild of {args.members} members, {args.events} gateway events before filtering by intents.')
+    for name in CLIENT_PROFILES:
+        output = subprocess.run(
+            [sys.executable, '-m', 'src.benchmarks.client_profile_benchmark', '--profile', name,
+             '--members', str(args.members), '--events', str(args.events)],
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout
+        result = json.loads(output.splitlines()[-1])
+        print(
+            f'{name:>8}: RSS +{result["connected_mib"]:.0f} MiB connected, +{result["after_events_mib"]:.0f} MiB '
+            f'after events, +{result["after_lookup_mib"]:.0f} MiB after the first lookup, '
+            f'{result["cached_members"]} members cached, {result["events_sent"]} events sent in '
+            f'{result["event_seconds"]:.2f}s ({result["events_per_second"]:.0f}/s), '
+            f'first lookup {result["first_lookup_seconds"]:.2f}s'
+        )
+
+
+# Import guard.
+if __name__ == '__main__':
+    main()
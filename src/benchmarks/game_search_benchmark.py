@@ -0,0 +1,149 @@
+"""
+Benchmarks game title search over a synthetic catalogue, comparing the in-memory title index against a LIKE '%term%'
+scan.
+
+Usage: python -m src.benchmarks.game_search_benchmark [--titles 200000] [--queries 2000]
+"""
+
+import argparse
+import random
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from src.database import DatabaseWrapper, TitleIndex, create_connection
+
+_WORDS = [
+    'age', 'alien', 'ancient', 'arena', 'battle', 'black', 'blade', 'city', 'crystal', 'dark', 'dawn', 'dead', 'dragon',
+    'dream', 'dungeon', 'empire', 'escape', 'fallen', 'farm', 'fire', 'forest', 'fortress', 'frontier', 'galaxy',
+    'ghost', 'hero', 'hollow', 'hunter', 'island', 'kingdom', 'knight', 'last', 'legend', 'light', 'lost', 'machine',
+    'magic', 'moon', 'night', 'ocean', 'odyssey', 'portal', 'quest', 'racer', 'rise', 'rogue', 'shadow', 'simulator',
+    'sky', 'soul', 'space', 'star', 'steel', 'storm', 'survival', 'tactics', 'tales', 'tower', 'village', 'war',
+    'world'
+]
+
+_SYLLABLES = [
+    'ka', 'zu', 'mor', 'vel', 'thi', 'ra', 'gon', 'lyx', 'ost', 'pra', 'qua', 'dre', 'nim', 'sol', 'fe', 'yth'
+]
+
+
+def generate_titles(count: int, seed: int = 0) -> Dict[int, str]:
+    """
+    Generates unique game titles of two to four words, with an optional sequel number. Half of the words come from a
+    small vocabulary of common words, and half from a large vocabulary of made up names, so that search terms range
+    from matching thousands of titles to matching a handful.
+    """
+
+    rng = random.Random(seed)
+    names = [''.join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(count // 10)]
+    titles: Dict[int, str] = {}
+    seen = set()
+
+    while len(titles) < count:
+        words = [rng.choice(_WORDS if rng.random() < 0.5 else names) for _ in range(rng.randint(2, 4))]
+        title = ' '.join(word.capitalize() for word in words)
+        if rng.random() < 0.3:
+            title += f' {rng.randint(2, 9)}'
+
+        if title not in seen:
+            seen.add(title)
+            titles[len(titles) + 1] = title
+
+    return titles
+
+
+def generate_queries(titles: List[str], count: int, seed: int = 1) -> List[str]:
+    """
+    Generates search terms the way a user types them, as the first one to ten characters of a word in a real title.
+    """
+
+    rng = random.Random(seed)
+    queries = []
+
+    for _ in range(count):
+        word = rng.choice(rng.choice(titles).split(' '))
+        queries.append(word[:rng.randint(1, 10)].lower())
+
+    return queries
+
+
+def add_typos(queries: List[str], seed: int = 2) -> List[str]:
+    """
+    Swaps two adjacent characters in every query of at least four characters, as a typing mistake would.
+    """
+
+    rng = random.Random(seed)
+    typos = []
+
+    for query in queries:
+        if len(query) >= 4:
+            i = rng.randrange(1, len(query) - 1)
+            typos.append(query[:i] + query[i + 1] + query[i] + query[i + 2:])
+
+    return typos
+
+
+def measure(search: Callable[[str], list], queries: List[str]) -> Dict[str, float]:
+    """
+    Runs every query, returning the p50, p99 and maximum latency in milliseconds.
+    """
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        search(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    return {'p50': percentiles[49], 'p99': percentiles[98], 'max': max(latencies)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmarks game title search over a synthetic catalogue.')
+    parser.add_argument('--titles', type=int, default=200000, help='The number of owned game titles.')
+    parser.add_argument('--queries', type=int, default=2000, help='The number of searches to run.')
+    parser.add_argument('--limit', type=int, default=25, help='The maximum number of results per search.')
+    args = parser.parse_args()
+
+    database = DatabaseWrapper(create_connection(':memory:'))
+    database.migrate()
+
+    print(f'Generating {args.titles} titles...')
+    titles = generate_titles(args.titles)
+    database.update_steam_apps_table(titles)
+    database.set_steam_user_id('1', '76561198000000001')
+
+    start = time.perf_counter()
+    database.sync_owned_games_table(list(titles), '76561198000000001')
+    print(f'Indexed {args.titles} owned titles in {time.perf_counter() - start:.2f}s.')
+
+    start = time.perf_counter()
+    title_index = TitleIndex(database.get_autocomplete_games())
+    print(
+        f'Built the title index in {time.perf_counter() - start:.2f}s, '
+        f'{title_index.memory_usage() / 2 ** 20:.1f}MiB, {title_index.bytes_per_title():.0f} bytes per title.'
+    )
+
+    queries = generate_queries(list(titles.values()), args.queries)
+
+    def like_scan(term: str) -> list:
+        return database.connection.execute(
+            'SELECT steam_app_id, game_title FROM tb_games_autocomplete WHERE game_title LIKE ? LIMIT ?',
+            [f'%{term}%', args.limit]
+        ).fetchall()
+
+    def report(name: str, result: Dict[str, float]) -> None:
+        print(f'{name:>20}: p50 {result["p50"]:.3f}ms, p99 {result["p99"]:.3f}ms, max {result["max"]:.3f}ms')
+
+    for name, search in [
+        ('title index', lambda term: title_index.search(term, args.limit)),
+        ("LIKE '%term%' scan", like_scan)
+    ]:
+        report(name, measure(search, queries))
+
+    report('title index, typos', measure(lambda term: title_index.search(term, args.limit), add_typos(queries)))
+
+
+# Import guard.
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmarks ranking users by shared games, through the ownership index and through a self-join of tb_owned_games, for
+every registered user and for the members of a guild.
+
+Usage: python -m src.benchmarks.library_overlap_benchmark [--users 100000] [--rows 10000000] [--database PATH]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Dict
+
+from src.benchmarks.ownership_lookup_benchmark import measure, populate
+from src.database import DatabaseWrapper, create_connection
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmarks ranking users by shared games.')
+    parser.add_argument('--users', type=int, default=100000, help='The number of registered users.')
+    parser.add_argument('--rows', type=int, default=10000000, help='The number of ownership rows to generate.')
+    parser.add_argument('--apps', type=int, default=50000, help='The number of apps in the catalogue.')
+    parser.add_argument('--repeats', type=int, default=20, help='The number of times each ranking is run.')
+    parser.add_argument('--join-repeats', type=int, default=3, help='The number of times each self-join is run.')
+    parser.add_argument('--database', help='The database file to use, reused if it already exists.')
+    args = parser.parse_args()
+
+    path = args.database or os.path.join(tempfile.mkdtemp(), 'ownership_benchmark.db')
+    is_new = not os.path.exists(path)
+
+    database = DatabaseWrapper(create_connection(path))
+    database.migrate()
+
+    if is_new:
+        print(f'Generating {args.users} users and {args.rows} ownership rows into {path}...')
+        start = time.perf_counter()
+        populate(database, args.users, args.rows, args.apps)
+        print(f'Generated in {time.perf_counter() - start:.1f}s.')
+
+    start = time.perf_counter()
+    is_loaded = database.load_ownership_index()
+    print(f'{"Loaded" if is_loaded else "Built"} the ownership index in {time.perf_counter() - start:.2f}s.')
+    database.save_ownership_index()
+
+    rng = random.Random(1)
+    all_users = range(args.users)
+    guilds: Dict[str, set | None] = {
+        'every user': None,
+        '50k member guild': {str(user) for user in rng.sample(all_users, min(50000, args.users))},
+        '500 member guild': {str(user) for user in rng.sample(all_users, min(500, args.users))}
+    }
+    discord_id = str(rng.randrange(args.users))
+
+    for guild_name, members in guilds.items():
+        for rank_by in ['shared', 'jaccard']:
+            for strategy, repeats in [('index', args.repeats), ('join', args.join_repeats)]:
+                database.overlap.index = database.ownership.index if strategy == 'index' else None
+                result = measure(lambda: database.find_similar_users(discord_id, members, 10, rank_by), repeats)
+                print(
+                    f'{strategy:>5}, {guild_name:>17}, {rank_by:>7}: p50 {result["p50"]:.3f}ms, '
+                    f'p99 {result["p99"]:.3f}ms'
+                )
+
+
+# Import guard.
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+"""
+Benchmarks finding the owners of games, with and without filtering to the members of a guild, through SQL and through
+the in-memory ownership index, and the raw index operations over dozens of games.
+
+Usage: python -m src.benchmarks.ownership_lookup_benchmark [--users 100000] [--rows 10000000] [--database PATH]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from src.database import DatabaseWrapper, create_connection
+
+
+def generate_ownership(users: int, rows: int, apps: int, seed: int = 0) -> Iterator[Tuple[str, int]]:
+    """
+    Generates (Steam ID, Steam App ID) pairs. Game popularity is heavily skewed, so a few games are owned by most
+    users and most games are owned by a handful, as on Steam. Duplicate pairs are possible, and are ignored on insert.
+    """
+
+    rng = random.Random(seed)
+    games_per_user = rows // users
+
+    for user in range(users):
+        steam_user_id = str(76561198000000000 + user)
+        for _ in range(games_per_user):
+            yield steam_user_id, int(apps * rng.random() ** 4)
+
+
+def populate(database: DatabaseWrapper, users: int, rows: int, apps: int) -> None:
+    """
+    Fills the database with users, apps and owned games, bypassing the owned games sync for speed.
+    """
+
+    with database.connection as connection:
+        connection.executemany(
+            'INSERT INTO tb_steam_apps (steam_app_id, game_title) VALUES (?, ?)',
+            ((steam_app_id, f'app_{steam_app_id}') for steam_app_id in range(apps))
+        )
+        connection.executemany(
+            'INSERT INTO tb_users (discord_id, steam_user_id) VALUES (?, ?)',
+            ((str(user), str(76561198000000000 + user)) for user in range(users))
+        )
+        connection.executemany(
+            'INSERT OR IGNORE INTO tb_owned_games (steam_user_id, steam_app_id) VALUES (?, ?)',
+            generate_ownership(users, rows, apps)
+        )
+        connection.execute(
+            '''
+            UPDATE tb_users SET library_size = (
+                SELECT COUNT(*) FROM tb_owned_games WHERE tb_owned_games.steam_user_id = tb_users.steam_user_id
+            )
+            '''
+        )
+        connection.execute(
+            '''
+            UPDATE tb_row_counts SET row_count = CASE table_name
+                WHEN 'tb_steam_apps' THEN (SELECT COUNT(*) FROM tb_steam_apps)
+                WHEN 'tb_owned_games' THEN (SELECT COUNT(*) FROM tb_owned_games)
+                ELSE row_count
+            END
+            '''
+        )
+
+
+def measure(lookup: Callable[[], list | int], repeats: int) -> Dict[str, float]:
+    """
+    Runs a lookup repeatedly, returning the p50 and p99 latency in milliseconds, and the number of owners found.
+    """
+
+    latencies = []
+    owners = 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        owners = lookup()
+        latencies.append((time.perf_counter() - start) * 1000)
+        owners = owners if isinstance(owners, int) else len(owners)
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    return {'p50': percentiles[49], 'p99': percentiles[98], 'owners': owners}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmarks finding the owners of games.')
+    parser.add_argument('--users', type=int, default=100000, help='The number of registered users.')
+    parser.add_argument('--rows', type=int, default=10000000, help='The number of ownership rows to generate.')
+    parser.add_argument('--apps', type=int, default=50000, help='The number of apps in the catalogue.')
+    parser.add_argument('--repeats', type=int, default=50, help='The number of times each lookup is run.')
+    parser.add_argument('--database', help='The database file to use, reused if it already exists.')
+    args = parser.parse_args()
+
+    path = args.database or os.path.join(tempfile.mkdtemp(), 'ownership_benchmark.db')
+    is_new = not os.path.exists(path)
+
+    database = DatabaseWrapper(create_connection(path))
+    database.migrate()
+
+    if is_new:
+        print(f'Generating {args.users} users and {args.rows} ownership rows into {path}...')
+        start = time.perf_counter()
+        populate(database, args.users, args.rows, args.apps)
+        print(f'Generated in {time.perf_counter() - start:.1f}s.')
+
+    rng = random.Random(1)
+    all_users = range(args.users)
+    guilds: Dict[str, set | None] = {
+        'every user': None,
+        '50k member guild': {str(user) for user in rng.sample(all_users, min(50000, args.users))},
+        '500 member guild': {str(user) for user in rng.sample(all_users, min(500, args.users))}
+    }
+    games: Dict[str, List[int]] = {
+        'popular game': [0],
+        'mid game': [args.apps // 20],
+        'rare game': [args.apps - 1],
+        'three games': [0, 1, args.apps // 20]
+    }
+
+    def run_lookups(strategy: str) -> None:
+        for guild_name, members in guilds.items():
+            for games_name, steam_app_ids in games.items():
+                result = measure(lambda: database.find_owners(steam_app_ids, members), args.repeats)
+                print(
+                    f'{strategy:>5}, {guild_name:>17}, {games_name:>12}: p50 {result["p50"]:.3f}ms, '
+                    f'p99 {result["p99"]:.3f}ms, {result["owners"]} owner(s)'
+                )
+
+    run_lookups('sql')
+
+    start = time.perf_counter()
+    database.ownership.index = None
+    is_loaded = database.load_ownership_index()
+    print(f'{"Loaded" if is_loaded else "Built"} the ownership index in {time.perf_counter() - start:.2f}s.')
+
+    start = time.perf_counter()
+    database.save_ownership_index()
+    print(f'Saved the ownership index in {time.perf_counter() - start:.2f}s.')
+
+    start = time.perf_counter()
+    database.ownership.index = None
+    database.load_ownership_index()
+    index = database.ownership.index
+    print(
+        f'Loaded the ownership index in {time.perf_counter() - start:.2f}s, {len(index)} games, '
+        f'{index.memory_usage() / 1024 / 1024:.1f}MiB.'
+    )
+
+    run_lookups('index')
+
+    # Raw index operations across dozens of games, popular and rare alike.
+    dozens = [int(args.apps * (position / 24) ** 4) for position in range(24)]
+    operations = {
+        'count of 3 popular': lambda: index.count([0, 1, 2]),
+        'count of 24': lambda: index.count(dozens),
+        'union count of 24': lambda: index.union_count(dozens),
+        'intersection of 24': lambda: index.intersection(dozens).bit_count()
+    }
+    for operation_name, operation in operations.items():
+        result = measure(operation, args.repeats)
+        print(
+            f'{operation_name:>20}: p50 {result["p50"] * 1000:.1f}us, p99 {result["p99"] * 1000:.1f}us, '
+            f'{result["owners"]} user(s)'
+        )
+
+
+# Import guard.
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmarks holding the Steam app list as a Dict[int, str], as fetch_app_list() returns it, against a memory-mapped
+PackedCatalogue: the time to build each from a GetAppList response, the time to load it again on the next start, the
+Python heap it takes, and the time of an ID to title lookup.
+
+Usage: python -m src.benchmarks.packed_catalogue_benchmark [--apps 150000] [--lookups 100000]
+"""
+
+import argparse
+import json
+import os
+import pickle
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Tuple, TypeVar
+
+from src.database import PackedCatalogue, write_packed_catalogue
+from src.steam.app_list_parser import parse_app_list
+
+T = TypeVar('T')
+
+
+def generate_response(apps: int) -> bytes:
+    """
+    Generates a GetAppList response with titles of realistic lengths, in a shuffled order, as Steam returns them.
+    """
+
+    rng = random.Random(3)
+    words = ['Portal', 'Tactics', 'Simulator', 'Legends', 'Online', 'Deluxe', 'Edition', 'Soundtrack', 'DLC', 'II']
+    steam_app_ids = rng.sample(range(10, apps * 20), apps)
+    return json.dumps({'applist': {'apps': [
+        {'appid': steam_app_id, 'name': ' '.join(rng.choices(words, k=rng.randint(1, 6)))}
+        for steam_app_id in steam_app_ids
+    ]}}).encode()
+
+
+def measure(function: Callable[[], T]) -> Tuple[T, float, int]:
+    """
+    Runs a function twice, once to time it, then again under tracemalloc, which slows allocations down.
+
+    :return: The result of the function, the seconds it took, and the bytes of Python heap its result holds.
+    """
+
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    del result
+
+    tracemalloc.start()
+    result = function()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, allocated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmarks the packed catalogue against a dictionary.')
+    parser.add_argument('--apps', type=int, default=150000, help='The number of apps in the catalogue.')
+    parser.add_argument('--lookups', type=int, default=100000, help='The number of ID to title lookups to time.')
+    args = parser.parse_args()
+
+    response = generate_response(args.apps)
+    directory = tempfile.mkdtemp()
+    packed_path = os.path.join(directory, 'apps.catalogue')
+    pickle_path = os.path.join(directory, 'apps.pickle')
+    print(f'{args.apps} apps, a {len(response) / 2 ** 20:.1f} MiB response.')
+
+    def chunks():
+        return (response[start:start + 65536] for start in range(0, len(response), 65536))
+
+    apps, build_dict, _ = measure(lambda: dict(parse_app_list(chunks())))
+    _, build_packed, _ = measure(lambda: write_packed_catalogue(packed_path, parse_app_list(chunks())))
+
+    # Loading a dictionary on the next start from the fastest Python serialisation, against mapping the packed file.
+    with open(pickle_path, 'wb') as file:
+        pickle.dump(apps, file, pickle.HIGHEST_PROTOCOL)
+    del apps
+
+    def load_dict():
+        with open(pickle_path, 'rb') as file:
+            return pickle.load(file)
+
+    apps, load_dict_time, dict_heap = measure(load_dict)
+    catalogue, load_packed_time, packed_heap = measure(lambda: PackedCatalogue(packed_path))
+
+    rng = random.Random(4)
+    keys = rng.choices(list(apps), k=args.lookups)
+
+    start = time.perf_counter()
+    for steam_app_id in keys:
+        apps.get(steam_app_id)
+    dict_lookup = (time.perf_counter() - start) / args.lookups
+
+    start = time.perf_counter()
+    for steam_app_id in keys:
+        catalogue.get(steam_app_id)
+    packed_lookup = (time.perf_counter() - start) / args.lookups
+
+    print(
+        f'      dictionary: build {build_dict:.2f}s, load {load_dict_time * 1000:.1f}ms, '
+        f'heap {dict_heap / 2 ** 20:.1f} MiB, lookup {dict_lookup * 1e9:.0f}ns'
+    )
+    print(
+        f'packed catalogue: build {build_packed:.2f}s, load {load_packed_time * 1000:.1f}ms, '
+        f'heap {packed_heap / 2 ** 20:.1f} MiB, lookup {packed_lookup * 1e9:.0f}ns, '
+        f'file {os.path.getsize(packed_path) / 2 ** 20:.1f} MiB'
+    )
+
+    catalogue.close()
+
+
+# Import guard.
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+from typing import Any, Dict, NamedTuple
+
+import discord
+
+
+class ClientProfile(NamedTuple):
+    """
+    The gateway intents and caches the Discord client is started with. Every intent is another stream of events Discord
+    sends the bot, and every cache holds an object per member, user or message, so on large guilds the profile decides
+    most of the bot's memory.
+    """
+
+    intents: discord.Intents
+    """
+    The gateway events the bot subscribes to.
+    """
+
+    member_cache_flags: discord.MemberCacheFlags
+    """
+    Which members the client keeps in its member cache.
+    """
+
+    chunk_guilds_at_startup: bool
+    """
+    Should every member of every guild be requested when the bot connects?
+    """
+
+    max_messages: int | None
+    """
+    The number of messages kept in the message cache, None to keep no messages.
+    """
+
+    def client_options(self) -> Dict[str, Any]:
+        """
+        :return: The keyword arguments that apply the profile to a discord.Client.
+        """
+
+        return self._asdict()
+
+
+FULL_PROFILE: ClientProfile = ClientProfile(
+    intents=discord.Intents.all(),
+    member_cache_flags=discord.MemberCacheFlags.from_intents(discord.Intents.all()),
+    chunk_guilds_at_startup=True,
+    max_messages=1000
+)
+"""
+Every intent and cache, as the bot was developed with. The client caches every member, user, presence and the last
+1000 messages across all guilds, and receives every presence, message and typing event.
+"""
+
+TRIMMED_PROFILE: ClientProfile = ClientProfile(
+    intents=discord.Intents(guilds=True, members=True),
+    member_cache_flags=discord.MemberCacheFlags.none(),
+    chunk_guilds_at_startup=False,
+    max_messages=None
+)
+"""
+Only what the Steam and lobby features need: guilds for the slash commands, and members for the member join and leave
+events that keep the GuildMembershipCache current. No member, user or message is cached by the client, and guilds are
+not chunked at startup. The members of a guild are requested the first time the guild is looked up, straight into the
+GuildMembershipCache, which only keeps their IDs.
+"""
+
+CLIENT_PROFILES: Dict[str, ClientProfile] = {'full': FULL_PROFILE, 'trimmed': TRIMMED_PROFILE}
+"""
+The profiles DISCORD_CLIENT_PROFILE can select, by name.
+"""
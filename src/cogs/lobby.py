@@ -0,0 +1,169 @@
+import discord
+from discord import ApplicationContext
+from discord.ext import commands
+
+from src.controllers.games_controller import game_title_autocomplete
+from src.controllers.lobby_controller import LobbyController
+from src.lobby_locator import LobbyLocator
+
+
+class Lobby(commands.Cog):
+
+    lobby_cmd_group = discord.SlashCommandGroup('lobby', 'Commands to find players')
+
+    max_listed_players: int = 50
+    """
+    The maximum number of players listed in a response, to stay within Discord's message length limit.
+    """
+
+    max_listed_common: int = 10
+    """
+    The maximum number of members listed by the /lobby common command.
+    """
+
+    def __init__(self, bot: LobbyLocator) -> None:
+        self.bot = bot
+        self.controller = LobbyController(self.bot)
+
+    @lobby_cmd_group.command(
+        name='find',
+        description='Finds the members of this server who own a game, or every one of up to three games.',
+        guild_ids=[1046992676865720420],
+        game=discord.Option(str, 'The game to find players for.', autocomplete=game_title_autocomplete),
+        second_game=discord.Option(
+            str,
+            'Another game players must also own.',
+            autocomplete=game_title_autocomplete,
+            required=False,
+            default=None
+        ),
+        third_game=discord.Option(
+            str,
+            'Another game players must also own.',
+            autocomplete=game_title_autocomplete,
+            required=False,
+            default=None
+        )
+    )
+    async def find_command(
+            self,
+            ctx: ApplicationContext,
+            game: str,
+            second_game: str | None,
+            third_game: str | None
+    ) -> None:
+        """
+        Lists the members of the server who own every passed game.
+
+        Called when a user invokes the /lobby find command.
+
+        :param ctx: The context that the interaction was invoked in.
+        :param game: The title of the game to find players for.
+        :param second_game: The title of another game players must own, if any.
+        :param third_game: The title of another game players must own, if any.
+        """
+
+        if ctx.guild is None:
+            await ctx.respond('This command can only be used in a server!', ephemeral=True)
+            return
+
+        if not self.bot.catalogue_ready.is_set():
+            await ctx.respond(self.bot.warming_up_message, delete_after=15, ephemeral=True)
+            return
+
+        # Deferring the response the first time the server is looked up, as its members are then requested from Discord,
+        # which can take longer than Discord waits for a response on large servers.
+        if ctx.guild.id not in self.bot.guild_members:
+            await ctx.defer()
+
+        game_titles = [title for title in [game, second_game, third_game] if title]
+        result = await self.controller.find_command(ctx.guild, game_titles)
+
+        if result.unknown_titles:
+            await ctx.respond(
+                f'Sorry, no registered player owns {", ".join(result.unknown_titles)}!',
+                delete_after=15,
+                ephemeral=True
+            )
+            return
+
+        if not result.owners:
+            await ctx.respond(f'Nobody in this server owns {" and ".join(result.game_titles)} yet!', ephemeral=True)
+            return
+
+        mentions = ' '.join(f'<@{discord_id}>' for discord_id in result.owners[:self.max_listed_players])
+        if len(result.owners) > self.max_listed_players:
+            mentions += f' and {len(result.owners) - self.max_listed_players} more'
+
+        # Listing the players without pinging them.
+        await ctx.respond(
+            f'{len(result.owners)} player(s) own {" and ".join(result.game_titles)}: {mentions}',
+            allowed_mentions=discord.AllowedMentions.none()
+        )
+
+    @lobby_cmd_group.command(
+        name='common',
+        description='Lists the members of this server who share the most games with you, or another member.',
+        guild_ids=[1046992676865720420],
+        member=discord.Option(
+            discord.Member,
+            'The member to compare, yourself if not set.',
+            required=False,
+            default=None
+        ),
+        ranking=discord.Option(
+            str,
+            'How to rank members.',
+            choices=[
+                discord.OptionChoice('Most games in common', 'shared'),
+                discord.OptionChoice('Most similar library', 'jaccard')
+            ],
+            required=False,
+            default='shared'
+        )
+    )
+    async def common_command(self, ctx: ApplicationContext, member: discord.Member | None, ranking: str) -> None:
+        """
+        Lists the members of the server who share the most games with a member.
+
+        Called when a user invokes the /lobby common command.
+
+        :param ctx: The context that the interaction was invoked in.
+        :param member: The member to compare, None to compare the invoking user.
+        :param ranking: 'shared' to rank by the number of games in common, 'jaccard' to rank by library similarity.
+        """
+
+        if ctx.guild is None:
+            await ctx.respond('This command can only be used in a server!', ephemeral=True)
+            return
+
+        # Deferring the response the first time the server is looked up, as its members are then requested from Discord,
+        # which can take longer than Discord waits for a response on large servers.
+        if ctx.guild.id not in self.bot.guild_members:
+            await ctx.defer()
+
+        member = member or ctx.author
+        overlaps = await self.controller.common_command(ctx.guild, str(member.id), ranking, self.max_listed_common)
+
+        if overlaps is None:
+            await ctx.respond(f'{member.mention} has not registered a Steam account yet!', ephemeral=True)
+            return
+
+        if not overlaps:
+            await ctx.respond(f'Nobody in this server shares a game with {member.mention} yet!', ephemeral=True)
+            return
+
+        lines = [
+            f'{position}. <@{overlap.discord_id}>: {overlap.shared} game(s) in common, {overlap.jaccard:.0%} similar'
+            for position, overlap in enumerate(overlaps, start=1)
+        ]
+
+        # Listing the players without pinging them.
+        await ctx.respond(
+            f'Members sharing the most games with {member.mention}:\n' + '\n'.join(lines),
+            allowed_mentions=discord.AllowedMentions.none()
+        )
+
+
+def setup(bot: LobbyLocator):
+    bot.add_cog(Lobby(bot))
@@ -4,6 +4,7 @@ from discord.ext import commands
 
 from src.controllers.steam_controller import SteamController
 from src.lobby_locator import LobbyLocator
+from src.steam import RefreshStatus
 
 
 class Steam(commands.Cog):
@@ -37,16 +38,16 @@ class Steam(commands.Cog):
         """
 
         # Checking if the user passed a valid Steam profile URL.
-        parsed_id = self.bot.steam_api.get_id_from_url(steam_id_or_url)
+        parsed_id = await self.bot.steam_api.get_id_from_url(steam_id_or_url)
 
         if parsed_id != '':
-            self.controller.set_command(str(ctx.interaction.user.id), parsed_id)
+            await self.controller.set_command(str(ctx.interaction.user.id), parsed_id)
             await ctx.respond(f'Set your Steam ID to: {parsed_id}', delete_after=15, ephemeral=True)
             return
 
         # Checking if the user passed a valid Steam ID.
-        if self.bot.steam_api.is_valid_id(steam_id_or_url):
-            self.controller.set_command(str(ctx.interaction.user.id), steam_id_or_url)
+        if await self.bot.steam_api.is_valid_id(steam_id_or_url):
+            await self.controller.set_command(str(ctx.interaction.user.id), steam_id_or_url)
             await ctx.respond(f'Set your Steam ID to: {steam_id_or_url}', delete_after=15, ephemeral=True)
             return
 
@@ -71,7 +72,7 @@ class Steam(commands.Cog):
         :param ctx: The context that the interaction was invoked in.
         """
 
-        self.controller.remove_command(str(ctx.interaction.user.id))
+        await self.controller.remove_command(str(ctx.interaction.user.id))
         await ctx.respond(
             'I successfully removed your data from the database!',
             delete_after=15,
@@ -83,17 +84,54 @@ class Steam(commands.Cog):
         description='Forces the bot to rescan your library files.',
         guild_ids=[1046992676865720420]
     )
-    async def steam_refresh(self, ctx):
+    async def steam_refresh(self, ctx: ApplicationContext):
         """
         Refreshes a users steam data. Used when a user got a new game and wants the bot database to
-        reflect that.
+        reflect that. The rescan happens in the background, so the user is answered straight away.
 
         Called when a user invokes the /steam refresh command.
 
         :param ctx: The context that the interaction was invoked in.
         """
 
-        raise NotImplementedError
+        status = await self.controller.refresh_command(str(ctx.interaction.user.id))
+
+        if status is None:
+            message = 'You have not set your Steam ID yet, use /steam set first!'
+        elif status == RefreshStatus.QUEUED and not self.bot.catalogue_ready.is_set():
+            message = 'Your library will be rescanned once I have finished loading the Steam app list!'
+        elif status == RefreshStatus.QUEUED:
+            message = 'Your library will be rescanned in the next few moments!'
+        elif status == RefreshStatus.ALREADY_QUEUED:
+            message = 'Your library is already waiting to be rescanned!'
+        else:
+            message = 'Your library was rescanned recently, try again in a few minutes.'
+
+        await ctx.respond(message, delete_after=15, ephemeral=True)
+
+    @steam_cmd_group.command(
+        name='rescan-all',
+        description='Rescans every registered library. Only the bot owner can use this command.',
+        guild_ids=[1046992676865720420]
+    )
+    async def steam_rescan_all(self, ctx: ApplicationContext):
+        """
+        Starts a bulk rescan of every registered library in the background, or resumes the unfinished rescan. The
+        rescan stops if the daily Steam API budget runs out, and resumes once the budget has reset.
+
+        Called when a user invokes the /steam rescan-all command.
+
+        :param ctx: The context that the interaction was invoked in.
+        """
+
+        if not await self.bot.is_owner(ctx.author):
+            message = 'Only the bot owner can rescan every library!'
+        elif self.bot.rescan_all_libraries():
+            message = 'Every library will be rescanned in the background!'
+        else:
+            message = 'Every library is already being rescanned!'
+
+        await ctx.respond(message, delete_after=15, ephemeral=True)
 
 
 def setup(bot: LobbyLocator):
@@ -0,0 +1,30 @@
+from typing import List
+
+import discord
+
+from src.controllers.controller import Controller
+from src.lobby_locator import LobbyLocator
+
+
+class GamesController(Controller):
+    def __init__(self, bot: LobbyLocator) -> None:
+        super().__init__(bot)
+
+    async def search_games(self, term: str, limit: int = 25) -> List[str]:
+        """
+        Searches the titles of games owned by registered users, through the in-memory title index.
+
+        :param term: The text to search for.
+        :param limit: The maximum number of titles to return, Discord shows at most 25 autocomplete choices.
+        :return: A list of game titles, best matches first.
+        """
+
+        return [game_title for _, game_title in self.bot.title_index.search(term, limit)]
+
+
+async def game_title_autocomplete(ctx: discord.AutocompleteContext) -> List[str]:
+    """
+    Autocomplete callback for slash command options that take the title of an owned game.
+    """
+
+    return await GamesController(ctx.bot).search_games(ctx.value or '')
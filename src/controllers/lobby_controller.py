@@ -0,0 +1,89 @@
+from typing import List, NamedTuple
+
+import discord
+
+from src.controllers.controller import Controller
+from src.database import Overlap
+from src.lobby_locator import LobbyLocator
+
+
+class FindResult(NamedTuple):
+    """
+    The result of the /lobby find command.
+    """
+
+    unknown_titles: List[str]
+    """
+    The titles that do not match a game owned by any registered user.
+    """
+
+    owners: List[str]
+    """
+    The Discord IDs of the guild members who own every game.
+    """
+
+    game_titles: List[str]
+    """
+    The titles of the games as they are listed on Steam, which may differ in case from the passed titles. Empty if any
+    title is unknown.
+    """
+
+
+class LobbyController(Controller):
+    def __init__(self, bot: LobbyLocator) -> None:
+        super().__init__(bot)
+
+    async def find_command(self, guild: discord.Guild, game_titles: List[str]) -> FindResult:
+        """
+        Handles the business logic for the /lobby find command.
+
+        :param guild: The guild to find players in.
+        :param game_titles: The titles of the games every player must own.
+        :return: The titles that could not be found, the guild members who own every game, and the titles of the games
+        as listed on Steam.
+        """
+
+        steam_app_ids = []
+        unknown_titles = []
+
+        for game_title in game_titles:
+            steam_app_id = await self.bot.database.get_app_id(game_title)
+            if steam_app_id is None:
+                unknown_titles.append(game_title)
+            else:
+                steam_app_ids.append(steam_app_id)
+
+        if unknown_titles:
+            return FindResult(unknown_titles, [], [])
+
+        # Reading the titles as listed on Steam from the memory-mapped catalogue, rather than echoing what was typed.
+        listed_titles = [
+            await self.bot.database.get_game_title(steam_app_id) or game_title
+            for steam_app_id, game_title in zip(steam_app_ids, game_titles)
+        ]
+
+        members = await self.bot.guild_members.fetch(guild)
+        return FindResult([], await self.bot.database.find_owners(steam_app_ids, members), listed_titles)
+
+    async def common_command(
+            self,
+            guild: discord.Guild,
+            discord_id: str,
+            rank_by: str,
+            limit: int
+    ) -> List[Overlap] | None:
+        """
+        Handles the business logic for the /lobby common command.
+
+        :param guild: The guild to compare members of.
+        :param discord_id: The Discord ID of the member to compare the other members against.
+        :param rank_by: 'shared' to rank by the number of games in common, 'jaccard' to rank by library similarity.
+        :param limit: The maximum number of members to return.
+        :return: The members sharing the most games with the member, most first. None if the member is not registered.
+        """
+
+        if await self.bot.database.get_steam_id(discord_id) is None:
+            return None
+
+        members = await self.bot.guild_members.fetch(guild)
+        return await self.bot.database.find_similar_users(discord_id, members, limit, rank_by)
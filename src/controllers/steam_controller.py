@@ -1,44 +1,37 @@
 from src.controllers.controller import Controller
 from src.lobby_locator import LobbyLocator
+from src.steam import RefreshStatus
 
 
 class SteamController(Controller):
     def __init__(self, bot: LobbyLocator) -> None:
         super().__init__(bot)
 
-    def set_command(self, discord_id: str, steam_id: str):
+    async def set_command(self, discord_id: str, steam_id: str):
         """
         Handles the business logic for the /steam set command.
         """
 
-        # Checking to see if the user has an old user ID.
-        with self.bot.database.connection as connection:
-            old_steam_id = connection.execute(
-                '''
-                SELECT steam_user_id FROM tb_users 
-                WHERE discord_id = ?
-                ''',
-                [discord_id]
-            ).fetchone()
-
-            # Dropping any user owned game entries (if the user already had a Steam ID set).
-            if old_steam_id:
-                self.bot.database.drop_users_owned_games(old_steam_id)
-
-        # Updating new user data.
-        self.bot.database.set_steam_user_id(discord_id, steam_id)
-        self.bot.database.update_owned_games_table(self.bot.steam_api.fetch_owned_games(steam_id), steam_id)
-
-    def remove_command(self, discord_id: str):
+        # Updating new user data, and queueing a scan of the users library.
+        if await self.bot.database.set_steam_user_id(discord_id, steam_id, drop_previous_games=True):
+            self.bot.library_refresh_queue.enqueue(steam_id, force=True)
+
+    async def remove_command(self, discord_id: str):
         """
         Handles the business logic for the /steam remove command.
         """
 
-        self.bot.database.remove_user(discord_id)
+        await self.bot.database.remove_user(discord_id)
 
-    def refresh_command(self, discord_id: str):
+    async def refresh_command(self, discord_id: str) -> RefreshStatus | None:
         """
         Handles the business logic for the /steam refresh command.
+
+        :return: Whether the users library was queued for a rescan, None if the user has not set their Steam ID.
         """
 
-        raise NotImplementedError
+        steam_id = await self.bot.database.get_steam_id(discord_id)
+        if steam_id is None:
+            return None
+
+        return self.bot.library_refresh_queue.enqueue(steam_id)
@@ -1,3 +1,14 @@
 from .database_wrapper import DatabaseWrapper
+from .async_database_wrapper import AsyncDatabaseWrapper
 from .connection import Connection
+from .connection_profile import DEFAULT_PROFILE, PRODUCTION_PROFILE, ConnectionProfile
 from .create_connection import create_connection
+from .catalogue_sync import CatalogueDiff, CatalogueSync
+from .library_overlap import LibraryOverlap, Overlap
+from .migrations import Backfill, Migration, MigrationRunner
+from .owned_games_sync import OwnedGamesDiff, OwnedGamesSync
+from .ownership_index import OwnershipIndex
+from .ownership_lookup import OwnershipLookup
+from .packed_catalogue import PackedCatalogue, write_packed_catalogue
+from .query_statistics import QueryStatistics, StatementStatistics
+from .title_index import TitleIndex
@@ -0,0 +1,139 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+
+from src.database.async_database_wrapper import AsyncDatabaseWrapper
+from src.database.connection_profile import PRODUCTION_PROFILE
+from src.database.create_connection import create_connection
+from src.database.database_wrapper import DatabaseWrapper
+
+
+class AsyncDatabaseWrapperTests(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for the AsyncDatabaseWrapper class, against a database file.
+    """
+
+    async def asyncSetUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        path = os.path.join(self.directory.name, 'lobby_locator.db')
+
+        self.writer = DatabaseWrapper(create_connection(path, PRODUCTION_PROFILE, check_same_thread=False))
+        self.writer.migrate()
+        self.writer.update_steam_apps_table({10: 'Portal', 20: 'Portal 2'})
+        self.writer.set_steam_user_id('1', '76561198000000001')
+        self.writer.sync_owned_games_table([10, 20], '76561198000000001')
+
+        self.database = AsyncDatabaseWrapper(self.writer, readers=2)
+
+    async def asyncTearDown(self) -> None:
+        await self.database.close()
+        self.writer.connection.close()
+        self.directory.cleanup()
+
+    async def test_reads_and_writes(self) -> None:
+        self.assertEqual(await self.database.get_steam_id('1'), '76561198000000001')
+        self.assertEqual(await self.database.get_app_id('Portal 2'), 20)
+
+        await self.database.set_steam_user_id('2', '76561198000000002')
+        await self.database.sync_owned_games_table([20], '76561198000000002')
+
+        self.assertEqual(await self.database.find_owners([20]), ['1', '2'])
+        self.assertEqual(await self.database.find_owners([10, 20], members={'2'}), [])
+
+    async def test_replacing_steam_id_drops_previous_games(self) -> None:
+        self.assertTrue(await self.database.set_steam_user_id('1', '76561198000000002', drop_previous_games=True))
+
+        self.assertEqual(await self.database.get_steam_id('1'), '76561198000000002')
+        self.assertEqual(await self.database.find_owners([10]), [])
+
+    async def test_reads_run_on_reader_threads(self) -> None:
+        thread_names = await asyncio.gather(*[
+            self.database.run_read(lambda database: threading.current_thread().name) for _ in range(4)
+        ])
+
+        self.assertTrue(all(name.startswith('database-reader') for name in thread_names))
+        thread_name = await self.database.run_write(lambda database: threading.current_thread().name)
+        self.assertTrue(thread_name.startswith('database-writer'))
+
+    async def test_reads_are_not_blocked_by_a_write(self) -> None:
+        writing, release = threading.Event(), threading.Event()
+
+        def slow_write(database: DatabaseWrapper) -> None:
+            with database.connection:
+                database.connection.execute(
+                    'UPDATE tb_users SET steam_user_id = ? WHERE discord_id = ?', ['76561198000000009', '1']
+                )
+                writing.set()
+                release.wait(5)
+
+        write = asyncio.create_task(self.database.run_write(slow_write))
+        await asyncio.to_thread(writing.wait, 5)
+
+        # The reader sees the last committed state while the write transaction is still open.
+        self.assertEqual(await asyncio.wait_for(self.database.get_steam_id('1'), 1), '76561198000000001')
+
+        release.set()
+        await write
+        self.assertEqual(await self.database.get_steam_id('1'), '76561198000000009')
+
+    async def test_writes_are_serialized(self) -> None:
+        order = []
+
+        def write(database: DatabaseWrapper, number: int) -> None:
+            order.append(number)
+
+        await asyncio.gather(*[self.database.run_write(write, number) for number in range(20)])
+        self.assertEqual(order, list(range(20)))
+
+    async def test_readers_share_the_ownership_index(self) -> None:
+        self.assertFalse(await self.database.load_ownership_index())
+        await self.database.set_steam_user_id('2', '76561198000000002')
+        await self.database.sync_owned_games_table([10], '76561198000000002')
+
+        self.assertIsNotNone(await self.database.run_read(lambda database: database.ownership.index))
+        self.assertEqual(await self.database.find_owners([10]), ['1', '2'])
+        self.assertEqual([overlap.discord_id for overlap in await self.database.find_similar_users('2')], ['1'])
+
+    async def test_autocomplete_listener_runs_on_the_event_loop(self) -> None:
+        changes = []
+        self.database.add_autocomplete_listener(
+            lambda added, removed: changes.append((threading.current_thread(), added, removed))
+        )
+
+        await self.database.drop_users_owned_games('76561198000000001')
+        await asyncio.sleep(0)
+
+        self.assertEqual(changes, [(threading.current_thread(), [], [(10, 'Portal'), (20, 'Portal 2')])])
+
+    async def test_read_now_and_write_later(self) -> None:
+        self.database.write_later(DatabaseWrapper.set_vanity_url, 'gaben', '76561197960287930', 100.0).result(5)
+
+        self.assertEqual(
+            self.database.read_now(DatabaseWrapper.get_vanity_url, 'gaben'), ('76561197960287930', 100.0)
+        )
+
+    async def test_run_backfills(self) -> None:
+        await self.database.run_backfills()
+        self.assertEqual(await self.database.run_write(lambda database: database.migrations.pending_backfills()), [])
+
+
+class InMemoryAsyncDatabaseWrapperTests(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for the AsyncDatabaseWrapper class, against an in-memory database, which every query runs on the
+    writer thread for.
+    """
+
+    async def test_reads_run_on_the_writer_thread(self) -> None:
+        writer = DatabaseWrapper(create_connection(':memory:', check_same_thread=False))
+        writer.migrate()
+        writer.set_steam_user_id('1', '76561198000000001')
+        database = AsyncDatabaseWrapper(writer)
+
+        self.assertEqual(await database.get_steam_id('1'), '76561198000000001')
+        thread_name = await database.run_read(lambda _: threading.current_thread().name)
+        self.assertTrue(thread_name.startswith('database-writer'))
+        self.assertEqual(database.read_now(DatabaseWrapper.get_steam_id, '1'), '76561198000000001')
+
+        await database.close()
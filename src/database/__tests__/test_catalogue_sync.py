@@ -0,0 +1,142 @@
+import contextlib
+import io
+import unittest
+
+from src.database.create_connection import create_connection
+from src.database.database_wrapper import DatabaseWrapper
+from src.database.catalogue_sync import CatalogueDiff, CatalogueSync
+
+
+class SyncSteamAppsTableMethodTests(unittest.TestCase):
+    """
+    Test cases for the DatabaseWrapper.sync_steam_apps_table() method.
+    """
+
+    def setUp(self) -> None:
+        self.database = DatabaseWrapper(create_connection(':memory:'))
+        self.database.create_tables()
+
+    def get_apps(self) -> dict[int, str]:
+        return dict(self.database.connection.execute('SELECT steam_app_id, game_title FROM tb_steam_apps').fetchall())
+
+    def test_initial_sync(self) -> None:
+        diff = self.database.sync_steam_apps_table({1: 'app_1', 2: 'app_2', 3: 'app_3'})
+
+        self.assertEqual(diff, CatalogueDiff(3, 0, 0))
+        self.assertEqual(self.get_apps(), {1: 'app_1', 2: 'app_2', 3: 'app_3'})
+
+    def test_added_renamed_and_removed(self) -> None:
+        self.database.sync_steam_apps_table({1: 'app_1', 2: 'app_2', 3: 'app_3'})
+        diff = self.database.sync_steam_apps_table({1: 'app_1', 2: 'app_2_renamed', 4: 'app_4'})
+
+        self.assertEqual(diff, CatalogueDiff(1, 1, 1))
+        self.assertEqual(self.get_apps(), {1: 'app_1', 2: 'app_2_renamed', 4: 'app_4'})
+
+    def test_rename_onto_removed_title(self) -> None:
+        self.database.sync_steam_apps_table({1: 'app_1', 2: 'app_2'})
+        diff = self.database.sync_steam_apps_table({1: 'app_2'})
+
+        self.assertEqual(diff, CatalogueDiff(0, 1, 1))
+        self.assertEqual(self.get_apps(), {1: 'app_2'})
+
+    def test_rename_onto_renamed_title(self) -> None:
+        # App 1 takes the title app 2 is renamed away from in the same sync, whichever is renamed first.
+        self.database.sync_steam_apps_table({1: 'app_1', 2: 'app_2'})
+        diff = self.database.sync_steam_apps_table({1: 'app_2', 2: 'app_2_renamed'})
+
+        self.assertEqual(diff, CatalogueDiff(0, 2, 0))
+        self.assertEqual(self.get_apps(), {1: 'app_2', 2: 'app_2_renamed'})
+
+    def test_rename_onto_kept_title(self) -> None:
+        self.database.sync_steam_apps_table({1: 'app_1', 2: 'app_2', 3: 'app_3'})
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            diff = self.database.sync_steam_apps_table({1: 'app_2', 2: 'app_2', 3: 'app_3_renamed'})
+
+        self.assertEqual(diff, CatalogueDiff(0, 1, 0, skipped_renames=1))
+        self.assertEqual(self.get_apps(), {1: 'app_1', 2: 'app_2', 3: 'app_3_renamed'})
+        self.assertIn("Skipped renaming 1 Steam app(s) onto a title another app has, such as 1 'app_1' to 'app_2'.",
+                      output.getvalue())
+
+    def test_identical_catalogue_is_skipped(self) -> None:
+        self.database.sync_steam_apps_table({1: 'app_1', 2: 'app_2'})
+        diff = self.database.sync_steam_apps_table([(2, 'app_2'), (1, 'app_1')])
+
+        self.assertEqual(diff, CatalogueDiff(0, 0, 0, unchanged=True))
+
+    def test_empty_catalogue_is_not_applied(self) -> None:
+        self.database.sync_steam_apps_table({1: 'app_1'})
+        diff = self.database.sync_steam_apps_table({})
+
+        self.assertEqual(diff, CatalogueDiff(0, 0, 0, unchanged=True))
+        self.assertEqual(self.get_apps(), {1: 'app_1'})
+
+    def test_failing_iterable_is_not_applied(self) -> None:
+        self.database.sync_steam_apps_table({1: 'app_1', 2: 'app_2'})
+
+        def steam_apps():
+            yield 1, 'app_1'
+            raise ValueError('Mocking a truncated app list.')
+
+        with self.assertRaises(ValueError):
+            self.database.sync_steam_apps_table(steam_apps())
+
+        self.assertEqual(self.get_apps(), {1: 'app_1', 2: 'app_2'})
+
+    def test_renames_autocomplete_entries(self) -> None:
+        self.database.sync_steam_apps_table({1: 'app_1', 2: 'app_2'})
+        self.database.connection.execute("INSERT INTO tb_games_autocomplete VALUES (1, 'app_1'), (2, 'app_2')")
+
+        self.database.sync_steam_apps_table({1: 'app_1_renamed'})
+
+        rows = self.database.connection.execute('SELECT steam_app_id, game_title FROM tb_games_autocomplete').fetchall()
+        self.assertEqual(rows, [(1, 'app_1_renamed')])
+
+    def test_owned_app_removed_from_catalogue(self) -> None:
+        self.database.sync_steam_apps_table({1: 'app_1', 2: 'app_2'})
+        self.database.set_steam_user_id('1', '10')
+        self.database.sync_owned_games_table([1], '10')
+
+        diff = self.database.sync_steam_apps_table({2: 'app_2'})
+
+        self.assertEqual(diff, CatalogueDiff(0, 0, 0))
+        self.assertEqual(self.get_apps(), {1: 'app_1', 2: 'app_2'})
+        self.assertEqual(self.database.get_app_id('app_1'), 1)
+        self.assertEqual(self.database.find_owners([1]), ['1'])
+
+    def test_calling_with_closed_connection(self) -> None:
+        self.database.connection.close()
+        self.assertEqual(self.database.sync_steam_apps_table({1: 'app_1'}), CatalogueDiff(0, 0, 0))
+
+
+class CatalogueSyncTests(unittest.TestCase):
+    """
+    Test cases for staging a catalogue in batches with the CatalogueSync class.
+    """
+
+    def setUp(self) -> None:
+        self.database = DatabaseWrapper(create_connection(':memory:'))
+        self.database.create_tables()
+
+    def test_staging_in_batches(self) -> None:
+        catalogue_sync = CatalogueSync(self.database.connection)
+        catalogue_sync.stage([(1, 'app_1'), (2, 'app_2')])
+        catalogue_sync.stage([(3, 'app_3')])
+
+        self.assertEqual(catalogue_sync.apply(), CatalogueDiff(3, 0, 0))
+
+    def test_discard(self) -> None:
+        catalogue_sync = CatalogueSync(self.database.connection)
+        catalogue_sync.stage([(1, 'app_1')])
+        catalogue_sync.discard()
+
+        self.assertEqual(catalogue_sync.apply(), CatalogueDiff(0, 0, 0, unchanged=True))
+        self.assertEqual(self.database.get_row_count('tb_steam_apps'), 0)
+
+    def test_update_steam_apps_table_resets_state(self) -> None:
+        self.database.sync_steam_apps_table({1: 'app_1'})
+        self.database.connection.execute('DELETE FROM tb_steam_apps')
+        self.database.update_steam_apps_table({})
+
+        self.assertEqual(self.database.sync_steam_apps_table({1: 'app_1'}), CatalogueDiff(1, 0, 0))
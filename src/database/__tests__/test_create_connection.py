@@ -5,6 +5,7 @@ import unittest
 from unittest.mock import patch, Mock
 
 from src.database.connection import Connection
+from src.database.connection_profile import PRODUCTION_PROFILE, ConnectionProfile
 from src.database.create_connection import create_connection
 
 
@@ -45,3 +46,70 @@ class CreateConnectionFunctionTests(unittest.TestCase):
     def test_mocking_sqlite_error(self) -> None:
         with patch.object(Connection, '__init__', Mock(side_effect=sqlite3.Error('Mocking Error'))):
             self.assertIsNone(create_connection(''))
+
+
+class ConnectionProfileTests(unittest.TestCase):
+    """
+    Test cases for opening connections with a ConnectionProfile.
+    """
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'lobby_locator.db')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_production_profile(self) -> None:
+        connection = create_connection(self.path, PRODUCTION_PROFILE)
+
+        self.assertEqual(connection.settings(), {
+            'journal_mode': 'wal',
+            'synchronous': 'NORMAL',
+            'mmap_size': 256 * 1024 * 1024,
+            'cache_size': -64 * 1024,
+            'busy_timeout': 5000,
+            'foreign_keys': False,
+            'read_only': False
+        })
+        connection.close()
+
+    def test_default_profile(self) -> None:
+        connection = create_connection(self.path)
+
+        self.assertEqual(connection.settings()['journal_mode'], 'delete')
+        self.assertEqual(connection.settings()['synchronous'], 'FULL')
+        connection.close()
+
+    def test_read_only_profile(self) -> None:
+        writer = create_connection(self.path, PRODUCTION_PROFILE)
+        with writer:
+            writer.execute('CREATE TABLE tb_test (id INTEGER PRIMARY KEY)')
+            writer.execute('INSERT INTO tb_test (id) VALUES (1)')
+
+        reader = create_connection(self.path, PRODUCTION_PROFILE.for_reading())
+        self.assertEqual(reader.execute('SELECT id FROM tb_test').fetchall(), [(1,)])
+        self.assertEqual(reader.settings()['journal_mode'], 'wal')
+        self.assertTrue(reader.settings()['read_only'])
+
+        with self.assertRaises(sqlite3.OperationalError):
+            reader.execute('INSERT INTO tb_test (id) VALUES (2)')
+
+        reader.close()
+        writer.close()
+
+    def test_read_only_profile_needs_an_existing_database(self) -> None:
+        self.assertIsNone(create_connection(self.path, PRODUCTION_PROFILE.for_reading()))
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_foreign_keys(self) -> None:
+        connection = create_connection(':memory:', ConnectionProfile(foreign_keys=True))
+        self.assertTrue(connection.settings()['foreign_keys'])
+
+    def test_invalid_profile(self) -> None:
+        with self.assertRaises(ValueError):
+            create_connection(self.path, ConnectionProfile(journal_mode='FAST'))
+        with self.assertRaises(ValueError):
+            create_connection(self.path, ConnectionProfile(synchronous='SOMETIMES'))
+
+        self.assertFalse(os.path.exists(self.path))
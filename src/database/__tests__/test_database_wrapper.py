@@ -3,11 +3,12 @@ import unittest
 
 from src.database.create_connection import create_connection
 from src.database.database_wrapper import DatabaseWrapper
+from src.database.owned_games_sync import OwnedGamesDiff
 
 
-class GetTableRowsMethodTests(unittest.TestCase):
+class GetRowCountMethodTests(unittest.TestCase):
     """
-    Test cases for the DatabaseWrapper._get_table_rows method.
+    Test cases for the DatabaseWrapper.get_row_count() method.
     """
 
     def setUp(self):
@@ -15,19 +16,55 @@ class GetTableRowsMethodTests(unittest.TestCase):
 
     def test_table_has_no_entries(self):
         self.database.create_tables()
-        self.assertEqual(self.database._get_table_rows('tb_steam_apps'), 0)
+        self.assertEqual(self.database.get_row_count('tb_steam_apps'), 0)
 
     def test_table_has_entries(self):
         self.database.create_tables()
         self.database.update_steam_apps_table({1: 'app_1', 2: 'app_2', 3: 'app_3'})
-        self.assertEqual(self.database._get_table_rows('tb_steam_apps'), 3)
+        self.assertEqual(self.database.get_row_count('tb_steam_apps'), 3)
 
     def test_table_not_created(self):
-        self.assertEqual(self.database._get_table_rows('tb_steam_apps'), 0)
+        self.assertEqual(self.database.get_row_count('tb_steam_apps'), 0)
 
     def test_connection_closed_connection(self):
         self.database.connection.close()
-        self.assertEqual(self.database._get_table_rows('tb_steam_apps'), 0)
+        self.assertEqual(self.database.get_row_count('tb_steam_apps'), 0)
+
+    def test_uncounted_table(self):
+        self.database.create_tables()
+        with self.assertRaises(ValueError):
+            self.database.get_row_count('tb_users; DROP TABLE tb_users')
+
+    def test_counts_follow_every_write(self):
+        self.database.create_tables()
+
+        def assert_counts_match() -> None:
+            for table, row_count in self.database.get_row_counts().items():
+                actual = self.database.connection.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                self.assertEqual(row_count, actual, table)
+
+        self.assertEqual(self.database.update_steam_apps_table({app_id: f'app_{app_id}' for app_id in range(10)}), 10)
+        self.assertEqual(self.database.update_steam_apps_table({app_id: f'app_{app_id}' for app_id in range(15)}), 5)
+        assert_counts_match()
+
+        for discord_id in ['1', '2', '3']:
+            self.database.set_steam_user_id(discord_id, f'7656119800000000{discord_id}')
+        self.database.set_steam_user_id('3', '76561198000000009')
+        self.database.sync_owned_games_table([1, 2, 3], '76561198000000001')
+        self.database.update_owned_games_table([3, 4], '76561198000000002')
+        self.database.sync_owned_games_table([12, 13], '76561198000000009')
+        assert_counts_match()
+
+        self.database.sync_owned_games_table([2], '76561198000000001')
+        self.database.drop_users_owned_games('76561198000000002')
+        self.database.remove_user('3')
+        assert_counts_match()
+
+        self.database.sync_steam_apps_table({app_id: f'app_{app_id}' for app_id in range(2, 20)})
+        assert_counts_match()
+        self.assertEqual(self.database.get_row_counts(), {
+            'tb_steam_apps': 18, 'tb_users': 2, 'tb_owned_games': 1, 'tb_games_autocomplete': 1
+        })
 
 
 class CreateTablesMethodTests(unittest.TestCase):
@@ -52,6 +89,86 @@ class CreateTablesMethodTests(unittest.TestCase):
         except sqlite3.Error as error:
             self.fail(f'Threw an SQLite exception: {error}')
 
+    def test_full_text_index_is_dropped(self) -> None:
+        self.database.create_tables()
+
+        names = [row[0] for row in self.database.connection.execute(
+            "SELECT name FROM sqlite_master WHERE name LIKE '%games_search%'"
+        )]
+        self.assertEqual(names, [])
+
+
+class OwnedGamesSchemaTests(unittest.TestCase):
+    """
+    Test cases for the keys, indexes and migration of the tb_owned_games table.
+    """
+
+    def setUp(self) -> None:
+        self.database = DatabaseWrapper(create_connection(':memory:'))
+
+    def create_unversioned_tables(self) -> None:
+        self.database.connection.executescript(
+            """
+            CREATE TABLE tb_users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                discord_id VARCHAR(18) NOT NULL UNIQUE,
+                steam_user_id VARCHAR(17) NOT NULL UNIQUE
+            );
+            CREATE TABLE tb_owned_games(
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                steam_app_id INTEGER NOT NULL,
+                steam_user_id VARCHAR(17) NOT NULL
+            );
+            CREATE TRIGGER tr_remove_owned_games
+            BEFORE DELETE ON tb_users
+            BEGIN
+                DELETE FROM tb_owned_games WHERE steam_user_id = OLD.steam_user_id;
+            END;
+            INSERT INTO tb_owned_games (steam_app_id, steam_user_id) VALUES (1, '1'), (1, '1'), (2, '1'), (1, '2');
+            """
+        )
+
+    def get_query_plan(self, query: str) -> str:
+        return ' '.join(row[-1] for row in self.database.connection.execute(f'EXPLAIN QUERY PLAN {query}').fetchall())
+
+    def test_schema_version(self) -> None:
+        self.database.create_tables()
+        self.assertEqual(self.database.migrations.schema_version(), self.database.migrations.latest_version)
+
+    def test_migrating_unversioned_table(self) -> None:
+        self.create_unversioned_tables()
+
+        self.assertTrue(self.database.create_tables())
+        self.assertTrue(self.database.create_triggers())
+
+        rows = self.database.connection.execute(
+            'SELECT steam_user_id, steam_app_id FROM tb_owned_games ORDER BY steam_user_id, steam_app_id'
+        ).fetchall()
+        self.assertEqual(rows, [('1', 1), ('1', 2), ('2', 1)])
+        self.assertEqual(self.database.get_row_count('tb_owned_games'), 3)
+
+    def test_triggers_work_after_migration(self) -> None:
+        self.create_unversioned_tables()
+        self.database.create_tables()
+        self.database.create_triggers()
+
+        self.database.set_steam_user_id('10', '1')
+        self.database.remove_user('10')
+
+        row_count = self.database.connection.execute('SELECT COUNT(*) FROM tb_owned_games').fetchone()[0]
+        self.assertEqual(row_count, 1)
+        self.assertEqual(self.database.get_row_count('tb_owned_games'), 1)
+
+    def test_lookup_by_user_uses_index(self) -> None:
+        self.database.create_tables()
+        plan = self.get_query_plan("SELECT steam_app_id FROM tb_owned_games WHERE steam_user_id = '1'")
+        self.assertIn('USING PRIMARY KEY', plan)
+
+    def test_lookup_by_app_uses_index(self) -> None:
+        self.database.create_tables()
+        plan = self.get_query_plan('SELECT steam_user_id FROM tb_owned_games WHERE steam_app_id = 1')
+        self.assertIn('USING COVERING INDEX ix_owned_games_app_user', plan)
+
 
 class UpdateSteamAppsTableMethodTests(unittest.TestCase):
     """
@@ -80,6 +197,20 @@ class UpdateSteamAppsTableMethodTests(unittest.TestCase):
         row_count = self.database.update_steam_apps_table({1: 'app_1'})
         self.assertEqual(row_count, 0)
 
+    def test_generator_of_pairs(self) -> None:
+        row_count = self.database.update_steam_apps_table((app_id, f'app_{app_id}') for app_id in range(1, 4))
+        self.assertEqual(row_count, 3)
+
+    def test_failing_generator_rolls_back(self) -> None:
+        def steam_apps():
+            yield 1, 'app_1'
+            raise ValueError('Mocking a truncated app list.')
+
+        with self.assertRaises(ValueError):
+            self.database.update_steam_apps_table(steam_apps())
+
+        self.assertEqual(self.database.get_row_count('tb_steam_apps'), 0)
+
 
 class SetSteamIDMethodTests(unittest.TestCase):
     """
@@ -118,6 +249,27 @@ class SetSteamIDMethodTests(unittest.TestCase):
         row_count = self.database.connection.execute('SELECT COUNT(id) FROM tb_users').fetchone()[0]
         self.assertEqual(row_count, 1)
 
+    def test_dropping_previous_games(self) -> None:
+        self.database.update_steam_apps_table({10: 'app_10', 20: 'app_20'})
+        self.database.set_steam_user_id('1', '1')
+        self.database.update_owned_games_table([10, 20], '1')
+
+        self.assertTrue(self.database.set_steam_user_id('1', '2', drop_previous_games=True))
+        self.assertEqual(self.database.get_row_count('tb_owned_games'), 0)
+        self.assertEqual(self.database.connection.execute('SELECT library_size FROM tb_users').fetchone(), (0,))
+
+    def test_previous_games_kept_if_steam_id_is_taken(self) -> None:
+        self.database.update_steam_apps_table({10: 'app_10', 20: 'app_20'})
+        self.database.set_steam_user_id('1', '1')
+        self.database.set_steam_user_id('2', '2')
+        self.database.update_owned_games_table([10, 20], '1')
+
+        self.assertFalse(self.database.set_steam_user_id('1', '2', drop_previous_games=True))
+        self.assertEqual(self.database.get_steam_id('1'), '1')
+        self.assertEqual(self.database.get_row_count('tb_owned_games'), 2)
+        library_size = self.database.connection.execute('SELECT library_size FROM tb_users WHERE discord_id = 1')
+        self.assertEqual(library_size.fetchone(), (2,))
+
     def test_inserting_empty_steam_id(self) -> None:
         with self.assertRaises(ValueError):
             self.database.set_steam_user_id('1', '')
@@ -167,6 +319,101 @@ class UpdateOwnedGamesTableMethodTests(unittest.TestCase):
         self.assertEqual(games_inserted, 0)
 
 
+class SyncOwnedGamesTableMethodTests(unittest.TestCase):
+    """
+    Test cases for the DatabaseWrapper.sync_owned_games_table() method.
+    """
+
+    def setUp(self) -> None:
+        self.database = DatabaseWrapper(create_connection(':memory:'))
+        self.database.create_tables()
+        self.database.update_steam_apps_table({1: 'app_1', 2: 'app_2', 3: 'app_3', 4: 'app_4'})
+        self.database.set_steam_user_id('1', '1')
+        self.database.set_steam_user_id('2', '2')
+
+    def get_owned_games(self, steam_user_id: str) -> list[int]:
+        return [row[0] for row in self.database.connection.execute(
+            'SELECT steam_app_id FROM tb_owned_games WHERE steam_user_id = ? ORDER BY steam_app_id', [steam_user_id]
+        )]
+
+    def get_autocomplete(self) -> list[int]:
+        return [row[0] for row in self.database.connection.execute(
+            'SELECT steam_app_id FROM tb_games_autocomplete ORDER BY steam_app_id'
+        )]
+
+    def test_initial_library(self) -> None:
+        self.assertEqual(self.database.sync_owned_games_table([1, 2, 2], '1'), OwnedGamesDiff(2, 0))
+        self.assertEqual(self.get_owned_games('1'), [1, 2])
+        self.assertEqual(self.get_autocomplete(), [1, 2])
+
+    def test_changed_library(self) -> None:
+        self.database.sync_owned_games_table([1, 2], '1')
+
+        self.assertEqual(self.database.sync_owned_games_table([2, 3, 4], '1'), OwnedGamesDiff(2, 1))
+        self.assertEqual(self.get_owned_games('1'), [2, 3, 4])
+        self.assertEqual(self.get_autocomplete(), [2, 3, 4])
+
+    def test_counts_are_per_user(self) -> None:
+        self.database.sync_owned_games_table([1, 2], '2')
+
+        self.assertEqual(self.database.sync_owned_games_table([1, 2, 3], '1'), OwnedGamesDiff(3, 0))
+        self.assertEqual(self.database.sync_owned_games_table([3], '1'), OwnedGamesDiff(0, 2))
+        self.assertEqual(self.get_owned_games('2'), [1, 2])
+
+    def test_autocomplete_kept_while_another_user_owns_game(self) -> None:
+        self.database.sync_owned_games_table([1], '2')
+        self.database.sync_owned_games_table([1, 2], '1')
+        self.database.sync_owned_games_table([], '1')
+
+        self.assertEqual(self.get_autocomplete(), [1])
+
+    def test_drop_users_owned_games(self) -> None:
+        self.database.sync_owned_games_table([1, 2], '1')
+
+        self.assertEqual(self.database.drop_users_owned_games('1'), 2)
+        self.assertEqual(self.get_owned_games('1'), [])
+        self.assertEqual(self.get_autocomplete(), [])
+
+    def test_remove_user(self) -> None:
+        self.database.sync_owned_games_table([1, 2], '1')
+        self.database.sync_owned_games_table([2], '2')
+        self.database.remove_user('1')
+
+        self.assertIsNone(self.database.get_steam_id('1'))
+        self.assertEqual(self.get_owned_games('1'), [])
+        self.assertEqual(self.get_autocomplete(), [2])
+
+
+class VanityURLMethodTests(unittest.TestCase):
+    """
+    Test cases for the DatabaseWrapper vanity URL methods.
+    """
+
+    def setUp(self) -> None:
+        self.database = DatabaseWrapper(create_connection(':memory:'))
+        self.database.create_tables()
+
+    def test_round_trip(self) -> None:
+        self.database.set_vanity_url('_m1nor', '76561198103635351', 100.0)
+        self.assertEqual(self.database.get_vanity_url('_m1nor'), ('76561198103635351', 100.0))
+
+    def test_missing_vanity_url(self) -> None:
+        self.assertIsNone(self.database.get_vanity_url('_m1nor'))
+
+    def test_replaces_existing(self) -> None:
+        self.database.set_vanity_url('_m1nor', '', 100.0)
+        self.database.set_vanity_url('_m1nor', '76561198103635351', 200.0)
+        self.assertEqual(self.database.get_vanity_url('_m1nor'), ('76561198103635351', 200.0))
+
+    def test_purge_expired(self) -> None:
+        self.database.set_vanity_url('old', '1', 100.0)
+        self.database.set_vanity_url('new', '2', 300.0)
+
+        self.assertEqual(self.database.purge_vanity_urls(200.0), 1)
+        self.assertIsNone(self.database.get_vanity_url('old'))
+        self.assertIsNotNone(self.database.get_vanity_url('new'))
+
+
 class GetSteamIdMethodTests(unittest.TestCase):
     """
     Test cases for the DatabaseWrapper.update_owned_games_table() method.
@@ -190,3 +437,47 @@ class GetSteamIdMethodTests(unittest.TestCase):
     def test_empty_discord_id(self) -> None:
         self.database.set_steam_user_id('1', '1')
         self.assertIsNone(self.database.get_steam_id(''))
+
+
+class LibraryScanMethodTests(unittest.TestCase):
+    """
+    Test cases for the DatabaseWrapper bulk library scan methods.
+    """
+
+    def setUp(self) -> None:
+        self.database = DatabaseWrapper(create_connection(':memory:'))
+        self.database.create_tables()
+        for steam_id in ['1', '2', '3']:
+            self.database.set_steam_user_id(steam_id, steam_id)
+
+    def test_start_and_resume(self) -> None:
+        self.assertIsNone(self.database.get_library_scan())
+
+        started_at, resumed = self.database.start_library_scan()
+        self.assertFalse(resumed)
+        self.assertEqual(self.database.get_library_scan(), started_at)
+        self.assertEqual(self.database.start_library_scan(), (started_at, True))
+
+        self.database.finish_library_scan()
+        self.assertIsNone(self.database.get_library_scan())
+
+    def test_unscanned_steam_ids(self) -> None:
+        self.database.connection.execute(
+            "UPDATE tb_users SET library_scanned_at = '2026-01-02 00:00:00' WHERE steam_user_id = '2'"
+        )
+        self.database.connection.execute(
+            "UPDATE tb_users SET library_scanned_at = '2025-12-31 00:00:00' WHERE steam_user_id = '3'"
+        )
+
+        self.assertEqual(self.database.get_unscanned_steam_ids('2026-01-01 00:00:00', 0, 10), [(1, '1'), (3, '3')])
+        self.assertEqual(self.database.get_unscanned_steam_ids('2026-01-01 00:00:00', 1, 10), [(3, '3')])
+        self.assertEqual(self.database.get_unscanned_steam_ids('2026-01-01 00:00:00', 0, 1), [(1, '1')])
+        self.assertEqual(self.database.count_unscanned_steam_ids('2026-01-01 00:00:00'), 2)
+
+    def test_apply_scanned_library(self) -> None:
+        self.database.update_steam_apps_table({10: 'app_10'})
+        self.database.apply_scanned_library('1', [10])
+        self.database.apply_scanned_library('2', [])
+
+        self.assertEqual(self.database.get_row_count('tb_owned_games'), 1)
+        self.assertEqual(self.database.get_stale_steam_ids(60, 10), ['3'])
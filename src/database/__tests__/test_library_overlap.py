@@ -0,0 +1,91 @@
+import random
+import unittest
+
+from src.database.create_connection import create_connection
+from src.database.database_wrapper import DatabaseWrapper
+from src.database.library_overlap import Overlap
+
+
+class FindSimilarUsersMethodTests(unittest.TestCase):
+    """
+    Test cases for the DatabaseWrapper.find_similar_users() method, and the LibraryOverlap class.
+    """
+
+    def setUp(self) -> None:
+        self.database = DatabaseWrapper(create_connection(':memory:'))
+        self.database.create_tables()
+        self.database.update_steam_apps_table({app_id: f'app_{app_id}' for app_id in range(1, 100)})
+
+        for discord_id, steam_apps in {'1': [1, 2, 3, 4], '2': [1, 2, 3], '3': [1, 5, 6, 7, 8], '4': [9]}.items():
+            self.register(discord_id, steam_apps)
+
+    def register(self, discord_id: str, steam_apps: list) -> None:
+        self.database.set_steam_user_id(discord_id, str(76561198000000000 + int(discord_id)))
+        self.database.sync_owned_games_table(steam_apps, str(76561198000000000 + int(discord_id)))
+
+    def find_similar(self, *args, **kwargs) -> list:
+        """
+        Finds similar users with and without the ownership index, checking they agree.
+        """
+
+        self.database.overlap.index = None
+        joined = self.database.find_similar_users(*args, **kwargs)
+
+        self.database.load_ownership_index()
+        counted = self.database.find_similar_users(*args, **kwargs)
+
+        self.assertEqual(joined, counted)
+        return joined
+
+    def test_rank_by_shared(self) -> None:
+        self.assertEqual(self.find_similar('1'), [Overlap('2', 3, 3 / 4), Overlap('3', 1, 1 / 8)])
+
+    def test_rank_by_jaccard(self) -> None:
+        self.register('5', [1, 2, 3, 4] + list(range(10, 30)))
+
+        self.assertEqual([overlap.discord_id for overlap in self.find_similar('1', rank_by='shared')], ['5', '2', '3'])
+        self.assertEqual([overlap.discord_id for overlap in self.find_similar('1', rank_by='jaccard')], ['2', '5', '3'])
+
+    def test_members_and_limit(self) -> None:
+        self.assertEqual(self.find_similar('1', members={'3', '4'}), [Overlap('3', 1, 1 / 8)])
+        self.assertEqual(self.find_similar('1', limit=1), [Overlap('2', 3, 3 / 4)])
+        self.assertEqual(self.find_similar('1', members=set()), [])
+
+    def test_no_shared_games(self) -> None:
+        self.assertEqual(self.find_similar('4'), [])
+        self.assertEqual(self.find_similar('unregistered'), [])
+
+    def test_invalid_ranking(self) -> None:
+        with self.assertRaises(ValueError):
+            self.database.find_similar_users('1', rank_by='hours')
+
+    def test_strategies_agree_on_random_libraries(self) -> None:
+        rng = random.Random(0)
+        for discord_id in range(10, 300):
+            self.register(str(discord_id), rng.sample(range(1, 100), rng.randint(1, 40)))
+
+        for _ in range(20):
+            members = {str(discord_id) for discord_id in rng.sample(range(1, 300), 100)}
+            discord_id = str(rng.randrange(10, 300))
+
+            for rank_by in ['shared', 'jaccard']:
+                self.find_similar(discord_id, limit=rng.randint(1, 20), rank_by=rank_by)
+                self.find_similar(discord_id, members=members, rank_by=rank_by)
+
+    def test_library_sizes_are_maintained(self) -> None:
+        self.database.load_ownership_index()
+        self.database.update_owned_games_table([1, 50, 51], str(76561198000000001))
+        self.database.sync_owned_games_table([60], str(76561198000000002))
+        self.database.drop_users_owned_games(str(76561198000000003))
+
+        with self.database.connection as connection:
+            sizes = dict(connection.execute('SELECT id, library_size FROM tb_users').fetchall())
+
+        index = self.database.ownership.index
+        self.assertEqual(sizes, {1: 6, 2: 1, 3: 0, 4: 1})
+        self.assertEqual({user_number: index.library_size(user_number) for user_number in sizes}, sizes)
+
+
+# Import guard.
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+import asyncio
+import contextlib
+import io
+import sqlite3
+import unittest
+
+from src.database.connection import Connection
+from src.database.migrations import Backfill, Migration, MigrationRunner, split_script
+
+
+def create_runner(connection: Connection, backfills: list[Backfill] = ()) -> MigrationRunner:
+    return MigrationRunner(
+        connection,
+        [
+            Migration(2, 'Add tb_b', script='CREATE TABLE tb_b (id INTEGER PRIMARY KEY);'),
+            Migration(1, 'Add tb_a', script='CREATE TABLE tb_a (id INTEGER PRIMARY KEY, value INTEGER);'),
+        ],
+        backfills
+    )
+
+
+class SplitScriptFunctionTests(unittest.TestCase):
+    """
+    Test cases for the split_script() function.
+    """
+
+    def test_splits_statements(self) -> None:
+        self.assertEqual(list(split_script('SELECT 1; SELECT 2;')), ['SELECT 1;', 'SELECT 2;'])
+
+    def test_keeps_triggers_whole(self) -> None:
+        statements = list(split_script(
+            '''
+            CREATE TRIGGER tr AFTER INSERT ON tb BEGIN DELETE FROM tb; DELETE FROM tb; END;
+            SELECT 1;
+            '''
+        ))
+        self.assertEqual(len(statements), 2)
+        self.assertTrue(statements[0].endswith('END;'))
+
+    def test_missing_final_semicolon(self) -> None:
+        self.assertEqual(list(split_script('SELECT 1; SELECT 2')), ['SELECT 1;', 'SELECT 2;'])
+
+
+class MigrateMethodTests(unittest.TestCase):
+    """
+    Test cases for the MigrationRunner.migrate() method.
+    """
+
+    def setUp(self) -> None:
+        self.connection = Connection(':memory:')
+        self.runner = create_runner(self.connection)
+
+    def test_applies_in_version_order(self) -> None:
+        applied = self.runner.migrate()
+
+        self.assertEqual([migration.version for migration in applied], [1, 2])
+        self.assertEqual(self.runner.schema_version(), 2)
+
+    def test_already_current(self) -> None:
+        self.runner.migrate()
+        self.assertEqual(self.runner.migrate(), [])
+
+    def test_quiet_by_default(self) -> None:
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.runner.migrate()
+
+        self.assertEqual(output.getvalue(), '')
+
+    def test_verbose(self) -> None:
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.runner.migrate(verbose=True)
+
+        self.assertEqual(
+            output.getvalue(),
+            'Applied database migration 1: Add tb_a.\nApplied database migration 2: Add tb_b.\n'
+        )
+
+    def test_failed_migration_is_rolled_back(self) -> None:
+        runner = MigrationRunner(self.connection, [
+            Migration(1, 'Add tb_a', script='CREATE TABLE tb_a (id INTEGER PRIMARY KEY);'),
+            Migration(2, 'Broken', script='CREATE TABLE tb_b (id INTEGER PRIMARY KEY); INSERT INTO missing VALUES (1);'),
+        ])
+
+        with self.assertRaises(sqlite3.Error):
+            runner.migrate()
+
+        self.assertEqual(runner.schema_version(), 1)
+        tables = [row[0] for row in self.connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        self.assertEqual(tables, ['tb_a'])
+
+    def test_duplicate_versions(self) -> None:
+        with self.assertRaises(ValueError):
+            MigrationRunner(self.connection, [Migration(1, 'a'), Migration(1, 'b')])
+
+
+class DryRunMethodTests(unittest.TestCase):
+    """
+    Test cases for the MigrationRunner.dry_run() method.
+    """
+
+    def test_database_is_untouched(self) -> None:
+        connection = Connection(':memory:')
+        runner = create_runner(connection)
+
+        self.assertEqual([migration.version for migration in runner.dry_run()], [1, 2])
+        self.assertEqual(runner.schema_version(), 0)
+        self.assertEqual(connection.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0], 0)
+
+
+class BackfillTests(unittest.TestCase):
+    """
+    Test cases for running Backfill objects with the MigrationRunner.
+    """
+
+    def setUp(self) -> None:
+        self.connection = Connection(':memory:')
+        self.chunks_processed = 0
+        self.runner = create_runner(self.connection, [Backfill('double_values', self.double_values, chunk_size=10)])
+        self.runner.migrate()
+
+        with self.connection:
+            self.connection.executemany('INSERT INTO tb_a (id, value) VALUES (?, ?)', [(i, i) for i in range(1, 26)])
+
+    def double_values(self, connection: Connection, last_key: int, chunk_size: int) -> int | None:
+        self.chunks_processed += 1
+        ids = [row[0] for row in connection.execute(
+            'SELECT id FROM tb_a WHERE id > ? ORDER BY id LIMIT ?', [last_key, chunk_size]
+        )]
+
+        if not ids:
+            return None
+
+        connection.execute(f'UPDATE tb_a SET value = value * 2 WHERE id BETWEEN ? AND ?', [ids[0], ids[-1]])
+        return ids[-1]
+
+    def test_runs_in_chunks(self) -> None:
+        self.runner.run_backfills()
+
+        self.assertEqual(self.chunks_processed, 4)
+        self.assertEqual(self.connection.execute('SELECT SUM(value) FROM tb_a').fetchone()[0], 2 * 325)
+        self.assertEqual(self.runner.pending_backfills(), [])
+
+    def test_resumes_after_interruption(self) -> None:
+        self.runner.run_backfill_chunk(self.runner.backfills[0])
+
+        # Simulating a restart with a new runner.
+        create_runner(self.connection, self.runner.backfills).run_backfills()
+
+        self.assertEqual(self.connection.execute('SELECT SUM(value) FROM tb_a').fetchone()[0], 2 * 325)
+
+    def test_async_yields_between_chunks(self) -> None:
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        async def run():
+            task = asyncio.create_task(ticker())
+            await self.runner.run_backfills_async()
+            task.cancel()
+
+        asyncio.run(run())
+        self.assertGreaterEqual(ticks, 3)
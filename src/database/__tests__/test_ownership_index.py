@@ -0,0 +1,234 @@
+import random
+import threading
+import unittest
+
+from src.database.create_connection import create_connection
+from src.database.database_wrapper import DatabaseWrapper
+from src.database.ownership_index import OwnershipIndex, add_to_planes, bitmap_of, iter_user_numbers
+
+
+def unslice(planes: list, users: int) -> list:
+    """
+    Reads every user's count back from bit-sliced planes.
+    """
+
+    return [
+        sum((plane >> user_number & 1) << position for position, plane in enumerate(planes))
+        for user_number in range(users)
+    ]
+
+
+class OwnershipIndexTests(unittest.TestCase):
+    """
+    Test cases for the OwnershipIndex class.
+    """
+
+    def setUp(self) -> None:
+        self.index = OwnershipIndex()
+        self.index.add(1, [10, 20, 30])
+        self.index.add(2, [10, 20])
+        self.index.add(3, [10])
+
+    def test_bitmaps(self) -> None:
+        self.assertEqual(bitmap_of([0, 3, 64, 200]), (1 << 0) | (1 << 3) | (1 << 64) | (1 << 200))
+        self.assertEqual(list(iter_user_numbers(bitmap_of([0, 3, 64, 200]))), [0, 3, 64, 200])
+        self.assertEqual(list(iter_user_numbers(0)), [])
+
+    def test_bit_sliced_counts(self) -> None:
+        rng = random.Random(0)
+        counts = [0] * 100
+        planes = []
+
+        for _ in range(50):
+            user_numbers, position = rng.sample(range(100), 30), rng.randrange(6)
+            add_to_planes(planes, bitmap_of(user_numbers), position)
+            for user_number in user_numbers:
+                counts[user_number] += 1 << position
+
+        self.assertEqual(unslice(planes, 100), counts)
+
+    def test_count_owned(self) -> None:
+        self.assertEqual(unslice(self.index.count_owned([10, 20, 30, 40]), 4), [0, 3, 2, 1])
+
+    def test_intersection(self) -> None:
+        self.assertEqual(list(iter_user_numbers(self.index.intersection([10]))), [1, 2, 3])
+        self.assertEqual(list(iter_user_numbers(self.index.intersection([10, 20]))), [1, 2])
+        self.assertEqual(list(iter_user_numbers(self.index.intersection([10, 20, 30, 30]))), [1])
+        self.assertEqual(self.index.intersection([10, 40]), 0)
+        self.assertEqual(self.index.intersection([]), 0)
+
+    def test_union(self) -> None:
+        self.assertEqual(list(iter_user_numbers(self.index.union([20, 30, 40]))), [1, 2])
+        self.assertEqual(self.index.union_count([10, 20]), 3)
+
+    def test_count(self) -> None:
+        self.assertEqual(self.index.count([10]), 3)
+        self.assertEqual(self.index.count([10, 20]), 2)
+
+    def test_remove(self) -> None:
+        self.index.remove(1, [10, 30, 40])
+        self.index.remove(4, [10])
+
+        self.assertEqual(list(iter_user_numbers(self.index.owners(10))), [2, 3])
+        self.assertNotIn(30, self.index)
+        self.assertEqual(len(self.index), 2)
+
+    def test_update_is_copy_on_write(self) -> None:
+        # Game 40 is owned by a handful of users, so is stored as an array.
+        self.index.add(1000, [40])
+        owners = self.index._owners[40]
+        self.index.update(3, removed_app_ids=[10], added_app_ids=[20, 40])
+
+        # The owners a query may still be reading are left as they were.
+        self.assertEqual(list(owners), [1000])
+        self.assertEqual(list(iter_user_numbers(self.index.owners(10))), [1, 2])
+        self.assertEqual(list(iter_user_numbers(self.index.owners(40))), [3, 1000])
+        self.assertEqual(self.index.library_size(3), 2)
+
+    def test_queries_never_see_a_half_applied_update(self) -> None:
+        # User 0 moves between two sets of games owned by many users, so the games are stored as bitmaps, and the
+        # games the user owns are always one set or the other.
+        first, second = list(range(100, 150)), list(range(200, 250))
+        for user_number in range(1, 200):
+            self.index.add(user_number, first + second)
+        self.index.add(0, first)
+
+        stop = threading.Event()
+        torn = []
+
+        def query() -> None:
+            while not stop.is_set():
+                planes = self.index.count_owned(first + second)
+                count = sum((plane & 1) << position for position, plane in enumerate(planes))
+                if count != len(first):
+                    torn.append(count)
+
+        readers = [threading.Thread(target=query) for _ in range(2)]
+        for reader in readers:
+            reader.start()
+
+        for _ in range(500):
+            self.index.update(0, removed_app_ids=first, added_app_ids=second)
+            self.index.update(0, removed_app_ids=second, added_app_ids=first)
+
+        stop.set()
+        for reader in readers:
+            reader.join()
+
+        self.assertEqual(torn, [])
+
+    def test_dense_and_sparse_games_agree(self) -> None:
+        rng = random.Random(0)
+        owners = {steam_app_id: set() for steam_app_id in range(10)}
+
+        # Game 0 is owned by most users, so is stored as a bitmap, game 9 by a handful, so is stored as an array.
+        for _ in range(5000):
+            user_number, steam_app_id = rng.randrange(20000), int(10 * rng.random() ** 3)
+            if rng.random() < 0.8:
+                self.index.add(user_number, [steam_app_id])
+                owners[steam_app_id].add(user_number)
+            else:
+                self.index.remove(user_number, [steam_app_id])
+                owners[steam_app_id].discard(user_number)
+
+        self.assertIsInstance(self.index._owners[0], int)
+        self.assertNotIsInstance(self.index._owners[9], int)
+
+        for _ in range(50):
+            steam_app_ids = rng.sample(range(10), rng.randint(1, 4))
+            expected = set.intersection(*(owners[steam_app_id] for steam_app_id in steam_app_ids))
+            self.assertEqual(set(iter_user_numbers(self.index.intersection(steam_app_ids))), expected)
+
+            expected = set.union(*(owners[steam_app_id] for steam_app_id in steam_app_ids))
+            self.assertEqual(set(iter_user_numbers(self.index.union(steam_app_ids))), expected)
+
+
+class OwnershipIndexDatabaseTests(unittest.TestCase):
+    """
+    Test cases for building, persisting and maintaining the OwnershipIndex class through the DatabaseWrapper class.
+    """
+
+    def setUp(self) -> None:
+        self.database = DatabaseWrapper(create_connection(':memory:'))
+        self.database.create_tables()
+        self.database.update_steam_apps_table({app_id: f'app_{app_id}' for app_id in range(1, 40)})
+
+        self.rng = random.Random(0)
+        for discord_id in range(1, 100):
+            self.register(discord_id, self.rng.sample(range(1, 40), 10))
+
+    def register(self, discord_id: int, steam_apps: list) -> None:
+        self.database.set_steam_user_id(str(discord_id), str(76561198000000000 + discord_id))
+        self.database.sync_owned_games_table(steam_apps, str(76561198000000000 + discord_id))
+
+    def assertIndexCurrent(self) -> None:
+        """
+        Checks the loaded index matches an index rebuilt from the owned games.
+        """
+
+        with self.database.connection as connection:
+            rebuilt = OwnershipIndex.build(connection)
+
+        index = self.database.ownership.index
+        self.assertEqual(index.version, rebuilt.version)
+        for steam_app_id in range(1, 40):
+            self.assertEqual(index.owners(steam_app_id), rebuilt.owners(steam_app_id))
+
+    def test_load_rebuilds_unsaved_index(self) -> None:
+        self.assertFalse(self.database.load_ownership_index())
+        self.assertIndexCurrent()
+
+    def test_save_and_load(self) -> None:
+        self.database.load_ownership_index()
+        self.assertEqual(self.database.save_ownership_index(), 39)
+
+        self.assertTrue(self.database.load_ownership_index())
+        self.assertIndexCurrent()
+
+    def test_changes_are_saved_incrementally(self) -> None:
+        self.database.load_ownership_index()
+        self.database.save_ownership_index()
+
+        diff = self.database.sync_owned_games_table([1, 2], str(76561198000000000 + 5))
+        self.assertLessEqual(self.database.save_ownership_index(), diff.added + diff.removed)
+
+        self.assertTrue(self.database.load_ownership_index())
+        self.assertIndexCurrent()
+
+    def test_stale_persisted_index_is_rebuilt(self) -> None:
+        self.database.load_ownership_index()
+        self.database.save_ownership_index()
+
+        # Changing the owned games while the index is not loaded, as another process would.
+        self.database.ownership.index = None
+        self.database.sync_owned_games_table([1, 2], str(76561198000000000 + 5))
+
+        self.assertFalse(self.database.load_ownership_index())
+        self.assertIndexCurrent()
+
+    def test_maintained_incrementally(self) -> None:
+        self.database.load_ownership_index()
+
+        for discord_id in range(1, 150):
+            action = self.rng.random()
+            if action < 0.4:
+                self.register(discord_id, self.rng.sample(range(1, 40), 10))
+            elif action < 0.6:
+                self.database.update_owned_games_table([self.rng.randrange(1, 40)], str(76561198000000000 + discord_id))
+            elif action < 0.7:
+                self.database.drop_users_owned_games(str(76561198000000000 + discord_id))
+            elif action < 0.8:
+                self.database.set_steam_user_id(str(discord_id), str(76561198100000000 + discord_id))
+            elif action < 0.9:
+                self.database.remove_user(str(discord_id))
+
+        self.assertIndexCurrent()
+
+        self.database.save_ownership_index()
+        self.assertTrue(self.database.load_ownership_index())
+        self.assertIndexCurrent()
+
+
+# Import guard.
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import random
+import unittest
+
+from src.database.create_connection import create_connection
+from src.database.database_wrapper import DatabaseWrapper
+
+
+class FindOwnersMethodTests(unittest.TestCase):
+    """
+    Test cases for the DatabaseWrapper.find_owners() method, and the OwnershipLookup class.
+    """
+
+    def setUp(self) -> None:
+        self.database = DatabaseWrapper(create_connection(':memory:'))
+        self.database.create_tables()
+        self.database.update_steam_apps_table({1: 'Portal', 2: 'Portal 2', 3: 'Team Fortress 2', 4: 'Unowned'})
+
+        for discord_id, steam_apps in {'1': [1, 2], '2': [1], '3': [2, 3], '4': [1, 2, 3]}.items():
+            self.database.set_steam_user_id(discord_id, f'7656119800000000{discord_id}')
+            self.database.sync_owned_games_table(steam_apps, f'7656119800000000{discord_id}')
+
+    def find_owners(self, *args, **kwargs) -> list:
+        """
+        Finds owners with every strategy, checking they agree.
+        """
+
+        self.database.ownership.index = None
+        self.database.ownership.probe_cost = 0
+        probed = self.database.find_owners(*args, **kwargs)
+
+        self.database.ownership.probe_cost = 10 ** 9
+        scanned = self.database.find_owners(*args, **kwargs)
+
+        self.database.load_ownership_index()
+        intersected = self.database.find_owners(*args, **kwargs)
+
+        self.assertEqual(probed, scanned)
+        self.assertEqual(probed, intersected)
+        return probed
+
+    def test_single_game(self) -> None:
+        self.assertEqual(self.find_owners([1]), ['1', '2', '4'])
+
+    def test_every_game(self) -> None:
+        self.assertEqual(self.find_owners([1, 2]), ['1', '4'])
+        self.assertEqual(self.find_owners([1, 2, 3]), ['4'])
+        self.assertEqual(self.find_owners([1, 1, 2]), ['1', '4'])
+
+    def test_members(self) -> None:
+        self.assertEqual(self.find_owners([1], members={'2', '3', '4', 'unregistered'}), ['2', '4'])
+        self.assertEqual(self.find_owners([1], members=set()), [])
+
+    def test_limit(self) -> None:
+        self.assertEqual(self.find_owners([1], limit=2), ['1', '2'])
+        self.assertEqual(self.find_owners([1], limit=0), [])
+
+    def test_unowned_games(self) -> None:
+        self.assertEqual(self.find_owners([4]), [])
+        self.assertEqual(self.find_owners([1, 4]), [])
+        self.assertEqual(self.find_owners([]), [])
+
+    def test_strategies_agree_on_random_libraries(self) -> None:
+        rng = random.Random(0)
+        self.database.update_steam_apps_table({app_id: f'app_{app_id}' for app_id in range(10, 30)})
+
+        for discord_id in range(10, 200):
+            self.database.set_steam_user_id(str(discord_id), str(76561198000000000 + discord_id))
+            self.database.sync_owned_games_table(rng.sample(range(10, 30), 8), str(76561198000000000 + discord_id))
+
+        for _ in range(20):
+            members = {str(discord_id) for discord_id in rng.sample(range(10, 250), 60)}
+            self.find_owners(rng.sample(range(10, 30), rng.randint(1, 3)), members=members)
+
+    def test_get_app_id(self) -> None:
+        self.assertEqual(self.database.get_app_id('portal 2'), 2)
+        self.assertIsNone(self.database.get_app_id('Unowned'))
@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+
+from src.database.create_connection import create_connection
+from src.database.database_wrapper import DatabaseWrapper
+from src.database.packed_catalogue import PackedCatalogue, write_packed_catalogue
+
+APPS = [
+    (620, 'Portal 2'),
+    (400, 'Portal'),
+    (1902490, 'Aperture Desk Job'),
+    (440, 'Team Fortress 2'),
+    (1, 'Pokémon™ ポケモン')
+]
+
+
+class PackedCatalogueTests(unittest.TestCase):
+    """
+    Test cases for the PackedCatalogue class and the write_packed_catalogue() function.
+    """
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'apps.catalogue')
+        self.assertEqual(write_packed_catalogue(self.path, iter(APPS)), 5)
+        self.catalogue = PackedCatalogue(self.path)
+
+    def tearDown(self) -> None:
+        self.catalogue.close()
+        self.directory.cleanup()
+
+    def test_lookup(self) -> None:
+        for steam_app_id, game_title in APPS:
+            self.assertEqual(self.catalogue.get(steam_app_id), game_title)
+            self.assertIn(steam_app_id, self.catalogue)
+
+        for steam_app_id in [0, 2, 500, 2 ** 31]:
+            self.assertIsNone(self.catalogue.get(steam_app_id))
+            self.assertNotIn(steam_app_id, self.catalogue)
+
+        self.assertEqual(self.catalogue.get(2, 'unknown'), 'unknown')
+
+    def test_iterates_in_app_id_order(self) -> None:
+        self.assertEqual(len(self.catalogue), 5)
+        self.assertEqual(list(self.catalogue), sorted(APPS))
+
+    def test_title_bytes(self) -> None:
+        title = self.catalogue.title_bytes(1)
+        self.assertIsInstance(title, memoryview)
+        self.assertEqual(title.tobytes(), 'Pokémon™ ポケモン'.encode('utf-8'))
+        title.release()
+
+        self.assertIsNone(self.catalogue.title_bytes(2))
+
+    def test_duplicates_keep_the_last_title(self) -> None:
+        write_packed_catalogue(self.path, [(10, 'old'), (5, 'five'), (10, 'new'), (10, '')])
+        with PackedCatalogue(self.path) as catalogue:
+            self.assertEqual(list(catalogue), [(5, 'five'), (10, '')])
+
+    def test_empty_catalogue(self) -> None:
+        write_packed_catalogue(self.path, [])
+        with PackedCatalogue(self.path) as catalogue:
+            self.assertEqual(len(catalogue), 0)
+            self.assertIsNone(catalogue.get(1))
+
+    def test_invalid_files(self) -> None:
+        with self.assertRaises(ValueError):
+            write_packed_catalogue(self.path, [(-1, 'negative')])
+
+        with open(self.path, 'rb') as file:
+            contents = file.read()
+
+        for invalid in [b'', b'not a catalogue', contents[:-1], contents.replace(b'LLCAT', b'XXCAT')]:
+            path = os.path.join(self.directory.name, 'invalid.catalogue')
+            with open(path, 'wb') as file:
+                file.write(invalid)
+
+            with self.assertRaises(ValueError):
+                PackedCatalogue(path)
+
+    def test_close_with_a_held_title(self) -> None:
+        title = self.catalogue.title_bytes(400)
+        self.catalogue.close()
+        self.assertEqual(title.tobytes(), b'Portal')
+        self.catalogue.close()
+
+    def test_sync_from_catalogue(self) -> None:
+        database = DatabaseWrapper(create_connection(':memory:'))
+        database.migrate()
+
+        self.assertEqual(database.sync_steam_apps_table(self.catalogue)[:3], (5, 0, 0))
+        self.assertEqual(database.get_game_title(1902490), 'Aperture Desk Job')
+
+        database.catalogue = self.catalogue
+        self.assertEqual(database.get_game_title(1902490), 'Aperture Desk Job')
+        self.assertIsNone(database.get_game_title(2))
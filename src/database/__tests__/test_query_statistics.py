@@ -0,0 +1,149 @@
+import contextlib
+import io
+import time
+import unittest
+
+from src.database.create_connection import create_connection
+from src.database.query_statistics import QueryStatistics
+
+
+class QueryStatisticsTests(unittest.TestCase):
+    """
+    Test cases for the QueryStatistics class.
+    """
+
+    def setUp(self) -> None:
+        self.statistics = QueryStatistics()
+
+    def test_record(self) -> None:
+        self.statistics.record('SELECT 1', 0.00005)
+        self.statistics.record('SELECT 1', 0.002, rows_returned=1)
+        self.statistics.record('DELETE FROM tb_users', 2.0, rows=3)
+
+        select, delete = sorted(self.statistics.top(by='calls'), key=lambda statement: statement.sql, reverse=True)
+        self.assertEqual((select.calls, select.rows, select.rows_returned, select.max_time), (2, 0, 1, 0.002))
+        self.assertAlmostEqual(select.mean_time, 0.001025)
+        self.assertEqual(select.histogram, [1, 0, 0, 1, 0, 0, 0, 0, 0, 0])
+        self.assertEqual((delete.calls, delete.rows), (1, 3))
+        self.assertEqual(delete.histogram[-1], 1)
+
+    def test_top(self) -> None:
+        self.statistics.record('SELECT 1', 0.01)
+        for _ in range(5):
+            self.statistics.record('SELECT 2', 0.003)
+
+        self.assertEqual([statement.sql for statement in self.statistics.top(by='total')], ['SELECT 2', 'SELECT 1'])
+        self.assertEqual([statement.sql for statement in self.statistics.top(by='max')], ['SELECT 1', 'SELECT 2'])
+        self.assertEqual([statement.sql for statement in self.statistics.top(1, by='calls')], ['SELECT 2'])
+
+        with self.assertRaises(ValueError):
+            self.statistics.top(by='rows')
+
+    def test_report_collapses_whitespace(self) -> None:
+        self.statistics.record('\n    SELECT steam_app_id\n    FROM tb_steam_apps\n', 0.001)
+
+        report = self.statistics.report()
+        self.assertIn('SELECT steam_app_id FROM tb_steam_apps', report)
+        self.assertEqual(len(report.splitlines()), 2)
+
+        self.statistics.reset()
+        self.assertEqual(self.statistics.top(), [])
+
+    def test_slow_query_log(self) -> None:
+        self.statistics.slow_query_threshold = 0.1
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.statistics.record('SELECT 1', 0.05)
+            self.statistics.record('SELECT 2', 0.25)
+
+        self.assertEqual(output.getvalue(), 'Slow query, 250.0ms: SELECT 2\n')
+
+
+class ConnectionStatisticsTests(unittest.TestCase):
+    """
+    Test cases for recording query statistics through the Connection class.
+    """
+
+    def setUp(self) -> None:
+        self.connection = create_connection(':memory:')
+        self.connection.execute('CREATE TABLE tb_test (id INTEGER PRIMARY KEY)')
+
+    def get_calls(self) -> dict:
+        return {statement.sql: (statement.calls, statement.rows) for statement in self.connection.statistics.top()}
+
+    def test_nothing_recorded_by_default(self) -> None:
+        self.assertIsNone(self.connection.statistics)
+        self.assertEqual(self.connection.execute('SELECT COUNT(*) FROM tb_test').fetchone(), (0,))
+
+    def test_records_statements_and_commits(self) -> None:
+        self.connection.statistics = QueryStatistics()
+
+        with self.connection:
+            self.connection.executemany('INSERT INTO tb_test (id) VALUES (?)', [(1,), (2,), (3,)])
+            self.connection.execute('DELETE FROM tb_test WHERE id > ?', [1])
+        self.connection.execute('SELECT id FROM tb_test').fetchall()
+
+        self.assertEqual(self.get_calls(), {
+            'INSERT INTO tb_test (id) VALUES (?)': (1, 3),
+            'DELETE FROM tb_test WHERE id > ?': (1, 2),
+            'SELECT id FROM tb_test': (1, 0),
+            'COMMIT': (1, 0)
+        })
+
+    def test_fetches_are_timed(self) -> None:
+        self.connection.statistics = QueryStatistics()
+        self.connection.executemany('INSERT INTO tb_test (id) VALUES (?)', [(1,), (2,), (3,)])
+        self.connection.create_function('slow', 1, lambda value: time.sleep(0.01) or value)
+
+        # Executing the query only finds the first row, the remaining rows are computed as they are fetched.
+        cursor = self.connection.execute('SELECT slow(id) FROM tb_test')
+        self.assertEqual(self.get_calls().get('SELECT slow(id) FROM tb_test'), None)
+        self.assertEqual(cursor.fetchall(), [(1,), (2,), (3,)])
+
+        statement = self.connection.statistics.top(by='total')[0]
+        self.assertEqual((statement.sql, statement.calls, statement.rows, statement.rows_returned),
+                         ('SELECT slow(id) FROM tb_test', 1, 0, 3))
+        self.assertGreaterEqual(statement.total_time, 0.03)
+
+    def test_partly_fetched_queries_are_recorded_once(self) -> None:
+        self.connection.statistics = QueryStatistics()
+        self.connection.executemany('INSERT INTO tb_test (id) VALUES (?)', [(1,), (2,), (3,)])
+
+        self.assertEqual(self.connection.execute('SELECT id FROM tb_test').fetchone(), (1,))
+        self.assertEqual([row for row in self.connection.execute('SELECT id FROM tb_test WHERE id > 1')], [(2,), (3,)])
+        cursor = self.connection.execute('SELECT id FROM tb_test WHERE id < 3')
+        self.assertEqual(cursor.fetchmany(1), [(1,)])
+        cursor.close()
+
+        returned = {statement.sql: (statement.calls, statement.rows_returned)
+                    for statement in self.connection.statistics.top()}
+        self.assertEqual(returned['SELECT id FROM tb_test'], (1, 1))
+        self.assertEqual(returned['SELECT id FROM tb_test WHERE id > 1'], (1, 2))
+        self.assertEqual(returned['SELECT id FROM tb_test WHERE id < 3'], (1, 1))
+
+    def test_row_count_of_statements_changing_nothing(self) -> None:
+        self.connection.statistics = QueryStatistics()
+        self.connection.execute('CREATE TABLE tb_other (id INTEGER PRIMARY KEY)')
+
+        self.assertEqual(self.get_calls()['CREATE TABLE tb_other (id INTEGER PRIMARY KEY)'], (1, 0))
+
+    def test_explicit_commit(self) -> None:
+        self.connection.statistics = QueryStatistics()
+
+        self.connection.commit()
+        self.connection.execute('INSERT INTO tb_test (id) VALUES (1)')
+        self.connection.commit()
+
+        self.assertEqual(self.get_calls()['COMMIT'], (1, 0))
+
+    def test_rolled_back_transaction(self) -> None:
+        self.connection.statistics = QueryStatistics()
+
+        with self.assertRaises(ZeroDivisionError):
+            with self.connection:
+                self.connection.execute('INSERT INTO tb_test (id) VALUES (1)')
+                raise ZeroDivisionError
+
+        self.assertNotIn('COMMIT', self.get_calls())
+        self.assertEqual(self.connection.execute('SELECT COUNT(*) FROM tb_test').fetchone(), (0,))
@@ -0,0 +1,143 @@
+import random
+import unittest
+
+from src.database.create_connection import create_connection
+from src.database.database_wrapper import DatabaseWrapper
+from src.database.title_index import TitleIndex
+
+GAMES = [
+    (1, 'Portal'),
+    (2, 'Portal 2'),
+    (3, 'Aperture Desk Job'),
+    (4, 'Team Fortress 2'),
+    (5, 'Half-Life 2: Episode One'),
+    (6, 'Fortnite')
+]
+
+
+class TitleIndexTests(unittest.TestCase):
+    """
+    Test cases for the TitleIndex class.
+    """
+
+    def setUp(self) -> None:
+        self.index = TitleIndex(GAMES)
+
+    def search(self, term: str, **kwargs) -> list:
+        return [game_title for _, game_title in self.index.search(term, **kwargs)]
+
+    def test_prefix_matches_rank_first(self) -> None:
+        self.assertEqual(self.search('fort'), ['Fortnite', 'Team Fortress 2'])
+
+    def test_case_insensitive(self) -> None:
+        self.assertEqual(self.search('PORTAL 2', fuzzy=False), ['Portal 2'])
+
+    def test_word_prefix(self) -> None:
+        self.assertEqual(self.search('episode'), ['Half-Life 2: Episode One'])
+        self.assertEqual(self.search('desk j'), ['Aperture Desk Job'])
+
+    def test_fuzzy(self) -> None:
+        self.assertEqual(self.search('protal'), ['Portal', 'Portal 2'])
+        self.assertEqual(self.search('protal', fuzzy=False), [])
+        self.assertEqual(self.search('xyzzy'), [])
+
+    def test_returns_app_ids(self) -> None:
+        self.assertEqual(self.index.search('aperture'), [(3, 'Aperture Desk Job')])
+
+    def test_limit(self) -> None:
+        self.assertEqual(self.search('portal', limit=1), ['Portal'])
+        self.assertEqual(self.search('portal', limit=0), [])
+
+    def test_add(self) -> None:
+        self.assertTrue(self.index.add(7, 'Portal Knights'))
+        self.assertFalse(self.index.add(7, 'Portal Knights'))
+        self.assertTrue(self.index.add(8, 'portal knights'))
+        self.index.remove(8, 'portal knights')
+
+        self.assertEqual(self.search('portal', fuzzy=False), ['Portal', 'Portal 2', 'Portal Knights'])
+        self.assertEqual(self.search('knights'), ['Portal Knights'])
+        self.assertEqual(len(self.index), 7)
+
+    def test_remove(self) -> None:
+        self.assertTrue(self.index.remove(4, 'Team Fortress 2'))
+        self.assertFalse(self.index.remove(4, 'Team Fortress 2'))
+        self.assertFalse(self.index.remove(99, 'Portal'))
+
+        self.assertEqual(self.search('fortress', fuzzy=False), [])
+        self.assertEqual(self.search('fort'), ['Fortnite'])
+        self.assertEqual(list(self.index)[3:], [(5, 'Half-Life 2: Episode One'), (6, 'Fortnite')])
+        self.assertEqual(len(self.index), 5)
+
+    def test_matches_a_linear_scan_after_random_changes(self) -> None:
+        rng = random.Random(0)
+        words = ['alpha', 'beta', 'gamma', 'delta', 'Delta', 'omega']
+        games = {}
+        index = TitleIndex()
+
+        for steam_app_id in range(300):
+            if games and rng.random() < 0.3:
+                removed_id = rng.choice(list(games))
+                self.assertTrue(index.remove(removed_id, games.pop(removed_id)))
+            else:
+                games[steam_app_id] = ' '.join(rng.choice(words) for _ in range(rng.randint(1, 3)))
+                index.add(steam_app_id, games[steam_app_id])
+
+        for term in ['a', 'al', 'delta', 'delta g', 'om', 'beta beta']:
+            expected = {
+                steam_app_id for steam_app_id, game_title in games.items()
+                if any(word.startswith(term) for word in [game_title.casefold()] + [
+                    game_title.casefold()[i + 1:] for i, char in enumerate(game_title) if char == ' '
+                ])
+            }
+            found = {steam_app_id for steam_app_id, _ in index.search(term, limit=1000, fuzzy=False)}
+            self.assertEqual(found, expected, term)
+
+    def test_memory_usage(self) -> None:
+        self.assertGreater(self.index.memory_usage(), 0)
+        self.assertEqual(TitleIndex().bytes_per_title(), 0)
+
+
+class AutocompleteListenerTests(unittest.TestCase):
+    """
+    Test cases for keeping a TitleIndex in step with the database through DatabaseWrapper autocomplete listeners.
+    """
+
+    def setUp(self) -> None:
+        self.database = DatabaseWrapper(create_connection(':memory:'))
+        self.database.create_tables()
+        self.database.update_steam_apps_table(dict(GAMES))
+        self.database.set_steam_user_id('1', '76561198103635351')
+        self.database.set_steam_user_id('2', '76561198000000001')
+
+        self.index = TitleIndex(self.database.get_autocomplete_games())
+        self.database.add_autocomplete_listener(self.index.apply)
+
+    def assert_index_matches_database(self) -> None:
+        self.assertEqual(sorted(self.index), sorted(self.database.get_autocomplete_games()))
+
+    def test_follows_owned_games(self) -> None:
+        self.database.sync_owned_games_table([1, 2, 4], '76561198103635351')
+        self.assert_index_matches_database()
+
+        self.database.sync_owned_games_table([2, 3], '76561198000000001')
+        self.database.sync_owned_games_table([4], '76561198103635351')
+        self.assert_index_matches_database()
+
+        self.database.update_owned_games_table([5], '76561198103635351')
+        self.assert_index_matches_database()
+
+        self.database.drop_users_owned_games('76561198000000001')
+        self.assert_index_matches_database()
+
+        self.database.remove_user('1')
+        self.assert_index_matches_database()
+        self.assertEqual(len(self.index), 0)
+
+    def test_not_notified_without_changes(self) -> None:
+        calls = []
+        self.database.add_autocomplete_listener(lambda added, removed: calls.append((added, removed)))
+
+        self.database.sync_owned_games_table([1], '76561198103635351')
+        self.database.sync_owned_games_table([1], '76561198000000001')
+
+        self.assertEqual(calls, [([(1, 'Portal')], [])])
@@ -0,0 +1,298 @@
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import AbstractSet, Callable, Dict, Iterable, List, Sequence, Tuple, TypeVar
+
+from .catalogue_sync import CatalogueDiff
+from .create_connection import create_connection
+from .database_wrapper import AutocompleteListener, DatabaseWrapper
+from .library_overlap import Overlap
+from .owned_games_sync import OwnedGamesDiff
+
+T = TypeVar('T')
+
+
+class AsyncDatabaseWrapper:
+    """
+    Asynchronous façade over the DatabaseWrapper class, so a slow query never blocks the event loop. Every method of
+    the DatabaseWrapper class has an async variant with the same name and parameters.
+
+    Writes run one at a time on a single writer thread, against the wrapped DatabaseWrapper, so they are serialized
+    exactly as they were on the event loop. Reads run on a pool of reader threads, each with its own read-only
+    connection, opened with the read-only variant of the writer's connection profile. With a WAL profile, such as
+    PRODUCTION_PROFILE, readers see the last committed state instead of waiting for the writer to commit. In-memory
+    databases cannot be shared between connections, so their reads run on the writer thread too.
+
+    The in-memory ownership index is shared by every reader, and updated by the writer thread once each change is
+    committed. Autocomplete listeners are called on the event loop, in the order the changes were committed.
+    """
+
+    def __init__(self, database: DatabaseWrapper, readers: int = 4) -> None:
+        """
+        Constructor for the AsyncDatabaseWrapper class.
+
+        :param database: The wrapper to run writes against. Its connection must be created with
+        check_same_thread=False, and must not be used outside of run_write() once the event loop is running.
+        :param readers: The number of reader threads, and read-only connections.
+        """
+
+        self.writer: DatabaseWrapper = database
+        """
+        The wrapper writes are run against, on the writer thread.
+        """
+
+        self._path: str = self.writer.connection.execute('PRAGMA database_list').fetchone()[2]
+        """
+        The path of the database file, an empty string for in-memory databases.
+        """
+
+        self._write_executor: ThreadPoolExecutor = ThreadPoolExecutor(1, thread_name_prefix='database-writer')
+        self._read_executor: ThreadPoolExecutor | None = None
+
+        if self._path and readers > 0:
+            self._read_executor = ThreadPoolExecutor(readers, thread_name_prefix='database-reader')
+
+        self._local: threading.local = threading.local()
+        """
+        The reader wrapper of each thread.
+        """
+
+        self._readers: List[DatabaseWrapper] = []
+        """
+        Every reader wrapper, closed by close().
+        """
+
+        self._readers_lock: threading.Lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_reader(self) -> DatabaseWrapper:
+        """
+        Gets the reader wrapper of the calling thread, opening a read-only connection the first time.
+        """
+
+        reader = getattr(self._local, 'reader', None)
+        if reader is None:
+            profile = self.writer.connection.profile.for_reading()
+            connection = create_connection(self._path, profile, check_same_thread=False)
+            if connection is None:
+                raise sqlite3.OperationalError(f'Could not open a read-only connection to {self._path}.')
+
+            reader = self._local.reader = DatabaseWrapper(connection)
+            with self._readers_lock:
+                self._readers.append(reader)
+
+        # Sharing the in-memory indexes, catalogue and query statistics of the writer, which may have been replaced
+        # since the last read.
+        reader.connection.statistics = self.writer.connection.statistics
+        reader.ownership.index = self.writer.ownership.index
+        reader.overlap.index = self.writer.overlap.index
+        reader.catalogue = self.writer.catalogue
+        return reader
+
+    def _call_reader(self, function: Callable[..., T], *args) -> T:
+        return function(self._get_reader(), *args)
+
+    async def run_read(self, function: Callable[..., T], *args) -> T:
+        """
+        Runs a function that only reads from the database on a reader thread.
+
+        :param function: The function to run, called with a DatabaseWrapper and the passed arguments.
+        :return: The return value of the function.
+        """
+
+        if self._read_executor is None:
+            return await self.run_write(function, *args)
+
+        self._loop = asyncio.get_running_loop()
+        return await self._loop.run_in_executor(self._read_executor, self._call_reader, function, *args)
+
+    async def run_write(self, function: Callable[..., T], *args) -> T:
+        """
+        Runs a function that writes to the database on the writer thread, after every write submitted before it.
+
+        :param function: The function to run, called with the writer DatabaseWrapper and the passed arguments.
+        :return: The return value of the function.
+        """
+
+        self._loop = asyncio.get_running_loop()
+        return await self._loop.run_in_executor(self._write_executor, function, self.writer, *args)
+
+    def read_now(self, function: Callable[..., T], *args) -> T:
+        """
+        Runs a function that only reads from the database on the calling thread, blocking it. Only meant for short
+        primary key lookups from callbacks that cannot await, such as the loader of a cache.
+
+        :param function: The function to run, called with a DatabaseWrapper and the passed arguments.
+        :return: The return value of the function.
+        """
+
+        if self._read_executor is None:
+            return self._write_executor.submit(function, self.writer, *args).result()
+
+        return self._call_reader(function, *args)
+
+    def write_later(self, function: Callable[..., T], *args) -> Future:
+        """
+        Queues a function that writes to the database on the writer thread, without waiting for it. Errors are
+        printed, as nothing waits for the result.
+
+        :param function: The function to run, called with the writer DatabaseWrapper and the passed arguments.
+        :return: The future of the function's return value.
+        """
+
+        future = self._write_executor.submit(function, self.writer, *args)
+        future.add_done_callback(self._print_write_error)
+        return future
+
+    @staticmethod
+    def _print_write_error(future: Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            print(f'Error while writing to the database in the background: {future.exception()}')
+
+    def add_autocomplete_listener(self, listener: AutocompleteListener) -> None:
+        """
+        Registers a function to be called whenever a change to owned games adds games to, or removes games from, the
+        autocomplete table. Once the event loop has run a query, the function is called on the event loop rather than
+        on the writer thread, so it never runs alongside code on the event loop.
+
+        :param listener: The function to call with the added and removed (Steam App ID, game title) pairs.
+        """
+
+        def dispatch(added: List[Tuple[int, str]], removed: List[Tuple[int, str]]) -> None:
+            if self._loop is None:
+                listener(added, removed)
+            else:
+                self._loop.call_soon_threadsafe(listener, added, removed)
+
+        self.writer.add_autocomplete_listener(dispatch)
+
+    async def close(self) -> None:
+        """
+        Waits for every queued write, then closes the reader connections. The writer connection is left open.
+        """
+
+        executors = [executor for executor in [self._write_executor, self._read_executor] if executor is not None]
+        await asyncio.to_thread(lambda: [executor.shutdown(wait=True) for executor in executors])
+
+        with self._readers_lock:
+            for reader in self._readers:
+                reader.connection.close()
+            self._readers.clear()
+
+    # Reads.
+
+    async def get_autocomplete_games(self) -> List[Tuple[int, str]]:
+        return await self.run_read(DatabaseWrapper.get_autocomplete_games)
+
+    async def get_stale_steam_ids(self, max_age: float, limit: int) -> List[str]:
+        return await self.run_read(DatabaseWrapper.get_stale_steam_ids, max_age, limit)
+
+    async def get_library_scan(self) -> str | None:
+        return await self.run_read(DatabaseWrapper.get_library_scan)
+
+    async def get_unscanned_steam_ids(self, scan_started_at: str, after: int, limit: int) -> List[Tuple[int, str]]:
+        return await self.run_read(DatabaseWrapper.get_unscanned_steam_ids, scan_started_at, after, limit)
+
+    async def count_unscanned_steam_ids(self, scan_started_at: str) -> int:
+        return await self.run_read(DatabaseWrapper.count_unscanned_steam_ids, scan_started_at)
+
+    async def get_game_title(self, steam_app_id: int) -> str | None:
+        return await self.run_read(DatabaseWrapper.get_game_title, steam_app_id)
+
+    async def get_app_id(self, game_title: str) -> int | None:
+        return await self.run_read(DatabaseWrapper.get_app_id, game_title)
+
+    async def find_owners(
+            self,
+            steam_app_ids: Sequence[int],
+            members: AbstractSet[str] | None = None,
+            limit: int | None = None
+    ) -> List[str]:
+        # Copying the members, as a cached member set may change on the event loop while the query runs.
+        members = None if members is None else frozenset(members)
+        return await self.run_read(DatabaseWrapper.find_owners, steam_app_ids, members, limit)
+
+    async def find_similar_users(
+            self,
+            discord_id: str,
+            members: AbstractSet[str] | None = None,
+            limit: int = 10,
+            rank_by: str = 'shared'
+    ) -> List[Overlap]:
+        members = None if members is None else frozenset(members)
+        return await self.run_read(DatabaseWrapper.find_similar_users, discord_id, members, limit, rank_by)
+
+    async def get_row_count(self, table: str) -> int:
+        return await self.run_read(DatabaseWrapper.get_row_count, table)
+
+    async def get_row_counts(self) -> Dict[str, int]:
+        return await self.run_read(DatabaseWrapper.get_row_counts)
+
+    async def get_vanity_url(self, vanity_name: str) -> Tuple[str, float] | None:
+        return await self.run_read(DatabaseWrapper.get_vanity_url, vanity_name)
+
+    async def get_steam_id(self, discord_id: str) -> str | None:
+        return await self.run_read(DatabaseWrapper.get_steam_id, discord_id)
+
+    # Writes.
+
+    async def migrate(self) -> bool:
+        return await self.run_write(DatabaseWrapper.migrate)
+
+    async def update_steam_apps_table(self, steam_apps: dict[int, str] | Iterable[Tuple[int, str]]) -> int:
+        return await self.run_write(DatabaseWrapper.update_steam_apps_table, steam_apps)
+
+    async def sync_steam_apps_table(self, steam_apps: dict[int, str] | Iterable[Tuple[int, str]]) -> CatalogueDiff:
+        return await self.run_write(DatabaseWrapper.sync_steam_apps_table, steam_apps)
+
+    async def set_steam_user_id(self, discord_id: str, steam_user_id: str, drop_previous_games: bool = False) -> bool:
+        return await self.run_write(DatabaseWrapper.set_steam_user_id, discord_id, steam_user_id, drop_previous_games)
+
+    async def update_owned_games_table(self, steam_apps: List[int], steam_user_id: str) -> int:
+        return await self.run_write(DatabaseWrapper.update_owned_games_table, steam_apps, steam_user_id)
+
+    async def sync_owned_games_table(self, steam_apps: List[int], steam_user_id: str) -> OwnedGamesDiff:
+        return await self.run_write(DatabaseWrapper.sync_owned_games_table, steam_apps, steam_user_id)
+
+    async def drop_users_owned_games(self, steam_user_id: str) -> int:
+        return await self.run_write(DatabaseWrapper.drop_users_owned_games, steam_user_id)
+
+    async def mark_library_scanned(self, steam_user_id: str) -> None:
+        return await self.run_write(DatabaseWrapper.mark_library_scanned, steam_user_id)
+
+    async def apply_scanned_library(self, steam_user_id: str, steam_apps: List[int]) -> None:
+        return await self.run_write(DatabaseWrapper.apply_scanned_library, steam_user_id, steam_apps)
+
+    async def start_library_scan(self) -> Tuple[str, bool]:
+        return await self.run_write(DatabaseWrapper.start_library_scan)
+
+    async def finish_library_scan(self) -> None:
+        return await self.run_write(DatabaseWrapper.finish_library_scan)
+
+    async def set_vanity_url(self, vanity_name: str, steam_user_id: str, expires_at: float) -> None:
+        return await self.run_write(DatabaseWrapper.set_vanity_url, vanity_name, steam_user_id, expires_at)
+
+    async def purge_vanity_urls(self, now: float) -> int:
+        return await self.run_write(DatabaseWrapper.purge_vanity_urls, now)
+
+    async def remove_user(self, discord_id: str) -> None:
+        return await self.run_write(DatabaseWrapper.remove_user, discord_id)
+
+    async def run_backfills(self, pause: float = 0.0) -> None:
+        """
+        Runs every pending backfill to completion, a chunk at a time on the writer thread, so other writes are
+        interleaved between chunks.
+
+        :param pause: Seconds to wait between chunks.
+        """
+
+        for backfill in await self.run_write(lambda database: database.migrations.pending_backfills()):
+            while await self.run_write(lambda database: database.migrations.run_backfill_chunk(backfill)):
+                await asyncio.sleep(pause)
+
+    async def load_ownership_index(self) -> bool:
+        return await self.run_write(DatabaseWrapper.load_ownership_index)
+
+    async def save_ownership_index(self) -> int:
+        return await self.run_write(DatabaseWrapper.save_ownership_index)
@@ -0,0 +1,258 @@
+import hashlib
+from typing import Iterable, NamedTuple, Tuple
+
+from .connection import Connection
+from .row_counts import change_row_count
+
+
+class CatalogueDiff(NamedTuple):
+    """
+    The changes applied to the tb_steam_apps table by a catalogue sync.
+    """
+
+    added: int
+    """
+    The number of apps inserted into the table.
+    """
+
+    renamed: int
+    """
+    The number of apps whose title was updated.
+    """
+
+    removed: int
+    """
+    The number of apps deleted from the table. Apps that are no longer in the catalogue but are still owned are kept.
+    """
+
+    unchanged: bool = False
+    """
+    True if the catalogue was identical to the last synced catalogue, and no diff was computed.
+    """
+
+    skipped_renames: int = 0
+    """
+    The number of apps whose title was not updated, as another app kept the new title.
+    """
+
+
+class CatalogueSync:
+    """
+    Incrementally syncs the tb_steam_apps table with the Steam app list. Apps are staged into a temporary table as they
+    are streamed from Steam, then only the added, renamed and removed apps are applied, in a single transaction.
+
+    A content hash of the last synced catalogue is kept in tb_catalogue_state, so a catalogue identical to the last one
+    is skipped without comparing it against tb_steam_apps at all.
+    """
+
+    def __init__(self, connection: Connection) -> None:
+        """
+        Constructor for the CatalogueSync class.
+
+        :param connection: The connection to the SQLite database.
+        """
+
+        self.connection: Connection = connection
+
+        self._content_hash: int = 0
+        """
+        Order independent hash of every staged app, the sum of the hashes of each app modulo 2^64.
+        """
+
+        self._staged_apps: int = 0
+        """
+        The number of apps staged so far.
+        """
+
+        with self.connection:
+            self.connection.execute(
+                '''
+                CREATE TEMP TABLE IF NOT EXISTS tb_staged_steam_apps(
+                    steam_app_id INTEGER PRIMARY KEY,
+                    game_title VARCHAR(100) NOT NULL
+                )
+                '''
+            )
+            self.connection.execute('DELETE FROM temp.tb_staged_steam_apps')
+
+    @staticmethod
+    def _hash_app(steam_app_id: int, game_title: str) -> int:
+        """
+        :return: A 64-bit hash of a single app.
+        """
+
+        digest = hashlib.blake2b(f'{steam_app_id}\0{game_title}'.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'little')
+
+    def _hashed(self, steam_apps: Iterable[Tuple[int, str]]) -> Iterable[Tuple[int, str]]:
+        """
+        Passes through the staged apps, adding each one to the content hash.
+        """
+
+        for steam_app_id, game_title in steam_apps:
+            self._content_hash = (self._content_hash + self._hash_app(steam_app_id, game_title)) % 2 ** 64
+            self._staged_apps += 1
+            yield steam_app_id, game_title
+
+    def stage(self, steam_apps: dict[int, str] | Iterable[Tuple[int, str]]) -> None:
+        """
+        Stages apps to be synced. Can be called any number of times, for example once per batch of a streamed app list.
+
+        :param steam_apps: Dictionary of Steam app IDs to titles, or an iterable of (steam_app_id, game_title) pairs.
+        """
+
+        if isinstance(steam_apps, dict):
+            steam_apps = steam_apps.items()
+
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO temp.tb_staged_steam_apps (steam_app_id, game_title) VALUES (?, ?)',
+                self._hashed(steam_apps)
+            )
+
+    def discard(self) -> None:
+        """
+        Discards every staged app, for example if the app list could not be fully downloaded.
+        """
+
+        with self.connection:
+            self.connection.execute('DELETE FROM temp.tb_staged_steam_apps')
+
+        self._content_hash = 0
+        self._staged_apps = 0
+
+    def apply(self) -> CatalogueDiff:
+        """
+        Applies the difference between the staged apps and the tb_steam_apps table. An empty catalogue is never applied,
+        so a failed download cannot remove every app from the database. Apps delisted from the catalogue are only
+        removed once nobody owns them, so they stay in the owners' libraries and in the autocomplete.
+
+        :return: The number of apps added, renamed and removed.
+        """
+
+        content_hash = f'{self._content_hash:016x}'
+        staged_apps = self._staged_apps
+
+        self._content_hash = 0
+        self._staged_apps = 0
+
+        if staged_apps == 0:
+            return CatalogueDiff(0, 0, 0, unchanged=True)
+
+        with self.connection:
+            last_state = self.connection.execute(
+                'SELECT content_hash, app_count FROM tb_catalogue_state WHERE id = 1'
+            ).fetchone()
+
+            if last_state == (content_hash, staged_apps):
+                self.connection.execute('DELETE FROM temp.tb_staged_steam_apps')
+                return CatalogueDiff(0, 0, 0, unchanged=True)
+
+            # Removing apps that are no longer in the catalogue, unless they are still owned, as delisted games stay in
+            # the libraries of the players who bought them.
+            removed = self.connection.execute(
+                '''
+                DELETE FROM tb_steam_apps
+                WHERE steam_app_id NOT IN (SELECT steam_app_id FROM temp.tb_staged_steam_apps)
+                AND steam_app_id NOT IN (SELECT steam_app_id FROM tb_owned_games)
+                '''
+            ).rowcount
+            autocomplete_removed = self.connection.execute(
+                '''
+                DELETE FROM tb_games_autocomplete
+                WHERE steam_app_id NOT IN (SELECT steam_app_id FROM temp.tb_staged_steam_apps)
+                AND steam_app_id NOT IN (SELECT steam_app_id FROM tb_owned_games)
+                '''
+            ).rowcount
+
+            # Renaming apps whose title has changed. Titles are unique, so a rename onto a title another app has not
+            # been renamed away from yet is skipped, and retried once a pass renames nothing more.
+            renamed = 0
+            while renamed_in_pass := self.connection.execute(
+                    '''
+                    UPDATE OR IGNORE tb_steam_apps
+                    SET game_title = staged.game_title
+                    FROM temp.tb_staged_steam_apps AS staged
+                    WHERE staged.steam_app_id = tb_steam_apps.steam_app_id
+                    AND staged.game_title != tb_steam_apps.game_title
+                    '''
+            ).rowcount:
+                renamed += renamed_in_pass
+
+            while self.connection.execute(
+                    '''
+                    UPDATE OR IGNORE tb_games_autocomplete
+                    SET game_title = apps.game_title
+                    FROM tb_steam_apps AS apps
+                    WHERE apps.steam_app_id = tb_games_autocomplete.steam_app_id
+                    AND apps.game_title != tb_games_autocomplete.game_title
+                    '''
+            ).rowcount:
+                pass
+
+            # Logging the renames still skipped, onto a title another app keeps, or swapping titles between apps.
+            skipped_renames = self.connection.execute(
+                '''
+                SELECT staged.steam_app_id, apps.game_title, staged.game_title
+                FROM temp.tb_staged_steam_apps AS staged
+                JOIN tb_steam_apps AS apps ON apps.steam_app_id = staged.steam_app_id
+                WHERE staged.game_title != apps.game_title
+                '''
+            ).fetchall()
+            if skipped_renames:
+                examples = ', '.join(
+                    f'{steam_app_id} {old_title!r} to {new_title!r}'
+                    for steam_app_id, old_title, new_title in skipped_renames[:5]
+                )
+                print(
+                    f'Skipped renaming {len(skipped_renames)} Steam app(s) onto a title another app has, '
+                    f'such as {examples}.'
+                )
+
+            # Inserting apps that are new to the catalogue.
+            added = self.connection.execute(
+                '''
+                INSERT OR IGNORE INTO tb_steam_apps (steam_app_id, game_title)
+                SELECT staged.steam_app_id, staged.game_title
+                FROM temp.tb_staged_steam_apps AS staged
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM tb_steam_apps
+                    WHERE tb_steam_apps.steam_app_id = staged.steam_app_id
+                )
+                '''
+            ).rowcount
+
+            # Adding the apps that were owned before they were in the catalogue to the autocomplete table, such as games
+            # in libraries scanned while the app list could not be downloaded on the first start.
+            autocomplete_added = 0
+            if added:
+                autocomplete_added = self.connection.execute(
+                    '''
+                    INSERT OR IGNORE INTO tb_games_autocomplete (steam_app_id, game_title)
+                    SELECT apps.steam_app_id, apps.game_title
+                    FROM tb_steam_apps AS apps
+                    WHERE apps.steam_app_id NOT IN (SELECT steam_app_id FROM tb_games_autocomplete)
+                    AND EXISTS (SELECT 1 FROM tb_owned_games WHERE tb_owned_games.steam_app_id = apps.steam_app_id)
+                    '''
+                ).rowcount
+
+            change_row_count(self.connection, 'tb_steam_apps', added - removed)
+            change_row_count(self.connection, 'tb_games_autocomplete', autocomplete_added - autocomplete_removed)
+
+            # Remembering the catalogue, so an identical catalogue is skipped next time.
+            self.connection.execute(
+                '''
+                INSERT INTO tb_catalogue_state (id, content_hash, app_count, synced_at)
+                VALUES (1, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT (id)
+                DO UPDATE SET
+                    content_hash = excluded.content_hash,
+                    app_count = excluded.app_count,
+                    synced_at = excluded.synced_at
+                ''',
+                [content_hash, staged_apps]
+            )
+
+            self.connection.execute('DELETE FROM temp.tb_staged_steam_apps')
+
+        return CatalogueDiff(added, renamed, removed, skipped_renames=len(skipped_renames))
@@ -1,4 +1,103 @@
 import sqlite3
+import time
+from typing import Any, Dict, Iterable, List
+
+from src.database.connection_profile import DEFAULT_PROFILE, SYNCHRONOUS_MODES, ConnectionProfile
+from src.database.query_statistics import QueryStatistics
+
+
+class TimedCursor(sqlite3.Cursor):
+    """
+    Cursor over the rows of a statement that adds the time spent fetching them to the time the statement took to
+    execute, and records the statement once every row has been fetched, or once the cursor is closed or dropped with
+    rows left. The rows changed by statements with a RETURNING clause are only known once every row has been fetched.
+    """
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        super().__init__(connection)
+
+        self._statistics: QueryStatistics | None = None
+        """
+        The statistics the query is recorded into, None once it has been recorded, or if it is not timed.
+        """
+
+        self._sql: str = ''
+        self._elapsed: float = 0.0
+        self._rows: int = 0
+
+    def time_fetches(self, statistics: QueryStatistics, sql: str, elapsed: float) -> None:
+        """
+        Starts timing the fetches of the executed query.
+
+        :param statistics: The statistics to record the query into.
+        :param sql: The SQL text of the query.
+        :param elapsed: The time the query took to execute, in seconds.
+        """
+
+        self._statistics = statistics
+        self._sql = sql
+        self._elapsed = elapsed
+
+    def _record(self) -> None:
+        """
+        Records the query, if it has not been recorded yet.
+        """
+
+        if self._statistics is not None:
+            statistics, self._statistics = self._statistics, None
+            statistics.record(self._sql, self._elapsed, max(self.rowcount, 0), self._rows)
+
+    def __next__(self) -> Any:
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._elapsed += time.perf_counter() - start
+            self._record()
+            raise
+
+        self._elapsed += time.perf_counter() - start
+        self._rows += 1
+        return row
+
+    def fetchone(self) -> Any:
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._elapsed += time.perf_counter() - start
+
+        if row is None:
+            self._record()
+        else:
+            self._rows += 1
+        return row
+
+    def fetchmany(self, size: int | None = None) -> List[Any]:
+        size = self.arraysize if size is None else size
+
+        start = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._elapsed += time.perf_counter() - start
+
+        self._rows += len(rows)
+        if len(rows) < size:
+            self._record()
+        return rows
+
+    def fetchall(self) -> List[Any]:
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._elapsed += time.perf_counter() - start
+
+        self._rows += len(rows)
+        self._record()
+        return rows
+
+    def close(self) -> None:
+        self._record()
+        super().close()
+
+    def __del__(self) -> None:
+        self._record()
 
 
 class Connection(sqlite3.Connection):
@@ -14,6 +113,117 @@ class Connection(sqlite3.Connection):
         Is the connection to the database currently open?
         """
 
+        self.profile: ConnectionProfile = DEFAULT_PROFILE
+        """
+        The profile the connection was opened with.
+        """
+
+        self.statistics: QueryStatistics | None = None
+        """
+        The statistics to record the timing of every statement into, None to record nothing.
+        """
+
+    def execute(self, sql: str, parameters: Any = (), /) -> sqlite3.Cursor:
+        """
+        Executes a statement, recording its timing if statistics are attached. Statements that return rows are timed
+        until their rows are fetched, through a TimedCursor. Overrides the sqlite3.Connection.execute() method.
+        """
+
+        if self.statistics is None:
+            return super().execute(sql, parameters)
+
+        cursor = self.cursor(TimedCursor)
+        start = time.perf_counter()
+        cursor.execute(sql, parameters)
+        elapsed = time.perf_counter() - start
+
+        # Recording statements that return no rows straight away, sqlite3 reports a row count of -1 for those that
+        # change none, such as CREATE TABLE.
+        if cursor.description is None:
+            self.statistics.record(sql, elapsed, max(cursor.rowcount, 0))
+        else:
+            cursor.time_fetches(self.statistics, sql, elapsed)
+        return cursor
+
+    def executemany(self, sql: str, parameters: Iterable[Any], /) -> sqlite3.Cursor:
+        """
+        Executes a statement once for each set of parameters, recording the timing of the whole batch if statistics
+        are attached. Overrides the sqlite3.Connection.executemany() method.
+        """
+
+        if self.statistics is None:
+            return super().executemany(sql, parameters)
+
+        start = time.perf_counter()
+        cursor = super().executemany(sql, parameters)
+        self.statistics.record(sql, time.perf_counter() - start, max(cursor.rowcount, 0))
+        return cursor
+
+    def commit(self) -> None:
+        """
+        Commits the current transaction, recording its timing as a COMMIT statement if statistics are attached.
+        Overrides the sqlite3.Connection.commit() method.
+        """
+
+        if self.statistics is None or not self.in_transaction:
+            return super().commit()
+
+        start = time.perf_counter()
+        super().commit()
+        self.statistics.record('COMMIT', time.perf_counter() - start)
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        """
+        Commits the transaction of a with block, or rolls it back if the block raised, recording the timing of the
+        commit if statistics are attached. Overrides the sqlite3.Connection.__exit__() method, which commits without
+        going through commit().
+        """
+
+        if self.statistics is None or exc_type is not None or not self.in_transaction:
+            return super().__exit__(exc_type, exc_value, traceback)
+
+        start = time.perf_counter()
+        result = super().__exit__(exc_type, exc_value, traceback)
+        self.statistics.record('COMMIT', time.perf_counter() - start)
+        return result
+
+    def apply_profile(self, profile: ConnectionProfile) -> None:
+        """
+        Applies the pragmas of a profile to the connection.
+
+        :param profile: The profile to apply.
+        :raises ValueError: If the profile has a journal mode or synchronous mode SQLite does not accept.
+        """
+
+        for name, value in profile.pragmas():
+            self.execute(f'PRAGMA {name} = {value}')
+
+        self.profile = profile
+
+    def settings(self) -> Dict[str, str | int | bool]:
+        """
+        Reads the effective settings of the connection back from SQLite, which may differ from the profile, for example
+        in-memory databases can not use WAL journaling.
+
+        :return: The journal mode, synchronous mode, memory map size, page cache size, busy timeout, foreign key
+        enforcement, and whether the connection is read-only.
+        """
+
+        def pragma(name: str) -> str | int:
+            row = self.execute(f'PRAGMA {name}').fetchone()
+            return 0 if row is None else row[0]
+
+        synchronous = pragma('synchronous')
+        return {
+            'journal_mode': pragma('journal_mode'),
+            'synchronous': SYNCHRONOUS_MODES[synchronous] if synchronous < len(SYNCHRONOUS_MODES) else synchronous,
+            'mmap_size': pragma('mmap_size'),
+            'cache_size': pragma('cache_size'),
+            'busy_timeout': pragma('busy_timeout'),
+            'foreign_keys': bool(pragma('foreign_keys')),
+            'read_only': self.profile.read_only
+        }
+
     def close(self) -> bool:
         """
         Gracefully closes the database connection, committing any pending transactions before doing so. Overrides the
@@ -0,0 +1,115 @@
+from typing import List, NamedTuple, Tuple
+
+JOURNAL_MODES: Tuple[str, ...] = ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF')
+"""
+The values PRAGMA journal_mode accepts.
+"""
+
+SYNCHRONOUS_MODES: Tuple[str, ...] = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+"""
+The values PRAGMA synchronous accepts, in order of the numbers SQLite reports them as.
+"""
+
+
+class ConnectionProfile(NamedTuple):
+    """
+    The settings a connection is opened with. Settings left as None keep the SQLite default.
+    """
+
+    journal_mode: str | None = None
+    """
+    The journal mode, one of JOURNAL_MODES. WAL lets readers carry on while a write is in progress. The journal mode is
+    stored in the database file, so it is never set on read-only connections.
+    """
+
+    synchronous: str | None = None
+    """
+    How often SQLite waits for writes to reach the disk, one of SYNCHRONOUS_MODES. NORMAL is safe against corruption
+    in WAL mode, only losing the last commits on a power failure.
+    """
+
+    mmap_size: int | None = None
+    """
+    The number of bytes of the database file to read through memory-mapped I/O.
+    """
+
+    cache_size: int | None = None
+    """
+    The size of the page cache, in pages if positive, in KiB if negative.
+    """
+
+    busy_timeout: int | None = None
+    """
+    The number of milliseconds to wait for a lock held by another connection before failing with 'database is locked'.
+    """
+
+    foreign_keys: bool | None = None
+    """
+    Should foreign key constraints be enforced?
+    """
+
+    cached_statements: int | None = None
+    """
+    The number of prepared statements sqlite3 keeps per connection, so repeated statements are not compiled again.
+    """
+
+    read_only: bool = False
+    """
+    Should the database be opened read-only, through a mode=ro URI? Opening fails if the database does not exist.
+    """
+
+    def for_reading(self) -> 'ConnectionProfile':
+        """
+        :return: The profile of the read-only connections that accompany a connection with this profile.
+        """
+
+        return self._replace(journal_mode=None, read_only=True)
+
+    def pragmas(self) -> List[Tuple[str, str]]:
+        """
+        Gets the pragmas that apply the profile. The busy timeout comes first, so changing the journal mode waits for
+        other connections rather than failing.
+
+        :raises ValueError: If the journal mode or synchronous mode is not one SQLite accepts.
+        :return: A list of (pragma name, value) pairs.
+        """
+
+        if self.journal_mode is not None and self.journal_mode.upper() not in JOURNAL_MODES:
+            raise ValueError(f'Journal mode must be one of {", ".join(JOURNAL_MODES)}.')
+        if self.synchronous is not None and self.synchronous.upper() not in SYNCHRONOUS_MODES:
+            raise ValueError(f'Synchronous mode must be one of {", ".join(SYNCHRONOUS_MODES)}.')
+
+        pragmas = [
+            ('busy_timeout', self.busy_timeout),
+            ('journal_mode', None if self.journal_mode is None else self.journal_mode.upper()),
+            ('synchronous', None if self.synchronous is None else self.synchronous.upper()),
+            ('mmap_size', self.mmap_size),
+            ('cache_size', self.cache_size),
+            ('foreign_keys', None if self.foreign_keys is None else 'ON' if self.foreign_keys else 'OFF')
+        ]
+
+        return [
+            (name, value if isinstance(value, str) else str(int(value))) for name, value in pragmas if value is not None
+        ]
+
+
+DEFAULT_PROFILE: ConnectionProfile = ConnectionProfile()
+"""
+Plain SQLite defaults, used by tests and tools.
+"""
+
+PRODUCTION_PROFILE: ConnectionProfile = ConnectionProfile(
+    journal_mode='WAL',
+    synchronous='NORMAL',
+    mmap_size=256 * 1024 * 1024,
+    cache_size=-64 * 1024,
+    busy_timeout=5000,
+    cached_statements=512
+)
+"""
+The profile the bot's database is opened with: WAL journaling, so reads on the read-only connections run alongside
+writes, with a 64 MiB page cache and 256 MiB memory map. Foreign keys are not enforced, as renaming a game and changing
+a user's Steam ID update keys that other rows still refer to, which the schema does not cascade. The statement cache
+holds every statement the bot runs, including the per-game-count variants of the ownership lookups, which overflow the
+default of 128.
+"""
@@ -1,23 +1,49 @@
 import sqlite3
+from urllib.parse import quote
 
 from src.database.connection import Connection
+from src.database.connection_profile import DEFAULT_PROFILE, ConnectionProfile
 
 
-def create_connection(connection_string: str) -> Connection | None:
+def create_connection(
+        connection_string: str,
+        profile: ConnectionProfile = DEFAULT_PROFILE,
+        **kwargs
+) -> Connection | None:
     """
     Attempts to safely create a connection to an SQLite database via the passed connection_string parameter.
 
     :param connection_string: The connection string for the database.
+    :param profile: The settings to open the connection with. Read-only profiles open the database file through a
+    mode=ro URI.
+    :param kwargs: Extra arguments passed to sqlite3.connect(), such as check_same_thread.
+    :raises ValueError: If the profile has a journal mode or synchronous mode SQLite does not accept.
     :return: The Connection object if the connection to the database is successful, returns None otherwise.
     """
 
+    # Checking the profile before opening the connection, so a bad profile can not leave a connection open.
+    profile.pragmas()
+
+    # Opening read-only connections through a URI, as sqlite3.connect() has no read-only flag.
+    if profile.read_only and not kwargs.get('uri'):
+        connection_string = f'file:{quote(connection_string)}?mode=ro'
+        kwargs['uri'] = True
+
+    if profile.cached_statements is not None:
+        kwargs.setdefault('cached_statements', profile.cached_statements)
+
     # Attempting to cleanly open an SQLite connection.
+    connection = None
     try:
-        connection = Connection(connection_string)
+        connection = Connection(connection_string, **kwargs)
+        connection.apply_profile(profile)
         return connection
     except sqlite3.OperationalError as error:
         print(f'SQLite error while creating database connection: {error}')
     except sqlite3.Error as error:
         print(f'SQLite error while creating database connection: {error}')
 
+    if connection is not None:
+        connection.close()
+
     return None
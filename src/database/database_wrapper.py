@@ -1,7 +1,21 @@
 import sqlite3
-from typing import List
+from typing import AbstractSet, Callable, Dict, Iterable, List, Sequence, Tuple
 
+from .catalogue_sync import CatalogueDiff, CatalogueSync
 from .connection import Connection
+from .library_overlap import LibraryOverlap, Overlap
+from .migrations import MigrationRunner
+from .owned_games_sync import OwnedGamesDiff, OwnedGamesSync
+from .ownership_index import OwnershipIndex
+from .ownership_lookup import OwnershipLookup
+from .packed_catalogue import PackedCatalogue
+from .row_counts import COUNTED_TABLES, change_row_count, get_row_counts
+from .schema import BACKFILLS, MIGRATIONS
+
+AutocompleteListener = Callable[[List[Tuple[int, str]], List[Tuple[int, str]]], None]
+"""
+Function called with the (Steam App ID, game title) pairs added to, and removed from, the autocomplete table.
+"""
 
 
 class DatabaseWrapper:
@@ -16,126 +30,207 @@ class DatabaseWrapper:
 
         self.connection: Connection = connection
 
-    def _get_table_rows(self, table: str) -> int:
+        self.migrations: MigrationRunner = MigrationRunner(connection, MIGRATIONS, BACKFILLS)
+        """
+        Applies the schema migrations and data backfills to the database.
+        """
+
+        self.ownership: OwnershipLookup = OwnershipLookup(connection)
+        """
+        Finds the users who own a set of games.
         """
-        Gets the amount of rows in a database table. Note that due to how the table string needs to be concatenated in
-        the statement string, this method is vulnerable to SQLite injection, use with caution.
 
-        :param table: The table to get the rowcount of.
-        :return: The amount of rows in the table.
+        self.overlap: LibraryOverlap = LibraryOverlap(connection)
+        """
+        Ranks users by how much of a user's library they share.
+        """
+
+        self._autocomplete_listeners: List[AutocompleteListener] = []
+        """
+        The functions called whenever owned games are added to, or removed from, the autocomplete table.
+        """
+
+        self.catalogue: PackedCatalogue | None = None
+        """
+        The memory-mapped Steam app list, answering title lookups without touching tb_steam_apps. None to look titles
+        up in the database.
+        """
+
+    def get_row_count(self, table: str) -> int:
+        """
+        Gets the number of rows in a table from the cached row counts, without scanning the table.
+
+        :param table: The table to get the row count of, one of COUNTED_TABLES.
+        :raises ValueError: If the table's row count is not cached.
+        :return: The number of rows in the table, 0 if the connection is closed or the schema is not migrated.
+        """
+
+        if table not in COUNTED_TABLES:
+            raise ValueError(f'Parameter table must be one of {", ".join(COUNTED_TABLES)}.')
+
+        return self.get_row_counts().get(table, 0)
+
+    def get_row_counts(self) -> Dict[str, int]:
+        """
+        Gets the number of rows in every table with a cached row count.
+
+        :return: The number of rows in each table, keyed by table name. Empty if the connection is closed or the schema
+        is not migrated.
         """
 
         if not self.connection.is_open():
-            return 0
+            return {}
 
-        with self.connection:
-            try:
-                return self.connection.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
-            except sqlite3.Error:
-                return 0
+        try:
+            return get_row_counts(self.connection)
+        except sqlite3.Error:
+            return {}
 
-    def create_tables(self) -> bool:
+    def migrate(self, verbose: bool = False) -> bool:
         """
-        Creates the tables in the database.
+        Brings the database schema up to date by applying every pending migration. If the schema is already current,
+        this costs a single schema version check.
 
-        :return: True if the tables were created successfully, False otherwise.
+        :param verbose: Whether to print each migration as it is applied.
+        :return: True if the schema is up to date, False otherwise.
         """
 
         # Safeguard if the connection is not open.
         if not self.connection.is_open():
             return False
 
-        # Creating the SQL tables.
-        with self.connection:
-            self.connection.executescript(
-                """
-                -- Table to hold user data.
-                CREATE TABLE IF NOT EXISTS tb_users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    discord_id VARCHAR(18) NOT NULL UNIQUE,
-                    steam_user_id VARCHAR(17) NOT NULL UNIQUE
-                );
-    
-                -- Table to hold Steam app data for every app on Steam.
-                CREATE TABLE IF NOT EXISTS tb_steam_apps(
-                    steam_app_id INTEGER PRIMARY KEY,
-                    game_title VARCHAR(100) NOT NULL UNIQUE
-                );
-                
-                -- Table to hold data for games owned by registered users.
-                CREATE TABLE IF NOT EXISTS tb_owned_games(
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    steam_app_id INTEGER NOT NULL,
-                    steam_user_id VARCHAR(17) NOT NULL,
-                    FOREIGN KEY (steam_app_id) REFERENCES tb_steam_apps(steam_app_id),
-                    FOREIGN KEY (steam_user_id) REFERENCES tb_users(steam_user_id)
-                );
-                
-                -- Table to hold autocomplete data for games owned by registered users.
-                CREATE TABLE IF NOT EXISTS tb_games_autocomplete(
-                    steam_app_id INTEGER PRIMARY KEY,
-                    game_title VARCHAR(100) NOT NULL UNIQUE,
-                    FOREIGN KEY (steam_app_id) REFERENCES tb_steam_apps(steam_app_id),
-                    FOREIGN KEY (game_title) REFERENCES tb_steam_apps(game_title)
-                );
-                """
-            )
+        try:
+            self.migrations.migrate(verbose)
+        except sqlite3.Error as error:
+            print(f'SQLite error while migrating the database: {error}')
+            return False
 
         return True
 
+    def create_tables(self) -> bool:
+        """
+        Creates the tables in the database. The tables are created by the schema migrations, so this is equivalent to
+        migrate().
+
+        :return: True if the tables were created successfully, False otherwise.
+        """
+
+        return self.migrate()
+
     def create_triggers(self) -> bool:
         """
-        Creates triggers for the database.
+        Creates triggers for the database. The triggers are created by the schema migrations, so this is equivalent to
+        migrate().
 
         :return: True if the triggers were created successfully, False otherwise.
         """
 
-        # Safeguard if the connection is not open.
-        if not self.connection.is_open():
-            return False
+        return self.migrate()
 
-        # Creating the SQL triggers.
-        with self.connection:
-            self.connection.executescript(
-                """
-                -- Trigger to add games to the autocomplete table when owned games are added.
-                CREATE TRIGGER IF NOT EXISTS tr_add_games_autocomplete 
-                AFTER INSERT ON tb_owned_games
-                BEGIN
-                    INSERT OR IGNORE INTO tb_games_autocomplete (steam_app_id, game_title)
-                    SELECT NEW.steam_app_id, game_title
-                    FROM tb_steam_apps
-                    WHERE tb_steam_apps.steam_app_id = NEW.steam_app_id;
-                END;
-
-                -- Trigger to remove games in the autocomplete table when owned games are deleted.
-                CREATE TRIGGER IF NOT EXISTS tr_remove_games_autocomplete
-                AFTER DELETE ON tb_owned_games
-                BEGIN
-                    DELETE FROM tb_games_autocomplete
-                    WHERE steam_app_id = OLD.steam_app_id
-                    AND NOT EXISTS (
-                        SELECT 1 FROM tb_owned_games
-                        WHERE steam_app_id = OLD.steam_app_id
-                    );
-                END;
-                
-                -- Trigger to cascade user deletions to owned games.
-                CREATE TRIGGER IF NOT EXISTS tr_remove_owned_games
-                BEFORE DELETE ON tb_users
-                BEGIN
-                    DELETE FROM tb_owned_games WHERE steam_user_id = OLD.steam_user_id;
-                END;
-                """
-            )
+    def add_autocomplete_listener(self, listener: AutocompleteListener) -> None:
+        """
+        Registers a function to be called whenever a change to owned games adds games to, or removes games from, the
+        autocomplete table. The function is called once the change is committed. Renames made by a catalogue sync are
+        not reported.
 
-        return True
+        :param listener: The function to call with the added and removed (Steam App ID, game title) pairs.
+        """
+
+        self._autocomplete_listeners.append(listener)
+
+    def _notify_autocomplete_listeners(self, owned_games_sync: OwnedGamesSync) -> None:
+        """
+        Reports the autocomplete changes made by an owned games change to every listener.
+        """
+
+        if owned_games_sync.autocomplete_added or owned_games_sync.autocomplete_removed:
+            for listener in self._autocomplete_listeners:
+                listener(owned_games_sync.autocomplete_added, owned_games_sync.autocomplete_removed)
+
+    def load_ownership_index(self) -> bool:
+        """
+        Loads the persisted ownership index, or rebuilds it from the owned games if it is out of date, and uses it to
+        find the owners of games from then on. The index is kept current by every change to owned games made through
+        this wrapper, and is used to rank users by shared games too.
+
+        :return: True if the persisted index was loaded, False if it was rebuilt.
+        """
+
+        with self.connection as connection:
+            index = OwnershipIndex.load(connection)
+            is_loaded = index is not None
+            if index is None:
+                index = OwnershipIndex.build(connection)
+
+        self.ownership.index = self.overlap.index = index
+        return is_loaded
 
-    def update_steam_apps_table(self, steam_apps: dict[int, str]) -> int:
+    def save_ownership_index(self) -> int:
+        """
+        Persists the games whose owners changed since the ownership index was last saved, so the next start loads the
+        index rather than rebuilding it. Does nothing if the index is not loaded.
+
+        :return: The number of games written.
+        """
+
+        if self.ownership.index is None:
+            return 0
+
+        with self.connection as connection:
+            return self.ownership.index.save(connection)
+
+    def _get_user_number(self, steam_user_id: str) -> int | None:
+        """
+        Gets the user number of a Steam ID, if the ownership index is loaded and needs it.
+        """
+
+        if self.ownership.index is None:
+            return None
+
+        row = self.connection.execute('SELECT id FROM tb_users WHERE steam_user_id = ?', [steam_user_id]).fetchone()
+        return None if row is None else row[0]
+
+    def _get_owned_games_version(self) -> int | None:
+        """
+        Gets the version of the owned games, if the ownership index is loaded and needs it.
+        """
+
+        if self.ownership.index is None:
+            return None
+
+        return self.connection.execute('SELECT version FROM tb_owned_games_version').fetchone()[0]
+
+    def _update_ownership_index(self, user_number: int | None, owned_games_sync: OwnedGamesSync, version: int) -> None:
+        """
+        Applies a committed change to a user's owned games to the ownership index, if it is loaded.
+        """
+
+        index = self.ownership.index
+        if index is None:
+            return
+
+        if user_number is not None:
+            index.update(user_number, owned_games_sync.removed_app_ids, owned_games_sync.added_app_ids)
+
+        index.version = version
+
+    def get_autocomplete_games(self) -> List[Tuple[int, str]]:
+        """
+        Gets every game in the autocomplete table.
+
+        :return: A list of (Steam App ID, game title) pairs.
+        """
+
+        with self.connection as connection:
+            return connection.execute('SELECT steam_app_id, game_title FROM tb_games_autocomplete').fetchall()
+
+    def update_steam_apps_table(self, steam_apps: dict[int, str] | Iterable[Tuple[int, str]]) -> int:
         """
         Updates the Steam apps table.
 
-        :param steam_apps: Dictionary of steam_apps to insert into the tb_steam_apps table.
+        :param steam_apps: Dictionary of steam_apps to insert into the tb_steam_apps table, or an iterable of
+        (steam_app_id, game_title) pairs. Iterables are consumed lazily, so a streamed app list never has to be
+        materialised in memory.
         :return: The number of steam apps added to the database.
         """
 
@@ -145,29 +240,55 @@ class DatabaseWrapper:
 
         with self.connection:
 
-            # Getting the initial table size.
-            table_start_size = self._get_table_rows('tb_steam_apps')
-
-            # Inserting new data into the steam games table.
-            self.connection.executemany(
+            # Inserting new data into the steam games table, the row count only counts the apps actually inserted.
+            added = self.connection.executemany(
                 '''
                     INSERT OR IGNORE INTO tb_steam_apps(steam_app_id, game_title) 
                     VALUES (?, ?)
                 ''',
-                zip(steam_apps.keys(), steam_apps.values())
-            )
+                steam_apps.items() if isinstance(steam_apps, dict) else steam_apps
+            ).rowcount
+            change_row_count(self.connection, 'tb_steam_apps', added)
+
+            # Forgetting the last synced catalogue, as the table no longer matches it.
+            self.connection.execute('DELETE FROM tb_catalogue_state')
 
             # Committing the transaction to prevent the database from locking.
             self.connection.commit()
 
-            return self._get_table_rows('tb_steam_apps') - table_start_size
+            return added
 
-    def set_steam_user_id(self, discord_id: str, steam_user_id: str) -> bool:
+    def sync_steam_apps_table(self, steam_apps: dict[int, str] | Iterable[Tuple[int, str]]) -> CatalogueDiff:
+        """
+        Syncs the Steam apps table with the full Steam app list, applying only the apps that were added, renamed or
+        removed since the last sync.
+
+        :param steam_apps: Dictionary of every Steam app, or an iterable of (steam_app_id, game_title) pairs. If the
+        iterable raises part way through, nothing is applied and the exception is re-raised.
+        :return: The number of apps added, renamed and removed.
+        """
+
+        # Safeguard if the connection is not open.
+        if not self.connection.is_open():
+            return CatalogueDiff(0, 0, 0)
+
+        catalogue_sync = CatalogueSync(self.connection)
+        try:
+            catalogue_sync.stage(steam_apps)
+        except Exception:
+            catalogue_sync.discard()
+            raise
+
+        return catalogue_sync.apply()
+
+    def set_steam_user_id(self, discord_id: str, steam_user_id: str, drop_previous_games: bool = False) -> bool:
         """
         Associates a user's Discord ID with a passed Steam ID.
 
         :param discord_id: The Discord ID to set the Steam ID of.
         :param steam_user_id: The Steam 64 ID to associate with the Discord ID.
+        :param drop_previous_games: Should the owned games of the user's previous Steam ID be removed? They are removed
+        in the same transaction as the Steam ID is set, so they are kept if the Steam ID can not be set.
         :raises ValueError: If either discord_id or steam_id are empty strings.
         :return: True if the Steam ID was set successfully, False otherwise.
         """
@@ -178,7 +299,20 @@ class DatabaseWrapper:
         if steam_user_id == '':
             raise ValueError('Parameter steam_id cannot be empty string.')
 
+        owned_games_sync = OwnedGamesSync(self.connection)
         with self.connection:
+            previous_games = self._get_indexed_games(discord_id)
+
+            # Removing the games of the previous Steam ID while it still belongs to the user, so the library size of the
+            # user is updated with them.
+            if drop_previous_games:
+                previous_steam_user_id = self.connection.execute(
+                    'SELECT steam_user_id FROM tb_users WHERE discord_id = ?',
+                    [discord_id]
+                ).fetchone()
+                if previous_steam_user_id is not None:
+                    owned_games_sync.remove_all(previous_steam_user_id[0])
+
             try:
                 self.connection.execute(
                     '''
@@ -190,10 +324,49 @@ class DatabaseWrapper:
                     [discord_id, steam_user_id]
                 )
             except sqlite3.IntegrityError:
+                # Rolling back the removal of the previous games, as the Steam ID belongs to another user.
+                self.connection.rollback()
                 return False
 
+            games = self._get_indexed_games(discord_id)
+            version = self._get_owned_games_version()
+
+        # Any games already stored against the new Steam ID now belong to the user, and games stored against their
+        # previous Steam ID no longer do.
+        if self.ownership.index is not None:
+            for user_number, steam_app_ids in previous_games.items():
+                self.ownership.index.remove(user_number, steam_app_ids)
+            for user_number, steam_app_ids in games.items():
+                self.ownership.index.add(user_number, steam_app_ids)
+            self.ownership.index.version = version
+
+        self._notify_autocomplete_listeners(owned_games_sync)
         return True
 
+    def _get_indexed_games(self, discord_id: str) -> Dict[int, List[int]]:
+        """
+        Gets the owned games of a user, keyed by their user number, if the ownership index is loaded and needs them.
+        """
+
+        if self.ownership.index is None:
+            return {}
+
+        games = {}
+        for user_number, steam_app_id in self.connection.execute(
+                '''
+                SELECT users.id, owned.steam_app_id
+                FROM tb_users AS users
+                LEFT JOIN tb_owned_games AS owned ON owned.steam_user_id = users.steam_user_id
+                WHERE users.discord_id = ?
+                ''',
+                [discord_id]
+        ):
+            games.setdefault(user_number, [])
+            if steam_app_id is not None:
+                games[user_number].append(steam_app_id)
+
+        return games
+
     def update_owned_games_table(self, steam_apps: List[int], steam_user_id: str) -> int:
         """
         Inserts a users owned games into the owned games table.
@@ -203,25 +376,295 @@ class DatabaseWrapper:
         :return: The number of games inserted into the owned games table.
         """
 
+        owned_games_sync = OwnedGamesSync(self.connection)
         with self.connection:
+            user_number = self._get_user_number(steam_user_id)
+            added = owned_games_sync.apply(steam_user_id, steam_apps, remove_missing=False).added
+            version = self._get_owned_games_version()
 
-            # Getting the initial table size.
-            table_start_size = self._get_table_rows('tb_owned_games')
+        self._update_ownership_index(user_number, owned_games_sync, version)
+        self._notify_autocomplete_listeners(owned_games_sync)
+        return added
 
-            # Inserting the steam app data into the table.
-            for steam_app_id in steam_apps:
-                self.connection.execute(
-                    '''
-                        INSERT OR IGNORE INTO tb_owned_games (steam_app_id, steam_user_id) 
-                        VALUES (?, ?)
-                    ''',
-                    [
-                        steam_app_id,
-                        steam_user_id
-                    ]
-                )
+    def sync_owned_games_table(self, steam_apps: List[int], steam_user_id: str) -> OwnedGamesDiff:
+        """
+        Replaces a users owned games with their current library, adding newly owned games and removing games that are
+        no longer in the library.
+
+        :param steam_apps: A list of every Steam application ID the user owns.
+        :param steam_user_id: The Steam ID of the user who owns the games in the steam_apps list.
+        :return: The number of games added to, and removed from, the user's library.
+        """
+
+        owned_games_sync = OwnedGamesSync(self.connection)
+        with self.connection:
+            user_number = self._get_user_number(steam_user_id)
+            diff = owned_games_sync.apply(steam_user_id, steam_apps)
+            version = self._get_owned_games_version()
+
+        self._update_ownership_index(user_number, owned_games_sync, version)
+        self._notify_autocomplete_listeners(owned_games_sync)
+        return diff
+
+    def drop_users_owned_games(self, steam_user_id: str) -> int:
+        """
+        Removes every owned game of a user from the owned games table.
+
+        :param steam_user_id: The Steam ID of the user to remove the owned games of.
+        :return: The number of games removed.
+        """
+
+        owned_games_sync = OwnedGamesSync(self.connection)
+        with self.connection:
+            user_number = self._get_user_number(steam_user_id)
+            removed = owned_games_sync.remove_all(steam_user_id)
+            version = self._get_owned_games_version()
+
+        self._update_ownership_index(user_number, owned_games_sync, version)
+        self._notify_autocomplete_listeners(owned_games_sync)
+        return removed
+
+    def mark_library_scanned(self, steam_user_id: str) -> None:
+        """
+        Records that a users library was just scanned.
+
+        :param steam_user_id: The Steam ID of the user whose library was scanned.
+        """
+
+        with self.connection:
+            self.connection.execute(
+                'UPDATE tb_users SET library_scanned_at = CURRENT_TIMESTAMP WHERE steam_user_id = ?',
+                [steam_user_id]
+            )
+
+    def apply_scanned_library(self, steam_user_id: str, steam_apps: List[int]) -> None:
+        """
+        Applies a library fetched from Steam, syncing the owned games if the library is non-empty, then marking the
+        library as scanned, so the library is only marked once it has been applied. An empty library is marked too, so
+        a private profile does not stay at the front of every sweep. Used by every library scan.
+
+        :param steam_user_id: The Steam ID of the user whose library was fetched.
+        :param steam_apps: The Steam application IDs in the library.
+        """
+
+        if steam_apps:
+            self.sync_owned_games_table(steam_apps, steam_user_id)
+
+        self.mark_library_scanned(steam_user_id)
+
+    def get_stale_steam_ids(self, max_age: float, limit: int) -> List[str]:
+        """
+        Gets the users whose libraries have not been scanned recently, oldest first. Libraries that have never been
+        scanned come before every other library.
+
+        :param max_age: Libraries last scanned more than this many seconds ago are stale.
+        :param limit: The maximum number of Steam IDs to return.
+        :return: A list of Steam IDs.
+        """
+
+        with self.connection:
+            return [row[0] for row in self.connection.execute(
+                '''
+                SELECT steam_user_id FROM tb_users
+                WHERE library_scanned_at IS NULL
+                OR library_scanned_at < datetime('now', ?)
+                ORDER BY library_scanned_at
+                LIMIT ?
+                ''',
+                [f'-{int(max_age)} seconds', limit]
+            )]
+
+    def start_library_scan(self) -> Tuple[str, bool]:
+        """
+        Starts a bulk scan of every library, or resumes the unfinished one. A scan covers the libraries that have not
+        been scanned since it started, so libraries scanned before a crash are not scanned again.
+
+        :return: The time the scan started, and whether an unfinished scan was resumed.
+        """
+
+        with self.connection:
+            resumed = self.connection.execute('SELECT started_at FROM tb_library_scan WHERE id = 1').fetchone()
+            if resumed is not None:
+                return resumed[0], True
+
+            return self.connection.execute(
+                'INSERT INTO tb_library_scan (id, started_at) VALUES (1, CURRENT_TIMESTAMP) RETURNING started_at'
+            ).fetchone()[0], False
+
+    def get_library_scan(self) -> str | None:
+        """
+        :return: The time the unfinished bulk library scan started, None if there is no unfinished scan.
+        """
+
+        row = self.connection.execute('SELECT started_at FROM tb_library_scan WHERE id = 1').fetchone()
+        return None if row is None else row[0]
+
+    def finish_library_scan(self) -> None:
+        """
+        Records that the bulk library scan finished.
+        """
+
+        with self.connection:
+            self.connection.execute('DELETE FROM tb_library_scan')
+
+    def get_unscanned_steam_ids(self, scan_started_at: str, after: int, limit: int) -> List[Tuple[int, str]]:
+        """
+        Gets the users whose libraries have not been scanned since a bulk scan started, in registration order, a page
+        at a time.
+
+        :param scan_started_at: The time the bulk scan started.
+        :param after: The user number the previous page ended at, 0 for the first page.
+        :param limit: The maximum number of users to return.
+        :return: A list of (user number, Steam ID) pairs.
+        """
+
+        return self.connection.execute(
+            '''
+            SELECT id, steam_user_id FROM tb_users
+            WHERE id > ?
+            AND (library_scanned_at IS NULL OR library_scanned_at < ?)
+            ORDER BY id
+            LIMIT ?
+            ''',
+            [after, scan_started_at, limit]
+        ).fetchall()
+
+    def count_unscanned_steam_ids(self, scan_started_at: str) -> int:
+        """
+        :return: The number of users whose libraries have not been scanned since a bulk scan started.
+        """
 
-            return self._get_table_rows('tb_owned_games') - table_start_size
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM tb_users WHERE library_scanned_at IS NULL OR library_scanned_at < ?',
+            [scan_started_at]
+        ).fetchone()[0]
+
+    def get_game_title(self, steam_app_id: int) -> str | None:
+        """
+        Gets the title of a Steam app, from the memory-mapped catalogue if there is one.
+
+        :param steam_app_id: The Steam App ID of the app.
+        :return: The title of the app, None if the app is not in the catalogue.
+        """
+
+        catalogue = self.catalogue
+        if catalogue is not None:
+            return catalogue.get(steam_app_id)
+
+        with self.connection as connection:
+            row = connection.execute(
+                'SELECT game_title FROM tb_steam_apps WHERE steam_app_id = ?',
+                [steam_app_id]
+            ).fetchone()
+
+        return None if row is None else row[0]
+
+    def get_app_id(self, game_title: str) -> int | None:
+        """
+        Gets the Steam App ID of an owned game from its title, matched case-insensitively.
+
+        :param game_title: The title of the game.
+        :return: The Steam App ID of the game, None if no registered user owns a game with the title.
+        """
+
+        with self.connection as connection:
+            row = connection.execute(
+                'SELECT steam_app_id FROM tb_games_autocomplete WHERE game_title = ? COLLATE NOCASE',
+                [game_title.strip()]
+            ).fetchone()
+
+        return None if row is None else row[0]
+
+    def find_owners(
+            self,
+            steam_app_ids: Sequence[int],
+            members: AbstractSet[str] | None = None,
+            limit: int | None = None
+    ) -> List[str]:
+        """
+        Finds the users who own every game in a set of games.
+
+        :param steam_app_ids: The Steam App IDs of the games.
+        :param members: The Discord IDs of the users to consider, for example the members of a guild. None to consider
+        every registered user.
+        :param limit: The maximum number of users to return, None for no limit.
+        :return: The Discord IDs of the users who own every game, sorted.
+        """
+
+        with self.connection:
+            try:
+                return self.ownership.find_owners(steam_app_ids, members, limit)
+            except sqlite3.Error:
+                return []
+
+    def find_similar_users(
+            self,
+            discord_id: str,
+            members: AbstractSet[str] | None = None,
+            limit: int = 10,
+            rank_by: str = 'shared'
+    ) -> List[Overlap]:
+        """
+        Finds the users who share the most of a user's library.
+
+        :param discord_id: The Discord ID of the user to compare against.
+        :param members: The Discord IDs of the users to consider, for example the members of a guild. None to consider
+        every registered user.
+        :param limit: The maximum number of users to return.
+        :param rank_by: 'shared' to rank by the number of games in common, 'jaccard' to rank by the Jaccard similarity
+        of the libraries.
+        :raises ValueError: If rank_by is not 'shared' or 'jaccard'.
+        :return: The most similar users, most similar first. Empty if the user is not registered.
+        """
+
+        with self.connection:
+            try:
+                return self.overlap.find_similar(discord_id, members, limit, rank_by)
+            except sqlite3.Error:
+                return []
+
+    def get_vanity_url(self, vanity_name: str) -> Tuple[str, float] | None:
+        """
+        Gets a persisted vanity URL resolution.
+
+        :param vanity_name: The lowercase vanity URL name.
+        :return: The (Steam ID, expiry Unix time) of the vanity URL, the Steam ID is an empty string if the name does
+        not exist. None if the vanity URL is not persisted.
+        """
+
+        with self.connection as connection:
+            row = connection.execute(
+                'SELECT steam_user_id, expires_at FROM tb_vanity_urls WHERE vanity_name = ?',
+                [vanity_name]
+            ).fetchone()
+
+        return None if row is None else (row[0], row[1])
+
+    def set_vanity_url(self, vanity_name: str, steam_user_id: str, expires_at: float) -> None:
+        """
+        Persists a vanity URL resolution.
+
+        :param vanity_name: The lowercase vanity URL name.
+        :param steam_user_id: The Steam ID the name resolved to, an empty string if the name does not exist.
+        :param expires_at: The Unix time the resolution expires at.
+        """
+
+        with self.connection as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO tb_vanity_urls (vanity_name, steam_user_id, expires_at) VALUES (?, ?, ?)',
+                [vanity_name, steam_user_id, expires_at]
+            )
+
+    def purge_vanity_urls(self, now: float) -> int:
+        """
+        Removes every expired vanity URL resolution.
+
+        :param now: The current Unix time.
+        :return: The number of vanity URLs removed.
+        """
+
+        with self.connection as connection:
+            return connection.execute('DELETE FROM tb_vanity_urls WHERE expires_at <= ?', [now]).rowcount
 
     def remove_user(self, discord_id: str) -> None:
         """
@@ -229,8 +672,22 @@ class DatabaseWrapper:
 
         :param discord_id: The Discord ID of the user to remove.
         """
+
+        steam_user_id = self.get_steam_id(discord_id)
+        owned_games_sync = OwnedGamesSync(self.connection)
+
+        user_number = None
+
         with self.connection as connection:
+            if steam_user_id is not None:
+                user_number = self._get_user_number(steam_user_id)
+                owned_games_sync.remove_all(steam_user_id)
+
             connection.execute('DELETE FROM tb_users WHERE discord_id = ?', [discord_id])
+            version = self._get_owned_games_version()
+
+        self._update_ownership_index(user_number, owned_games_sync, version)
+        self._notify_autocomplete_listeners(owned_games_sync)
 
     def get_steam_id(self, discord_id: str) -> str | None:
         """
@@ -0,0 +1,222 @@
+import heapq
+import json
+from typing import AbstractSet, Iterator, List, NamedTuple, Tuple
+
+from .connection import Connection
+from .ownership_index import OwnershipIndex, bitmap_of, iter_user_numbers
+
+
+class Overlap(NamedTuple):
+    """
+    How much of a user's library another user shares.
+    """
+
+    discord_id: str
+    """
+    The Discord ID of the other user.
+    """
+
+    shared: int
+    """
+    The number of games both users own.
+    """
+
+    jaccard: float
+    """
+    The number of games both users own, divided by the number of games either user owns.
+    """
+
+
+def _iter_count_groups(planes: List[int], candidates: int) -> Iterator[Tuple[int, int]]:
+    """
+    Groups users by their bit-sliced count, highest count first. The groups are found by splitting the candidates on
+    each plane in turn, from the most significant, so empty groups are never visited.
+
+    :param planes: The bit-sliced counts, least significant first.
+    :param candidates: The bitmap of the users to group.
+    :return: An iterator of (count, bitmap of the users with that count) pairs.
+    """
+
+    stack = [(candidates, len(planes) - 1, 0)]
+    while stack:
+        users, position, count = stack.pop()
+        if position < 0:
+            yield count, users
+            continue
+
+        # Pushing the users without the bit first, so the users with it are visited first.
+        without_bit, with_bit = users & ~planes[position], users & planes[position]
+        if without_bit:
+            stack.append((without_bit, position - 1, count))
+        if with_bit:
+            stack.append((with_bit, position - 1, count | (1 << position)))
+
+
+class LibraryOverlap:
+    """
+    Ranks registered users by how much of a user's library they share, by the number of games in common or by the
+    Jaccard similarity of the libraries.
+
+    If an ownership index is loaded, the bitmaps of the owners of every game in the user's library are summed into a
+    bit-sliced count of shared games for every user at once, and users are then read highest count first, stopping as
+    soon as no lower count can make the ranking. Otherwise, tb_owned_games is joined with itself, counting the shared
+    games of every user who shares any.
+    """
+
+    rankings: Tuple[str, ...] = ('shared', 'jaccard')
+    """
+    The ways users can be ranked: by the number of games in common, or by the Jaccard similarity of their libraries.
+    """
+
+    def __init__(self, connection: Connection) -> None:
+        """
+        Constructor for the LibraryOverlap class.
+
+        :param connection: The connection to the SQLite database.
+        """
+
+        self.connection: Connection = connection
+
+        self.index: OwnershipIndex | None = None
+        """
+        The in-memory index of the owners of each game, None to query tb_owned_games instead.
+        """
+
+    def find_similar(
+            self,
+            discord_id: str,
+            members: AbstractSet[str] | None = None,
+            limit: int = 10,
+            rank_by: str = 'shared'
+    ) -> List[Overlap]:
+        """
+        Finds the users who share the most of a user's library. Ties are broken by registration order.
+
+        :param discord_id: The Discord ID of the user to compare against.
+        :param members: The Discord IDs of the users to consider, None to consider every registered user.
+        :param limit: The maximum number of users to return.
+        :param rank_by: 'shared' to rank by the number of games in common, 'jaccard' to rank by Jaccard similarity.
+        :raises ValueError: If rank_by is not one of the rankings.
+        :return: The most similar users, most similar first. Users sharing no games are never returned.
+        """
+
+        if rank_by not in self.rankings:
+            raise ValueError(f'Parameter rank_by must be one of {", ".join(self.rankings)}.')
+
+        if limit <= 0 or members is not None and not members:
+            return []
+
+        user = self.connection.execute(
+            'SELECT id, steam_user_id, library_size FROM tb_users WHERE discord_id = ?',
+            [discord_id]
+        ).fetchone()
+        if user is None or not user[2]:
+            return []
+
+        if self.index is None:
+            ranked = self._join(user, members, rank_by)
+        else:
+            ranked = self._count(user, members, limit, rank_by)
+
+        ranked.sort(key=lambda overlap: (-overlap[2 if rank_by == 'jaccard' else 1], overlap[0]))
+        ranked = ranked[:limit]
+
+        # Reading the Discord IDs of the ranked users only.
+        discord_ids = dict(self.connection.execute(
+            'SELECT id, discord_id FROM tb_users WHERE id IN (SELECT value FROM json_each(?))',
+            [json.dumps([user_number for user_number, _, _ in ranked])]
+        ).fetchall())
+
+        return [Overlap(discord_ids[user_number], shared, jaccard) for user_number, shared, jaccard in ranked]
+
+    def _count(
+            self,
+            user: tuple,
+            members: AbstractSet[str] | None,
+            limit: int,
+            rank_by: str
+    ) -> List[Tuple[int, int, float]]:
+        """
+        Ranks users through the ownership index.
+
+        :return: At least the top limit (user number, shared games, Jaccard similarity) triples, unsorted.
+        """
+
+        user_number, steam_user_id, library_size = user
+        steam_app_ids = [row[0] for row in self.connection.execute(
+            'SELECT steam_app_id FROM tb_owned_games WHERE steam_user_id = ?',
+            [steam_user_id]
+        )]
+
+        planes = self.index.count_owned(steam_app_ids)
+        if not planes:
+            return []
+
+        candidates = 0
+        for plane in planes:
+            candidates |= plane
+        candidates &= ~(1 << user_number)
+
+        if members is not None:
+            candidates &= bitmap_of(row[0] for row in self.connection.execute(
+                '''
+                SELECT users.id
+                FROM json_each(?) AS members
+                JOIN tb_users AS users ON users.discord_id = members.value
+                ''',
+                [json.dumps(list(members))]
+            ))
+
+        ranked: List[Tuple[int, int, float]] = []
+        if rank_by == 'shared':
+            for shared, users in _iter_count_groups(planes, candidates):
+                for other in iter_user_numbers(users):
+                    ranked.append((other, shared, shared / (library_size + self.index.library_size(other) - shared)))
+                    if len(ranked) == limit:
+                        return ranked
+
+            return ranked
+
+        # Keeping the top limit users by Jaccard similarity in a heap, worst first. A user sharing n games has a
+        # similarity of at most n / library_size, so once that is below the worst kept similarity, no later group of
+        # users can make the ranking.
+        heap: List[Tuple[float, int, int]] = []
+        for shared, users in _iter_count_groups(planes, candidates):
+            if len(heap) == limit and shared / library_size < heap[0][0]:
+                break
+
+            for other in iter_user_numbers(users):
+                jaccard = shared / (library_size + self.index.library_size(other) - shared)
+                entry = (jaccard, -other, shared)
+                if len(heap) < limit:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+
+        return [(-other, shared, jaccard) for jaccard, other, shared in heap]
+
+    def _join(self, user: tuple, members: AbstractSet[str] | None, rank_by: str) -> List[Tuple[int, int, float]]:
+        """
+        Ranks users by joining tb_owned_games with itself.
+
+        :return: The (user number, shared games, Jaccard similarity) triple of every user sharing any games, unsorted.
+        """
+
+        user_number, steam_user_id, library_size = user
+        ranked = []
+
+        for other, discord_id, other_library_size, shared in self.connection.execute(
+                '''
+                SELECT users.id, users.discord_id, users.library_size, COUNT(*)
+                FROM tb_owned_games AS mine
+                JOIN tb_owned_games AS theirs ON theirs.steam_app_id = mine.steam_app_id
+                JOIN tb_users AS users ON users.steam_user_id = theirs.steam_user_id
+                WHERE mine.steam_user_id = ? AND users.id != ?
+                GROUP BY users.id
+                ''',
+                [steam_user_id, user_number]
+        ):
+            if members is None or discord_id in members:
+                ranked.append((other, shared, shared / (library_size + other_library_size - shared)))
+
+        return ranked
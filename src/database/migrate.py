@@ -0,0 +1,36 @@
+import argparse
+
+from src.database.connection import Connection
+from src.database.migrations import MigrationRunner
+from src.database.schema import BACKFILLS, MIGRATIONS
+
+
+def main():
+    """
+    Applies the schema migrations to a database from the command line. With --dry-run, the migrations are checked
+    against an in-memory copy of the database instead, for example before a deploy:
+
+    python -m src.database.migrate path/to/database.sqlite --dry-run
+    """
+
+    parser = argparse.ArgumentParser(description='Applies the schema migrations to a database.')
+    parser.add_argument('database', help='The path to the SQLite database.')
+    parser.add_argument('--dry-run', action='store_true', help='Apply the migrations to an in-memory copy only.')
+    arguments = parser.parse_args()
+
+    runner = MigrationRunner(Connection(arguments.database), MIGRATIONS, BACKFILLS)
+    print(f'Database schema is at version {runner.schema_version()}, latest version is {runner.latest_version}.')
+
+    if arguments.dry_run:
+        for migration in runner.dry_run():
+            print(f'Would apply migration {migration.version}: {migration.description}.')
+    else:
+        runner.migrate(verbose=True)
+        runner.run_backfills()
+
+    runner.connection.close()
+
+
+# Import guard.
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,282 @@
+import asyncio
+import sqlite3
+from typing import Callable, Iterator, List, Sequence
+
+from .connection import Connection
+
+
+def split_script(script: str) -> Iterator[str]:
+    """
+    Splits an SQL script into its individual statements. Unlike a naive split on semicolons, statements containing
+    semicolons of their own (such as CREATE TRIGGER ... BEGIN ... END) are kept whole.
+
+    :param script: The SQL script to split.
+    :return: An iterator of SQL statements.
+    """
+
+    statement = ''
+    for part in script.split(';'):
+        statement += part + ';'
+
+        if sqlite3.complete_statement(statement):
+            if statement.strip(' \t\r\n;'):
+                yield statement.strip()
+            statement = ''
+
+    if statement.strip(' \t\r\n;'):
+        yield statement.strip()
+
+
+class Migration:
+    """
+    A single, versioned upgrade step of the database schema. Each migration is applied in its own transaction, along
+    with the update to the schema version, so a failed migration leaves the database untouched.
+    """
+
+    def __init__(
+            self,
+            version: int,
+            description: str,
+            script: str | None = None,
+            function: Callable[[Connection], None] | None = None
+    ) -> None:
+        """
+        Constructor for the Migration class.
+
+        :param version: The schema version the database is at once the migration is applied.
+        :param description: A short description of the migration.
+        :param script: SQL statements to execute, the statements must not manage their own transactions.
+        :param function: A function to call with the connection, for steps that can not be written as plain SQL. It is
+        called after the script, and must not manage its own transactions.
+        """
+
+        self.version: int = version
+        self.description: str = description
+        self.script: str | None = script
+        self.function: Callable[[Connection], None] | None = function
+
+    def apply(self, connection: Connection) -> None:
+        """
+        Applies the migration. Must be called inside an open transaction.
+
+        :param connection: The connection to the database to migrate.
+        """
+
+        if self.script:
+            for statement in split_script(self.script):
+                connection.execute(statement)
+
+        if self.function:
+            self.function(connection)
+
+
+class Backfill:
+    """
+    A long-running data backfill, processed in chunks so that each transaction stays short and the bot can keep serving
+    requests in between. Progress is recorded after every chunk, so an interrupted backfill resumes where it left off.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            process_chunk: Callable[[Connection, int, int], int | None],
+            chunk_size: int = 1000
+    ) -> None:
+        """
+        Constructor for the Backfill class.
+
+        :param name: The unique name of the backfill, used to record its progress.
+        :param process_chunk: A function called with the connection, the key the last chunk ended at (0 for the first
+        chunk) and the chunk size. It processes a single chunk and returns the key the chunk ended at, or None once
+        there is nothing left to process. It must not manage its own transactions.
+        :param chunk_size: The maximum number of rows to process in a single chunk.
+        """
+
+        self.name: str = name
+        self.process_chunk: Callable[[Connection, int, int], int | None] = process_chunk
+        self.chunk_size: int = chunk_size
+
+
+class MigrationRunner:
+    """
+    Applies schema migrations and data backfills to a database. The schema version is tracked in the user_version
+    pragma, so checking a database that is already current costs a single pragma read.
+    """
+
+    def __init__(
+            self,
+            connection: Connection,
+            migrations: Sequence[Migration],
+            backfills: Sequence[Backfill] = ()
+    ) -> None:
+        """
+        Constructor for the MigrationRunner class.
+
+        :param connection: The connection to the database to migrate.
+        :param migrations: Every migration, in any order.
+        :param backfills: Every backfill, run in the order passed.
+        :raises ValueError: If two migrations share a version.
+        """
+
+        self.connection: Connection = connection
+        self.migrations: List[Migration] = sorted(migrations, key=lambda migration: migration.version)
+        self.backfills: List[Backfill] = list(backfills)
+
+        versions = [migration.version for migration in self.migrations]
+        if len(versions) != len(set(versions)):
+            raise ValueError('Each migration must have a unique version.')
+
+    @property
+    def latest_version(self) -> int:
+        """
+        :return: The schema version the database is at once every migration is applied.
+        """
+
+        return self.migrations[-1].version if self.migrations else 0
+
+    def schema_version(self) -> int:
+        """
+        :return: The current schema version of the database.
+        """
+
+        return self.connection.execute('PRAGMA user_version').fetchone()[0]
+
+    def pending(self) -> List[Migration]:
+        """
+        :return: The migrations that have not been applied to the database yet, in the order they will be applied.
+        """
+
+        current_version = self.schema_version()
+        return [migration for migration in self.migrations if migration.version > current_version]
+
+    def migrate(self, verbose: bool = False) -> List[Migration]:
+        """
+        Applies every pending migration, each in its own transaction.
+
+        :param verbose: Whether to print each migration as it is applied. Off by default, so the library and the tests
+        migrate quietly.
+        :raises sqlite3.Error: If a migration fails. The failed migration is rolled back, migrations before it stay
+        applied.
+        :return: The migrations that were applied.
+        """
+
+        applied: List[Migration] = []
+
+        for migration in self.pending():
+            # Committing any implicitly opened transaction, so the migration can open its own.
+            self.connection.commit()
+            self.connection.execute('BEGIN')
+
+            try:
+                migration.apply(self.connection)
+                self.connection.execute(f'PRAGMA user_version = {int(migration.version)}')
+            except Exception:
+                self.connection.rollback()
+                raise
+
+            self.connection.commit()
+            applied.append(migration)
+
+            if verbose:
+                print(f'Applied database migration {migration.version}: {migration.description}.')
+
+        return applied
+
+    def _create_backfill_progress_table(self) -> None:
+        with self.connection:
+            self.connection.execute(
+                '''
+                CREATE TABLE IF NOT EXISTS tb_backfill_progress(
+                    name VARCHAR(100) PRIMARY KEY,
+                    last_key INTEGER NOT NULL DEFAULT 0,
+                    completed INTEGER NOT NULL DEFAULT 0
+                )
+                '''
+            )
+
+    def pending_backfills(self) -> List[Backfill]:
+        """
+        :return: The backfills that have not been completed yet.
+        """
+
+        if not self.backfills:
+            return []
+
+        self._create_backfill_progress_table()
+        completed = {
+            row[0] for row in self.connection.execute('SELECT name FROM tb_backfill_progress WHERE completed = 1')
+        }
+
+        return [backfill for backfill in self.backfills if backfill.name not in completed]
+
+    def run_backfill_chunk(self, backfill: Backfill) -> bool:
+        """
+        Processes the next chunk of a backfill, and records its progress, in a single transaction.
+
+        :param backfill: The backfill to process.
+        :return: True if the backfill has more chunks to process, False once it is complete.
+        """
+
+        self._create_backfill_progress_table()
+
+        with self.connection:
+            self.connection.execute('INSERT OR IGNORE INTO tb_backfill_progress (name) VALUES (?)', [backfill.name])
+            last_key, completed = self.connection.execute(
+                'SELECT last_key, completed FROM tb_backfill_progress WHERE name = ?',
+                [backfill.name]
+            ).fetchone()
+
+            if completed:
+                return False
+
+            next_key = backfill.process_chunk(self.connection, last_key, backfill.chunk_size)
+
+            self.connection.execute(
+                'UPDATE tb_backfill_progress SET last_key = ?, completed = ? WHERE name = ?',
+                [last_key if next_key is None else next_key, next_key is None, backfill.name]
+            )
+
+        return next_key is not None
+
+    def run_backfills(self) -> None:
+        """
+        Runs every pending backfill to completion, blocking until they are done.
+        """
+
+        for backfill in self.pending_backfills():
+            while self.run_backfill_chunk(backfill):
+                pass
+
+    async def run_backfills_async(self, pause: float = 0.0) -> None:
+        """
+        Runs every pending backfill to completion, yielding to the event loop between chunks so other tasks keep
+        running while the backfills progress.
+
+        :param pause: Seconds to wait between chunks.
+        """
+
+        for backfill in self.pending_backfills():
+            while self.run_backfill_chunk(backfill):
+                await asyncio.sleep(pause)
+
+    def dry_run(self) -> List[Migration]:
+        """
+        Applies every pending migration and backfill to an in-memory copy of the database, leaving the database itself
+        untouched.
+
+        :raises sqlite3.Error: If a migration or backfill fails against the copy.
+        :return: The migrations that would be applied.
+        """
+
+        copy = Connection(':memory:')
+        try:
+            self.connection.commit()
+            self.connection.backup(copy)
+
+            runner = MigrationRunner(copy, self.migrations, self.backfills)
+            applied = runner.migrate()
+            runner.run_backfills()
+        finally:
+            copy.close()
+
+        return applied
@@ -0,0 +1,206 @@
+from typing import Iterable, List, NamedTuple, Tuple
+
+from .connection import Connection
+from .row_counts import change_row_count
+
+
+class OwnedGamesDiff(NamedTuple):
+    """
+    The changes applied to a single user's rows in the tb_owned_games table.
+    """
+
+    added: int
+    """
+    The number of games added to the user's library.
+    """
+
+    removed: int
+    """
+    The number of games removed from the user's library.
+    """
+
+
+class OwnedGamesSync:
+    """
+    Applies a user's library to the tb_owned_games table with set-based statements. The incoming app IDs are loaded
+    into a temporary table, the games to add and remove are computed against the user's current rows, and each is
+    applied in a single statement. The tb_games_autocomplete table is maintained in bulk alongside them, the user's
+    library_size and the cached row counts are updated, and the version in tb_owned_games_version is bumped once per
+    change, so a persisted ownership index can tell it is out of date.
+
+    None of the methods commit, they must be called inside a transaction.
+    """
+
+    def __init__(self, connection: Connection) -> None:
+        """
+        Constructor for the OwnedGamesSync class.
+
+        :param connection: The connection to the SQLite database.
+        """
+
+        self.connection: Connection = connection
+
+        self.autocomplete_added: List[Tuple[int, str]] = []
+        """
+        The (Steam App ID, game title) pairs added to the autocomplete table by the last change.
+        """
+
+        self.autocomplete_removed: List[Tuple[int, str]] = []
+        """
+        The (Steam App ID, game title) pairs removed from the autocomplete table by the last change.
+        """
+
+        self.added_app_ids: List[int] = []
+        """
+        The Steam App IDs added to the user's library by the last change.
+        """
+
+        self.removed_app_ids: List[int] = []
+        """
+        The Steam App IDs removed from the user's library by the last change.
+        """
+
+    def _create_temp_tables(self) -> None:
+        """
+        Creates, or empties, the temporary tables holding the incoming and removed app IDs.
+        """
+
+        for table in ['tb_incoming_owned_games', 'tb_removed_owned_games']:
+            self.connection.execute(f'CREATE TEMP TABLE IF NOT EXISTS {table}(steam_app_id INTEGER PRIMARY KEY)')
+            self.connection.execute(f'DELETE FROM temp.{table}')
+
+    def apply(self, steam_user_id: str, steam_apps: Iterable[int], remove_missing: bool = True) -> OwnedGamesDiff:
+        """
+        Applies a user's library to the owned games table.
+
+        :param steam_user_id: The Steam ID of the user who owns the games.
+        :param steam_apps: The Steam application IDs the user owns.
+        :param remove_missing: Should games the user no longer owns be removed? If False, games are only added.
+        :return: The number of games added to, and removed from, the user's library.
+        """
+
+        self._create_temp_tables()
+        self.autocomplete_added, self.autocomplete_removed = [], []
+        self.added_app_ids, self.removed_app_ids = [], []
+
+        self.connection.executemany(
+            'INSERT OR IGNORE INTO temp.tb_incoming_owned_games (steam_app_id) VALUES (?)',
+            ((steam_app_id,) for steam_app_id in steam_apps)
+        )
+
+        removed = 0
+        if remove_missing:
+            self.connection.execute(
+                '''
+                INSERT INTO temp.tb_removed_owned_games (steam_app_id)
+                SELECT steam_app_id FROM tb_owned_games
+                WHERE steam_user_id = ?
+                AND steam_app_id NOT IN (SELECT steam_app_id FROM temp.tb_incoming_owned_games)
+                ''',
+                [steam_user_id]
+            )
+            removed = self._remove_games(steam_user_id)
+
+        self.added_app_ids = [row[0] for row in self.connection.execute(
+            '''
+            INSERT OR IGNORE INTO tb_owned_games (steam_user_id, steam_app_id)
+            SELECT ?, steam_app_id FROM temp.tb_incoming_owned_games
+            RETURNING steam_app_id
+            ''',
+            [steam_user_id]
+        )]
+        added = len(self.added_app_ids)
+
+        # Adding any newly owned games to the autocomplete table.
+        if added:
+            self.autocomplete_added = self.connection.execute(
+                '''
+                INSERT OR IGNORE INTO tb_games_autocomplete (steam_app_id, game_title)
+                SELECT apps.steam_app_id, apps.game_title
+                FROM temp.tb_incoming_owned_games AS incoming
+                JOIN tb_steam_apps AS apps ON apps.steam_app_id = incoming.steam_app_id
+                RETURNING steam_app_id, game_title
+                '''
+            ).fetchall()
+
+        if added or removed:
+            self._record_change(steam_user_id, added - removed)
+
+        return OwnedGamesDiff(added, removed)
+
+    def remove_all(self, steam_user_id: str) -> int:
+        """
+        Removes every game from a user's library.
+
+        :param steam_user_id: The Steam ID of the user.
+        :return: The number of games removed.
+        """
+
+        self._create_temp_tables()
+        self.autocomplete_added, self.autocomplete_removed = [], []
+        self.added_app_ids, self.removed_app_ids = [], []
+
+        self.connection.execute(
+            '''
+            INSERT INTO temp.tb_removed_owned_games (steam_app_id)
+            SELECT steam_app_id FROM tb_owned_games WHERE steam_user_id = ?
+            ''',
+            [steam_user_id]
+        )
+
+        removed = self._remove_games(steam_user_id)
+        if removed:
+            self._record_change(steam_user_id, -removed)
+
+        return removed
+
+    def _record_change(self, steam_user_id: str, size_change: int) -> None:
+        """
+        Records that a user's library changed, bumping the version of the owned games and updating the library size and
+        the row counts.
+        """
+
+        change_row_count(self.connection, 'tb_owned_games', size_change)
+        change_row_count(
+            self.connection, 'tb_games_autocomplete', len(self.autocomplete_added) - len(self.autocomplete_removed)
+        )
+
+        self.connection.execute('UPDATE tb_owned_games_version SET version = version + 1')
+        self.connection.execute(
+            'UPDATE tb_users SET library_size = library_size + ? WHERE steam_user_id = ?',
+            [size_change, steam_user_id]
+        )
+
+    def _remove_games(self, steam_user_id: str) -> int:
+        """
+        Removes the games in tb_removed_owned_games from a user's library, and removes any of those games that no
+        longer have an owner from the autocomplete table.
+
+        :return: The number of games removed.
+        """
+
+        self.removed_app_ids = [row[0] for row in self.connection.execute(
+            '''
+            DELETE FROM tb_owned_games
+            WHERE steam_user_id = ?
+            AND steam_app_id IN (SELECT steam_app_id FROM temp.tb_removed_owned_games)
+            RETURNING steam_app_id
+            ''',
+            [steam_user_id]
+        )]
+        removed = len(self.removed_app_ids)
+
+        if removed:
+            self.autocomplete_removed = self.connection.execute(
+                '''
+                DELETE FROM tb_games_autocomplete
+                WHERE steam_app_id IN (SELECT steam_app_id FROM temp.tb_removed_owned_games)
+                AND NOT EXISTS (
+                    SELECT 1 FROM tb_owned_games
+                    WHERE tb_owned_games.steam_app_id = tb_games_autocomplete.steam_app_id
+                )
+                RETURNING steam_app_id, game_title
+                '''
+            ).fetchall()
+
+        return removed
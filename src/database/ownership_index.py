@@ -0,0 +1,505 @@
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+from .connection import Connection
+
+
+def bitmap_of(user_numbers: Iterable[int]) -> int:
+    """
+    Packs user numbers into a bitmap.
+
+    :return: An integer with bit n set for every user number n.
+    """
+
+    user_numbers = list(user_numbers)
+    if not user_numbers:
+        return 0
+
+    data = bytearray((max(user_numbers) >> 3) + 1)
+    for user_number in user_numbers:
+        data[user_number >> 3] |= 1 << (user_number & 7)
+
+    return int.from_bytes(data, 'little')
+
+
+def iter_user_numbers(bitmap: int) -> Iterator[int]:
+    """
+    Unpacks the user numbers from a bitmap, 64 bits at a time.
+
+    :return: An iterator of the set bits of the bitmap, in ascending order.
+    """
+
+    words = array('Q', bitmap.to_bytes((bitmap.bit_length() + 63) // 64 * 8, 'little'))
+    if sys.byteorder == 'big':
+        words.byteswap()
+
+    for position, word in enumerate(words):
+        base = position << 6
+        while word:
+            lowest = word & -word
+            yield base + lowest.bit_length() - 1
+            word ^= lowest
+
+
+def add_to_planes(planes: List[int], bitmap: int, position: int = 0) -> None:
+    """
+    Adds 1 << position to the count of every user in a bitmap, where the counts are bit-sliced across planes: bit n of
+    plane j is bit j of user n's count. Carries ripple through the planes as big integer operations, so a bitmap is
+    added for every user at once.
+
+    :param planes: The bit-sliced counts, extended in place if a count outgrows them.
+    :param bitmap: The users to count.
+    :param position: The plane to add the bitmap at.
+    """
+
+    if bitmap and position > len(planes):
+        planes.extend([0] * (position - len(planes)))
+
+    carry = bitmap
+    while carry:
+        if position == len(planes):
+            planes.append(carry)
+            return
+
+        planes[position], carry = planes[position] ^ carry, planes[position] & carry
+        position += 1
+
+
+def _pack_numbers(user_numbers: array) -> bytes:
+    if sys.byteorder == 'big':
+        user_numbers = array('I', user_numbers)
+        user_numbers.byteswap()
+
+    return user_numbers.tobytes()
+
+
+def _unpack_numbers(data: bytes) -> array:
+    user_numbers = array('I')
+    user_numbers.frombytes(data)
+    if sys.byteorder == 'big':
+        user_numbers.byteswap()
+
+    return user_numbers
+
+
+class OwnershipIndex:
+    """
+    In-memory index of the owners of every owned game, keyed by Steam App ID. Owners are identified by their user
+    number, the dense tb_users.id of their registration, so the owners of a game fit one bit per registered user.
+
+    Each game's owners are held in whichever form is smaller:
+
+    - a bitmap, a Python integer with bit n set if user n owns the game, for games owned by many users,
+    - a sorted array of user numbers, for games owned by a handful of users, whose bitmap would be mostly zeroes.
+
+    Queries answer with bitmaps, so intersecting, uniting and counting the owners of dozens of games are a handful of
+    big integer operations, each running in C over a few kilobytes for 100,000 users.
+
+    The index is persisted to tb_ownership_index, stamped with the version of tb_owned_games it reflects. The version
+    is bumped by every change to the owned games, so a persisted index is only loaded if nothing changed since it was
+    saved, and is rebuilt from tb_owned_games otherwise.
+
+    The index is changed by the database writer thread while the reader threads query it, so changes are copy-on-write:
+    the owners of a game are never changed in place, a change builds new owners for each game it touches, then swaps
+    them all in at once under a lock. Queries only hold the lock while picking up the owners of their games, so they
+    compute on a consistent view of the index, never a half-applied change, without blocking each other.
+    """
+
+    sparse_ratio: int = 64
+    """
+    The number of bits a bitmap spends per owner, beyond which a game's owners are stored as an array of 32-bit user
+    numbers instead. Arrays are only converted back once a bitmap would spend less than half this, so a game gaining
+    and losing an owner around the threshold is not converted back and forth.
+    """
+
+    def __init__(self) -> None:
+        self._owners: Dict[int, array | int] = {}
+        """
+        The owners of each game, as a bitmap or a sorted array of user numbers, keyed by Steam App ID. Games without
+        owners are not stored. Owners are replaced rather than changed in place, under the lock.
+        """
+
+        self._lock: threading.Lock = threading.Lock()
+        """
+        Held while changes are swapped in, and while queries pick up the owners of their games.
+        """
+
+        self._dirty: Set[int] = set()
+        """
+        The Steam App IDs of the games whose owners changed since the index was last saved.
+        """
+
+        self._saved_version: int | None = None
+        """
+        The version of tb_owned_games the persisted index reflected when it was last saved or loaded, None if the
+        persisted index must be rewritten in full.
+        """
+
+        self.version: int | None = None
+        """
+        The version of tb_owned_games the index reflects.
+        """
+
+        self._library_sizes: array = array('I')
+        """
+        The number of games each user owns, indexed by user number.
+        """
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+    def __contains__(self, steam_app_id: int) -> bool:
+        return steam_app_id in self._owners
+
+    def library_size(self, user_number: int) -> int:
+        """
+        :return: The number of games a user owns.
+        """
+
+        return self._library_sizes[user_number] if user_number < len(self._library_sizes) else 0
+
+    def _resize_library(self, user_number: int, change: int) -> None:
+        if user_number >= len(self._library_sizes):
+            self._library_sizes.extend([0] * (user_number - len(self._library_sizes) + 1))
+
+        self._library_sizes[user_number] += change
+
+    def _compact(self, owners: array | int) -> array | int | None:
+        """
+        :return: The owners of a game in whichever form is smaller, None if the game has no owners.
+        """
+
+        if not owners:
+            return None
+        elif isinstance(owners, int) and owners.bit_count() * self.sparse_ratio * 2 < owners.bit_length():
+            return array('I', iter_user_numbers(owners))
+        elif isinstance(owners, array) and len(owners) * self.sparse_ratio > owners[-1]:
+            return bitmap_of(owners)
+        else:
+            return owners
+
+    def _get_owners(self, steam_app_ids: Iterable[int]) -> List[array | int | None]:
+        """
+        Picks up the owners of each distinct game under the lock, as a consistent view of the index.
+
+        :return: The owners of each game, None for games without owners, in the order of the Steam App IDs.
+        """
+
+        steam_app_ids = list(dict.fromkeys(steam_app_ids))
+        with self._lock:
+            return [self._owners.get(steam_app_id) for steam_app_id in steam_app_ids]
+
+    def update(
+            self,
+            user_number: int,
+            removed_app_ids: Iterable[int] = (),
+            added_app_ids: Iterable[int] = ()
+    ) -> None:
+        """
+        Records a user no longer owning some games and owning others, as a single change to the index.
+
+        :param user_number: The tb_users.id of the user.
+        :param removed_app_ids: The Steam App IDs of the games the user no longer owns.
+        :param added_app_ids: The Steam App IDs of the games the user now owns.
+        """
+
+        changes: Dict[int, array | int] = {}
+        library_change = 0
+
+        # Building the new owners of each game, copying arrays rather than changing them, as queries may read them.
+        for steam_app_id in removed_app_ids:
+            owners = changes.get(steam_app_id, self._owners.get(steam_app_id))
+
+            if not owners:
+                continue
+            elif isinstance(owners, int):
+                if not owners >> user_number & 1:
+                    continue
+                owners &= ~(1 << user_number)
+            else:
+                position = bisect_left(owners, user_number)
+                if position == len(owners) or owners[position] != user_number:
+                    continue
+                owners = owners[:position] + owners[position + 1:]
+
+            changes[steam_app_id] = owners
+            library_change -= 1
+
+        for steam_app_id in added_app_ids:
+            owners = changes.get(steam_app_id, self._owners.get(steam_app_id))
+
+            if not owners:
+                owners = array('I', [user_number])
+            elif isinstance(owners, int):
+                if owners >> user_number & 1:
+                    continue
+                owners |= 1 << user_number
+            else:
+                position = bisect_left(owners, user_number)
+                if position < len(owners) and owners[position] == user_number:
+                    continue
+                owners = owners[:position] + array('I', [user_number]) + owners[position:]
+
+            changes[steam_app_id] = owners
+            library_change += 1
+
+        if not changes:
+            return
+
+        stored: List[Tuple[int, array | int | None]] = [
+            (steam_app_id, self._compact(owners)) for steam_app_id, owners in changes.items()
+        ]
+        with self._lock:
+            for steam_app_id, owners in stored:
+                if owners is None:
+                    self._owners.pop(steam_app_id, None)
+                else:
+                    self._owners[steam_app_id] = owners
+            self._resize_library(user_number, library_change)
+
+        self._dirty.update(changes)
+
+    def add(self, user_number: int, steam_app_ids: Iterable[int]) -> None:
+        """
+        Records a user owning games.
+
+        :param user_number: The tb_users.id of the user.
+        :param steam_app_ids: The Steam App IDs of the games.
+        """
+
+        self.update(user_number, added_app_ids=steam_app_ids)
+
+    def remove(self, user_number: int, steam_app_ids: Iterable[int]) -> None:
+        """
+        Records a user no longer owning games.
+
+        :param user_number: The tb_users.id of the user.
+        :param steam_app_ids: The Steam App IDs of the games.
+        """
+
+        self.update(user_number, removed_app_ids=steam_app_ids)
+
+    def owners(self, steam_app_id: int) -> int:
+        """
+        :return: The bitmap of the owners of a game.
+        """
+
+        owners = self._get_owners([steam_app_id])[0] or 0
+        return owners if isinstance(owners, int) else bitmap_of(owners)
+
+    def intersection(self, steam_app_ids: Iterable[int]) -> int:
+        """
+        Finds the users who own every game in a set of games. Bitmaps are intersected first, stopping as soon as no
+        owner is left, then arrays.
+
+        :return: The bitmap of the users who own every game, 0 if no games are passed.
+        """
+
+        bitmaps: List[int] = []
+        arrays: List[array] = []
+
+        for owners in self._get_owners(steam_app_ids):
+            if owners is None:
+                return 0
+            (bitmaps if isinstance(owners, int) else arrays).append(owners)
+
+        result = -1
+        for bitmap in bitmaps:
+            result &= bitmap
+            if not result:
+                return 0
+
+        if not arrays:
+            return max(result, 0)
+
+        # Intersecting the arrays as sets, starting from the smallest, so only the owners they share are packed into a
+        # bitmap. The result of the bitmaps is still -1, every bit set, if there were none.
+        arrays.sort(key=len)
+        candidates = set(arrays[0])
+        for owners in arrays[1:]:
+            candidates.intersection_update(owners)
+            if not candidates:
+                return 0
+
+        return bitmap_of(candidates) & result
+
+    def union(self, steam_app_ids: Iterable[int]) -> int:
+        """
+        Finds the users who own any game in a set of games.
+
+        :return: The bitmap of the users who own at least one of the games.
+        """
+
+        arrays = []
+        result = 0
+
+        for owners in self._get_owners(steam_app_ids):
+            if isinstance(owners, int):
+                result |= owners
+            elif owners is not None:
+                arrays.append(owners)
+
+        # Deduplicating the owners in the arrays as a set first, so each is only packed once.
+        return result | bitmap_of(set().union(*arrays))
+
+    def count(self, steam_app_ids: Iterable[int]) -> int:
+        """
+        :return: The number of users who own every game in a set of games.
+        """
+
+        return self.intersection(steam_app_ids).bit_count()
+
+    def union_count(self, steam_app_ids: Iterable[int]) -> int:
+        """
+        :return: The number of users who own any game in a set of games.
+        """
+
+        return self.union(steam_app_ids).bit_count()
+
+    def count_owned(self, steam_app_ids: Iterable[int]) -> List[int]:
+        """
+        Counts how many games in a set of games every user owns, such as the games in another user's library.
+
+        The counts are bit-sliced: bit n of plane j is bit j of user n's count, so every user's count is summed at once
+        by adding each game's bitmap to the planes. The owners of games stored as arrays are counted in a Counter
+        instead, and added to the planes grouped by count.
+
+        :return: The planes of the counts, least significant first.
+        """
+
+        planes: List[int] = []
+        sparse_counts = Counter()
+
+        for owners in self._get_owners(steam_app_ids):
+            if isinstance(owners, int):
+                add_to_planes(planes, owners)
+            elif owners is not None:
+                sparse_counts.update(owners)
+
+        users_by_count: Dict[int, List[int]] = defaultdict(list)
+        for user_number, count in sparse_counts.items():
+            users_by_count[count].append(user_number)
+
+        for count, user_numbers in users_by_count.items():
+            bitmap = bitmap_of(user_numbers)
+            for position in range(count.bit_length()):
+                if count >> position & 1:
+                    add_to_planes(planes, bitmap, position)
+
+        return planes
+
+    def memory_usage(self) -> int:
+        """
+        Estimates the memory used by the index.
+
+        :return: The size of the index in bytes.
+        """
+
+        with self._lock:
+            size = sys.getsizeof(self._owners) + sys.getsizeof(self._library_sizes)
+            return size + sum(sys.getsizeof(owners) for owners in self._owners.values())
+
+    @staticmethod
+    def _get_versions(connection: Connection) -> tuple:
+        return connection.execute('SELECT version, indexed_version FROM tb_owned_games_version').fetchone()
+
+    @classmethod
+    def build(cls, connection: Connection) -> 'OwnershipIndex':
+        """
+        Builds the index from tb_owned_games. This reads every row, taking seconds for millions of rows, so the index
+        is loaded from its persisted copy whenever that is current.
+
+        :param connection: The connection to the SQLite database.
+        :return: The index, which must be saved in full.
+        """
+
+        index = cls()
+        index.version = cls._get_versions(connection)[0]
+
+        # Reading each user's library in one row, in the order of tb_owned_games, rather than looking up the owner of
+        # every row, then fanning the libraries out into lists of owners.
+        owners: Dict[int, List[int]] = defaultdict(list)
+        for user_number, steam_app_ids in connection.execute(
+                '''
+                SELECT users.id, group_concat(owned.steam_app_id)
+                FROM tb_users AS users
+                CROSS JOIN tb_owned_games AS owned ON owned.steam_user_id = users.steam_user_id
+                GROUP BY users.steam_user_id
+                '''
+        ):
+            steam_app_ids = steam_app_ids.split(',')
+            index._resize_library(user_number, len(steam_app_ids))
+            for steam_app_id in map(int, steam_app_ids):
+                owners[steam_app_id].append(user_number)
+
+        for steam_app_id, user_numbers in owners.items():
+            user_numbers.sort()
+            index._owners[steam_app_id] = index._compact(array('I', user_numbers))
+
+        return index
+
+    @classmethod
+    def load(cls, connection: Connection) -> 'OwnershipIndex | None':
+        """
+        Loads the persisted index, if it reflects the current version of tb_owned_games.
+
+        :param connection: The connection to the SQLite database.
+        :return: The index, None if there is no persisted index, or it is out of date.
+        """
+
+        version, indexed_version = cls._get_versions(connection)
+        if indexed_version != version:
+            return None
+
+        index = cls()
+        index.version = index._saved_version = version
+
+        for steam_app_id, is_bitmap, data in connection.execute(
+                'SELECT steam_app_id, is_bitmap, owners FROM tb_ownership_index'
+        ):
+            index._owners[steam_app_id] = int.from_bytes(data, 'little') if is_bitmap else _unpack_numbers(data)
+
+        for user_number, library_size in connection.execute('SELECT id, library_size FROM tb_users'):
+            index._resize_library(user_number, library_size)
+
+        return index
+
+    def save(self, connection: Connection) -> int:
+        """
+        Persists the index. Only the games whose owners changed since the index was last saved are written, unless the
+        persisted index is from another version, in which case it is rewritten in full. Must be called inside a
+        transaction.
+
+        :param connection: The connection to the SQLite database.
+        :return: The number of games written.
+        """
+
+        if self._saved_version is None or self._get_versions(connection)[1] != self._saved_version:
+            connection.execute('DELETE FROM tb_ownership_index')
+            changed = list(self._owners)
+        else:
+            changed = list(self._dirty)
+
+        rows = []
+        for steam_app_id in changed:
+            owners = self._owners.get(steam_app_id)
+            if isinstance(owners, int):
+                rows.append((steam_app_id, True, owners.to_bytes((owners.bit_length() + 7) // 8, 'little')))
+            elif owners is not None:
+                rows.append((steam_app_id, False, _pack_numbers(owners)))
+            else:
+                connection.execute('DELETE FROM tb_ownership_index WHERE steam_app_id = ?', [steam_app_id])
+
+        connection.executemany(
+            'INSERT OR REPLACE INTO tb_ownership_index (steam_app_id, is_bitmap, owners) VALUES (?, ?, ?)',
+            rows
+        )
+        connection.execute('UPDATE tb_owned_games_version SET indexed_version = ?', [self.version])
+
+        self._dirty.clear()
+        self._saved_version = self.version
+        return len(changed)
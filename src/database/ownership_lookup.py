@@ -0,0 +1,158 @@
+import json
+from typing import AbstractSet, List, Sequence
+
+from .connection import Connection
+from .ownership_index import OwnershipIndex, bitmap_of, iter_user_numbers
+
+
+class OwnershipLookup:
+    """
+    Finds the registered users who own a game, or every game in a set of games, optionally limited to a set of
+    members, such as the members of a Discord guild.
+
+    If an ownership index is loaded, the owners are intersected in memory, and only the users in the result are read.
+    Otherwise, two strategies are used, picking whichever reads fewer rows:
+
+    - the owners of each game are scanned through ix_owned_games_app_user, intersected, and filtered against the member
+      set in memory, which costs a row per owner of each game,
+    - the members are probed, looking up each member's ownership of each game by the primary key of tb_owned_games,
+      which costs a few lookups per member, however popular the games are.
+
+    Scanning is picked unless the games have more owners than probing the members would cost, which is checked by
+    counting owners only up to that cost.
+    """
+
+    probe_cost: int = 4
+    """
+    The cost of probing a single member for a single game, relative to scanning a single owner.
+    """
+
+    def __init__(self, connection: Connection) -> None:
+        """
+        Constructor for the OwnershipLookup class.
+
+        :param connection: The connection to the SQLite database.
+        """
+
+        self.connection: Connection = connection
+
+        self.index: OwnershipIndex | None = None
+        """
+        The in-memory index of the owners of each game, None to query tb_owned_games instead.
+        """
+
+    def find_owners(
+            self,
+            steam_app_ids: Sequence[int],
+            members: AbstractSet[str] | None = None,
+            limit: int | None = None
+    ) -> List[str]:
+        """
+        Finds the users who own every game in a set of games.
+
+        :param steam_app_ids: The Steam App IDs of the games.
+        :param members: The Discord IDs of the users to consider, None to consider every registered user.
+        :param limit: The maximum number of users to return, None for no limit.
+        :return: The Discord IDs of the users who own every game, sorted.
+        """
+
+        steam_app_ids = list(dict.fromkeys(steam_app_ids))
+        if not steam_app_ids or limit is not None and limit <= 0 or members is not None and not members:
+            return []
+
+        if self.index is not None:
+            owners = self._intersect(steam_app_ids, members)
+        elif members is not None and self._has_more_owners_than(steam_app_ids, len(members) * self.probe_cost):
+            owners = self._probe(steam_app_ids, members)
+        else:
+            owners = self._scan(steam_app_ids, members)
+
+        owners.sort()
+        return owners if limit is None else owners[:limit]
+
+    def _has_more_owners_than(self, steam_app_ids: List[int], bound: int) -> bool:
+        """
+        Checks if the games have more owners, in total, than a bound, counting no further than the bound.
+        """
+
+        remaining = bound
+        for steam_app_id in steam_app_ids:
+            remaining -= self.connection.execute(
+                'SELECT COUNT(*) FROM (SELECT 1 FROM tb_owned_games WHERE steam_app_id = ? LIMIT ?)',
+                [steam_app_id, remaining + 1]
+            ).fetchone()[0]
+
+            if remaining < 0:
+                return True
+
+        return False
+
+    def _probe(self, steam_app_ids: List[int], members: AbstractSet[str]) -> List[str]:
+        """
+        Looks up each member's ownership of each game.
+        """
+
+        ownership_checks = ' AND '.join(
+            ['EXISTS (SELECT 1 FROM tb_owned_games AS owned '
+             'WHERE owned.steam_user_id = users.steam_user_id AND owned.steam_app_id = ?)'] * len(steam_app_ids)
+        )
+
+        # Passing the members as a single JSON array, so any number of members fits in one bound parameter.
+        return [row[0] for row in self.connection.execute(
+            f'''
+            SELECT users.discord_id
+            FROM json_each(?) AS members
+            JOIN tb_users AS users ON users.discord_id = members.value
+            WHERE {ownership_checks}
+            ''',
+            [json.dumps(list(members)), *steam_app_ids]
+        )]
+
+    def _scan(self, steam_app_ids: List[int], members: AbstractSet[str] | None) -> List[str]:
+        """
+        Scans the owners of each game, intersecting them, and filtering them against the members.
+        """
+
+        owners_of_each_game = ' INTERSECT '.join(
+            ['SELECT steam_user_id FROM tb_owned_games WHERE steam_app_id = ?'] * len(steam_app_ids)
+        )
+
+        owners = [row[0] for row in self.connection.execute(
+            f'''
+            SELECT users.discord_id
+            FROM ({owners_of_each_game}) AS owners
+            JOIN tb_users AS users ON users.steam_user_id = owners.steam_user_id
+            ''',
+            steam_app_ids
+        )]
+
+        return owners if members is None else [discord_id for discord_id in owners if discord_id in members]
+
+    def _intersect(self, steam_app_ids: List[int], members: AbstractSet[str] | None) -> List[str]:
+        """
+        Intersects the owners of each game through the ownership index, reading the Discord IDs of whichever of the
+        owners or the members are fewer.
+        """
+
+        owners = self.index.intersection(steam_app_ids)
+        if not owners:
+            return []
+
+        if members is not None and len(members) < owners.bit_count():
+            discord_ids = dict(self.connection.execute(
+                '''
+                SELECT users.id, users.discord_id
+                FROM json_each(?) AS members
+                JOIN tb_users AS users ON users.discord_id = members.value
+                ''',
+                [json.dumps(list(members))]
+            ).fetchall())
+
+            return [discord_ids[user_number] for user_number in iter_user_numbers(owners & bitmap_of(discord_ids))]
+
+        owners = [row[0] for row in self.connection.execute(
+            'SELECT discord_id FROM tb_users WHERE id IN (SELECT value FROM json_each(?))',
+            [json.dumps(list(iter_user_numbers(owners)))]
+        )]
+
+        return owners if members is None else [discord_id for discord_id in owners if discord_id in members]
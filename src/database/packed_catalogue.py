@@ -0,0 +1,202 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator, Tuple
+
+_header = struct.Struct('<8sII')
+"""
+The header of a packed catalogue file: the magic bytes, the number of apps and the size of the title blob in bytes.
+"""
+
+_magic = b'LLCATv1\0'
+"""
+The magic bytes every packed catalogue file starts with, including the version of the format.
+"""
+
+
+def write_packed_catalogue(path: str, steam_apps: Iterable[Tuple[int, str]]) -> int:
+    """
+    Writes the Steam app list to a packed catalogue file, for PackedCatalogue to memory-map. The file holds the header,
+    the app IDs in ascending order as little-endian uint32s, the end offset of each title in the blob as little-endian
+    uint32s, then every title as UTF-8, in app ID order.
+
+    Apps are consumed one at a time, so the catalogue can be written straight from a streamed app list. Only the IDs,
+    offsets and encoded titles are held in memory while writing, in compact arrays rather than Python objects. The file
+    is written next to path and moved into place, so readers never see a partial catalogue.
+
+    :param path: The path of the file to write.
+    :param steam_apps: The (Steam App ID, game title) pairs, in any order. Where an app appears more than once, the last
+    title wins.
+    :raises ValueError: If an app ID does not fit in a uint32, or the titles add up to more than 4 GiB.
+    :return: The number of apps written.
+    """
+
+    steam_app_ids = array('I')
+    ends = array('Q')
+    blob = bytearray()
+
+    for steam_app_id, game_title in steam_apps:
+        try:
+            steam_app_ids.append(steam_app_id)
+        except OverflowError:
+            raise ValueError(f'App ID {steam_app_id} does not fit in a packed catalogue.') from None
+        blob += game_title.encode('utf-8')
+        ends.append(len(blob))
+
+    # Sorting by app ID, keeping the last occurrence of a duplicated app, as a sort is stable.
+    order = sorted(range(len(steam_app_ids)), key=steam_app_ids.__getitem__)
+    order = [position for index, position in enumerate(order)
+             if index + 1 == len(order) or steam_app_ids[order[index + 1]] != steam_app_ids[position]]
+
+    sorted_ids = array('I', (steam_app_ids[position] for position in order))
+    sorted_ends = array('I')
+    sorted_blob = bytearray()
+    for position in order:
+        start = ends[position - 1] if position else 0
+        sorted_blob += blob[start:ends[position]]
+        if len(sorted_blob) > 0xFFFFFFFF:
+            raise ValueError('The titles of a packed catalogue can not add up to more than 4 GiB.')
+        sorted_ends.append(len(sorted_blob))
+
+    if sys.byteorder != 'little':
+        sorted_ids.byteswap()
+        sorted_ends.byteswap()
+
+    temporary_path = f'{path}.tmp'
+    with open(temporary_path, 'wb') as file:
+        file.write(_header.pack(_magic, len(sorted_ids), len(sorted_blob)))
+        file.write(sorted_ids.tobytes())
+        file.write(sorted_ends.tobytes())
+        file.write(sorted_blob)
+
+    os.replace(temporary_path, path)
+    return len(sorted_ids)
+
+
+class PackedCatalogue:
+    """
+    Read-only, memory-mapped view of a catalogue written by write_packed_catalogue(). Titles are looked up by binary
+    search over the memory-mapped app IDs, and sliced out of the memory-mapped title blob, so opening a catalogue
+    reads nothing and the catalogue costs no Python objects per app. The pages are shared with the OS page cache, and
+    with every other process mapping the same file.
+
+    Iterating a catalogue yields (Steam App ID, game title) pairs in app ID order, so a catalogue can be passed to
+    anything accepting an app list, such as DatabaseWrapper.sync_steam_apps_table(). Lookups are safe from any thread.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Constructor for the PackedCatalogue class, mapping the file.
+
+        :param path: The path of the packed catalogue file.
+        :raises OSError: If the file can not be opened.
+        :raises ValueError: If the file is not a packed catalogue, or is cut off.
+        """
+
+        with open(path, 'rb') as file:
+            self._mmap: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, count, blob_size = _header.unpack_from(self._mmap)
+        except struct.error:
+            magic, count, blob_size = b'', 0, 0
+
+        ids_start = _header.size
+        ends_start = ids_start + count * 4
+        blob_start = ends_start + count * 4
+        if magic != _magic or len(self._mmap) != blob_start + blob_size:
+            self._mmap.close()
+            raise ValueError(f'{path} is not a packed catalogue, or is cut off.')
+
+        self._view: memoryview = memoryview(self._mmap)
+
+        # Casting the arrays in place on little-endian machines, copying them into byte-swapped arrays otherwise.
+        if sys.byteorder == 'little':
+            self._ids: memoryview | array = self._view[ids_start:ends_start].cast('I')
+            self._ends: memoryview | array = self._view[ends_start:blob_start].cast('I')
+        else:
+            self._ids = array('I', self._view[ids_start:ends_start])
+            self._ends = array('I', self._view[ends_start:blob_start])
+            self._ids.byteswap()
+            self._ends.byteswap()
+
+        self._blob: memoryview = self._view[blob_start:]
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, steam_app_id: int) -> bool:
+        return self._find(steam_app_id) is not None
+
+    def __iter__(self) -> Iterator[Tuple[int, str]]:
+        start = 0
+        for steam_app_id, end in zip(self._ids, self._ends):
+            yield steam_app_id, str(self._blob[start:end], 'utf-8')
+            start = end
+
+    def __enter__(self) -> 'PackedCatalogue':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _find(self, steam_app_id: int) -> int | None:
+        """
+        :return: The position of an app in the catalogue, None if the app is not in the catalogue.
+        """
+
+        position = bisect_left(self._ids, steam_app_id)
+        if position < len(self._ids) and self._ids[position] == steam_app_id:
+            return position
+
+        return None
+
+    def title_bytes(self, steam_app_id: int) -> memoryview | None:
+        """
+        Gets the title of an app without copying it.
+
+        :param steam_app_id: The Steam App ID of the app.
+        :return: A view of the UTF-8 encoded title within the mapped file, None if the app is not in the catalogue. The
+        view must be released before the catalogue is closed.
+        """
+
+        position = self._find(steam_app_id)
+        if position is None:
+            return None
+
+        return self._blob[self._ends[position - 1] if position else 0:self._ends[position]]
+
+    def get(self, steam_app_id: int, default: str | None = None) -> str | None:
+        """
+        Gets the title of an app.
+
+        :param steam_app_id: The Steam App ID of the app.
+        :param default: The value to return if the app is not in the catalogue.
+        :return: The title of the app, or the default.
+        """
+
+        position = self._find(steam_app_id)
+        if position is None:
+            return default
+
+        return str(self._blob[self._ends[position - 1] if position else 0:self._ends[position]], 'utf-8')
+
+    def close(self) -> None:
+        """
+        Unmaps the file. If title views are still held, the file stays mapped until they are released.
+        """
+
+        if self._mmap.closed:
+            return
+
+        for view in (self._blob, self._ids, self._ends, self._view):
+            if isinstance(view, memoryview):
+                view.release()
+
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
@@ -0,0 +1,150 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+
+class StatementStatistics:
+    """
+    The timings of a single SQL statement, across every execution.
+    """
+
+    def __init__(self, sql: str, buckets: int) -> None:
+        self.sql: str = ' '.join(sql.split())
+        """
+        The statement, with its whitespace collapsed for display.
+        """
+
+        self.calls: int = 0
+        self.total_time: float = 0.0
+        self.max_time: float = 0.0
+
+        self.rows: int = 0
+        """
+        The number of rows inserted, updated or deleted by the statement, not counting rows changed by triggers.
+        """
+
+        self.rows_returned: int = 0
+        """
+        The number of rows fetched from the results of the statement.
+        """
+
+        self.histogram: List[int] = [0] * buckets
+        """
+        The number of executions in each bucket of QueryStatistics.histogram_bounds, with a final bucket for
+        executions slower than every bound.
+        """
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+
+class QueryStatistics:
+    """
+    Per-statement timings of the queries run through one or more connections, with a log of slow queries.
+
+    The time of a statement is the time sqlite3 takes to execute it, which includes the triggers it fires and, for
+    queries, fetching every row that is fetched. Commits are recorded as a COMMIT statement.
+    """
+
+    histogram_bounds: Tuple[float, ...] = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+    """
+    The upper bounds of the histogram buckets, in seconds.
+    """
+
+    orderings: Tuple[str, ...] = ('total', 'max', 'mean', 'calls')
+    """
+    The ways statements can be ranked by top() and report().
+    """
+
+    def __init__(self, slow_query_threshold: float | None = None) -> None:
+        """
+        Constructor for the QueryStatistics class.
+
+        :param slow_query_threshold: Statements slower than this many seconds are printed, None to log none.
+        """
+
+        self.slow_query_threshold: float | None = slow_query_threshold
+
+        self._statements: Dict[str, StatementStatistics] = {}
+        """
+        The statistics of each statement, keyed by the SQL text as it was executed.
+        """
+
+        self._lock: threading.Lock = threading.Lock()
+        """
+        Lock shared by every connection recording into these statistics, as connections may run on different threads.
+        """
+
+    def record(self, sql: str, elapsed: float, rows: int = 0, rows_returned: int = 0) -> None:
+        """
+        Records an execution of a statement.
+
+        :param sql: The SQL text of the statement.
+        :param elapsed: The time the statement took, in seconds.
+        :param rows: The number of rows the statement changed.
+        :param rows_returned: The number of rows fetched from the results of the statement.
+        """
+
+        with self._lock:
+            statement = self._statements.get(sql)
+            if statement is None:
+                statement = self._statements[sql] = StatementStatistics(sql, len(self.histogram_bounds) + 1)
+
+            statement.calls += 1
+            statement.total_time += elapsed
+            statement.max_time = max(statement.max_time, elapsed)
+            statement.rows += rows
+            statement.rows_returned += rows_returned
+            statement.histogram[bisect_left(self.histogram_bounds, elapsed)] += 1
+
+        if self.slow_query_threshold is not None and elapsed > self.slow_query_threshold:
+            print(f'Slow query, {elapsed * 1000:.1f}ms: {statement.sql}')
+
+    def top(self, limit: int = 10, by: str = 'total') -> List[StatementStatistics]:
+        """
+        Gets the most expensive statements.
+
+        :param limit: The maximum number of statements to return.
+        :param by: 'total' to rank by total time, 'max' by slowest execution, 'mean' by mean time, 'calls' by calls.
+        :raises ValueError: If by is not one of the orderings.
+        :return: The statements, most expensive first.
+        """
+
+        if by not in self.orderings:
+            raise ValueError(f'Parameter by must be one of {", ".join(self.orderings)}.')
+
+        with self._lock:
+            statements = list(self._statements.values())
+
+        statements.sort(key=lambda statement: getattr(statement, by if by == 'calls' else f'{by}_time'), reverse=True)
+        return statements[:limit]
+
+    def report(self, limit: int = 10, by: str = 'total') -> str:
+        """
+        Formats the most expensive statements, one per line, for logging.
+
+        :param limit: The maximum number of statements to include.
+        :param by: How to rank the statements, one of the orderings.
+        :return: The report.
+        """
+
+        bounds = ' '.join(f'<{bound * 1000:g}ms' for bound in self.histogram_bounds) + ' slower'
+        lines = [f'Top {limit} statements by {by}, histogram buckets: {bounds}']
+        for statement in self.top(limit, by):
+            lines.append(
+                f'{statement.calls} call(s), {statement.total_time * 1000:.1f}ms total, '
+                f'{statement.mean_time * 1000:.3f}ms mean, {statement.max_time * 1000:.1f}ms max, '
+                f'{statement.rows} row(s) changed, {statement.rows_returned} row(s) returned, '
+                f'histogram {statement.histogram}: {statement.sql[:200]}'
+            )
+
+        return '\n'.join(lines)
+
+    def reset(self) -> None:
+        """
+        Forgets every recorded statement.
+        """
+
+        with self._lock:
+            self._statements.clear()
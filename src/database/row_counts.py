@@ -0,0 +1,36 @@
+from typing import Dict, Tuple
+
+from .connection import Connection
+
+COUNTED_TABLES: Tuple[str, ...] = ('tb_steam_apps', 'tb_users', 'tb_owned_games', 'tb_games_autocomplete')
+"""
+The tables whose row count is kept in tb_row_counts.
+"""
+
+
+def change_row_count(connection: Connection, table: str, change: int) -> None:
+    """
+    Adjusts the cached row count of a table, in the caller's transaction, so the count commits or rolls back with the
+    rows it counts.
+
+    :param connection: The connection to the SQLite database.
+    :param table: The table the rows were inserted into or deleted from, one of COUNTED_TABLES.
+    :param change: The number of rows inserted, minus the number of rows deleted.
+    """
+
+    if change:
+        connection.execute(
+            'UPDATE tb_row_counts SET row_count = row_count + ? WHERE table_name = ?',
+            [change, table]
+        )
+
+
+def get_row_counts(connection: Connection) -> Dict[str, int]:
+    """
+    Reads the cached row count of every counted table, without scanning any of them.
+
+    :param connection: The connection to the SQLite database.
+    :return: The number of rows in each table, keyed by table name.
+    """
+
+    return dict(connection.execute('SELECT table_name, row_count FROM tb_row_counts').fetchall())
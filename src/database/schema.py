@@ -0,0 +1,306 @@
+from typing import List
+
+from .connection import Connection
+from .migrations import Backfill, Migration, split_script
+
+_initial_tables = """
+-- Table to hold user data.
+CREATE TABLE IF NOT EXISTS tb_users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    discord_id VARCHAR(18) NOT NULL UNIQUE,
+    steam_user_id VARCHAR(17) NOT NULL UNIQUE
+);
+
+-- Table to hold Steam app data for every app on Steam.
+CREATE TABLE IF NOT EXISTS tb_steam_apps(
+    steam_app_id INTEGER PRIMARY KEY,
+    game_title VARCHAR(100) NOT NULL UNIQUE
+);
+
+-- Table to hold data for games owned by registered users.
+CREATE TABLE IF NOT EXISTS tb_owned_games(
+    steam_user_id VARCHAR(17) NOT NULL,
+    steam_app_id INTEGER NOT NULL,
+    PRIMARY KEY (steam_user_id, steam_app_id),
+    FOREIGN KEY (steam_app_id) REFERENCES tb_steam_apps(steam_app_id),
+    FOREIGN KEY (steam_user_id) REFERENCES tb_users(steam_user_id)
+) WITHOUT ROWID;
+
+-- Index to look up the owners of a game.
+CREATE INDEX IF NOT EXISTS ix_owned_games_app_user ON tb_owned_games(steam_app_id, steam_user_id);
+
+-- Table to hold autocomplete data for games owned by registered users.
+CREATE TABLE IF NOT EXISTS tb_games_autocomplete(
+    steam_app_id INTEGER PRIMARY KEY,
+    game_title VARCHAR(100) NOT NULL UNIQUE,
+    FOREIGN KEY (steam_app_id) REFERENCES tb_steam_apps(steam_app_id),
+    FOREIGN KEY (game_title) REFERENCES tb_steam_apps(game_title)
+);
+
+-- Table to hold the state of the last Steam app catalogue sync.
+CREATE TABLE IF NOT EXISTS tb_catalogue_state(
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    content_hash VARCHAR(16) NOT NULL,
+    app_count INTEGER NOT NULL,
+    synced_at TIMESTAMP NOT NULL
+);
+"""
+
+_initial_triggers = """
+-- Trigger to add games to the autocomplete table when owned games are added.
+CREATE TRIGGER IF NOT EXISTS tr_add_games_autocomplete
+AFTER INSERT ON tb_owned_games
+BEGIN
+    INSERT OR IGNORE INTO tb_games_autocomplete (steam_app_id, game_title)
+    SELECT NEW.steam_app_id, game_title
+    FROM tb_steam_apps
+    WHERE tb_steam_apps.steam_app_id = NEW.steam_app_id;
+END;
+
+-- Trigger to remove games in the autocomplete table when owned games are deleted.
+CREATE TRIGGER IF NOT EXISTS tr_remove_games_autocomplete
+AFTER DELETE ON tb_owned_games
+BEGIN
+    DELETE FROM tb_games_autocomplete
+    WHERE steam_app_id = OLD.steam_app_id
+    AND NOT EXISTS (
+        SELECT 1 FROM tb_owned_games
+        WHERE steam_app_id = OLD.steam_app_id
+    );
+END;
+
+-- Trigger to cascade user deletions to owned games.
+CREATE TRIGGER IF NOT EXISTS tr_remove_owned_games
+BEFORE DELETE ON tb_users
+BEGIN
+    DELETE FROM tb_owned_games WHERE steam_user_id = OLD.steam_user_id;
+END;
+"""
+
+
+def _initial_schema(connection: Connection) -> None:
+    """
+    Creates the initial schema. Databases created before the schema was versioned already have most of these tables,
+    so every statement is conditional, and an owned games table still in the unversioned layout (keyed on an
+    autoincrement ID) has its rows deduplicated into the new layout.
+    """
+
+    columns = [column[1] for column in connection.execute('PRAGMA table_info(tb_owned_games)').fetchall()]
+    is_unversioned = 'id' in columns
+
+    # Dropping the triggers that reference the old table, they are recreated below.
+    if is_unversioned:
+        for trigger in ['tr_add_games_autocomplete', 'tr_remove_games_autocomplete', 'tr_remove_owned_games']:
+            connection.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+
+        connection.execute('ALTER TABLE tb_owned_games RENAME TO tb_owned_games_unversioned')
+
+    for statement in split_script(_initial_tables):
+        connection.execute(statement)
+
+    if is_unversioned:
+        connection.execute(
+            '''
+            INSERT OR IGNORE INTO tb_owned_games (steam_user_id, steam_app_id)
+            SELECT steam_user_id, steam_app_id FROM tb_owned_games_unversioned
+            '''
+        )
+        connection.execute('DROP TABLE tb_owned_games_unversioned')
+
+    for statement in split_script(_initial_triggers):
+        connection.execute(statement)
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, 'Initial schema, with tb_owned_games keyed on (steam_user_id, steam_app_id)', function=_initial_schema),
+    Migration(
+        2,
+        'Maintain tb_games_autocomplete in bulk instead of with per-row triggers',
+        script="""
+        DROP TRIGGER IF EXISTS tr_add_games_autocomplete;
+        DROP TRIGGER IF EXISTS tr_remove_games_autocomplete;
+        """
+    ),
+    Migration(
+        3,
+        'Track when each library was last scanned',
+        script="""
+        ALTER TABLE tb_users ADD COLUMN library_scanned_at TIMESTAMP;
+        CREATE INDEX IF NOT EXISTS ix_users_library_scanned_at ON tb_users(library_scanned_at);
+        """
+    ),
+    Migration(
+        4,
+        'Persist resolved vanity URLs',
+        script="""
+        CREATE TABLE IF NOT EXISTS tb_vanity_urls(
+            vanity_name VARCHAR(32) PRIMARY KEY,
+            steam_user_id VARCHAR(17) NOT NULL,
+            expires_at REAL NOT NULL
+        ) WITHOUT ROWID;
+        """
+    ),
+    Migration(
+        5,
+        'Search indexes over tb_games_autocomplete',
+        script="""
+        CREATE INDEX IF NOT EXISTS ix_games_autocomplete_title_nocase
+        ON tb_games_autocomplete(game_title COLLATE NOCASE);
+
+        CREATE VIRTUAL TABLE IF NOT EXISTS tb_games_search USING fts5(
+            game_title,
+            content='tb_games_autocomplete',
+            content_rowid='steam_app_id',
+            tokenize='trigram'
+        );
+
+        CREATE TRIGGER IF NOT EXISTS tr_games_search_insert
+        AFTER INSERT ON tb_games_autocomplete
+        BEGIN
+            INSERT INTO tb_games_search (rowid, game_title) VALUES (NEW.steam_app_id, NEW.game_title);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS tr_games_search_delete
+        AFTER DELETE ON tb_games_autocomplete
+        BEGIN
+            INSERT INTO tb_games_search (tb_games_search, rowid, game_title)
+            VALUES ('delete', OLD.steam_app_id, OLD.game_title);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS tr_games_search_update
+        AFTER UPDATE OF game_title ON tb_games_autocomplete
+        BEGIN
+            INSERT INTO tb_games_search (tb_games_search, rowid, game_title)
+            VALUES ('delete', OLD.steam_app_id, OLD.game_title);
+            INSERT INTO tb_games_search (rowid, game_title) VALUES (NEW.steam_app_id, NEW.game_title);
+        END;
+
+        INSERT INTO tb_games_search (tb_games_search) VALUES ('rebuild');
+        """
+    ),
+    Migration(
+        6,
+        'Persisted ownership index, stamped with the version of tb_owned_games it reflects',
+        script="""
+        CREATE TABLE IF NOT EXISTS tb_ownership_index(
+            steam_app_id INTEGER PRIMARY KEY,
+            is_bitmap BOOLEAN NOT NULL,
+            owners BLOB NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS tb_owned_games_version(
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL,
+            indexed_version INTEGER
+        );
+
+        INSERT OR IGNORE INTO tb_owned_games_version (id, version, indexed_version) VALUES (1, 0, NULL);
+
+        CREATE TRIGGER IF NOT EXISTS tr_owned_games_version_user_insert
+        AFTER INSERT ON tb_users
+        BEGIN
+            UPDATE tb_owned_games_version SET version = version + 1;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS tr_owned_games_version_user_update
+        AFTER UPDATE OF steam_user_id ON tb_users
+        BEGIN
+            UPDATE tb_owned_games_version SET version = version + 1;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS tr_owned_games_version_user_delete
+        AFTER DELETE ON tb_users
+        BEGIN
+            UPDATE tb_owned_games_version SET version = version + 1;
+        END;
+        """
+    ),
+    Migration(
+        7,
+        'Track the size of each library',
+        script="""
+        ALTER TABLE tb_users ADD COLUMN library_size INTEGER NOT NULL DEFAULT 0;
+
+        UPDATE tb_users SET library_size = (
+            SELECT COUNT(*) FROM tb_owned_games WHERE tb_owned_games.steam_user_id = tb_users.steam_user_id
+        );
+
+        CREATE TRIGGER IF NOT EXISTS tr_users_library_size_insert
+        AFTER INSERT ON tb_users
+        BEGIN
+            UPDATE tb_users SET library_size = (
+                SELECT COUNT(*) FROM tb_owned_games WHERE tb_owned_games.steam_user_id = NEW.steam_user_id
+            )
+            WHERE id = NEW.id;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS tr_users_library_size_update
+        AFTER UPDATE OF steam_user_id ON tb_users
+        BEGIN
+            UPDATE tb_users SET library_size = (
+                SELECT COUNT(*) FROM tb_owned_games WHERE tb_owned_games.steam_user_id = NEW.steam_user_id
+            )
+            WHERE id = NEW.id;
+        END;
+        """
+    ),
+    Migration(
+        8,
+        'Cache the row count of the largest tables',
+        script="""
+        CREATE TABLE IF NOT EXISTS tb_row_counts(
+            table_name VARCHAR(32) PRIMARY KEY,
+            row_count INTEGER NOT NULL
+        ) WITHOUT ROWID;
+
+        INSERT INTO tb_row_counts (table_name, row_count)
+        SELECT 'tb_steam_apps', COUNT(*) FROM tb_steam_apps
+        UNION ALL SELECT 'tb_users', COUNT(*) FROM tb_users
+        UNION ALL SELECT 'tb_owned_games', COUNT(*) FROM tb_owned_games
+        UNION ALL SELECT 'tb_games_autocomplete', COUNT(*) FROM tb_games_autocomplete;
+
+        -- Users are counted by triggers, the other tables are counted in bulk by the code writing to them.
+        CREATE TRIGGER IF NOT EXISTS tr_row_counts_user_insert
+        AFTER INSERT ON tb_users
+        BEGIN
+            UPDATE tb_row_counts SET row_count = row_count + 1 WHERE table_name = 'tb_users';
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS tr_row_counts_user_delete
+        AFTER DELETE ON tb_users
+        BEGIN
+            UPDATE tb_row_counts SET row_count = row_count - 1 WHERE table_name = 'tb_users';
+        END;
+        """
+    ),
+    Migration(
+        9,
+        'Track the unfinished bulk library scan, so it can be resumed',
+        script="""
+        CREATE TABLE IF NOT EXISTS tb_library_scan(
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            started_at TIMESTAMP NOT NULL
+        );
+        """
+    ),
+    Migration(
+        10,
+        'Drop the full-text index of owned game titles, searched in memory by the title index instead',
+        script="""
+        DROP TRIGGER IF EXISTS tr_games_search_insert;
+        DROP TRIGGER IF EXISTS tr_games_search_delete;
+        DROP TRIGGER IF EXISTS tr_games_search_update;
+        DROP TABLE IF EXISTS tb_games_search;
+        """
+    ),
+]
+"""
+Every schema migration, in version order. New migrations must be appended with the next version, released migrations
+must never be edited.
+"""
+
+BACKFILLS: List[Backfill] = []
+"""
+Every data backfill, in the order they are run.
+"""
+
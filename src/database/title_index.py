@@ -0,0 +1,331 @@
+import math
+import sys
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+
+def _trigrams(key: str) -> Set[str]:
+    """
+    Splits a casefolded title into trigrams. Each word is padded with two spaces before it and one after it, so the
+    start and end of words carry extra weight, which keeps short words with a typo similar to the intended word.
+
+    :return: The set of trigrams in the title.
+    """
+
+    trigrams = set()
+    for word in key.split():
+        padded = f'  {word} '
+        trigrams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+
+    return trigrams
+
+
+def _word_starts(key: str) -> List[int]:
+    """
+    :return: The offset of every word in a casefolded title, other than the first word.
+    """
+
+    return [i for i in range(1, min(len(key), 256)) if key[i - 1] == ' ' and key[i] != ' ']
+
+
+class TitleIndex:
+    """
+    Compact in-memory index of game titles, answering autocomplete queries without touching the database.
+
+    Titles are stored once, interned, in a list of slots, and every other structure refers to titles by slot number in
+    packed arrays:
+
+    - the slots sorted by casefolded title, binary searched to find titles starting with a term,
+    - the starts of every later word in every title, packed as (slot << 8 | offset) and sorted by the text from that
+      offset, binary searched to find titles with a word starting with a term,
+    - a posting array of slots per trigram, used for fuzzy matching when a term has a typo.
+
+    Casefolded titles are never stored, they are recomputed for the handful of titles each comparison touches. Removed
+    titles leave an empty slot behind, which is skipped by every query and reclaimed when the index is rebuilt.
+    """
+
+    max_fuzzy_candidates: int = 1000
+    """
+    The maximum number of titles scored by a fuzzy query, bounding its cost for very common trigrams.
+    """
+
+    fuzzy_threshold: float = 0.4
+    """
+    The share of the trigrams of a term a title must contain to be a fuzzy match.
+    """
+
+    def __init__(self, games: Iterable[Tuple[int, str]] = ()) -> None:
+        """
+        Constructor for the TitleIndex class.
+
+        :param games: The (Steam App ID, game title) pairs to index.
+        """
+
+        self._titles: List[str | None] = []
+        """
+        The title in each slot, None if the title was removed.
+        """
+
+        self._app_ids: array = array('q')
+        """
+        The Steam App ID in each slot.
+        """
+
+        self._removed: int = 0
+        """
+        The number of empty slots.
+        """
+
+        for steam_app_id, game_title in games:
+            self._titles.append(sys.intern(game_title))
+            self._app_ids.append(steam_app_id)
+
+        keys = [title.casefold() for title in self._titles]
+
+        self._order: array = array('I', sorted(range(len(keys)), key=keys.__getitem__))
+        """
+        The slots of every title, sorted by casefolded title.
+        """
+
+        word_starts = [(slot << 8) | offset for slot, key in enumerate(keys) for offset in _word_starts(key)]
+        word_starts.sort(key=lambda entry: keys[entry >> 8][entry & 0xFF:])
+        self._word_starts: array = array('Q', word_starts)
+        """
+        The (slot << 8 | offset) of the start of every later word of every title, sorted by the text from the offset.
+        """
+
+        self._postings: Dict[str, array] = {}
+        """
+        The slots of the titles containing each trigram.
+        """
+
+        for slot, key in enumerate(keys):
+            self._add_postings(slot, key)
+
+    def __len__(self) -> int:
+        return len(self._titles) - self._removed
+
+    def __iter__(self) -> Iterator[Tuple[int, str]]:
+        """
+        :return: An iterator of the (Steam App ID, game title) pairs in the index.
+        """
+
+        for slot, title in enumerate(self._titles):
+            if title is not None:
+                yield self._app_ids[slot], title
+
+    def _key(self, slot: int) -> str:
+        return self._titles[slot].casefold()
+
+    def _word_key(self, entry: int) -> str:
+        return self._titles[entry >> 8].casefold()[entry & 0xFF:]
+
+    def _add_postings(self, slot: int, key: str) -> None:
+        for trigram in _trigrams(key):
+            postings = self._postings.get(trigram)
+            if postings is None:
+                postings = self._postings[sys.intern(trigram)] = array('I')
+            postings.append(slot)
+
+    def _find(self, steam_app_id: int, key: str) -> Tuple[int, int | None]:
+        """
+        Finds the slot of a title among the titles that casefold to the same key.
+
+        :return: The position of the title in the sorted slots and its slot, or the position it would be inserted at
+        and None if it is not in the index.
+        """
+
+        position = bisect_left(self._order, key, key=self._key)
+        while position < len(self._order) and self._key(self._order[position]) == key:
+            slot = self._order[position]
+            if self._app_ids[slot] == steam_app_id:
+                return position, slot
+            position += 1
+
+        return position, None
+
+    def add(self, steam_app_id: int, game_title: str) -> bool:
+        """
+        Adds a title to the index.
+
+        :return: True if the title was added, False if it was already in the index.
+        """
+
+        key = game_title.casefold()
+        position, slot = self._find(steam_app_id, key)
+        if slot is not None:
+            return False
+
+        slot = len(self._titles)
+        self._titles.append(sys.intern(game_title))
+        self._app_ids.append(steam_app_id)
+        self._order.insert(position, slot)
+
+        for offset in _word_starts(key):
+            insort(self._word_starts, (slot << 8) | offset, key=self._word_key)
+
+        self._add_postings(slot, key)
+        return True
+
+    def remove(self, steam_app_id: int, game_title: str) -> bool:
+        """
+        Removes a title from the index.
+
+        :return: True if the title was removed, False if it was not in the index.
+        """
+
+        key = game_title.casefold()
+        position, slot = self._find(steam_app_id, key)
+        if slot is None:
+            return False
+
+        for offset in _word_starts(key):
+            entry = (slot << 8) | offset
+            word_position = bisect_left(self._word_starts, key[offset:], key=self._word_key)
+            while self._word_starts[word_position] != entry:
+                word_position += 1
+            del self._word_starts[word_position]
+
+        del self._order[position]
+        self._titles[slot] = None
+        self._removed += 1
+        return True
+
+    def apply(self, added: Iterable[Tuple[int, str]], removed: Iterable[Tuple[int, str]]) -> None:
+        """
+        Applies a change to the owned games, removing titles before adding titles. Titles already added, or already
+        removed, are skipped, so a change can safely be applied to an index built after it was made.
+
+        :param added: The (Steam App ID, game title) pairs to add.
+        :param removed: The (Steam App ID, game title) pairs to remove.
+        """
+
+        for steam_app_id, game_title in removed:
+            self.remove(steam_app_id, game_title)
+
+        for steam_app_id, game_title in added:
+            self.add(steam_app_id, game_title)
+
+    def _prefix_slots(self, term: str, limit: int) -> List[int]:
+        """
+        :return: The slots of titles starting with the casefolded term, in alphabetical order.
+        """
+
+        slots = []
+        position = bisect_left(self._order, term, key=self._key)
+
+        while len(slots) < limit and position < len(self._order):
+            slot = self._order[position]
+            if not self._key(slot).startswith(term):
+                break
+
+            slots.append(slot)
+            position += 1
+
+        return slots
+
+    def _word_prefix_slots(self, term: str, limit: int, found: Set[int]) -> List[int]:
+        """
+        :return: The slots of titles with a later word starting with the casefolded term, in alphabetical order of the
+        text from that word.
+        """
+
+        slots = []
+        position = bisect_left(self._word_starts, term, key=self._word_key)
+
+        while len(slots) < limit and position < len(self._word_starts):
+            entry = self._word_starts[position]
+            if not self._word_key(entry).startswith(term):
+                break
+
+            slot = entry >> 8
+            if slot not in found:
+                found.add(slot)
+                slots.append(slot)
+
+            position += 1
+
+        return slots
+
+    def _fuzzy_slots(self, term: str, limit: int, found: Set[int]) -> List[int]:
+        """
+        :return: The slots of titles sharing at least fuzzy_threshold of the trigrams of the casefolded term, most
+        shared trigrams first, then shortest first.
+        """
+
+        query = _trigrams(term)
+        if not query:
+            return []
+
+        # A title sharing at least min_shared of the trigrams must be in at least one of the rarest
+        # (len(query) - min_shared + 1) posting arrays, so only those are read.
+        min_shared = max(1, math.ceil(len(query) * self.fuzzy_threshold))
+        postings = sorted((self._postings.get(trigram, array('I')) for trigram in query), key=len)
+
+        candidates: Set[int] = set()
+        for posting in postings[:len(query) - min_shared + 1]:
+            candidates.update(posting[:self.max_fuzzy_candidates - len(candidates)])
+            if len(candidates) >= self.max_fuzzy_candidates:
+                break
+
+        # Counting the trigrams each candidate shares with the term, a set intersection per trigram.
+        shared = Counter()
+        for posting in postings:
+            shared.update(candidates.intersection(posting))
+
+        scored = [
+            (-count, len(self._titles[slot]), slot) for slot, count in shared.items()
+            if count >= min_shared and slot not in found and self._titles[slot] is not None
+        ]
+        scored.sort()
+        return [slot for _, _, slot in scored[:limit]]
+
+    def search(self, term: str, limit: int = 25, fuzzy: bool = True) -> List[Tuple[int, str]]:
+        """
+        Searches the index. Titles starting with the term come first, then titles with a later word starting with the
+        term. If neither matches, fuzzy matching is enabled, and the term is at least three characters long, titles
+        similar to the term are returned instead, so a typo still finds the intended game.
+
+        :param term: The text to search for, matched case-insensitively.
+        :param limit: The maximum number of games to return.
+        :param fuzzy: Should titles similar to the term be returned, to tolerate typos?
+        :return: A list of (Steam App ID, game title) pairs.
+        """
+
+        term = term.strip().casefold()
+        if not term or limit <= 0:
+            return []
+
+        slots = self._prefix_slots(term, limit)
+        found = set(slots)
+
+        if len(slots) < limit:
+            slots += self._word_prefix_slots(term, limit - len(slots), found)
+
+        if fuzzy and not slots and len(term) >= 3:
+            slots = self._fuzzy_slots(term, limit, found)
+
+        return [(self._app_ids[slot], self._titles[slot]) for slot in slots]
+
+    def memory_usage(self) -> int:
+        """
+        Estimates the memory used by the index, including the title strings.
+
+        :return: The size of the index in bytes.
+        """
+
+        size = sys.getsizeof(self._titles) + sys.getsizeof(self._postings)
+        size += sum(sys.getsizeof(title) for title in self._titles if title is not None)
+        size += sum(sys.getsizeof(packed) for packed in [self._app_ids, self._order, self._word_starts])
+        size += sum(sys.getsizeof(trigram) + sys.getsizeof(posting) for trigram, posting in self._postings.items())
+
+        return size
+
+    def bytes_per_title(self) -> float:
+        """
+        :return: The estimated memory used by the index per title, in bytes.
+        """
+
+        return self.memory_usage() / len(self) if len(self) else 0.0
@@ -20,11 +20,12 @@ class EnvironmentFile:
 
         if path:
             dotenv.load_dotenv(dotenv_path=path)
+            self.environment_variables = dotenv.dotenv_values(dotenv_path=path)
         else:
             dotenv.load_dotenv()
+            self.environment_variables = dotenv.dotenv_values()
 
         self.required_variables = required
-        self.environment_variables = dotenv.dotenv_values()
 
     def is_valid(self) -> bool:
         """
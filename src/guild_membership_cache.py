@@ -0,0 +1,121 @@
+import asyncio
+from typing import AbstractSet, Dict, Iterable, Set
+
+import discord
+
+
+class GuildMembershipCache:
+    """
+    Cache of the Discord IDs of the members of each guild, so that filtering lookups down to a guild costs a set
+    membership test per user, rather than iterating the guild's members on every query.
+
+    A guild's members are read once, the first time the guild is looked up, and the cache is then kept current by the
+    member join and leave events. Where the client does not cache members itself, fetch() requests the guild's members
+    from Discord instead, keeping only their IDs.
+    """
+
+    chunk_timeout: float = 60.0
+    """
+    The number of seconds to wait for Discord to send the members of a guild.
+    """
+
+    def __init__(self) -> None:
+        self._members: Dict[int, Set[str]] = {}
+        """
+        The Discord IDs of the members of each cached guild, keyed by guild ID.
+        """
+
+        self._requests: Dict[int, asyncio.Future] = {}
+        """
+        The member requests in progress, keyed by guild ID, shared by every lookup of the guild made meanwhile.
+        """
+
+    def __contains__(self, guild_id: int) -> bool:
+        return guild_id in self._members
+
+    def get(self, guild: discord.Guild) -> AbstractSet[str]:
+        """
+        Gets the members of a guild, reading them from the guild if the guild is not cached.
+
+        :param guild: The guild to get the members of.
+        :return: The Discord IDs of the guild's members. The cached set itself is returned, so it must not be kept
+        beyond the current query.
+        """
+
+        members = self._members.get(guild.id)
+        if members is None:
+            members = self._members[guild.id] = {str(member.id) for member in guild.members}
+
+        return members
+
+    async def fetch(self, guild: discord.Guild) -> AbstractSet[str]:
+        """
+        Gets the members of a guild, requesting them from Discord if the guild is not cached and the client has not
+        cached every member of the guild itself. The members are requested without being added to the client's member
+        cache, so only their IDs are kept. Lookups of the same guild while its members are requested share the request.
+
+        :param guild: The guild to get the members of.
+        :return: The Discord IDs of the guild's members. The cached set itself is returned, so it must not be kept
+        beyond the current query. If the members could not be requested, the members the client has cached, which are
+        not cached in turn.
+        """
+
+        members = self._members.get(guild.id)
+        if members is not None:
+            return members
+
+        if guild.chunked:
+            return self.get(guild)
+
+        # Sharing the request between the lookups of the guild, shielding it so a cancelled lookup does not cancel it
+        # for the others.
+        request = self._requests.get(guild.id)
+        if request is None:
+            request = self._requests[guild.id] = asyncio.ensure_future(
+                asyncio.wait_for(guild.chunk(cache=False), self.chunk_timeout)
+            )
+            request.add_done_callback(lambda _: self._requests.pop(guild.id, None))
+
+        try:
+            chunk = await asyncio.shield(request)
+        except (discord.ClientException, asyncio.TimeoutError) as error:
+            print(f'Could not request the members of guild {guild.id}: {error or "timed out"}')
+            return {str(member.id) for member in guild.members}
+
+        # Checking the cache again, another lookup of the guild may have cached the members while this one waited.
+        members = self._members.get(guild.id)
+        if members is None:
+            members = self._members[guild.id] = {str(member.id) for member in chunk or []}
+
+        return members
+
+    def set(self, guild_id: int, discord_ids: Iterable[str]) -> None:
+        """
+        Replaces the cached members of a guild.
+        """
+
+        self._members[guild_id] = set(discord_ids)
+
+    def add_member(self, guild_id: int, discord_id: str) -> None:
+        """
+        Records a member joining a guild. Does nothing if the guild is not cached yet, as the member will be read with
+        the rest of the guild.
+        """
+
+        if guild_id in self._members:
+            self._members[guild_id].add(discord_id)
+
+    def remove_member(self, guild_id: int, discord_id: str) -> None:
+        """
+        Records a member leaving a guild.
+        """
+
+        if guild_id in self._members:
+            self._members[guild_id].discard(discord_id)
+
+    def remove_guild(self, guild_id: int) -> None:
+        """
+        Forgets a guild, for example when the bot is removed from it.
+        """
+
+        self._members.pop(guild_id, None)
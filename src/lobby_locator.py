@@ -1,10 +1,19 @@
+import asyncio
+import datetime
+import signal
+import time
+from typing import List, Tuple
+
 import discord
 
 from discord.ext import commands, tasks
 
+from src.client_profile import TRIMMED_PROFILE, ClientProfile
 from src.environment import EnvironmentFile
-from src.database import DatabaseWrapper
-from src.steam import SteamAPIHandler
+from src.database import AsyncDatabaseWrapper, CatalogueDiff, DatabaseWrapper, TitleIndex
+from src.guild_membership_cache import GuildMembershipCache
+from src.startup_timer import StartupTimer
+from src.steam import AsyncSteamAPIHandler, BulkLibraryScan, CatalogueSnapshot, LibraryRefreshQueue, SnapshotStatus
 
 
 class LobbyLocator(commands.Bot):
@@ -12,30 +21,105 @@ class LobbyLocator(commands.Bot):
     Wrapper class for the discord.ext.commands.Bot class.
     """
 
-    def __init__(self, env_file: EnvironmentFile, database: DatabaseWrapper, steam_api: SteamAPIHandler):
+    warming_up_message: str = 'I am still loading the Steam app list, try again in a minute!'
+    """
+    The response to commands that need the Steam app list, while it is loaded for the first time.
+    """
+
+    def __init__(
+            self,
+            env_file: EnvironmentFile,
+            database: AsyncDatabaseWrapper,
+            steam_api: AsyncSteamAPIHandler,
+            catalogue_snapshot: CatalogueSnapshot,
+            startup_timer: StartupTimer | None = None,
+            client_profile: ClientProfile = TRIMMED_PROFILE
+    ):
         """
         Constructor for the LobbyLocator bot class.
 
         :param env_file: The EnvironmentFile object to attach to the bot.
-        :param database: The DatabaseWrapper object to attach to the bot.
-        :param steam_api: The SteamAPIHandler object to attach to the bot.
+        :param database: The AsyncDatabaseWrapper object to attach to the bot.
+        :param steam_api: The AsyncSteamAPIHandler object to attach to the bot.
+        :param catalogue_snapshot: The on-disk snapshot of the Steam app list, refreshed daily.
+        :param startup_timer: The timer of the startup phases so far, a new timer if not set.
+        :param client_profile: The gateway intents and caches to start the Discord client with.
         """
 
-        # TODO: Get proper intents, using all intents for development.
-        # Initializing the Discord intents.
-        intents = discord.Intents.all()
-
-        # Initializing parent class.
-        super().__init__(intents=intents)
+        # Initializing parent class, with the intents and caches of the client profile.
+        super().__init__(**client_profile.client_options())
+        self.client_profile: ClientProfile = client_profile
 
         # Setting object values.
         self.env_file = env_file
         self.database = database
         self.steam_api = steam_api
+        self.catalogue_snapshot = catalogue_snapshot
+        self.startup_timer: StartupTimer = startup_timer or StartupTimer()
+
+        self.catalogue_ready: asyncio.Event = asyncio.Event()
+        """
+        Set once the Steam apps table has been populated. Until then, commands that need the Steam app list answer with
+        the warming up message. Libraries are still scanned meanwhile, their games reach the autocomplete table once the
+        apps are synced. Set from the start when the table was populated by a previous run, in which case the startup
+        sync only refreshes it.
+        """
+
+        if database.writer.get_row_count('tb_steam_apps') > 0:
+            self.catalogue_ready.set()
+
+        self.library_refresh_queue = LibraryRefreshQueue(steam_api, database)
+        """
+        Queue of Steam libraries waiting to be rescanned in the background.
+        """
+
+        self.bulk_library_scan = BulkLibraryScan(steam_api, database)
+        """
+        Rescans every registered library at once, several libraries at a time.
+        """
+
+        self._backfill_task: asyncio.Task | None = None
+        """
+        The task running the pending data backfills, if any.
+        """
+
+        self._library_scan_task: asyncio.Task | None = None
+        """
+        The task running the bulk library scan, if any.
+        """
+
+        self._warm_up_task: asyncio.Task | None = None
+        """
+        The task syncing the Steam app list and starting the background work after the first login, if started.
+        """
+
+        # Reading the titles and the ownership index before the event loop starts, through the writer directly.
+        self.title_index: TitleIndex = TitleIndex(database.writer.get_autocomplete_games())
+        """
+        In-memory index of owned game titles, answering autocomplete queries without touching the database.
+        """
+
+        self._title_index_changes: List[Tuple[List[Tuple[int, str]], List[Tuple[int, str]]]] | None = None
+        """
+        The owned game changes made while a replacement title index is being built, None if no index is being built.
+        """
+
+        database.add_autocomplete_listener(self._on_autocomplete_changed)
+
+        # Loading the ownership index persisted at the last shutdown, only rebuilding it if the owned games changed.
+        if database.writer.load_ownership_index():
+            print('Loaded the persisted ownership index.')
+        else:
+            print('Rebuilt the ownership index from the owned games.')
+
+        self.guild_members = GuildMembershipCache()
+        """
+        Cache of the Discord IDs of the members of each guild.
+        """
 
     def load_cogs(self, cogs: [str]) -> int:
         """
-        Loads cogs for the LobbyLocator bot at runtime.
+        Loads cogs for the LobbyLocator bot at runtime, timing each cog for the startup report.
 
         :param cogs: A list of dot-qualified import paths for each cog to load.
         :return int: Number of cogs that were successfully loaded.
@@ -45,7 +129,9 @@ class LobbyLocator(commands.Bot):
 
         for cog in cogs:
             try:
-                if self.load_extension(cog, store=True):
+                with self.startup_timer.cog(cog):
+                    loaded = self.load_extension(cog, store=True)
+                if loaded:
                     print(f'Successfully loaded extension: {cog}.')
                     loaded_cogs += 1
             except discord.ExtensionNotFound:
@@ -59,6 +145,136 @@ class LobbyLocator(commands.Bot):
 
         return loaded_cogs
 
+    def _on_autocomplete_changed(self, added: List[Tuple[int, str]], removed: List[Tuple[int, str]]) -> None:
+        """
+        Keeps the title index in step with the owned games.
+        """
+
+        self.title_index.apply(added, removed)
+
+        if self._title_index_changes is not None:
+            self._title_index_changes.append((added, removed))
+
+    async def rebuild_title_index(self) -> None:
+        """
+        Rebuilds the title index from the database in a worker thread, then swaps it in. Owned game changes made while
+        the index is built are replayed onto it before the swap, so none are lost. Changes are recorded from before the
+        titles are read, as a change already read may still be waiting to reach the listener, and replaying it again is
+        harmless.
+        """
+
+        self._title_index_changes = []
+        try:
+            games = await self.database.get_autocomplete_games()
+            title_index = await asyncio.to_thread(TitleIndex, games)
+
+            for added, removed in self._title_index_changes:
+                title_index.apply(added, removed)
+        finally:
+            self._title_index_changes = None
+
+        self.title_index = title_index
+        print(
+            f'Rebuilt the title index: {len(title_index)} titles, '
+            f'{title_index.bytes_per_title():.0f} bytes per title.'
+        )
+
+    def report_query_statistics(self, limit: int = 10) -> None:
+        """
+        Prints the database statements that took the most time since the last report, then starts counting afresh.
+        Also printed on SIGUSR1, where the platform supports it, to inspect a running bot.
+
+        :param limit: The number of statements to print.
+        """
+
+        statistics = self.database.writer.connection.statistics
+        if statistics is None:
+            return
+
+        print(statistics.report(limit))
+        statistics.reset()
+
+    async def refresh_catalogue(self) -> None:
+        """
+        Refreshes the snapshot of the Steam app list, which is only downloaded if it changed, then syncs the games table
+        from the snapshot on the writer thread, so the sync never blocks the event loop. The snapshot stands in for
+        Steam while it is unreachable, so the games table is populated even during Steam maintenance.
+        """
+
+        snapshot_status = await self.steam_api.download_app_list(self.catalogue_snapshot)
+        if snapshot_status == SnapshotStatus.FAILED:
+            if self.catalogue_snapshot.exists():
+                print(
+                    'Could not refresh the app list, keeping the last snapshot. Steam API may be down for maintenance.'
+                )
+            else:
+                print('Could not obtain the app list. Steam API may be down for maintenance, try again later.')
+
+        try:
+            catalogue_diff = await self.database.run_write(self._apply_catalogue_snapshot, self.catalogue_snapshot)
+
+            # Mapping the new snapshot, the previous one is unmapped once no lookup still holds it.
+            if snapshot_status == SnapshotStatus.UPDATED or (
+                    self.database.writer.catalogue is None and self.catalogue_snapshot.exists()
+            ):
+                self.database.writer.catalogue = self.catalogue_snapshot.open()
+        except (OSError, ValueError) as error:
+            print(f'Could not sync the app list from the snapshot: {error}')
+            catalogue_diff = None
+
+        if catalogue_diff is None:
+            if snapshot_status != SnapshotStatus.FAILED:
+                print(f'The Steam app list has not changed since the last sync ({snapshot_status.value}).')
+        else:
+            print(
+                f'Synced the Steam app list: {catalogue_diff.added} added, {catalogue_diff.renamed} renamed, '
+                f'{catalogue_diff.removed} removed, {catalogue_diff.skipped_renames} rename(s) skipped.'
+            )
+
+            # Rebuilding the title index, picking up renamed titles and reclaiming the slots of removed titles.
+            await self.rebuild_title_index()
+
+        # Opening the commands that need the Steam app list once the games table is populated.
+        if not self.catalogue_ready.is_set():
+            if await self.database.get_row_count('tb_steam_apps') > 0:
+                self.catalogue_ready.set()
+            else:
+                print('The Steam apps table is still empty, the commands that need it wait for the next sync.')
+
+    @staticmethod
+    def _apply_catalogue_snapshot(
+            database: DatabaseWrapper,
+            catalogue_snapshot: CatalogueSnapshot
+    ) -> CatalogueDiff | None:
+        """
+        Applies the snapshot to the games table, even if it already has been when the table is empty, such as when a
+        new database is pointed at an existing snapshot.
+        """
+
+        return catalogue_snapshot.apply(database, force=database.get_row_count('tb_steam_apps') == 0)
+
+    async def warm_up(self) -> None:
+        """
+        Syncs the Steam app list, then starts the library workers and the background task loops, even if the sync
+        failed, in which case the daily task retries it. Runs in the background after the first login, so the bot
+        answers commands while the app list is downloaded and synced.
+        """
+
+        with self.startup_timer.phase('catalogue sync'):
+            await self.refresh_catalogue()
+
+        # Starting the library workers and background task loops, which are only started once.
+        self.library_refresh_queue.start()
+        self.library_sweep.start()
+        self.daily_background_tasks.start()
+        self.resume_library_scan.start()
+
+        # Resuming a bulk library scan interrupted by a crash or restart.
+        if await self.database.get_library_scan() is not None:
+            self.rescan_all_libraries()
+
+        self.startup_timer.finish()
+
     @tasks.loop(hours=24)
     async def daily_background_tasks(self):
         """
@@ -66,16 +282,125 @@ class LobbyLocator(commands.Bot):
         """
 
         print('Running daily background tasks...')
+        print(
+            f'Steam API usage: {self.steam_api.rate_limiter.metrics.as_dict()}, '
+            f'{self.steam_api.rate_limiter.budget.remaining} call(s) left in the daily budget.'
+        )
+        print(
+            f'Vanity URL cache: {self.steam_api.vanity_url_cache.stats()}, '
+            f'Steam ID cache: {self.steam_api.id_validator.cache.stats()}.'
+        )
+        print(f'Database row counts: {await self.database.get_row_counts()}.')
+
+        # Removing expired vanity URLs from the database.
+        await self.database.purge_vanity_urls(time.time())
+
+        # Refreshing the Steam app list, the first run follows the warm up, which has just refreshed it.
+        if self.daily_background_tasks.current_loop > 0:
+            await self.refresh_catalogue()
+
+        # Persisting the ownership index, so a restart after a crash does not need to rebuild it.
+        print(f'Saved the ownership index: {await self.database.save_ownership_index()} game(s) written.')
 
-        # Refreshing the Steam app list.
-        self.database.update_steam_apps_table(self.steam_api.fetch_app_list())
+        self.report_query_statistics()
+
+    @tasks.loop(hours=1)
+    async def library_sweep(self):
+        """
+        Queues a rescan of the libraries that have not been rescanned for a week, a batch at a time.
+        """
+
+        queued = await self.library_refresh_queue.sweep(max_age=7 * 24 * 60 * 60, limit=50)
+        if queued:
+            print(f'Queued {queued} stale Steam library(s) for a rescan.')
+
+    @tasks.loop(time=datetime.time(0, 5, tzinfo=datetime.timezone.utc))
+    async def resume_library_scan(self):
+        """
+        Resumes the unfinished bulk library scan every day, shortly after the daily Steam API budget resets at midnight
+        UTC, so a scan stopped by the budget running out continues the next day rather than after the next restart.
+        """
+
+        if await self.database.get_library_scan() is not None:
+            print('Resuming the bulk library scan now the daily Steam API budget has reset.')
+            self.rescan_all_libraries()
+
+    def rescan_all_libraries(self) -> bool:
+        """
+        Starts rescanning every registered library in the background, or resumes the unfinished rescan. New scans are
+        started by the bot owner with /steam rescan-all, unfinished scans are resumed on startup and by the daily
+        resume_library_scan() task.
+
+        :return: True if the rescan was started, False if a rescan is already running.
+        """
+
+        if self._library_scan_task is not None and not self._library_scan_task.done():
+            return False
+
+        self._library_scan_task = asyncio.create_task(self.bulk_library_scan.scan_all())
+        return True
+
+    async def close(self):
+        """
+        Closes the connection to Discord, the library refresh workers and the pooled Steam API session, persists the
+        ownership index and waits for the database threads to finish. Overrides the commands.Bot.close() method. A
+        bulk library scan that is still running is cancelled, and resumes on the next start.
+        """
+
+        for task in (self._warm_up_task, self._library_scan_task):
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+        await self.library_refresh_queue.stop()
+        await self.steam_api.close()
+        await self.database.save_ownership_index()
+        await self.database.close()
+        self.report_query_statistics()
+        await super().close()
 
     async def on_ready(self):
         """
         The on_ready event for the Discord Bot class.
         """
 
-        # Starting background task loops.
-        self.daily_background_tasks.start()
+        # Syncing the Steam app list in the background, then starting the background work, after the first login
+        # only, as on_ready can be called again after a reconnect.
+        if self._warm_up_task is None:
+            self.startup_timer.mark('discord login')
+            print(f'Online after {self.startup_timer.elapsed():.2f}s, syncing the Steam app list in the background.')
+            self._warm_up_task = asyncio.create_task(self.warm_up())
+
+        # Printing the query statistics on demand, signal handlers are only supported on Unix event loops.
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, self.report_query_statistics)
+        except (AttributeError, NotImplementedError):
+            pass
+
+        # Running any pending data backfills in the background, a chunk at a time.
+        if self._backfill_task is None:
+            self._backfill_task = asyncio.create_task(self.database.run_backfills())
 
         print(f'Logged in as user {self.user}.')
+
+    async def on_member_join(self, member: discord.Member):
+        """
+        The on_member_join event for the Discord Bot class.
+        """
+
+        self.guild_members.add_member(member.guild.id, str(member.id))
+
+    async def on_raw_member_remove(self, payload: discord.RawMemberRemoveEvent):
+        """
+        The on_raw_member_remove event for the Discord Bot class. Handled rather than on_member_remove, which is only
+        dispatched for members the client has cached, and the trimmed client profile caches none.
+        """
+
+        self.guild_members.remove_member(payload.guild_id, str(payload.user.id))
+
+    async def on_guild_remove(self, guild: discord.Guild):
+        """
+        The on_guild_remove event for the Discord Bot class.
+        """
+
+        self.guild_members.remove_guild(guild.id)
@@ -1,64 +1,126 @@
+import asyncio
 import os
 
-from environment import EnvironmentFile
-from database import DatabaseWrapper
-from src.database import create_connection
+# Importing everything through the src package, as importing a package both as src.database and as database would load
+# and run it twice.
+from src.client_profile import CLIENT_PROFILES
+from src.environment import EnvironmentFile
+from src.database import PRODUCTION_PROFILE, AsyncDatabaseWrapper, DatabaseWrapper, QueryStatistics, create_connection
 from src.lobby_locator import LobbyLocator
+from src.startup_timer import StartupTimer
+from src.steam import AsyncSteamAPIHandler, CatalogueSnapshot, RateLimiter, create_vanity_url_cache
 
-from steam import SteamAPIHandler
 
+def main(startup_timer: StartupTimer | None = None, env_path: str | None = None, log_in: bool = True):
+    """
+    Starts the bot.
 
-def main():
+    :param startup_timer: The timer of the startup phases, a new timer if not set. Passed in by the startup profiler,
+    which times the imports before this module is imported.
+    :param env_path: The path to the .env file, found automatically if not set.
+    :param log_in: Should the bot log into Discord? If not, the bot is built then closed, to profile a start without
+    connecting to Discord.
+    """
+
+    # Timing each startup phase, the phases after the Discord login are timed by the bot.
+    startup_timer = startup_timer or StartupTimer()
 
     # Validating the environment variables.
-    env_file = EnvironmentFile(['DISCORD_BOT_TOKEN', 'STEAM_API_KEY', 'DB_CONNECTION_STRING'])
+    with startup_timer.phase('environment'):
+        env_file = EnvironmentFile(['DISCORD_BOT_TOKEN', 'STEAM_API_KEY', 'DB_CONNECTION_STRING'], env_path)
     if not env_file.is_valid():
         print('The .env file failed validation, aborting bot startup...')
         quit()
 
-    # Attempting to connect to the SQL database.
-    with create_connection(env_file.environment_variables.get('DB_CONNECTION_STRING')) as connection:
-        if not connection:
-            print('Encountered an error while attempting to connect to the SQL database, aborting bot startup...')
-            quit()
-
-        database = DatabaseWrapper(connection)
-
-    # Creating the database tables.
-    if database.create_tables():
-        print('Successfully created database tables.')
-    else:
-        print('Could not create the database tables, aborting bot startup...')
+    # Choosing the gateway intents and caches of the Discord client, the trimmed profile by default.
+    client_profile_name = env_file.environment_variables.get('DISCORD_CLIENT_PROFILE') or 'trimmed'
+    client_profile = CLIENT_PROFILES.get(client_profile_name)
+    if client_profile is None:
+        print(f'DISCORD_CLIENT_PROFILE must be one of {", ".join(CLIENT_PROFILES)}, aborting bot startup...')
         quit()
 
-    # Creating the database triggers.
-    if database.create_triggers():
-        print('Successfully created database triggers.')
-    else:
-        print('Could not create the database triggers, aborting bot startup...')
+    # Attempting to connect to the SQL database, the connection is handed to the database writer thread once the bot
+    # starts.
+    connection_string = env_file.environment_variables.get('DB_CONNECTION_STRING')
+    with startup_timer.phase('database connection'):
+        connection = create_connection(connection_string, PRODUCTION_PROFILE, check_same_thread=False)
+    if not connection:
+        print('Encountered an error while attempting to connect to the SQL database, aborting bot startup...')
         quit()
 
-    # Instantiating Steam API Handler.
-    steam_api = SteamAPIHandler(env_file.environment_variables.get('STEAM_API_KEY'))
+    database = DatabaseWrapper(connection)
+    print(f'Database writer connection settings: {connection.settings()}.')
 
-    # Populating the games table.
-    steam_apps = steam_api.fetch_app_list()
-    if len(steam_apps) > 0:
-        print(f'Fetched {len(steam_apps)} app(s) from Steam.')
-    else:
-        print('Could not obtain the app list. Steam API may be down for maintenance, try again in a few minutes.')
+    # Timing every statement, logging those slower than DB_SLOW_QUERY_MS (100ms by default).
+    slow_query_ms = float(env_file.environment_variables.get('DB_SLOW_QUERY_MS') or 100)
+    connection.statistics = QueryStatistics(slow_query_threshold=slow_query_ms / 1000)
 
-    print(f'Inserted {database.update_steam_apps_table(steam_apps)} new app(s) into the database.')
+    # Migrating the database schema.
+    with startup_timer.phase('schema migration'):
+        migrated = database.migrate(verbose=True)
+    if migrated:
+        print(f'Database schema is at version {database.migrations.schema_version()}.')
+    else:
+        print('Could not migrate the database schema, aborting bot startup...')
+        quit()
 
-    # Getting the cog import paths.
+    # Running database queries on dedicated threads, so they never block the event loop. Opening the read-only
+    # connection of this thread up front, which the vanity URL cache reads through, to log its settings.
+    async_database = AsyncDatabaseWrapper(database)
+    print(
+        'Database reader connection settings: '
+        f'{async_database.read_now(lambda reader: reader.connection.settings())}.'
+    )
+
+    # Sharing a single rate limiter between every Steam API request, so they share the daily call budget of the API
+    # key. Resolved vanity URLs are persisted in the database, so the cache is warm after a restart. The cache can not
+    # await, so lookups are read on the calling thread and saves are queued on the writer thread.
+    rate_limiter = RateLimiter()
+    vanity_url_cache = create_vanity_url_cache(
+        lambda vanity_name: async_database.read_now(DatabaseWrapper.get_vanity_url, vanity_name),
+        lambda *vanity_url: async_database.write_later(DatabaseWrapper.set_vanity_url, *vanity_url)
+    )
+
+    # The snapshot of the app list is refreshed and synced into the games table by the bot, in the background once it
+    # has logged in, so neither a Steam download nor a Steam outage delays the bot coming online.
+    catalogue_snapshot = CatalogueSnapshot(
+        env_file.environment_variables.get('CATALOGUE_SNAPSHOT_PATH') or 'steam_app_list.catalogue'
+    )
+
+    # Memory-mapping the last snapshot, which reads nothing up front, so game titles are looked up without querying the
+    # database from the start.
+    if catalogue_snapshot.exists():
+        try:
+            database.catalogue = catalogue_snapshot.open()
+        except (OSError, ValueError) as error:
+            print(f'Could not map the app list snapshot: {error}')
+
+    # Getting the cog import paths, relative to this file so the bot can be started from any directory.
     cogs: [str] = []
-    for file in os.listdir('./cogs'):
+    for file in sorted(os.listdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cogs'))):
         if file.endswith('.py'):
-            cogs.append(f'cogs.{file.split(".py")[0]}')
-
-    # Initializing and starting the bot.
-    bot = LobbyLocator(env_file, database, steam_api)
-    bot.load_cogs(cogs)
+            cogs.append(f'src.cogs.{file.split(".py")[0]}')
+
+    # Initializing and starting the bot, the bot uses the non-blocking Steam API handler so that Steam requests do not
+    # stall the event loop.
+    async_steam_api = AsyncSteamAPIHandler(
+        env_file.environment_variables.get('STEAM_API_KEY'),
+        rate_limiter=rate_limiter,
+        vanity_url_cache=vanity_url_cache
+    )
+    with startup_timer.phase('indexes'):
+        bot = LobbyLocator(
+            env_file, async_database, async_steam_api, catalogue_snapshot, startup_timer, client_profile
+        )
+    with startup_timer.phase('cogs'):
+        bot.load_cogs(cogs)
+
+    if not log_in:
+        asyncio.run(async_database.close())
+        startup_timer.finish()
+        return
+
+    print(startup_timer.report())
     bot.run(env_file.environment_variables.get('DISCORD_BOT_TOKEN'))
 
 
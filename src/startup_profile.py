@@ -0,0 +1,62 @@
+"""
+Profiles a cold start of the bot: the import time of each module, the load time of each cog and the wall clock of each
+startup phase, written as a JSON report. By default the bot is built against the configured database without logging
+into Discord, and the start is checked against a budget, so a slower start is caught before a deploy. With --log-in the
+bot is started for real, and the report is written once the Steam app list has been synced.
+
+Usage: python -m src.startup_profile [--output startup_profile.json] [--env-file .env] [--budget 3.0] [--log-in]
+"""
+
+import argparse
+import sys
+
+from src.startup_timer import ImportTimer, StartupTimer
+
+DEFAULT_BUDGET_SECONDS: float = 3.0
+"""
+The cold start budget, from the first import until the cogs are loaded, with no Discord login.
+"""
+
+LAZY_MODULES: tuple[str, ...] = ('requests', 'src.steam.steam_api_handler')
+"""
+Modules the bot only imports on first use, which a start must not import.
+"""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Profiles a cold start of the bot.')
+    parser.add_argument('--output', default='startup_profile.json', help='Where to write the JSON report.')
+    parser.add_argument('--env-file', default=None, help='The path to the .env file, found automatically if not set.')
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET_SECONDS, help='The cold start budget, seconds.')
+    parser.add_argument('--log-in', action='store_true', help='Log into Discord, and keep the bot running.')
+    args = parser.parse_args()
+
+    # Timing the imports from before the bot is imported, the startup timer starts the clock at the first import.
+    import_timer = ImportTimer()
+    startup_timer = StartupTimer(import_timer=import_timer, report_path=args.output)
+    import_timer.install()
+    try:
+        with startup_timer.phase('imports'):
+            from src.main import main as start_bot
+    finally:
+        import_timer.uninstall()
+
+    start_bot(startup_timer, args.env_file, log_in=args.log_in)
+    if args.log_in:
+        return
+
+    failures = [f'{module} was imported, but should only be imported on first use.'
+                for module in LAZY_MODULES if module in sys.modules]
+    if startup_timer.elapsed() > args.budget:
+        failures.append(f'The start took {startup_timer.elapsed():.2f}s, over the budget of {args.budget:.2f}s.')
+
+    for failure in failures:
+        print(failure)
+
+    if failures:
+        sys.exit(1)
+
+
+# Import guard.
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+import builtins
+import importlib.util
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+
+class ImportTimer:
+    """
+    Times the first import of every module while installed, by wrapping the built-in __import__(), in the manner of
+    python -X importtime, but readable from the running process. Only imports made on the installing thread are timed.
+
+    Each module is timed once, the first time it is imported. Its cumulative time includes the modules it imported in
+    turn, its self time excludes them.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        """
+        Constructor for the ImportTimer class.
+
+        :param clock: Function returning a monotonic time in seconds, overridable for testing.
+        """
+
+        self._clock: Callable[[], float] = clock
+        self._original_import: Callable[..., Any] | None = None
+        self._thread_id: int | None = None
+
+        self._child_times: List[float] = []
+        """
+        The time spent importing the children of each module being imported, innermost module last.
+        """
+
+        self.imports: Dict[str, Tuple[float, float]] = {}
+        """
+        The self and cumulative import time in seconds of each module, keyed by module name, in import order.
+        """
+
+    def install(self) -> None:
+        """
+        Starts timing imports made on the calling thread.
+        """
+
+        if self._original_import is None:
+            self._original_import = builtins.__import__
+            self._thread_id = threading.get_ident()
+            builtins.__import__ = self._import
+
+    def uninstall(self) -> None:
+        """
+        Stops timing imports.
+        """
+
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def slowest(self, limit: int | None = None) -> List[Tuple[str, float, float]]:
+        """
+        :param limit: The number of modules to return, every module if not set.
+        :return: The (module name, self seconds, cumulative seconds) of the modules with the largest self time first.
+        """
+
+        slowest = sorted(self.imports.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+        return [(name, self_time, cumulative_time) for name, (self_time, cumulative_time) in slowest]
+
+    def _import(self, name: str, globals=None, locals=None, fromlist=(), level: int = 0):
+        original_import = self._original_import
+        if threading.get_ident() != self._thread_id:
+            return original_import(name, globals, locals, fromlist, level)
+
+        # Resolving relative imports, an import of a module that is already loaded is not timed.
+        try:
+            module_name = importlib.util.resolve_name('.' * level + name, (globals or {}).get('__package__'))
+        except (ImportError, ValueError):
+            module_name = name
+        if module_name in sys.modules or not module_name:
+            return original_import(name, globals, locals, fromlist, level)
+
+        self._child_times.append(0.0)
+        start = self._clock()
+        try:
+            return original_import(name, globals, locals, fromlist, level)
+        finally:
+            cumulative_time = self._clock() - start
+            child_time = self._child_times.pop()
+            if self._child_times:
+                self._child_times[-1] += cumulative_time
+            if module_name in sys.modules:
+                self.imports.setdefault(module_name, (cumulative_time - child_time, cumulative_time))
+
+
+class StartupTimer:
+    """
+    Records the wall-clock duration of each phase of the bot's startup, so a phase that regresses shows up in the
+    startup report rather than as a vague slower start.
+
+    Phases are either timed around a block with phase(), or, for phases that end in a callback, such as logging into
+    Discord, measured with mark() from the end of the previous phase. Loading each cog is timed with cog(), and the
+    module imports with an attached ImportTimer, for the machine-readable report of as_dict().
+    """
+
+    def __init__(
+            self,
+            clock: Callable[[], float] = time.perf_counter,
+            import_timer: ImportTimer | None = None,
+            report_path: str | None = None
+    ) -> None:
+        """
+        Constructor for the StartupTimer class, starting the clock.
+
+        :param clock: Function returning a monotonic time in seconds, overridable for testing.
+        :param import_timer: The timer of the module imports, to include in the report, if the imports are timed.
+        :param report_path: Where finish() writes the report as JSON, None to only print the report.
+        """
+
+        self._clock: Callable[[], float] = clock
+        self._started_at: float = clock()
+        self._last_mark: float = self._started_at
+        self.import_timer: ImportTimer | None = import_timer
+        self.report_path: str | None = report_path
+
+        self.phases: List[Tuple[str, float]] = []
+        """
+        The name and duration in seconds of each finished phase, in the order they finished.
+        """
+
+        self.cogs: List[Tuple[str, float]] = []
+        """
+        The import path and load time in seconds of each cog, in the order they were loaded.
+        """
+
+    def elapsed(self) -> float:
+        """
+        :return: The seconds since the timer was started.
+        """
+
+        return self._clock() - self._started_at
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Times the wrapped block as a phase. The phase is recorded even if the block raises.
+
+        :param name: The name of the phase.
+        """
+
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self._last_mark = self._clock()
+            self.phases.append((name, self._last_mark - start))
+
+    @contextmanager
+    def cog(self, name: str) -> Iterator[None]:
+        """
+        Times loading a cog, within the current phase.
+
+        :param name: The import path of the cog.
+        """
+
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.cogs.append((name, self._clock() - start))
+
+    def mark(self, name: str) -> float:
+        """
+        Records a phase lasting from the end of the previous phase, or the start of the timer, until now.
+
+        :param name: The name of the phase.
+        :return: The duration of the phase in seconds.
+        """
+
+        now = self._clock()
+        duration = now - self._last_mark
+        self._last_mark = now
+        self.phases.append((name, duration))
+        return duration
+
+    def report(self) -> str:
+        """
+        :return: A one line breakdown of the phases so far, and the time since the timer started.
+        """
+
+        phases = ', '.join(f'{name} {duration * 1000:.0f}ms' for name, duration in self.phases)
+        return f'Startup timings: {phases or "no phases"}; {self.elapsed():.2f}s since start.'
+
+    def as_dict(self, slowest_imports: int | None = None) -> Dict[str, Any]:
+        """
+        :param slowest_imports: The number of imports to include, those with the largest self time, every import if not
+        set.
+        :return: The report as a JSON serialisable dictionary: the seconds since start, every phase and cog load, and
+        the imports, slowest first, if the imports were timed.
+        """
+
+        report: Dict[str, Any] = {
+            'elapsed_seconds': self.elapsed(),
+            'phases': [{'name': name, 'seconds': duration} for name, duration in self.phases],
+            'cogs': [{'name': name, 'seconds': duration} for name, duration in self.cogs]
+        }
+
+        if self.import_timer is not None:
+            report['modules_imported'] = len(self.import_timer.imports)
+            report['imports'] = [
+                {'module': name, 'self_seconds': self_time, 'cumulative_seconds': cumulative_time}
+                for name, self_time, cumulative_time in self.import_timer.slowest(slowest_imports)
+            ]
+
+        return report
+
+    def finish(self) -> None:
+        """
+        Prints the report once startup has finished, and writes it as JSON to the report path, if set.
+        """
+
+        print(self.report())
+
+        if self.report_path is not None:
+            with open(self.report_path, 'w', encoding='utf-8') as file:
+                json.dump(self.as_dict(), file, indent=2)
+            print(f'Wrote the startup profile to {self.report_path}.')
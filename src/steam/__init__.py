@@ -1 +1,18 @@
-from .steam_api_handler import SteamAPIHandler
+from .rate_limiter import RateLimiter, RetryPolicy
+from .ttl_cache import TTLCache
+from .catalogue_snapshot import CatalogueSnapshot, SnapshotStatus
+from .profile_urls import create_vanity_url_cache, parse_profile_url
+from .player_summary_batcher import PlayerSummaryBatcher
+from .async_steam_api_handler import AsyncSteamAPIHandler
+from .library_refresh_queue import LibraryRefreshQueue, RefreshStatus
+from .bulk_library_scan import BulkLibraryScan, ScanProgress
+
+
+def __getattr__(name: str):
+    # Importing the blocking Steam API handler on first use, as the bot does not use it, so starting the bot does not
+    # import requests.
+    if name == 'SteamAPIHandler':
+        from .steam_api_handler import SteamAPIHandler
+        return SteamAPIHandler
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
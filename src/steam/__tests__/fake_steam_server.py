@@ -0,0 +1,201 @@
+import asyncio
+import hashlib
+import json
+from typing import Dict, List
+
+from aiohttp import web
+
+
+class FakeSteamServer:
+    """
+    A local HTTP server that imitates the Steam Web API endpoints used by the Steam API handlers.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        """
+        Constructor for the FakeSteamServer class.
+
+        :param latency: Seconds to wait before answering each request.
+        """
+
+        self.latency: float = latency
+        """
+        Seconds to wait before answering each request.
+        """
+
+        self.players: Dict[str, dict] = {}
+        """
+        Player summaries, keyed by Steam ID.
+        """
+
+        self.vanity_urls: Dict[str, str] = {}
+        """
+        Steam IDs, keyed by vanity URL name.
+        """
+
+        self.owned_games: Dict[str, List[int]] = {}
+        """
+        Owned app IDs, keyed by Steam ID.
+        """
+
+        self.apps: Dict[int, str] = {}
+        """
+        The app list, keyed by app ID.
+        """
+
+        self.app_list_validators: bool = True
+        """
+        Should the app list be sent with an ETag, and conditional requests for an unchanged app list be answered with
+        304 Not Modified?
+        """
+
+        self.status_overrides: Dict[str, int] = {}
+        """
+        Status codes to answer with instead of a normal response, keyed by request path.
+        """
+
+        self.queued_statuses: Dict[str, List[int]] = {}
+        """
+        Status codes to answer the next requests with, in order, keyed by request path. Takes priority over the status
+        overrides.
+        """
+
+        self.retry_after: str | None = None
+        """
+        The Retry-After header to send with error responses.
+        """
+
+        self.request_counts: Dict[str, int] = {}
+        """
+        Number of requests received, keyed by request path.
+        """
+
+        self.peers: set = set()
+        """
+        The distinct client sockets that sent requests, used to check for connection reuse.
+        """
+
+        self.in_flight: int = 0
+        """
+        The number of requests being answered right now.
+        """
+
+        self.max_in_flight: int = 0
+        """
+        The most requests answered at the same time, used to check concurrency limits.
+        """
+
+        self._runner: web.AppRunner | None = None
+        self.url: str = ''
+        """
+        The root URL of the server, set once the server has started.
+        """
+
+    async def start(self) -> str:
+        """
+        Starts the server on a free local port.
+
+        :return: The root URL of the server.
+        """
+
+        app = web.Application()
+        app.router.add_get('/ISteamUser/GetPlayerSummaries/v0002/', self._get_player_summaries)
+        app.router.add_get('/ISteamUser/ResolveVanityURL/v1/', self._resolve_vanity_url)
+        app.router.add_get('/ISteamApps/GetAppList/v0002', self._get_app_list)
+        app.router.add_get('/IPlayerService/GetOwnedGames/v0001/', self._get_owned_games)
+
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+
+        port = self._runner.addresses[0][1]
+        self.url = f'http://127.0.0.1:{port}'
+        return self.url
+
+    async def close(self) -> None:
+        """
+        Stops the server.
+        """
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _prepare(self, request: web.Request) -> web.Response | None:
+        """
+        Records a request and applies the configured latency and status overrides.
+
+        :return: A response to send instead of the normal response, or None to answer normally.
+        """
+
+        self.request_counts[request.path] = self.request_counts.get(request.path, 0) + 1
+        self.peers.add(request.transport.get_extra_info('peername') if request.transport else None)
+
+        if self.latency:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                await asyncio.sleep(self.latency)
+            finally:
+                self.in_flight -= 1
+
+        status = self.status_overrides.get(request.path)
+        if self.queued_statuses.get(request.path):
+            status = self.queued_statuses[request.path].pop(0)
+
+        if status is not None and status != 200:
+            headers = {'Retry-After': self.retry_after} if self.retry_after else {}
+            return web.Response(status=status, headers=headers)
+
+        return None
+
+    async def _get_player_summaries(self, request: web.Request) -> web.Response:
+        override = await self._prepare(request)
+        if override:
+            return override
+
+        steam_ids = request.query.get('steamids', '').split(',')
+        players = [self.players[steam_id] for steam_id in steam_ids if steam_id in self.players]
+        return web.json_response({'response': {'players': players}})
+
+    async def _resolve_vanity_url(self, request: web.Request) -> web.Response:
+        override = await self._prepare(request)
+        if override:
+            return override
+
+        steam_id = self.vanity_urls.get(request.query.get('vanityurl', ''))
+        if steam_id is None:
+            return web.json_response({'response': {'success': 42, 'message': 'No match'}})
+
+        return web.json_response({'response': {'steamid': steam_id, 'success': 1}})
+
+    async def _get_app_list(self, request: web.Request) -> web.Response:
+        override = await self._prepare(request)
+        if override:
+            return override
+
+        apps = [{'appid': app_id, 'name': name} for app_id, name in self.apps.items()]
+        body = json.dumps({'applist': {'apps': apps}})
+        if not self.app_list_validators:
+            return web.Response(body=body, content_type='application/json')
+
+        etag = f'"{hashlib.sha1(body.encode()).hexdigest()}"'
+        if request.headers.get('If-None-Match') == etag:
+            return web.Response(status=304, headers={'ETag': etag})
+
+        return web.Response(body=body, content_type='application/json', headers={'ETag': etag})
+
+    async def _get_owned_games(self, request: web.Request) -> web.Response:
+        override = await self._prepare(request)
+        if override:
+            return override
+
+        games = self.owned_games.get(request.query.get('steamid', ''))
+        if games is None:
+            return web.json_response({'response': {}})
+
+        return web.json_response({'response': {
+            'game_count': len(games),
+            'games': [{'appid': app_id, 'playtime_forever': 0} for app_id in games]
+        }})
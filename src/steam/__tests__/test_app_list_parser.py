@@ -0,0 +1,68 @@
+import json
+import unittest
+
+from src.steam.app_list_parser import AppListStreamParser, parse_app_list
+
+
+def make_payload(apps: list[dict]) -> bytes:
+    return json.dumps({'applist': {'apps': apps}}, ensure_ascii=False).encode('utf-8')
+
+
+class ParseAppListFunctionTests(unittest.TestCase):
+    """
+    Test cases for the parse_app_list() function.
+    """
+
+    def setUp(self) -> None:
+        self.payload = make_payload([
+            {'appid': 10, 'name': 'Counter-Strike'},
+            {'appid': 20, 'name': ''},
+            {'appid': 30, 'name': 'Pokémon "Quoted" [Edition]'},
+            {'appid': 40, 'name': '東方'},
+        ])
+        self.expected = [(10, 'Counter-Strike'), (30, 'Pokémon "Quoted" [Edition]'), (40, '東方')]
+
+    def test_single_chunk(self) -> None:
+        self.assertEqual(list(parse_app_list([self.payload])), self.expected)
+
+    def test_every_split_point(self) -> None:
+        for split in range(len(self.payload)):
+            chunks = [self.payload[:split], self.payload[split:]]
+            self.assertEqual(list(parse_app_list(chunks)), self.expected, f'Failed when split at byte {split}.')
+
+    def test_single_byte_chunks(self) -> None:
+        chunks = [self.payload[i:i + 1] for i in range(len(self.payload))]
+        self.assertEqual(list(parse_app_list(chunks)), self.expected)
+
+    def test_empty_app_list(self) -> None:
+        self.assertEqual(list(parse_app_list([make_payload([])])), [])
+
+    def test_truncated_response(self) -> None:
+        with self.assertRaises(ValueError):
+            list(parse_app_list([self.payload[:-10]]))
+
+    def test_empty_response(self) -> None:
+        with self.assertRaises(ValueError):
+            list(parse_app_list([]))
+
+
+class AppListStreamParserTests(unittest.TestCase):
+    """
+    Test cases for the AppListStreamParser class.
+    """
+
+    def test_yields_apps_as_they_complete(self) -> None:
+        parser = AppListStreamParser()
+
+        self.assertEqual(list(parser.feed(b'{"applist": {"apps": [{"appid": 1, "name": "a"}, {"appid": 2,')), [(1, 'a')])
+        self.assertEqual(list(parser.feed(b' "name": "b"}]}}')), [(2, 'b')])
+        self.assertTrue(parser.finished)
+
+    def test_buffer_stays_small(self) -> None:
+        parser = AppListStreamParser()
+        list(parser.feed(b'{"applist": {"apps": ['))
+
+        for app_id in range(10000):
+            list(parser.feed(f'{{"appid": {app_id}, "name": "app_{app_id}"}},'.encode('utf-8')))
+
+        self.assertLess(len(parser._buffer), 100)
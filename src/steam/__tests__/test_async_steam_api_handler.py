@@ -0,0 +1,209 @@
+import asyncio
+import unittest
+
+from src.steam.async_steam_api_handler import AsyncSteamAPIHandler
+from src.steam.rate_limiter import RateLimiter
+from src.steam.__tests__.fake_steam_server import FakeSteamServer
+
+
+class FakeServerTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    Base test case that runs an AsyncSteamAPIHandler against a FakeSteamServer.
+    """
+
+    async def asyncSetUp(self) -> None:
+        self.server = FakeSteamServer()
+        self.server.players['76561198103635351'] = {'steamid': '76561198103635351'}
+        self.server.vanity_urls['_M1nor'] = '76561198103635351'
+        self.server.owned_games['76561198103635351'] = [10, 20, 30]
+        self.server.apps = {10: 'app_10', 20: 'app_20', 30: ''}
+
+        self.sleeps: list[float] = []
+        self.rate_limiter = RateLimiter(sleep=self.record_sleep)
+        self.steam_api = AsyncSteamAPIHandler(
+            'test_key',
+            api_root=await self.server.start(),
+            timeout=1.0,
+            rate_limiter=self.rate_limiter
+        )
+
+    async def record_sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+
+    async def asyncTearDown(self) -> None:
+        await self.steam_api.close()
+        await self.server.close()
+
+
+class IsValidIDMethodTests(FakeServerTestCase):
+    """
+    Test cases for the AsyncSteamAPIHandler.is_valid_id() method.
+    """
+
+    async def test_valid_id(self) -> None:
+        self.assertTrue(await self.steam_api.is_valid_id('76561198103635351'))
+
+    async def test_invalid_id(self) -> None:
+        self.assertFalse(await self.steam_api.is_valid_id('1'))
+
+    async def test_server_error(self) -> None:
+        self.server.status_overrides['/ISteamUser/GetPlayerSummaries/v0002/'] = 500
+        self.assertFalse(await self.steam_api.is_valid_id('76561198103635351'))
+
+    async def test_api_is_down(self) -> None:
+        await self.server.close()
+        self.assertFalse(await self.steam_api.is_valid_id('76561198103635351'))
+
+
+class GetIDFromURLMethodTests(FakeServerTestCase):
+    """
+    Test cases for the AsyncSteamAPIHandler.get_id_from_url() method.
+    """
+
+    async def test_vanity_url(self) -> None:
+        steam_id = await self.steam_api.get_id_from_url('https://steamcommunity.com/id/_M1nor/')
+        self.assertEqual(steam_id, '76561198103635351')
+
+    async def test_unknown_vanity_url(self) -> None:
+        steam_id = await self.steam_api.get_id_from_url('https://steamcommunity.com/id/unknown')
+        self.assertEqual(steam_id, '')
+
+    async def test_url_with_id(self) -> None:
+        steam_id = await self.steam_api.get_id_from_url('www.steamcommunity.com/profiles/76561198103635351/')
+        self.assertEqual(steam_id, '76561198103635351')
+        self.assertEqual(self.server.request_counts, {})
+
+    async def test_non_steam_url(self) -> None:
+        self.assertEqual(await self.steam_api.get_id_from_url('https://www.example.com/'), '')
+
+    async def test_vanity_url_is_cached(self) -> None:
+        for vanity_name in ['_M1nor', '_m1nor', 'unknown'] * 2:
+            await self.steam_api.get_id_from_url(f'steamcommunity.com/id/{vanity_name}')
+
+        self.assertEqual(self.server.request_counts['/ISteamUser/ResolveVanityURL/v1/'], 2)
+        self.assertEqual(self.steam_api.vanity_url_cache.stats()['hits'], 4)
+
+    async def test_failed_resolution_is_not_cached(self) -> None:
+        self.server.queued_statuses['/ISteamUser/ResolveVanityURL/v1/'] = [403]
+
+        self.assertEqual(await self.steam_api.get_id_from_url('steamcommunity.com/id/_M1nor'), '')
+        self.assertEqual(await self.steam_api.get_id_from_url('steamcommunity.com/id/_M1nor'), '76561198103635351')
+
+    async def test_resolved_id_needs_no_validation_call(self) -> None:
+        steam_id = await self.steam_api.get_id_from_url('steamcommunity.com/id/_M1nor')
+
+        self.assertTrue(await self.steam_api.is_valid_id(steam_id))
+        self.assertNotIn('/ISteamUser/GetPlayerSummaries/v0002/', self.server.request_counts)
+
+
+class FetchAppListMethodTests(FakeServerTestCase):
+    """
+    Test cases for the AsyncSteamAPIHandler.fetch_app_list() method.
+    """
+
+    async def test_successful_fetch(self) -> None:
+        self.assertEqual(await self.steam_api.fetch_app_list(), {10: 'app_10', 20: 'app_20'})
+
+    async def test_simulating_404_error(self) -> None:
+        self.server.status_overrides['/ISteamApps/GetAppList/v0002'] = 404
+        self.assertEqual(await self.steam_api.fetch_app_list(), {})
+
+
+class FetchOwnedGamesMethodTests(FakeServerTestCase):
+    """
+    Test cases for the AsyncSteamAPIHandler.fetch_owned_games() method.
+    """
+
+    async def test_successful_fetch(self) -> None:
+        self.assertEqual(await self.steam_api.fetch_owned_games('76561198103635351'), [10, 20, 30])
+
+    async def test_user_not_found(self) -> None:
+        self.assertEqual(await self.steam_api.fetch_owned_games('invalid_steam_id'), [])
+
+    async def test_timeout(self) -> None:
+        self.server.latency = 2.0
+        self.assertEqual(await self.steam_api.fetch_owned_games('76561198103635351'), [])
+
+
+class SessionTests(FakeServerTestCase):
+    """
+    Test cases for the connection pooling behaviour of the AsyncSteamAPIHandler.
+    """
+
+    async def test_sequential_requests_reuse_connection(self) -> None:
+        for _ in range(5):
+            await self.steam_api.fetch_owned_games('76561198103635351')
+
+        self.assertEqual(len(self.server.peers), 1)
+
+    async def test_concurrent_requests_do_not_block(self) -> None:
+        self.server.latency = 0.2
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        results = await asyncio.gather(*[self.steam_api.fetch_owned_games('76561198103635351') for _ in range(10)])
+
+        self.assertEqual(len(results), 10)
+        self.assertLess(loop.time() - start, 1.0)
+
+    async def test_close_then_reuse(self) -> None:
+        await self.steam_api.close()
+        self.assertTrue(await self.steam_api.is_valid_id('76561198103635351'))
+
+
+class StreamAppListMethodTests(FakeServerTestCase):
+    """
+    Test cases for the AsyncSteamAPIHandler.stream_app_list() method.
+    """
+
+    async def test_batches(self) -> None:
+        self.server.apps = {app_id: f'app_{app_id}' for app_id in range(1, 26)}
+
+        batches = [batch async for batch in self.steam_api.stream_app_list(batch_size=10)]
+
+        self.assertEqual([len(batch) for batch in batches], [10, 10, 5])
+        self.assertEqual(dict(app for batch in batches for app in batch), self.server.apps)
+
+    async def test_api_is_down(self) -> None:
+        await self.server.close()
+        self.assertEqual([batch async for batch in self.steam_api.stream_app_list()], [])
+
+
+class RateLimitingTests(FakeServerTestCase):
+    """
+    Test cases for the rate limiting and retries of the AsyncSteamAPIHandler.
+    """
+
+    async def test_retries_throttled_request(self) -> None:
+        self.server.queued_statuses['/IPlayerService/GetOwnedGames/v0001/'] = [429, 503]
+
+        self.assertEqual(await self.steam_api.fetch_owned_games('76561198103635351'), [10, 20, 30])
+        self.assertEqual(self.server.request_counts['/IPlayerService/GetOwnedGames/v0001/'], 3)
+        self.assertEqual(self.rate_limiter.metrics.retried, 2)
+
+    async def test_honours_retry_after(self) -> None:
+        self.server.queued_statuses['/IPlayerService/GetOwnedGames/v0001/'] = [429]
+        self.server.retry_after = '7'
+
+        await self.steam_api.fetch_owned_games('76561198103635351')
+        self.assertEqual(self.sleeps, [7.0])
+
+    async def test_gives_up_after_max_retries(self) -> None:
+        self.server.status_overrides['/IPlayerService/GetOwnedGames/v0001/'] = 500
+
+        self.assertEqual(await self.steam_api.fetch_owned_games('76561198103635351'), [])
+        self.assertEqual(self.server.request_counts['/IPlayerService/GetOwnedGames/v0001/'], 4)
+
+    async def test_does_not_retry_client_errors(self) -> None:
+        self.server.status_overrides['/IPlayerService/GetOwnedGames/v0001/'] = 403
+
+        await self.steam_api.fetch_owned_games('76561198103635351')
+        self.assertEqual(self.server.request_counts['/IPlayerService/GetOwnedGames/v0001/'], 1)
+
+    async def test_daily_budget(self) -> None:
+        self.rate_limiter.budget.limit = 1
+
+        self.assertEqual(await self.steam_api.fetch_owned_games('76561198103635351'), [10, 20, 30])
+        self.assertEqual(await self.steam_api.fetch_owned_games('76561198103635351'), [])
+        self.assertEqual(self.server.request_counts['/IPlayerService/GetOwnedGames/v0001/'], 1)
+        self.assertEqual(self.rate_limiter.metrics.budget_exhausted, 1)
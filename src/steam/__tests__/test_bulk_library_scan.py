@@ -0,0 +1,126 @@
+import asyncio
+import unittest
+
+from src.database.async_database_wrapper import AsyncDatabaseWrapper
+from src.database.create_connection import create_connection
+from src.database.database_wrapper import DatabaseWrapper
+from src.steam.async_steam_api_handler import AsyncSteamAPIHandler
+from src.steam.bulk_library_scan import BulkLibraryScan, ScanProgress
+from src.steam.rate_limiter import RateLimiter, RetryPolicy
+from src.steam.__tests__.fake_steam_server import FakeSteamServer
+
+
+class BulkLibraryScanTests(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for the BulkLibraryScan class.
+    """
+
+    async def asyncSetUp(self) -> None:
+        self.server = FakeSteamServer(latency=0.02)
+        self.server.owned_games = {str(steam_id): [10, 20 + steam_id % 2] for steam_id in range(1, 21)}
+        self.server.owned_games['20'] = []
+
+        self.rate_limiter = RateLimiter({'/IPlayerService/GetOwnedGames/v0001/': (1000.0, 1000.0)})
+        self.steam_api = AsyncSteamAPIHandler(
+            'test_key', api_root=await self.server.start(), timeout=1.0, rate_limiter=self.rate_limiter
+        )
+
+        self.database = DatabaseWrapper(create_connection(':memory:', check_same_thread=False))
+        self.database.migrate()
+        self.database.update_steam_apps_table({10: 'app_10', 20: 'app_20', 21: 'app_21'})
+        for steam_id in range(1, 21):
+            self.database.set_steam_user_id(str(steam_id), str(steam_id))
+
+        self.async_database = AsyncDatabaseWrapper(self.database)
+        self.reports: list[str] = []
+        self.bulk_scan = BulkLibraryScan(
+            self.steam_api, self.async_database, concurrency=4, on_progress=lambda progress: self.reports.append(
+                str(progress)
+            )
+        )
+
+    async def asyncTearDown(self) -> None:
+        await self.async_database.close()
+        await self.steam_api.close()
+        await self.server.close()
+
+    def count_owned_games(self) -> int:
+        return self.database.connection.execute('SELECT COUNT(*) FROM tb_owned_games').fetchone()[0]
+
+    def count_scanned(self) -> int:
+        return self.database.connection.execute(
+            'SELECT COUNT(*) FROM tb_users WHERE library_scanned_at IS NOT NULL'
+        ).fetchone()[0]
+
+    async def test_scan(self) -> None:
+        progress = await self.bulk_scan.scan(['1', '2', '20'], total=3)
+
+        self.assertEqual((progress.scanned, progress.empty, progress.failed), (3, 1, 0))
+        self.assertEqual(self.count_owned_games(), 4)
+        self.assertEqual(self.count_scanned(), 3)
+        self.assertTrue(self.reports[-1].startswith('3/3 libraries scanned (1 empty, 0 failed)'))
+
+    async def test_concurrency_limit(self) -> None:
+        await self.bulk_scan.scan(str(steam_id) for steam_id in range(1, 21))
+
+        self.assertEqual(self.server.max_in_flight, 4)
+        self.assertEqual(self.server.request_counts['/IPlayerService/GetOwnedGames/v0001/'], 20)
+
+        with self.assertRaises(ValueError):
+            BulkLibraryScan(self.steam_api, self.async_database, concurrency=0)
+
+    async def test_failed_libraries_are_not_marked(self) -> None:
+        self.steam_api.rate_limiter.retry_policy = RetryPolicy(max_retries=0)
+        self.server.queued_statuses['/IPlayerService/GetOwnedGames/v0001/'] = [500]
+
+        progress = await self.bulk_scan.scan(['1'])
+
+        self.assertEqual((progress.scanned, progress.failed), (0, 1))
+        self.assertEqual(self.count_scanned(), 0)
+
+    async def test_scan_all(self) -> None:
+        progress = await self.bulk_scan.scan_all(page_size=3)
+
+        self.assertEqual((progress.total, progress.scanned), (20, 20))
+        self.assertEqual(self.count_owned_games(), 38)
+        self.assertIsNone(await self.async_database.get_library_scan())
+
+    async def test_resume_after_interruption(self) -> None:
+        self.bulk_scan.concurrency = 1
+        task = asyncio.create_task(self.bulk_scan.scan_all(page_size=3))
+        while self.count_scanned() < 5:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        started_at = await self.async_database.get_library_scan()
+        self.assertIsNotNone(started_at)
+        scanned = self.count_scanned()
+
+        progress = await self.bulk_scan.scan_all(page_size=3)
+
+        self.assertEqual(progress.total, 20 - scanned)
+        self.assertEqual(progress.scanned, 20 - scanned)
+        # Only the library being fetched when the scan was interrupted is fetched twice.
+        self.assertLessEqual(self.server.request_counts['/IPlayerService/GetOwnedGames/v0001/'], 21)
+        self.assertIsNone(await self.async_database.get_library_scan())
+
+    async def test_budget_exhaustion(self) -> None:
+        self.rate_limiter.budget.limit = 5
+
+        progress = await self.bulk_scan.scan_all()
+
+        self.assertTrue(progress.budget_exhausted)
+        self.assertEqual(progress.scanned, 5)
+        self.assertEqual(progress.failed, 0)
+        self.assertEqual(self.count_scanned(), 5)
+        self.assertIsNotNone(await self.async_database.get_library_scan())
+
+    def test_progress(self) -> None:
+        time = 10.0
+        progress = ScanProgress(100, clock=lambda: time)
+        progress.scanned = 50
+
+        time = 20.0
+        self.assertEqual(progress.rate, 5.0)
+        self.assertEqual(str(progress), '50/100 libraries scanned (0 empty, 0 failed) in 10.0s, 5.0/s')
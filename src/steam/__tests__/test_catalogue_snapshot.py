@@ -0,0 +1,151 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src.database.create_connection import create_connection
+from src.database.database_wrapper import DatabaseWrapper
+from src.steam.catalogue_snapshot import CatalogueSnapshot, SnapshotStatus
+from src.steam.__tests__.test_async_steam_api_handler import FakeServerTestCase
+
+
+def read(snapshot: CatalogueSnapshot) -> list:
+    with snapshot.open() as catalogue:
+        return list(catalogue)
+
+
+def app_list(apps: dict) -> bytes:
+    apps = [{'appid': app_id, 'name': name} for app_id, name in apps.items()]
+    return json.dumps({'applist': {'apps': apps}}).encode()
+
+
+class CatalogueSnapshotTests(unittest.TestCase):
+    """
+    Test cases for the CatalogueSnapshot class.
+    """
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'app_list.catalogue')
+        self.snapshot = CatalogueSnapshot(self.path, clock=lambda: 1000.0)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def download(self, body: bytes, etag: str | None = '"1"') -> SnapshotStatus:
+        writer = self.snapshot.writer()
+        for start in range(0, len(body), 7):
+            writer.write(body[start:start + 7])
+        return writer.commit(etag, 'Wed, 01 Jan 2025 00:00:00 GMT')
+
+    def test_no_snapshot(self) -> None:
+        self.assertFalse(self.snapshot.exists())
+        self.assertEqual(self.snapshot.conditional_headers(), {})
+        self.assertIsNone(self.snapshot.apply(DatabaseWrapper(create_connection(':memory:'))))
+
+    def test_save_and_reload(self) -> None:
+        self.assertEqual(self.download(app_list({20: 'app_20', 10: 'app_10', 30: ''})), SnapshotStatus.UPDATED)
+
+        snapshot = CatalogueSnapshot(self.path)
+        self.assertTrue(snapshot.exists())
+        self.assertEqual(read(snapshot), [(10, 'app_10'), (20, 'app_20')])
+        self.assertEqual(snapshot.metadata['apps'], 2)
+        self.assertEqual(snapshot.conditional_headers(), {
+            'If-None-Match': '"1"',
+            'If-Modified-Since': 'Wed, 01 Jan 2025 00:00:00 GMT'
+        })
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ['app_list.catalogue', 'app_list.catalogue.json'])
+
+    def test_identical_download(self) -> None:
+        self.download(app_list({10: 'app_10'}), etag=None)
+        self.snapshot.mark_applied()
+
+        self.assertEqual(self.download(app_list({10: 'app_10'}), etag='"2"'), SnapshotStatus.UNCHANGED)
+        self.assertTrue(self.snapshot.applied)
+        self.assertEqual(self.snapshot.conditional_headers()['If-None-Match'], '"2"')
+
+    def test_incomplete_download(self) -> None:
+        self.download(app_list({10: 'app_10'}))
+
+        self.assertEqual(self.download(app_list({10: 'app_10', 20: 'app_20'})[:-10]), SnapshotStatus.FAILED)
+        self.assertEqual(read(self.snapshot), [(10, 'app_10')])
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ['app_list.catalogue', 'app_list.catalogue.json'])
+
+    def test_ignores_other_formats(self) -> None:
+        self.download(app_list({10: 'app_10'}))
+        self.snapshot.metadata['format'] = 'gzip'
+
+        self.assertFalse(self.snapshot.exists())
+        self.assertEqual(self.snapshot.conditional_headers(), {})
+
+    def test_aborted_download(self) -> None:
+        writer = self.snapshot.writer()
+        writer.write(b'{"applist"')
+        writer.abort()
+
+        self.assertFalse(self.snapshot.exists())
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_apply(self) -> None:
+        database = DatabaseWrapper(create_connection(':memory:'))
+        database.migrate()
+        self.download(app_list({10: 'app_10', 20: 'app_20'}))
+
+        self.assertEqual(self.snapshot.apply(database)[:3], (2, 0, 0))
+        self.assertTrue(self.snapshot.applied)
+        self.assertIsNone(self.snapshot.apply(database))
+        self.assertEqual(database.get_row_count('tb_steam_apps'), 2)
+
+        # A new database pointed at an applied snapshot.
+        new_database = DatabaseWrapper(create_connection(':memory:'))
+        new_database.migrate()
+        self.assertEqual(self.snapshot.apply(new_database, force=True)[:3], (2, 0, 0))
+
+        self.download(app_list({10: 'app_10', 20: 'app_20 renamed'}))
+        self.assertFalse(self.snapshot.applied)
+        self.assertEqual(self.snapshot.apply(database)[:3], (0, 1, 0))
+
+
+class DownloadAppListMethodTests(FakeServerTestCase):
+    """
+    Test cases for the AsyncSteamAPIHandler.download_app_list() method.
+    """
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.snapshot = CatalogueSnapshot(os.path.join(self.directory.name, 'app_list.catalogue'))
+
+    async def asyncTearDown(self) -> None:
+        await super().asyncTearDown()
+        self.directory.cleanup()
+
+    async def test_conditional_request(self) -> None:
+        self.assertEqual(await self.steam_api.download_app_list(self.snapshot), SnapshotStatus.UPDATED)
+        self.assertEqual(dict(read(self.snapshot)), {10: 'app_10', 20: 'app_20'})
+
+        self.assertEqual(await self.steam_api.download_app_list(self.snapshot), SnapshotStatus.NOT_MODIFIED)
+        self.assertEqual(self.server.request_counts['/ISteamApps/GetAppList/v0002'], 2)
+
+        self.server.apps[40] = 'app_40'
+        self.assertEqual(await self.steam_api.download_app_list(self.snapshot), SnapshotStatus.UPDATED)
+        self.assertEqual(dict(read(self.snapshot)), {10: 'app_10', 20: 'app_20', 40: 'app_40'})
+
+    async def test_identical_response(self) -> None:
+        self.server.app_list_validators = False
+
+        self.assertEqual(await self.steam_api.download_app_list(self.snapshot), SnapshotStatus.UPDATED)
+        self.assertEqual(await self.steam_api.download_app_list(self.snapshot), SnapshotStatus.UNCHANGED)
+
+    async def test_api_is_down(self) -> None:
+        await self.steam_api.download_app_list(self.snapshot)
+        await self.server.close()
+
+        self.assertEqual(await self.steam_api.download_app_list(self.snapshot), SnapshotStatus.FAILED)
+        self.assertEqual(dict(read(self.snapshot)), {10: 'app_10', 20: 'app_20'})
+
+    async def test_server_error(self) -> None:
+        self.server.status_overrides['/ISteamApps/GetAppList/v0002'] = 404
+
+        self.assertEqual(await self.steam_api.download_app_list(self.snapshot), SnapshotStatus.FAILED)
+        self.assertFalse(self.snapshot.exists())
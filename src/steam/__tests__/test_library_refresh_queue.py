@@ -0,0 +1,140 @@
+import asyncio
+import unittest
+
+from src.database.async_database_wrapper import AsyncDatabaseWrapper
+from src.database.create_connection import create_connection
+from src.database.database_wrapper import DatabaseWrapper
+from src.steam.async_steam_api_handler import AsyncSteamAPIHandler
+from src.steam.library_refresh_queue import LibraryRefreshQueue, RefreshStatus
+from src.steam.__tests__.fake_steam_server import FakeSteamServer
+
+
+class LibraryRefreshQueueTests(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for the LibraryRefreshQueue class.
+    """
+
+    async def asyncSetUp(self) -> None:
+        self.server = FakeSteamServer()
+        self.server.owned_games = {'1': [10, 20], '2': [20, 30], '3': []}
+        self.steam_api = AsyncSteamAPIHandler('test_key', api_root=await self.server.start(), timeout=1.0)
+
+        self.database = DatabaseWrapper(create_connection(':memory:', check_same_thread=False))
+        self.database.migrate()
+        self.database.update_steam_apps_table({10: 'app_10', 20: 'app_20', 30: 'app_30'})
+        for steam_id in ['1', '2', '3']:
+            self.database.set_steam_user_id(steam_id, steam_id)
+
+        self.time = 0.0
+        self.async_database = AsyncDatabaseWrapper(self.database)
+        self.queue = LibraryRefreshQueue(
+            self.steam_api, self.async_database, workers=2, cooldown=60, clock=lambda: self.time
+        )
+
+    async def asyncTearDown(self) -> None:
+        await self.queue.stop()
+        await self.async_database.close()
+        await self.steam_api.close()
+        await self.server.close()
+
+    def get_owned_games(self, steam_user_id: str) -> list[int]:
+        return [row[0] for row in self.database.connection.execute(
+            'SELECT steam_app_id FROM tb_owned_games WHERE steam_user_id = ? ORDER BY steam_app_id', [steam_user_id]
+        )]
+
+    async def test_refreshes_queued_libraries(self) -> None:
+        self.queue.start()
+        self.assertEqual(self.queue.enqueue('1'), RefreshStatus.QUEUED)
+        self.assertEqual(self.queue.enqueue('2'), RefreshStatus.QUEUED)
+        await self.queue.join()
+
+        self.assertEqual(self.get_owned_games('1'), [10, 20])
+        self.assertEqual(self.get_owned_games('2'), [20, 30])
+        self.assertEqual(self.queue.refreshed, 2)
+
+    async def test_deduplicates_requests(self) -> None:
+        self.assertEqual(self.queue.enqueue('1'), RefreshStatus.QUEUED)
+        self.assertEqual(self.queue.enqueue('1'), RefreshStatus.ALREADY_QUEUED)
+
+        self.queue.start()
+        await self.queue.join()
+
+        self.assertEqual(self.server.request_counts['/IPlayerService/GetOwnedGames/v0001/'], 1)
+
+    async def test_cooldown(self) -> None:
+        self.queue.start()
+        self.queue.enqueue('1')
+        await self.queue.join()
+
+        self.time = 30
+        self.assertEqual(self.queue.enqueue('1'), RefreshStatus.ON_COOLDOWN)
+        self.assertEqual(self.queue.enqueue('1', force=True), RefreshStatus.QUEUED)
+        await self.queue.join()
+
+        self.time = 100
+        self.assertEqual(self.queue.enqueue('1'), RefreshStatus.QUEUED)
+
+    async def test_empty_library_is_not_applied(self) -> None:
+        self.database.sync_owned_games_table([10], '3')
+
+        self.queue.start()
+        self.queue.enqueue('3')
+        await self.queue.join()
+
+        self.assertEqual(self.get_owned_games('3'), [10])
+        self.assertEqual(self.queue.failed, 1)
+
+    async def test_failed_fetch_stays_due(self) -> None:
+        self.server.status_overrides['/IPlayerService/GetOwnedGames/v0001/'] = 404
+
+        self.queue.start()
+        self.queue.enqueue('1')
+        await self.queue.join()
+
+        self.assertEqual(self.queue.failed, 1)
+        self.assertEqual(self.get_owned_games('1'), [])
+        self.assertIn('1', self.database.get_stale_steam_ids(3600, 10))
+        self.assertEqual(self.queue.enqueue('1'), RefreshStatus.QUEUED)
+
+    async def test_budget_exhausted_stays_due(self) -> None:
+        self.steam_api.rate_limiter.budget.limit = 0
+
+        self.queue.start()
+        self.queue.enqueue('1')
+        await self.queue.join()
+
+        self.assertEqual(self.queue.failed, 1)
+        self.assertIn('1', self.database.get_stale_steam_ids(3600, 10))
+        self.assertEqual(self.queue.enqueue('1'), RefreshStatus.QUEUED)
+
+    async def test_workers_run_concurrently(self) -> None:
+        self.server.latency = 0.2
+        self.queue.start()
+        for steam_id in ['1', '2']:
+            self.queue.enqueue(steam_id)
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await self.queue.join()
+
+        self.assertLess(loop.time() - start, 0.35)
+
+    async def test_sweep_oldest_first(self) -> None:
+        self.database.mark_library_scanned('2')
+
+        self.assertEqual(await self.queue.sweep(max_age=3600, limit=2), 2)
+        self.queue.start()
+        await self.queue.join()
+
+        self.assertEqual(self.get_owned_games('1'), [10, 20])
+        self.assertEqual(self.get_owned_games('2'), [])
+
+    async def test_sweep_waits_for_previous_sweep(self) -> None:
+        self.assertEqual(await self.queue.sweep(max_age=3600, limit=2), 2)
+        self.assertEqual(await self.queue.sweep(max_age=3600, limit=2), 0)
+
+    async def test_sweep_skips_recent_libraries(self) -> None:
+        for steam_id in ['1', '2', '3']:
+            self.database.mark_library_scanned(steam_id)
+
+        self.assertEqual(await self.queue.sweep(max_age=3600, limit=10), 0)
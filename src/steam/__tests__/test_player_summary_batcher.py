@@ -0,0 +1,146 @@
+import asyncio
+import unittest
+from typing import Dict, List
+
+from src.steam.player_summary_batcher import PlayerSummaryBatcher
+from src.steam.__tests__.test_async_steam_api_handler import FakeServerTestCase
+
+
+class FakeFetcher:
+    """
+    Records the batches sent to it, answering from a fixed set of valid Steam IDs.
+    """
+
+    def __init__(self, valid_ids: set) -> None:
+        self.valid_ids = valid_ids
+        self.batches: List[List[str]] = []
+        self.fail = False
+        self.raising_ids: set = set()
+        self.delay = 0.0
+
+    async def __call__(self, steam_ids: List[str]) -> Dict[str, dict] | None:
+        self.batches.append(steam_ids)
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            return None
+        if self.raising_ids.intersection(steam_ids):
+            raise ValueError('Malformed Steam ID.')
+
+        return {steam_id: {'steamid': steam_id} for steam_id in steam_ids if steam_id in self.valid_ids}
+
+
+class PlayerSummaryBatcherTests(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for the PlayerSummaryBatcher class.
+    """
+
+    async def asyncSetUp(self) -> None:
+        self.now = 0.0
+        self.fetcher = FakeFetcher({'1', '2'})
+        self.batcher = PlayerSummaryBatcher(self.fetcher, ttl=60, negative_ttl=10, clock=lambda: self.now)
+
+    async def test_coalesces_concurrent_requests(self) -> None:
+        results = await asyncio.gather(*(self.batcher.is_valid_id(steam_id) for steam_id in ['1', '2', '3']))
+
+        self.assertEqual(results, [True, True, False])
+        self.assertEqual(self.fetcher.batches, [['1', '2', '3']])
+
+    async def test_deduplicates_requests(self) -> None:
+        results = await asyncio.gather(*(self.batcher.is_valid_id('1') for _ in range(5)))
+
+        self.assertEqual(results, [True] * 5)
+        self.assertEqual(self.fetcher.batches, [['1']])
+
+    async def test_splits_batches_at_100(self) -> None:
+        await asyncio.gather(*(self.batcher.is_valid_id(str(steam_id)) for steam_id in range(250)))
+
+        self.assertEqual([len(batch) for batch in self.fetcher.batches], [100, 100, 50])
+
+    async def test_caches_results(self) -> None:
+        self.assertTrue(await self.batcher.is_valid_id('1'))
+        self.assertFalse(await self.batcher.is_valid_id('3'))
+        self.assertTrue(await self.batcher.is_valid_id('1'))
+        self.assertFalse(await self.batcher.is_valid_id('3'))
+
+        self.assertEqual(len(self.fetcher.batches), 2)
+
+    async def test_cache_expiry(self) -> None:
+        await self.batcher.is_valid_id('1')
+        await self.batcher.is_valid_id('3')
+
+        # Invalid IDs expire before valid ones.
+        self.now = 30
+        await self.batcher.is_valid_id('1')
+        await self.batcher.is_valid_id('3')
+        self.assertEqual(self.fetcher.batches, [['1'], ['3'], ['3']])
+
+        self.now = 100
+        await self.batcher.is_valid_id('1')
+        self.assertEqual(self.fetcher.batches[-1], ['1'])
+
+    async def test_failures_are_not_cached(self) -> None:
+        self.fetcher.fail = True
+        self.assertFalse(await self.batcher.is_valid_id('1'))
+
+        self.fetcher.fail = False
+        self.assertTrue(await self.batcher.is_valid_id('1'))
+        self.assertEqual(len(self.fetcher.batches), 2)
+
+    async def test_raising_id_only_fails_its_caller(self) -> None:
+        self.fetcher.raising_ids = {'3'}
+        results = await asyncio.gather(
+            *(self.batcher.is_valid_id(steam_id) for steam_id in ['1', '2', '3']), return_exceptions=True
+        )
+
+        self.assertEqual(results[:2], [True, True])
+        self.assertIsInstance(results[2], ValueError)
+        self.assertEqual(self.fetcher.batches, [['1', '2', '3'], ['1'], ['2'], ['3']])
+
+    async def test_sends_are_referenced_until_finished(self) -> None:
+        self.fetcher.delay = 0.05
+        validation = asyncio.ensure_future(self.batcher.is_valid_id('1'))
+        await asyncio.sleep(0.06)
+
+        self.assertEqual(len(self.batcher._tasks), 1)
+        self.assertTrue(await validation)
+        self.assertEqual(self.batcher._tasks, set())
+
+    async def test_close_cancels_waiting_callers(self) -> None:
+        self.fetcher.delay = 1.0
+        sending = asyncio.ensure_future(self.batcher.is_valid_id('1'))
+        waiting = asyncio.ensure_future(self.batcher.is_valid_id('2'))
+        await asyncio.sleep(0.06)
+        waiting_for_next = asyncio.ensure_future(self.batcher.is_valid_id('3'))
+        await asyncio.sleep(0)
+
+        await self.batcher.close()
+        for validation in [sending, waiting, waiting_for_next]:
+            with self.assertRaises(asyncio.CancelledError):
+                await validation
+        self.assertEqual(self.batcher._tasks, set())
+
+
+class BatchedValidationTests(FakeServerTestCase):
+    """
+    Test cases for batched validation through the AsyncSteamAPIHandler.
+    """
+
+    async def test_single_call_for_concurrent_validations(self) -> None:
+        self.server.players['76561198000000001'] = {'steamid': '76561198000000001'}
+
+        results = await asyncio.gather(
+            self.steam_api.is_valid_id('76561198103635351'),
+            self.steam_api.is_valid_id('76561198000000001'),
+            self.steam_api.is_valid_id('1')
+        )
+
+        self.assertEqual(results, [True, True, False])
+        self.assertEqual(self.server.request_counts['/ISteamUser/GetPlayerSummaries/v0002/'], 1)
+
+    async def test_fetch_player_summaries(self) -> None:
+        players = await self.steam_api.fetch_player_summaries(['76561198103635351', '1'])
+        self.assertEqual(list(players), ['76561198103635351'])
+
+    async def test_fetch_player_summaries_failure(self) -> None:
+        self.server.status_overrides['/ISteamUser/GetPlayerSummaries/v0002/'] = 403
+        self.assertIsNone(await self.steam_api.fetch_player_summaries(['76561198103635351']))
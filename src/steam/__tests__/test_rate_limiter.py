@@ -0,0 +1,145 @@
+import asyncio
+import unittest
+
+from src.steam.rate_limiter import DailyBudget, RateLimiter, RetryPolicy, TokenBucket
+
+
+class FakeClock:
+    """
+    Clock that only moves when told to, and a sleep function that moves it.
+    """
+
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+class TokenBucketTests(unittest.TestCase):
+    """
+    Test cases for the TokenBucket class.
+    """
+
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.bucket = TokenBucket(rate=2, capacity=3, clock=self.clock)
+
+    def test_burst_up_to_capacity(self) -> None:
+        self.assertEqual([self.bucket.reserve() for _ in range(3)], [0, 0, 0])
+
+    def test_waits_once_empty(self) -> None:
+        for _ in range(3):
+            self.bucket.reserve()
+
+        self.assertEqual(self.bucket.reserve(), 0.5)
+        self.assertEqual(self.bucket.reserve(), 1.0)
+
+    def test_refills_over_time(self) -> None:
+        for _ in range(3):
+            self.bucket.reserve()
+
+        self.clock.now = 1.0
+        self.assertEqual([self.bucket.reserve() for _ in range(2)], [0, 0])
+        self.assertEqual(self.bucket.reserve(), 0.5)
+
+    def test_does_not_refill_past_capacity(self) -> None:
+        self.clock.now = 100
+        self.assertEqual([self.bucket.reserve() for _ in range(4)], [0, 0, 0, 0.5])
+
+
+class DailyBudgetTests(unittest.TestCase):
+    """
+    Test cases for the DailyBudget class.
+    """
+
+    def test_resets_each_day(self) -> None:
+        clock = FakeClock(now=86400 * 10 + 5)
+        budget = DailyBudget(2, clock)
+
+        self.assertTrue(budget.try_spend())
+        self.assertTrue(budget.try_spend())
+        self.assertFalse(budget.try_spend())
+        self.assertEqual(budget.remaining, 0)
+
+        clock.now += 86400
+        self.assertEqual(budget.remaining, 2)
+        self.assertTrue(budget.try_spend())
+
+
+class RetryPolicyTests(unittest.TestCase):
+    """
+    Test cases for the RetryPolicy class.
+    """
+
+    def test_exponential_backoff_with_jitter(self) -> None:
+        policy = RetryPolicy(base_delay=1, max_delay=5, random_value=lambda: 0.5)
+        self.assertEqual([policy.delay(attempt) for attempt in range(5)], [0.5, 1, 2, 2.5, 2.5])
+
+    def test_retry_after_takes_priority(self) -> None:
+        policy = RetryPolicy(max_delay=30)
+        self.assertEqual(policy.delay(0, retry_after=12), 12)
+        self.assertEqual(policy.delay(0, retry_after=120), 30)
+
+    def test_retryable_statuses(self) -> None:
+        self.assertEqual([RetryPolicy.is_retryable(status) for status in [200, 403, 404, 429, 500, 503]],
+                         [False, False, False, True, True, True])
+
+    def test_parse_retry_after_seconds(self) -> None:
+        self.assertEqual(RetryPolicy.parse_retry_after('30'), 30)
+
+    def test_parse_retry_after_date(self) -> None:
+        self.assertEqual(RetryPolicy.parse_retry_after('Thu, 01 Jan 1970 00:01:00 GMT', now=15), 45)
+
+    def test_parse_malformed_retry_after(self) -> None:
+        self.assertIsNone(RetryPolicy.parse_retry_after('soon'))
+        self.assertIsNone(RetryPolicy.parse_retry_after(None))
+
+
+class RateLimiterTests(unittest.TestCase):
+    """
+    Test cases for the RateLimiter class.
+    """
+
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.rate_limiter = RateLimiter(
+            endpoint_rates={'/slow': (1, 1)},
+            daily_limit=5,
+            retry_policy=RetryPolicy(max_retries=2, random_value=lambda: 1.0),
+            clock=self.clock,
+            wall_clock=self.clock,
+            sleep=self.clock.sleep
+        )
+
+    def test_buckets_are_per_endpoint(self) -> None:
+        async def run():
+            for _ in range(2):
+                await self.rate_limiter.acquire('/slow')
+            await self.rate_limiter.acquire('/fast')
+
+        asyncio.run(run())
+
+        self.assertEqual(self.clock.sleeps, [1.0])
+        self.assertEqual(self.rate_limiter.metrics.calls, 3)
+        self.assertEqual(self.rate_limiter.metrics.throttled, 1)
+
+    def test_budget_is_shared(self) -> None:
+        async def run():
+            return [await self.rate_limiter.acquire(endpoint) for endpoint in ['/a', '/b', '/c', '/d', '/e', '/f']]
+
+        self.assertEqual(asyncio.run(run()), [True] * 5 + [False])
+        self.assertEqual(self.rate_limiter.metrics.budget_exhausted, 1)
+
+    def test_retry_delays(self) -> None:
+        self.assertEqual(self.rate_limiter.retry_delay(0, 503, None), 1.0)
+        self.assertEqual(self.rate_limiter.retry_delay(1, 503, None), 2.0)
+        self.assertIsNone(self.rate_limiter.retry_delay(2, 503, None))
+        self.assertIsNone(self.rate_limiter.retry_delay(0, 404, None))
+        self.assertEqual(self.rate_limiter.retry_delay(0, 429, '3'), 3.0)
+        self.assertEqual(self.rate_limiter.metrics.retried, 3)
@@ -0,0 +1,92 @@
+import unittest
+
+from src.database import DatabaseWrapper, create_connection
+from src.steam.ttl_cache import TTLCache
+
+
+class TTLCacheTests(unittest.TestCase):
+    """
+    Test cases for the TTLCache class.
+    """
+
+    def setUp(self) -> None:
+        self.now = 1000.0
+        self.cache = TTLCache(max_size=3, ttl=60, negative_ttl=10, clock=lambda: self.now)
+
+    def test_hit_and_miss(self) -> None:
+        self.cache.set('a', 'value')
+
+        self.assertEqual(self.cache.get('a'), 'value')
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_negative_entries(self) -> None:
+        self.cache.set('a', '')
+
+        self.assertEqual(self.cache.get('a', default=None), '')
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_expiry(self) -> None:
+        self.cache.set('positive', 'value')
+        self.cache.set('negative', '')
+
+        self.now += 30
+        self.assertEqual(self.cache.get('positive'), 'value')
+        self.assertIsNone(self.cache.get('negative'))
+
+        self.now += 60
+        self.assertIsNone(self.cache.get('positive'))
+        self.assertEqual(self.cache.expirations, 2)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_evicts_least_recently_used(self) -> None:
+        for key in ['a', 'b', 'c']:
+            self.cache.set(key, key)
+
+        # Using a, so b becomes the least recently used entry.
+        self.cache.get('a')
+        self.cache.set('d', 'd')
+
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual([self.cache.get(key) for key in ['a', 'c', 'd']], ['a', 'c', 'd'])
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_stats(self) -> None:
+        self.cache.set('a', 'a')
+        self.cache.get('a')
+
+        self.assertEqual(self.cache.stats(), {'size': 1, 'hits': 1, 'misses': 0, 'evictions': 0, 'expirations': 0})
+
+
+class PersistentTTLCacheTests(unittest.TestCase):
+    """
+    Test cases for a TTLCache backed by the tb_vanity_urls table.
+    """
+
+    def setUp(self) -> None:
+        self.now = 1000.0
+        self.database = DatabaseWrapper(create_connection(':memory:'))
+        self.database.create_tables()
+
+    def create_cache(self) -> TTLCache:
+        return TTLCache(
+            max_size=10,
+            ttl=60,
+            loader=self.database.get_vanity_url,
+            saver=self.database.set_vanity_url,
+            clock=lambda: self.now
+        )
+
+    def test_survives_restart(self) -> None:
+        self.create_cache().set('_m1nor', '76561198103635351')
+
+        cache = self.create_cache()
+        self.assertEqual(cache.get('_m1nor'), '76561198103635351')
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(len(cache), 1)
+
+    def test_expired_entries_are_not_loaded(self) -> None:
+        self.create_cache().set('_m1nor', '76561198103635351')
+
+        self.now += 120
+        self.assertIsNone(self.create_cache().get('_m1nor'))
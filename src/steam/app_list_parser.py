@@ -0,0 +1,125 @@
+import codecs
+import json
+import re
+from typing import Iterable, Iterator, Tuple
+
+_apps_array_start = re.compile(r'"apps"\s*:\s*\[')
+"""
+Pattern that matches the start of the applist.apps array in a GetAppList response.
+"""
+
+_whitespace_and_commas = re.compile(r'[\s,]*')
+"""
+Pattern that matches the separators between items in a JSON array.
+"""
+
+
+class AppListStreamParser:
+    """
+    Incremental parser for the ISteamApps/GetAppList/v0002 response. Bytes are fed in as they arrive and every complete
+    app in the applist.apps array is yielded straight away, so only a single unparsed item is ever held in memory
+    rather than the whole response.
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructor for the AppListStreamParser class.
+        """
+
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        """
+        Decodes the byte stream, keeping multibyte characters split across chunks intact.
+        """
+
+        self._json_decoder = json.JSONDecoder()
+        """
+        Decodes individual app objects from the buffer.
+        """
+
+        self._buffer: str = ''
+        """
+        The decoded text that has not been parsed yet.
+        """
+
+        self._in_array: bool = False
+        """
+        Has the start of the apps array been found?
+        """
+
+        self.finished: bool = False
+        """
+        Has the end of the apps array been reached?
+        """
+
+    def feed(self, chunk: bytes) -> Iterator[Tuple[int, str]]:
+        """
+        Feeds a chunk of the response into the parser.
+
+        :param chunk: The next chunk of the response body.
+        :return: An iterator of (app ID, app name) pairs for every app completed by this chunk. Apps with an empty
+        name are skipped.
+        """
+
+        if self.finished:
+            return
+
+        self._buffer += self._decoder.decode(chunk)
+
+        # Discarding everything before the apps array, keeping a short tail in case the key is split across chunks.
+        if not self._in_array:
+            match = _apps_array_start.search(self._buffer)
+            if match is None:
+                self._buffer = self._buffer[-32:]
+                return
+
+            self._buffer = self._buffer[match.end():]
+            self._in_array = True
+
+        position = 0
+        while True:
+            position = _whitespace_and_commas.match(self._buffer, position).end()
+
+            if position >= len(self._buffer):
+                break
+
+            if self._buffer[position] == ']':
+                self.finished = True
+                position += 1
+                break
+
+            # Stopping at an incomplete object, the rest of it will arrive with the next chunk.
+            try:
+                app, position = self._json_decoder.raw_decode(self._buffer, position)
+            except json.JSONDecodeError:
+                break
+
+            if app.get('name'):
+                yield int(app['appid']), str(app['name'])
+
+        self._buffer = self._buffer[position:]
+
+    def close(self) -> None:
+        """
+        Signals the end of the response.
+
+        :raises ValueError: If the response ended before the end of the apps array was reached.
+        """
+
+        if not self.finished:
+            raise ValueError('The app list response ended before the end of the apps array.')
+
+
+def parse_app_list(chunks: Iterable[bytes]) -> Iterator[Tuple[int, str]]:
+    """
+    Parses a GetAppList response from an iterable of body chunks.
+
+    :param chunks: The chunks of the response body, in order.
+    :raises ValueError: If the response ended before the end of the apps array was reached.
+    :return: An iterator of (app ID, app name) pairs. Apps with an empty name are skipped.
+    """
+
+    parser = AppListStreamParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+
+    parser.close()
@@ -0,0 +1,365 @@
+import asyncio
+import itertools
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+import aiohttp
+
+from .app_list_parser import AppListStreamParser
+from .catalogue_snapshot import CatalogueSnapshot, SnapshotStatus
+from .player_summary_batcher import PlayerSummaryBatcher
+from .profile_urls import create_vanity_url_cache, parse_profile_url
+from .rate_limiter import RateLimiter
+from .ttl_cache import TTLCache
+
+
+class AsyncSteamAPIHandler:
+    """
+    Class that handles sending requests to the Steam API without blocking the event loop. All requests share a single
+    long-lived, connection-pooled HTTP session, so repeated calls reuse keep-alive connections to the Steam API.
+    """
+
+    _api_root: str = 'https://api.steampowered.com'
+    """
+    The default root for the Steam API.
+    """
+
+    def __init__(
+            self,
+            api_key: str,
+            api_root: str | None = None,
+            timeout: float = 10.0,
+            connection_limit: int = 20,
+            keepalive_timeout: float = 60.0,
+            rate_limiter: RateLimiter | None = None,
+            vanity_url_cache: TTLCache[str, str] | None = None
+    ):
+        """
+        Constructor for the AsyncSteamAPIHandler class. The HTTP session is created lazily on the first request, as
+        aiohttp sessions must be created from within a running event loop.
+
+        :param api_key: The Steam API key to connect to Steam with.
+        :param api_root: The root URL of the Steam API. Overridable so the handler can be pointed at a test server.
+        :param timeout: The total timeout for each request, in seconds.
+        :param connection_limit: The maximum number of simultaneous connections in the session pool.
+        :param keepalive_timeout: How long idle connections are kept open for reuse, in seconds.
+        :param rate_limiter: The rate limiter pacing and retrying every call. Pass the same rate limiter to every
+        handler that shares an API key, so they share its daily budget.
+        :param vanity_url_cache: The cache of resolved vanity URLs, defaults to an in-memory cache.
+        """
+
+        self._api_key = api_key
+        """
+        The Steam API key.
+        """
+
+        if api_root:
+            self._api_root = api_root.rstrip('/')
+
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        """
+        The per-request timeout.
+        """
+
+        self._connection_limit = connection_limit
+        """
+        The maximum number of simultaneous connections in the session pool.
+        """
+
+        self._keepalive_timeout = keepalive_timeout
+        """
+        How long idle connections are kept open for reuse, in seconds.
+        """
+
+        self._session: aiohttp.ClientSession | None = None
+        """
+        The shared HTTP session, None until the first request is sent.
+        """
+
+        self.rate_limiter: RateLimiter = rate_limiter or RateLimiter()
+        """
+        The rate limiter pacing and retrying every call.
+        """
+
+        self.vanity_url_cache: TTLCache[str, str] = (
+            create_vanity_url_cache() if vanity_url_cache is None else vanity_url_cache
+        )
+        """
+        The Steam ID of each recently resolved vanity URL name, an empty string if the name does not exist.
+        """
+
+        self.id_validator: PlayerSummaryBatcher = PlayerSummaryBatcher(self.fetch_player_summaries)
+        """
+        Batches and caches Steam ID validation.
+        """
+
+    async def __aenter__(self) -> 'AsyncSteamAPIHandler':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Gets the shared HTTP session, creating it if it does not exist or was closed.
+
+        :return: The shared HTTP session.
+        """
+
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._connection_limit,
+                keepalive_timeout=self._keepalive_timeout,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self._timeout)
+
+        return self._session
+
+    async def close(self) -> None:
+        """
+        Cancels the Steam ID validations still waiting, then closes the shared HTTP session, and all of its pooled
+        connections.
+        """
+
+        await self.id_validator.close()
+
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+        self._session = None
+
+    async def _get_json(self, path: str, params: Dict[str, str]) -> Any | None:
+        """
+        Sends a GET request to the Steam API and decodes the JSON response.
+
+        :param path: The path of the API endpoint, relative to the API root.
+        :param params: The query parameters to send with the request.
+        :return: The decoded JSON response, or None if the request failed, did not return a 200 status code after any
+        retries, or the daily budget is used up.
+        """
+
+        for attempt in itertools.count():
+            # Waiting for the rate limiter, giving up if the daily budget is used up.
+            if not await self.rate_limiter.acquire(path):
+                return None
+
+            # Catching connection errors and timeouts (for example, if the Steam API is down for maintenance).
+            try:
+                async with self._get_session().get(f'{self._api_root}{path}', params=params) as response:
+                    if response.status == 200:
+                        return await response.json(content_type=None)
+
+                    status = response.status
+                    retry_after = response.headers.get('Retry-After')
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                return None
+
+            # Retrying throttled requests and server errors after a backoff.
+            if not await self.rate_limiter.wait_before_retry(attempt, status, retry_after):
+                return None
+
+    async def fetch_player_summaries(self, steam_ids: List[str]) -> Dict[str, dict] | None:
+        """
+        Fetches the player summaries of up to 100 Steam IDs in a single call.
+
+        :param steam_ids: The Steam IDs to fetch.
+        :return: The player summaries of the Steam IDs connected to a Steam account, keyed by Steam ID, or None if the
+        request failed.
+        """
+
+        data = await self._get_json(
+            '/ISteamUser/GetPlayerSummaries/v0002/',
+            {'key': self._api_key, 'steamids': ','.join(steam_ids)}
+        )
+
+        try:
+            return {str(player['steamid']): player for player in data['response']['players']}
+        except (KeyError, TypeError):
+            return None
+
+    async def is_valid_id(self, steam_id: str) -> bool:
+        """
+        Checks if a passed Steam ID is connected to an existing Steam account. Concurrent checks are batched into a
+        single call, and recent results are cached.
+
+        :param steam_id: The Steam ID to validate.
+        :return: True if the passed Steam ID is connected to a Steam account, False otherwise.
+        """
+
+        return await self.id_validator.is_valid_id(steam_id)
+
+    async def get_id_from_url(self, steam_url: str) -> str:
+        """
+        Converts a Steam Profile URL to a Steam ID. Accepts the same URLs as SteamAPIHandler.get_id_from_url().
+
+        :param steam_url: The Steam profile URL to convert.
+        :return: A Steam ID string, if no Steam ID could be resolved an empty string is returned.
+        """
+
+        url_type, url_value = parse_profile_url(steam_url)
+
+        # If a non-custom Steam URL is set, returns the ID within the URL.
+        if url_type == 'profiles':
+            return url_value
+
+        # If there is a custom Steam profile URL.
+        if url_type == 'id':
+            steam_id = self.vanity_url_cache.get(url_value.lower())
+            if steam_id is not None:
+                return steam_id
+
+            data = await self._get_json(
+                '/ISteamUser/ResolveVanityURL/v1/',
+                {'key': self._api_key, 'vanityurl': url_value}
+            )
+
+            try:
+                steam_id = str(data['response']['steamid']) if data['response']['success'] == 1 else ''
+            except (KeyError, TypeError):
+                return ''
+
+            # Caching unknown names as well, failed requests are not cached as they never reach this point.
+            self.vanity_url_cache.set(url_value.lower(), steam_id)
+
+            # A resolved Steam ID is known to be valid, so validating it afterwards costs no API call.
+            if steam_id:
+                self.id_validator.cache.set(steam_id, True)
+
+            return steam_id
+
+        return ''
+
+    async def fetch_app_list(self) -> Dict[int, str]:
+        """
+        Fetches a list of every app from Steam.
+
+        :return: A dictionary of the Steam app list. Keys are the Steam App ID, values are the Steam App names.
+        """
+
+        apps: Dict[int, str] = {}
+
+        # Catching errors part way through the response, so a partial app list is never returned.
+        try:
+            async for batch in self.stream_app_list():
+                apps.update(batch)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            return {}
+
+        return apps
+
+    async def stream_app_list(self, batch_size: int = 5000) -> AsyncIterator[List[Tuple[int, str]]]:
+        """
+        Streams the list of every app from Steam, parsing each app as the response arrives rather than loading the
+        whole response into memory. Apps are yielded in batches so that consumers, such as database inserts, can
+        work through the list a batch at a time.
+
+        :param batch_size: The maximum number of apps in each batch.
+        :raises aiohttp.ClientError: If the connection fails part way through the response.
+        :raises asyncio.TimeoutError: If the response stalls part way through.
+        :raises ValueError: If the response is cut off or malformed.
+        :return: An async iterator of lists of (Steam App ID, Steam App name) pairs. Apps with an empty name are
+        skipped. If the Steam API could not be reached, or did not return a 200 status code, the iterator is empty.
+        """
+
+        parser = AppListStreamParser()
+        batch: List[Tuple[int, str]] = []
+
+        if not await self.rate_limiter.acquire('/ISteamApps/GetAppList/v0002'):
+            return
+
+        # Catching connection errors and timeouts (for example, if the Steam API is down for maintenance).
+        try:
+            response = await self._get_session().get(
+                f'{self._api_root}/ISteamApps/GetAppList/v0002',
+                timeout=aiohttp.ClientTimeout(total=None, sock_read=self._timeout.total)
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return
+
+        async with response:
+            if response.status != 200:
+                return
+
+            async for chunk in response.content.iter_chunked(65536):
+                for app in parser.feed(chunk):
+                    batch.append(app)
+
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = []
+
+        parser.close()
+
+        if batch:
+            yield batch
+
+    async def download_app_list(self, snapshot: CatalogueSnapshot) -> SnapshotStatus:
+        """
+        Downloads the list of every app from Steam into a snapshot. The request carries the validators of the snapshot,
+        so an unchanged app list is answered with 304 Not Modified, and a response identical to the snapshot is not
+        parsed. The download is compared and compressed on a worker thread, off the event loop.
+
+        :param snapshot: The snapshot to refresh.
+        :return: Whether the snapshot was replaced, left unchanged, or could not be refreshed.
+        """
+
+        if not await self.rate_limiter.acquire('/ISteamApps/GetAppList/v0002'):
+            return SnapshotStatus.FAILED
+
+        writer = snapshot.writer()
+        try:
+            async with self._get_session().get(
+                f'{self._api_root}/ISteamApps/GetAppList/v0002',
+                headers=snapshot.conditional_headers(),
+                timeout=aiohttp.ClientTimeout(total=None, sock_read=self._timeout.total)
+            ) as response:
+                if response.status == 304:
+                    writer.abort()
+                    snapshot.mark_not_modified()
+                    return SnapshotStatus.NOT_MODIFIED
+
+                if response.status != 200:
+                    writer.abort()
+                    return SnapshotStatus.FAILED
+
+                async for chunk in response.content.iter_chunked(65536):
+                    writer.write(chunk)
+
+                etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            writer.abort()
+            return SnapshotStatus.FAILED
+
+        return await asyncio.to_thread(writer.commit, etag, last_modified)
+
+    async def fetch_owned_games(self, steam_id: str) -> List[int]:
+        """
+        Gets the ID of every game a Steam user owns.
+
+        :param steam_id: The Steam ID of the user to get the owned games for.
+        :return: A list of Steam application IDs.
+        """
+
+        return await self.try_fetch_owned_games(steam_id) or []
+
+    async def try_fetch_owned_games(self, steam_id: str) -> List[int] | None:
+        """
+        Gets the ID of every game a Steam user owns, telling a failed request apart from an empty or private library.
+
+        :param steam_id: The Steam ID of the user to get the owned games for.
+        :return: A list of Steam application IDs, empty for private profiles, or None if the request failed or the
+        daily budget is used up.
+        """
+
+        data = await self._get_json(
+            '/IPlayerService/GetOwnedGames/v0001/',
+            {'key': self._api_key, 'steamid': steam_id}
+        )
+
+        if data is None:
+            return None
+
+        try:
+            return [int(app['appid']) for app in data['response']['games']]
+        except (KeyError, TypeError):
+            return []
@@ -0,0 +1,226 @@
+import asyncio
+import time
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable
+
+from src.database import AsyncDatabaseWrapper
+from .async_steam_api_handler import AsyncSteamAPIHandler
+
+
+class ScanProgress:
+    """
+    The progress of a bulk library scan.
+    """
+
+    def __init__(self, total: int | None = None, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Constructor for the ScanProgress class.
+
+        :param total: The number of libraries to scan, None if unknown.
+        :param clock: Function returning the current time in seconds, overridable for testing.
+        """
+
+        self.total: int | None = total
+
+        self.scanned: int = 0
+        """
+        The number of libraries fetched from Steam and applied to the database, including empty libraries.
+        """
+
+        self.empty: int = 0
+        """
+        The number of libraries Steam returned no games for, usually private profiles. Empty libraries are not applied,
+        as applying them would wipe the stored library.
+        """
+
+        self.failed: int = 0
+        """
+        The number of libraries that could not be fetched. Failed libraries are not marked as scanned, so resuming the
+        scan, or the next library sweep, tries them again.
+        """
+
+        self.budget_exhausted: bool = False
+        """
+        Did the scan stop early because the daily Steam API budget was used up?
+        """
+
+        self._clock: Callable[[], float] = clock
+        self._started: float = clock()
+
+    @property
+    def elapsed(self) -> float:
+        """
+        :return: The number of seconds since the scan started.
+        """
+
+        return self._clock() - self._started
+
+    @property
+    def rate(self) -> float:
+        """
+        :return: The number of libraries scanned per second.
+        """
+
+        elapsed = self.elapsed
+        return self.scanned / elapsed if elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        total = '?' if self.total is None else self.total
+        return (
+            f'{self.scanned}/{total} libraries scanned ({self.empty} empty, {self.failed} failed) '
+            f'in {self.elapsed:.1f}s, {self.rate:.1f}/s'
+        )
+
+
+class BulkLibraryScan:
+    """
+    Rescans many Steam libraries at once, such as every registered library after the bot has been offline. Libraries
+    are fetched concurrently, up to a fixed number at a time, while the rate limiter of the Steam API handler paces the
+    requests and enforces the daily budget. Each library is applied to the database as soon as it arrives.
+
+    A full rescan is resumable: its start time is stored in the database, and each library is marked as scanned when it
+    is applied, so a rescan interrupted by a crash or restart picks up with the libraries not scanned since it started.
+    """
+
+    def __init__(
+            self,
+            steam_api: AsyncSteamAPIHandler,
+            database: AsyncDatabaseWrapper,
+            concurrency: int = 8,
+            progress_interval: float = 30.0,
+            on_progress: Callable[[ScanProgress], None] = print
+    ) -> None:
+        """
+        Constructor for the BulkLibraryScan class.
+
+        :param steam_api: The Steam API handler to fetch libraries with.
+        :param database: The database to apply the libraries to.
+        :param concurrency: The maximum number of libraries fetched at the same time. Requests beyond the connection
+        limit of the Steam API handler wait for a free connection.
+        :param progress_interval: The number of seconds between progress reports.
+        :param on_progress: Function called with the progress of the scan, periodically and once the scan ends.
+        """
+
+        if concurrency < 1:
+            raise ValueError('Parameter concurrency must be at least 1.')
+
+        self.steam_api: AsyncSteamAPIHandler = steam_api
+        self.database: AsyncDatabaseWrapper = database
+
+        self.concurrency: int = concurrency
+        self.progress_interval: float = progress_interval
+        self.on_progress: Callable[[ScanProgress], None] = on_progress
+
+    async def scan(self, steam_ids: Iterable[str] | AsyncIterable[str], total: int | None = None) -> ScanProgress:
+        """
+        Fetches and applies the libraries of the passed Steam IDs, stopping early if the daily budget is used up.
+
+        :param steam_ids: The Steam IDs to scan. Read lazily, so a large scan can be paged from the database.
+        :param total: The number of Steam IDs, used for progress reports.
+        :return: The progress of the finished scan.
+        """
+
+        progress = ScanProgress(total)
+
+        # Holding a few Steam IDs per worker, so the workers never wait on the producer and the producer never reads
+        # far ahead of the workers.
+        queue: asyncio.Queue[str | None] = asyncio.Queue(self.concurrency * 2)
+
+        async def produce() -> None:
+            async for steam_user_id in self._iterate(steam_ids):
+                if progress.budget_exhausted:
+                    break
+                await queue.put(steam_user_id)
+
+            for _ in range(self.concurrency):
+                await queue.put(None)
+
+        async def work() -> None:
+            while (steam_user_id := await queue.get()) is not None:
+                if not progress.budget_exhausted:
+                    await self._scan_library(steam_user_id, progress)
+
+        async def report() -> None:
+            while True:
+                await asyncio.sleep(self.progress_interval)
+                self.on_progress(progress)
+
+        tasks = [asyncio.create_task(produce()), *(asyncio.create_task(work()) for _ in range(self.concurrency))]
+        reporter = asyncio.create_task(report())
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # Cancelling the remaining tasks if the scan was cancelled or failed, so no worker waits forever.
+            for task in [*tasks, reporter]:
+                task.cancel()
+            self.on_progress(progress)
+
+        return progress
+
+    async def scan_all(self, page_size: int = 1000) -> ScanProgress:
+        """
+        Rescans every registered library, resuming an unfinished rescan if there is one. The rescan is finished once
+        every library has been tried, unless the daily budget ran out first, in which case it resumes on the next call,
+        which the bot makes daily once the budget has reset.
+
+        :param page_size: The number of Steam IDs read from the database at a time.
+        :return: The progress of this run of the rescan.
+        """
+
+        started_at, resumed = await self.database.start_library_scan()
+        if resumed:
+            print(f'Resuming the library scan started at {started_at}.')
+
+        progress = await self.scan(
+            self._page_unscanned_steam_ids(started_at, page_size),
+            await self.database.count_unscanned_steam_ids(started_at)
+        )
+
+        if not progress.budget_exhausted:
+            await self.database.finish_library_scan()
+
+        return progress
+
+    async def _page_unscanned_steam_ids(self, started_at: str, page_size: int) -> AsyncIterator[str]:
+        """
+        Reads the Steam IDs not scanned since the rescan started, a page at a time, continuing from the last user of
+        the previous page rather than from an offset, as the users scanned in the meantime drop out of the query.
+        """
+
+        after = 0
+        while page := await self.database.get_unscanned_steam_ids(started_at, after, page_size):
+            for _, steam_user_id in page:
+                yield steam_user_id
+            after = page[-1][0]
+
+    async def _scan_library(self, steam_user_id: str, progress: ScanProgress) -> None:
+        """
+        Fetches a library from Steam and applies it to the database on the database writer thread.
+        """
+
+        try:
+            steam_apps = await self.steam_api.try_fetch_owned_games(steam_user_id)
+            if steam_apps is None:
+                if self.steam_api.rate_limiter.budget.remaining == 0:
+                    progress.budget_exhausted = True
+                else:
+                    progress.failed += 1
+                return
+
+            await self.database.apply_scanned_library(steam_user_id, steam_apps)
+        except Exception as error:
+            progress.failed += 1
+            print(f'Error while scanning the library of {steam_user_id}: {error}')
+            return
+
+        progress.scanned += 1
+        if not steam_apps:
+            progress.empty += 1
+
+    @staticmethod
+    async def _iterate(steam_ids: Iterable[str] | AsyncIterable[str]) -> AsyncIterator[str]:
+        if isinstance(steam_ids, AsyncIterable):
+            async for steam_user_id in steam_ids:
+                yield steam_user_id
+        else:
+            for steam_user_id in steam_ids:
+                yield steam_user_id
@@ -0,0 +1,268 @@
+import hashlib
+import json
+import os
+import time
+from enum import Enum
+from typing import Callable, Dict, Iterator
+
+from src.database import CatalogueDiff, DatabaseWrapper, PackedCatalogue, write_packed_catalogue
+from .app_list_parser import parse_app_list
+
+
+class SnapshotStatus(Enum):
+    """
+    The outcome of downloading the app list into a CatalogueSnapshot.
+    """
+
+    UPDATED = 'updated'
+    """
+    Steam returned a different app list, which replaced the snapshot.
+    """
+
+    UNCHANGED = 'unchanged'
+    """
+    Steam returned the same app list as the snapshot, byte for byte, so it was not parsed.
+    """
+
+    NOT_MODIFIED = 'not_modified'
+    """
+    Steam answered the conditional request with 304 Not Modified, so nothing was downloaded.
+    """
+
+    FAILED = 'failed'
+    """
+    The app list could not be downloaded, or was cut off. The snapshot, if any, is left as it was.
+    """
+
+
+class CatalogueSnapshot:
+    """
+    On-disk copy of the last complete GetAppList response, as a packed catalogue, with the ETag and Last-Modified
+    validators Steam sent with it. Refreshes send the validators, so an unchanged app list is not downloaded again, and
+    the snapshot stands in for Steam when it cannot be reached, so the catalogue can be loaded without the network.
+
+    The snapshot is stored in two files: the packed catalogue at path, and its metadata, as JSON, at path + '.json'.
+    Both are replaced atomically.
+    """
+
+    format: str = 'packed-v1'
+    """
+    The format of the snapshot files, snapshots in any other format are ignored.
+    """
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time) -> None:
+        """
+        Constructor for the CatalogueSnapshot class.
+
+        :param path: The path of the packed catalogue. The metadata is stored next to it.
+        :param clock: Function returning the current Unix time, overridable for testing.
+        """
+
+        self.path: str = path
+        self.metadata_path: str = f'{path}.json'
+        self._clock: Callable[[], float] = clock
+
+        self.metadata: Dict[str, str | int | float | bool | None] = {}
+        """
+        The format of the snapshot, the ETag, Last-Modified and SHA-256 of the response body, the number of apps, the
+        Unix time the snapshot was saved and last checked against Steam, and whether it has been applied to the
+        database.
+        """
+
+        try:
+            with open(self.metadata_path, encoding='utf-8') as file:
+                self.metadata = json.load(file)
+        except (OSError, ValueError):
+            self.metadata = {}
+
+    def exists(self) -> bool:
+        """
+        :return: True if a snapshot has been saved, False otherwise.
+        """
+
+        return self.metadata.get('format') == self.format and os.path.exists(self.path)
+
+    @property
+    def applied(self) -> bool:
+        """
+        :return: True if the snapshot has been applied to the database since it was saved.
+        """
+
+        return bool(self.metadata.get('applied'))
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """
+        :return: The If-None-Match and If-Modified-Since headers to refresh the snapshot with, empty if there is no
+        snapshot.
+        """
+
+        if not self.exists():
+            return {}
+
+        headers = {}
+        if self.metadata.get('etag'):
+            headers['If-None-Match'] = self.metadata['etag']
+        if self.metadata.get('last_modified'):
+            headers['If-Modified-Since'] = self.metadata['last_modified']
+
+        return headers
+
+    def writer(self) -> 'SnapshotWriter':
+        """
+        :return: A writer to download a new response into, which only replaces the snapshot once it is committed.
+        """
+
+        return SnapshotWriter(self)
+
+    def mark_not_modified(self) -> None:
+        """
+        Records that Steam confirmed the snapshot is still current.
+        """
+
+        self.metadata['checked_at'] = self._clock()
+        self._save_metadata()
+
+    def mark_applied(self) -> None:
+        """
+        Records that the snapshot has been applied to the database, so it is not applied again until it changes.
+        """
+
+        self.metadata['applied'] = True
+        self._save_metadata()
+
+    def open(self) -> PackedCatalogue:
+        """
+        Memory-maps the snapshot.
+
+        :raises OSError: If the snapshot can not be read.
+        :raises ValueError: If the snapshot is cut off or malformed.
+        :return: The catalogue, whose titles are read straight from the file.
+        """
+
+        return PackedCatalogue(self.path)
+
+    def apply(self, database: DatabaseWrapper, force: bool = False) -> CatalogueDiff | None:
+        """
+        Syncs the Steam apps table with the snapshot, unless the snapshot has already been applied. Blocks while the
+        snapshot is parsed and synced, so run it on the database writer thread.
+
+        :param database: The database to sync.
+        :param force: Should the snapshot be applied even if it already has been? Used when the table is empty, such
+        as when a new database is pointed at an existing snapshot.
+        :raises OSError: If the snapshot can not be read.
+        :raises ValueError: If the snapshot is cut off or malformed. Nothing is applied.
+        :return: The apps added, renamed and removed, or None if there is no snapshot to apply.
+        """
+
+        if not self.exists() or (self.applied and not force):
+            return None
+
+        with self.open() as catalogue:
+            catalogue_diff = database.sync_steam_apps_table(catalogue)
+
+        self.mark_applied()
+        return catalogue_diff
+
+    def _replace(self, download_path: str, sha256: str, etag: str | None, last_modified: str | None) -> SnapshotStatus:
+        """
+        Replaces the snapshot with a downloaded response, unless the response is identical to the snapshot.
+        """
+
+        if self.exists() and sha256 == self.metadata.get('sha256'):
+            self.metadata.update(etag=etag, last_modified=last_modified, checked_at=self._clock())
+            self._save_metadata()
+            return SnapshotStatus.UNCHANGED
+
+        # Packing the response as it is parsed. The packed catalogue is only written once the whole response has
+        # parsed, so a cut off or malformed response never replaces a good snapshot.
+        try:
+            apps = write_packed_catalogue(self.path, parse_app_list(_read_chunks(download_path)))
+        except ValueError as error:
+            print(f'Discarded an incomplete app list download: {error}')
+            return SnapshotStatus.FAILED
+
+        now = self._clock()
+        self.metadata = {
+            'format': self.format,
+            'etag': etag,
+            'last_modified': last_modified,
+            'sha256': sha256,
+            'apps': apps,
+            'saved_at': now,
+            'checked_at': now,
+            'applied': False
+        }
+        self._save_metadata()
+        return SnapshotStatus.UPDATED
+
+    def _save_metadata(self) -> None:
+        temporary_path = f'{self.metadata_path}.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump(self.metadata, file)
+
+        os.replace(temporary_path, self.metadata_path)
+
+
+def _read_chunks(path: str, chunk_size: int = 65536) -> Iterator[bytes]:
+    with open(path, 'rb') as file:
+        while chunk := file.read(chunk_size):
+            yield chunk
+
+
+class SnapshotWriter:
+    """
+    Receives a downloaded response a chunk at a time, writing it to a temporary file and hashing it as it arrives, so
+    nothing is parsed until the whole response has been compared with the snapshot.
+    """
+
+    def __init__(self, snapshot: CatalogueSnapshot) -> None:
+        """
+        Constructor for the SnapshotWriter class.
+
+        :param snapshot: The snapshot to replace once the download is committed.
+        """
+
+        self.snapshot: CatalogueSnapshot = snapshot
+        self._temporary_path: str = f'{snapshot.path}.download'
+        self._file = open(self._temporary_path, 'wb')
+        self._hash = hashlib.sha256()
+
+    def write(self, chunk: bytes) -> None:
+        """
+        Appends a chunk of the response body.
+        """
+
+        self._file.write(chunk)
+        self._hash.update(chunk)
+
+    def commit(self, etag: str | None, last_modified: str | None) -> SnapshotStatus:
+        """
+        Replaces the snapshot with the downloaded response, unless it is identical to the snapshot. The response is
+        parsed once, to check it is a complete app list, before it replaces the snapshot. Blocks while the response is
+        parsed and compressed, so run it off the event loop.
+
+        :param etag: The ETag header of the response.
+        :param last_modified: The Last-Modified header of the response.
+        :return: UPDATED if the snapshot was replaced, UNCHANGED if the response was identical, FAILED if the response
+        was not a complete app list.
+        """
+
+        self._file.close()
+        try:
+            return self.snapshot._replace(self._temporary_path, self._hash.hexdigest(), etag, last_modified)
+        finally:
+            self._remove_download()
+
+    def abort(self) -> None:
+        """
+        Discards the downloaded response, leaving the snapshot as it was.
+        """
+
+        self._file.close()
+        self._remove_download()
+
+    def _remove_download(self) -> None:
+        try:
+            os.remove(self._temporary_path)
+        except FileNotFoundError:
+            pass
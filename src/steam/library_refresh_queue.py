@@ -0,0 +1,213 @@
+import asyncio
+import time
+from enum import Enum
+from typing import Callable, Dict, List, Set
+
+from src.database import AsyncDatabaseWrapper
+from .async_steam_api_handler import AsyncSteamAPIHandler
+
+
+class RefreshStatus(Enum):
+    """
+    The outcome of asking the LibraryRefreshQueue to rescan a library.
+    """
+
+    QUEUED = 'queued'
+    """
+    The library was added to the queue.
+    """
+
+    ALREADY_QUEUED = 'already_queued'
+    """
+    The library is already queued, or is being rescanned right now.
+    """
+
+    ON_COOLDOWN = 'on_cooldown'
+    """
+    The library was rescanned too recently to be rescanned again.
+    """
+
+
+class LibraryRefreshQueue:
+    """
+    Queue of Steam libraries waiting to be rescanned. A bounded pool of worker tasks drains the queue, fetching each
+    library from the Steam API and applying it to the database, so commands that request a rescan can respond
+    immediately instead of waiting on Steam.
+    """
+
+    def __init__(
+            self,
+            steam_api: AsyncSteamAPIHandler,
+            database: AsyncDatabaseWrapper,
+            workers: int = 4,
+            cooldown: float = 600.0,
+            clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """
+        Constructor for the LibraryRefreshQueue class.
+
+        :param steam_api: The Steam API handler to fetch libraries with.
+        :param database: The database to apply the libraries to.
+        :param workers: The number of libraries that can be rescanned at the same time.
+        :param cooldown: The minimum time between rescans of the same library, in seconds.
+        :param clock: Function returning the current time in seconds, overridable for testing.
+        """
+
+        self.steam_api: AsyncSteamAPIHandler = steam_api
+        self.database: AsyncDatabaseWrapper = database
+
+        self._worker_count: int = workers
+        self._cooldown: float = cooldown
+        self._clock: Callable[[], float] = clock
+
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        """
+        The Steam IDs waiting to be rescanned.
+        """
+
+        self._pending: Set[str] = set()
+        """
+        The Steam IDs that are queued or being rescanned, used to deduplicate requests.
+        """
+
+        self._last_refreshed: Dict[str, float] = {}
+        """
+        The time each Steam ID was last fetched from Steam, used to enforce the cooldown. Failed fetches are not
+        recorded, so a library whose fetch failed can be queued again straight away.
+        """
+
+        self._workers: List[asyncio.Task] = []
+
+        self.refreshed: int = 0
+        """
+        The number of libraries successfully rescanned.
+        """
+
+        self.failed: int = 0
+        """
+        The number of libraries that could not be fetched from Steam, or were empty.
+        """
+
+    def __len__(self) -> int:
+        """
+        :return: The number of libraries that are queued or being rescanned.
+        """
+
+        return len(self._pending)
+
+    def is_running(self) -> bool:
+        """
+        :return: True if the workers are running, False otherwise.
+        """
+
+        return bool(self._workers)
+
+    def start(self) -> None:
+        """
+        Starts the worker tasks. Does nothing if they are already running.
+        """
+
+        if self._workers:
+            return
+
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self._worker_count)]
+
+    async def stop(self) -> None:
+        """
+        Stops the worker tasks. Libraries still in the queue stay queued until the workers are started again.
+        """
+
+        for worker in self._workers:
+            worker.cancel()
+
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def join(self) -> None:
+        """
+        Waits until every queued library has been rescanned.
+        """
+
+        await self._queue.join()
+
+    def enqueue(self, steam_user_id: str, force: bool = False) -> RefreshStatus:
+        """
+        Adds a library to the queue.
+
+        :param steam_user_id: The Steam ID of the library to rescan.
+        :param force: Should the cooldown be ignored? Used when a user first sets their Steam ID.
+        :return: Whether the library was queued.
+        """
+
+        if steam_user_id in self._pending:
+            return RefreshStatus.ALREADY_QUEUED
+
+        last_refreshed = self._last_refreshed.get(steam_user_id)
+        if not force and last_refreshed is not None and self._clock() - last_refreshed < self._cooldown:
+            return RefreshStatus.ON_COOLDOWN
+
+        self._pending.add(steam_user_id)
+        self._queue.put_nowait(steam_user_id)
+        return RefreshStatus.QUEUED
+
+    async def sweep(self, max_age: float, limit: int) -> int:
+        """
+        Queues the libraries that have not been rescanned recently, oldest first. At most limit libraries are queued
+        per sweep, and nothing is queued while a previous sweep is still being worked through, so the Steam API is
+        never hit with every stale library at once.
+
+        :param max_age: Libraries last rescanned more than this many seconds ago are stale.
+        :param limit: The maximum number of libraries to queue.
+        :return: The number of libraries queued.
+        """
+
+        if len(self._pending) >= limit:
+            return 0
+
+        queued = 0
+        for steam_user_id in await self.database.get_stale_steam_ids(max_age, limit):
+            if self.enqueue(steam_user_id) == RefreshStatus.QUEUED:
+                queued += 1
+
+        return queued
+
+    async def _worker(self) -> None:
+        """
+        Rescans queued libraries until cancelled.
+        """
+
+        while True:
+            steam_user_id = await self._queue.get()
+
+            try:
+                if await self._refresh(steam_user_id):
+                    self._last_refreshed[steam_user_id] = self._clock()
+            except Exception as error:
+                self.failed += 1
+                print(f'Error while rescanning the library of {steam_user_id}: {error}')
+            finally:
+                self._pending.discard(steam_user_id)
+                self._queue.task_done()
+
+    async def _refresh(self, steam_user_id: str) -> bool:
+        """
+        Fetches a library from Steam and applies it to the database. A failed fetch, including one refused because the
+        daily budget is used up, leaves the library unmarked, so it is still due for a rescan. An empty library is not
+        applied, as the Steam API returns no games for private profiles, and applying it would wipe the stored library.
+
+        :return: True if the library was fetched, False if the fetch failed.
+        """
+
+        steam_apps = await self.steam_api.try_fetch_owned_games(steam_user_id)
+        if steam_apps is None:
+            self.failed += 1
+            return False
+
+        await self.database.apply_scanned_library(steam_user_id, steam_apps)
+
+        if steam_apps:
+            self.refreshed += 1
+        else:
+            self.failed += 1
+
+        return True
@@ -0,0 +1,185 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Set
+
+from .ttl_cache import TTLCache
+
+PlayerSummaryFetcher = Callable[[List[str]], Awaitable[Dict[str, dict] | None]]
+"""
+Coroutine function fetching the player summaries of up to 100 Steam IDs, returning the summaries keyed by Steam ID, or
+None if the request failed.
+"""
+
+
+class PlayerSummaryBatcher:
+    """
+    Validates Steam IDs in batches. GetPlayerSummaries accepts up to 100 Steam IDs per call, so validation requests that
+    arrive within a short window of each other are coalesced into a single call, and its result is fanned back out to
+    every waiting caller. Results are cached, so an ID validated recently is not sent to Steam again.
+    """
+
+    max_batch_size: int = 100
+    """
+    The maximum number of Steam IDs GetPlayerSummaries accepts per call.
+    """
+
+    def __init__(
+            self,
+            fetch_player_summaries: PlayerSummaryFetcher,
+            window: float = 0.05,
+            ttl: float = 3600.0,
+            negative_ttl: float = 300.0,
+            cache_size: int = 10000,
+            clock: Callable[[], float] = time.time
+    ) -> None:
+        """
+        Constructor for the PlayerSummaryBatcher class.
+
+        :param fetch_player_summaries: Coroutine function fetching the player summaries of a batch of Steam IDs.
+        :param window: How long to wait for more requests before sending a batch, in seconds.
+        :param ttl: How long a valid Steam ID stays cached, in seconds.
+        :param negative_ttl: How long an invalid Steam ID stays cached, in seconds. Kept shorter than the ttl, as a
+        user who mistyped their ID may fix their profile and try again.
+        :param cache_size: The maximum number of validated Steam IDs kept in the cache.
+        :param clock: Function returning the current Unix time, overridable for testing.
+        """
+
+        self._fetch_player_summaries: PlayerSummaryFetcher = fetch_player_summaries
+        self._window: float = window
+
+        self.cache: TTLCache[str, bool] = TTLCache(cache_size, ttl, negative_ttl, clock=clock)
+        """
+        Whether each recently validated Steam ID is valid.
+        """
+
+        self._pending: Dict[str, asyncio.Future] = {}
+        """
+        The futures of the Steam IDs waiting for the next batch, keyed by Steam ID.
+        """
+
+        self._flush_handle: asyncio.TimerHandle | None = None
+        """
+        The scheduled send of the next batch, None if no batch is waiting.
+        """
+
+        self._tasks: Set[asyncio.Task] = set()
+        """
+        The batches being sent. The event loop only keeps weak references to tasks, so the sends are referenced here
+        until they finish, otherwise a send could be garbage collected, leaving its callers waiting forever.
+        """
+
+        self.batches_sent: int = 0
+        """
+        The number of GetPlayerSummaries calls made.
+        """
+
+    async def is_valid_id(self, steam_id: str) -> bool:
+        """
+        Checks if a Steam ID is connected to an existing Steam account, waiting for the batch it joins to be sent.
+
+        :param steam_id: The Steam ID to validate.
+        :return: True if the Steam ID is connected to a Steam account, False otherwise. Also False if Steam could not
+        be reached, in which case the result is not cached.
+        """
+
+        cached = self.cache.get(steam_id)
+        if cached is not None:
+            return cached
+
+        # Joining the batch the Steam ID is already waiting in, if it has already been requested.
+        future = self._pending.get(steam_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[steam_id] = future
+            self._schedule_flush()
+
+        return await asyncio.shield(future)
+
+    def _schedule_flush(self) -> None:
+        """
+        Sends the waiting Steam IDs straight away if a batch is full, otherwise schedules them to be sent once the
+        window has passed.
+        """
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self._window, self._flush)
+
+    def _flush(self) -> None:
+        """
+        Sends every waiting Steam ID, in batches of up to max_batch_size.
+        """
+
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        pending, self._pending = self._pending, {}
+        steam_ids = list(pending)
+
+        for start in range(0, len(steam_ids), self.max_batch_size):
+            batch = {steam_id: pending[steam_id] for steam_id in steam_ids[start:start + self.max_batch_size]}
+            task = asyncio.get_running_loop().create_task(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def close(self) -> None:
+        """
+        Cancels the waiting and in-flight batches, cancelling the futures of their callers.
+        """
+
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.cancel()
+
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _send(self, batch: Dict[str, asyncio.Future]) -> None:
+        """
+        Fetches the player summaries of a batch of Steam IDs, and resolves each waiting caller's future. If the request
+        raises, each Steam ID of the batch is retried on its own, so only the callers whose Steam ID makes the request
+        raise are failed.
+
+        :param batch: The futures of the Steam IDs in the batch, keyed by Steam ID.
+        """
+
+        self.batches_sent += 1
+
+        try:
+            players = await self._fetch_player_summaries(list(batch))
+        except asyncio.CancelledError:
+            for future in batch.values():
+                future.cancel()
+            raise
+        except Exception as error:
+            if len(batch) == 1:
+                for future in batch.values():
+                    if not future.done():
+                        future.set_exception(error)
+            else:
+                try:
+                    for steam_id, future in batch.items():
+                        await self._send({steam_id: future})
+                except asyncio.CancelledError:
+                    for future in batch.values():
+                        future.cancel()
+                    raise
+            return
+
+        for steam_id, future in batch.items():
+            is_valid = players is not None and steam_id in players
+
+            # Only caching answers from Steam, so a failed request is retried by the next caller.
+            if players is not None:
+                self.cache.set(steam_id, is_valid)
+
+            if not future.done():
+                future.set_result(is_valid)
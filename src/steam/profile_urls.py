@@ -0,0 +1,52 @@
+from .ttl_cache import CacheLoader, CacheSaver, TTLCache
+
+
+def parse_profile_url(steam_url: str) -> tuple[str, str]:
+    """
+    Splits a Steam profile URL into its profile type and its trailing value. Can accept both vanity and default
+    steam profiles, with or without the "https://" and "www." prefixes.
+
+    :param steam_url: The Steam profile URL to parse.
+    :return: A tuple of the profile type and the value, the profile type is "profiles" for default profile URLs and
+    "id" for vanity profile URLs. If the URL is not a Steam profile URL, a tuple of two empty strings is returned.
+    """
+
+    trimmed_url = steam_url
+
+    # Trimming the trailing slash from the URL, if it exists.
+    if trimmed_url.endswith('/'):
+        trimmed_url = trimmed_url[:-1]
+
+    # Removing "https://" from the URL, if it exists.
+    if trimmed_url.startswith('https://'):
+        trimmed_url = trimmed_url[8:]
+
+    # Removing "www." from the URL, if it exists.
+    if trimmed_url.startswith('www.'):
+        trimmed_url = trimmed_url[4:]
+
+    if trimmed_url.startswith('steamcommunity.com/profiles/'):
+        return 'profiles', trimmed_url.split('/')[-1]
+
+    if trimmed_url.startswith('steamcommunity.com/id/'):
+        return 'id', trimmed_url.split('/')[-1]
+
+    return '', ''
+
+
+def create_vanity_url_cache(
+        loader: CacheLoader | None = None,
+        saver: CacheSaver | None = None,
+        max_size: int = 10000
+) -> TTLCache[str, str]:
+    """
+    Creates the cache of resolved vanity URLs. Vanity names rarely change owner, so resolved names are kept for a day,
+    while unknown names are only kept for an hour, as someone may claim the name in the meantime.
+
+    :param loader: Function loading resolved vanity URLs from a persistent store.
+    :param saver: Function saving resolved vanity URLs to a persistent store.
+    :param max_size: The maximum number of vanity URLs kept in memory.
+    :return: A cache of Steam IDs keyed by lowercase vanity URL name, holding an empty string for unknown names.
+    """
+
+    return TTLCache(max_size, ttl=86400.0, negative_ttl=3600.0, loader=loader, saver=saver)
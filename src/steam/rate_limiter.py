@@ -0,0 +1,331 @@
+import asyncio
+import random
+import time
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Tuple
+
+
+class TokenBucket:
+    """
+    Token bucket that paces calls to a single endpoint. Tokens refill continuously at a fixed rate up to the bucket's
+    capacity, and each call takes one token. A call made while the bucket is empty borrows a token from the future, and
+    is told how long to wait before making the call.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Constructor for the TokenBucket class.
+
+        :param rate: The number of tokens added per second.
+        :param capacity: The maximum number of tokens the bucket holds, which is the size of the largest burst.
+        :param clock: Function returning the current time in seconds, overridable for testing.
+        """
+
+        self.rate: float = rate
+        self.capacity: float = capacity
+        self._clock: Callable[[], float] = clock
+
+        self._tokens: float = capacity
+        self._updated_at: float = clock()
+
+    def reserve(self) -> float:
+        """
+        Takes a token from the bucket.
+
+        :return: The number of seconds to wait before making the call, 0 if it can be made straight away.
+        """
+
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class DailyBudget:
+    """
+    Counter for the total number of calls allowed per UTC day, shared by every endpoint.
+    """
+
+    def __init__(self, limit: int, clock: Callable[[], float] = time.time) -> None:
+        """
+        Constructor for the DailyBudget class.
+
+        :param limit: The number of calls allowed per day.
+        :param clock: Function returning the current Unix time, overridable for testing.
+        """
+
+        self.limit: int = limit
+        self._clock: Callable[[], float] = clock
+
+        self._day: int = self._today()
+        self.used: int = 0
+        """
+        The number of calls made today.
+        """
+
+    def _today(self) -> int:
+        return int(self._clock() // 86400)
+
+    @property
+    def remaining(self) -> int:
+        """
+        :return: The number of calls left today.
+        """
+
+        if self._today() != self._day:
+            return self.limit
+
+        return max(0, self.limit - self.used)
+
+    def try_spend(self) -> bool:
+        """
+        Spends a call from today's budget.
+
+        :return: True if the budget allowed the call, False if today's budget is used up.
+        """
+
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self.used = 0
+
+        if self.used >= self.limit:
+            return False
+
+        self.used += 1
+        return True
+
+
+class RetryPolicy:
+    """
+    Decides which failed calls are retried, and how long to wait before each retry. Waits grow exponentially with full
+    jitter, unless the server says how long to wait with a Retry-After header.
+    """
+
+    def __init__(
+            self,
+            max_retries: int = 3,
+            base_delay: float = 1.0,
+            max_delay: float = 60.0,
+            random_value: Callable[[], float] = random.random
+    ) -> None:
+        """
+        Constructor for the RetryPolicy class.
+
+        :param max_retries: The maximum number of retries per call.
+        :param base_delay: The upper bound of the wait before the first retry, in seconds. Doubles with every retry.
+        :param max_delay: The longest wait before any retry, in seconds.
+        :param random_value: Function returning a random float in [0, 1), overridable for testing.
+        """
+
+        self.max_retries: int = max_retries
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self._random_value: Callable[[], float] = random_value
+
+    @staticmethod
+    def is_retryable(status: int) -> bool:
+        """
+        :return: True if a call that failed with the HTTP status code should be retried, False otherwise.
+        """
+
+        return status == 429 or 500 <= status < 600
+
+    @staticmethod
+    def parse_retry_after(value: str | None, now: float | None = None) -> float | None:
+        """
+        Parses a Retry-After header, which is either a number of seconds or an HTTP date.
+
+        :param value: The value of the header.
+        :param now: The current Unix time, used when the header is a date.
+        :return: The number of seconds to wait, or None if the header is missing or malformed.
+        """
+
+        if not value:
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+        return max(0.0, retry_at.timestamp() - (time.time() if now is None else now))
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """
+        :param attempt: The number of retries made so far for the call, starting at 0.
+        :param retry_after: The wait requested by the server, if any.
+        :return: The number of seconds to wait before the next retry.
+        """
+
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+
+        return self._random_value() * min(self.max_delay, self.base_delay * 2 ** attempt)
+
+
+class RateLimiterMetrics:
+    """
+    Counters describing the calls made through a RateLimiter.
+    """
+
+    def __init__(self) -> None:
+        self.calls: int = 0
+        """
+        The number of calls made, including retries.
+        """
+
+        self.throttled: int = 0
+        """
+        The number of calls that had to wait for a token before being made.
+        """
+
+        self.retried: int = 0
+        """
+        The number of retries made after a 429 or 5xx response.
+        """
+
+        self.budget_exhausted: int = 0
+        """
+        The number of calls refused because the daily budget was used up.
+        """
+
+    def as_dict(self) -> Dict[str, int]:
+        """
+        :return: The counters, keyed by name.
+        """
+
+        return {
+            'calls': self.calls,
+            'throttled': self.throttled,
+            'retried': self.retried,
+            'budget_exhausted': self.budget_exhausted
+        }
+
+
+class RateLimiter:
+    """
+    Client-side rate limiting for the Steam Web API, shared by every call a handler makes. Each endpoint is paced by its
+    own token bucket, every endpoint draws from a single daily budget, and failed calls are retried according to a
+    RetryPolicy. The clocks and sleep function are injectable, so the limiter is deterministic under test.
+    """
+
+    default_rate: Tuple[float, float] = (5.0, 10.0)
+    """
+    The (rate, capacity) of the token bucket of endpoints without a configured rate.
+    """
+
+    def __init__(
+            self,
+            endpoint_rates: Dict[str, Tuple[float, float]] | None = None,
+            daily_limit: int = 100000,
+            retry_policy: RetryPolicy | None = None,
+            clock: Callable[[], float] = time.monotonic,
+            wall_clock: Callable[[], float] = time.time,
+            sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ) -> None:
+        """
+        Constructor for the RateLimiter class.
+
+        :param endpoint_rates: The (rate, capacity) of the token bucket of each endpoint, keyed by endpoint path.
+        :param daily_limit: The number of calls allowed per day across every endpoint. The Steam Web API allows 100,000.
+        :param retry_policy: The policy deciding which failed calls are retried.
+        :param clock: Monotonic clock used by the token buckets.
+        :param wall_clock: Unix time clock used by the daily budget and to parse Retry-After dates.
+        :param sleep: Coroutine function used to wait.
+        """
+
+        self._endpoint_rates: Dict[str, Tuple[float, float]] = endpoint_rates or {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._clock: Callable[[], float] = clock
+        self._wall_clock: Callable[[], float] = wall_clock
+        self._sleep: Callable[[float], Awaitable[None]] = sleep
+
+        self.budget: DailyBudget = DailyBudget(daily_limit, wall_clock)
+        self.retry_policy: RetryPolicy = retry_policy or RetryPolicy()
+        self.metrics: RateLimiterMetrics = RateLimiterMetrics()
+
+    def _get_bucket(self, endpoint: str) -> TokenBucket:
+        if endpoint not in self._buckets:
+            rate, capacity = self._endpoint_rates.get(endpoint, self.default_rate)
+            self._buckets[endpoint] = TokenBucket(rate, capacity, self._clock)
+
+        return self._buckets[endpoint]
+
+    def reserve(self, endpoint: str) -> float | None:
+        """
+        Reserves a call to an endpoint, without waiting.
+
+        :param endpoint: The path of the endpoint being called.
+        :return: The number of seconds to wait before making the call, or None if the daily budget is used up and the
+        call must not be made.
+        """
+
+        if not self.budget.try_spend():
+            self.metrics.budget_exhausted += 1
+            return None
+
+        delay = self._get_bucket(endpoint).reserve()
+        if delay > 0:
+            self.metrics.throttled += 1
+
+        self.metrics.calls += 1
+        return delay
+
+    async def acquire(self, endpoint: str) -> bool:
+        """
+        Waits until a call to an endpoint is allowed.
+
+        :param endpoint: The path of the endpoint being called.
+        :return: True once the call can be made, False if the daily budget is used up.
+        """
+
+        delay = self.reserve(endpoint)
+        if delay is None:
+            return False
+
+        if delay > 0:
+            await self._sleep(delay)
+
+        return True
+
+    def retry_delay(self, attempt: int, status: int, retry_after: str | None) -> float | None:
+        """
+        Decides whether a failed call is retried.
+
+        :param attempt: The number of retries made so far for the call, starting at 0.
+        :param status: The HTTP status code of the failed call.
+        :param retry_after: The value of the Retry-After header of the response, if any.
+        :return: The number of seconds to wait before retrying, or None if the call must not be retried.
+        """
+
+        if attempt >= self.retry_policy.max_retries or not self.retry_policy.is_retryable(status):
+            return None
+
+        self.metrics.retried += 1
+        return self.retry_policy.delay(attempt, RetryPolicy.parse_retry_after(retry_after, self._wall_clock()))
+
+    async def wait_before_retry(self, attempt: int, status: int, retry_after: str | None) -> bool:
+        """
+        Waits before retrying a failed call, if it should be retried.
+
+        :return: True if the call should be retried, False otherwise.
+        """
+
+        delay = self.retry_delay(attempt, status, retry_after)
+        if delay is None:
+            return False
+
+        await self._sleep(delay)
+        return True
@@ -1,8 +1,15 @@
-import json
-from typing import List, Dict
+import itertools
+import time
+from typing import Dict, Iterator, List, Tuple
 
 import requests
 
+from .app_list_parser import parse_app_list
+from .catalogue_snapshot import CatalogueSnapshot, SnapshotStatus
+from .profile_urls import create_vanity_url_cache, parse_profile_url
+from .rate_limiter import RateLimiter
+from .ttl_cache import TTLCache
+
 
 class SteamAPIHandler:
     """
@@ -14,11 +21,18 @@ class SteamAPIHandler:
     The root for the Steam API.
     """
 
-    def __init__(self, api_key: str):
+    def __init__(
+            self,
+            api_key: str,
+            rate_limiter: RateLimiter | None = None,
+            vanity_url_cache: TTLCache[str, str] | None = None
+    ):
         """
         Constructor for the SteamAPIHandler class.
 
         :param api_key: The Steam API key to connect to Steam with.
+        :param rate_limiter: The rate limiter pacing and retrying every call.
+        :param vanity_url_cache: The cache of resolved vanity URLs, defaults to an in-memory cache.
         """
 
         self._api_key = api_key
@@ -26,6 +40,51 @@ class SteamAPIHandler:
         The Steam API key.
         """
 
+        self.rate_limiter: RateLimiter = rate_limiter or RateLimiter()
+        """
+        The rate limiter pacing and retrying every call.
+        """
+
+        self.vanity_url_cache: TTLCache[str, str] = (
+            create_vanity_url_cache() if vanity_url_cache is None else vanity_url_cache
+        )
+        """
+        The Steam ID of each recently resolved vanity URL name, an empty string if the name does not exist.
+        """
+
+    def _get(self, endpoint: str, request_uri: str, **kwargs) -> requests.Response | None:
+        """
+        Sends a GET request to the Steam API, blocking while the rate limiter paces the request, and retrying throttled
+        requests and server errors after a backoff.
+
+        :param endpoint: The path of the API endpoint, used to pick its rate limit.
+        :param request_uri: The full URI to request.
+        :param kwargs: Extra keyword arguments passed to requests.get().
+        :raises requests.exceptions.ConnectionError: If the Steam API could not be reached.
+        :return: The final response, or None if the daily budget is used up.
+        """
+
+        for attempt in itertools.count():
+            delay = self.rate_limiter.reserve(endpoint)
+            if delay is None:
+                return None
+
+            if delay > 0:
+                time.sleep(delay)
+
+            response = requests.get(request_uri, **kwargs)
+
+            retry_delay = self.rate_limiter.retry_delay(
+                attempt,
+                response.status_code,
+                response.headers.get('Retry-After')
+            )
+            if retry_delay is None:
+                return response
+
+            response.close()
+            time.sleep(retry_delay)
+
     def is_valid_id(self, steam_id: str) -> bool:
         """
         Checks if a passed Steam ID is connected to an existing Steam account.
@@ -39,12 +98,12 @@ class SteamAPIHandler:
 
         # Catching ConnectionErrors (for example, if the Steam API is down for maintenance).
         try:
-            response = requests.get(request_uri)
+            response = self._get('/ISteamUser/GetPlayerSummaries/v0002/', request_uri)
         except requests.exceptions.ConnectionError:
             return False
 
         # Parsing the API response.
-        if response.status_code == 200:
+        if response is not None and response.status_code == 200:
             data = response.json()
             return len(data['response']['players']) != 0
 
@@ -63,36 +122,28 @@ class SteamAPIHandler:
         :return: A Steam ID string, if no Steam ID could be resolved an empty string is returned.
         """
 
-        trimmed_url = steam_url
-
-        # Trimming the trailing slash from the URL, if it exists.
-        if trimmed_url.endswith('/'):
-            trimmed_url = trimmed_url[:-1]
-
-        # Removing "https://" from the URL, if it exists.
-        if trimmed_url.startswith('https://'):
-            trimmed_url = trimmed_url[8:]
-
-        # Removing "www." from the URL, if it exists.
-        if trimmed_url.startswith('www.'):
-            trimmed_url = trimmed_url[4:]
+        url_type, url_value = parse_profile_url(steam_url)
 
         # If a non-custom Steam URL is set, returns the ID within the URL.
-        if trimmed_url.startswith('steamcommunity.com/profiles/'):
-            return trimmed_url.split('/')[-1]
+        if url_type == 'profiles':
+            return url_value
 
         # If there is a custom Steam profile URL.
-        if trimmed_url.startswith('steamcommunity.com/id/'):
-            vanity_url = trimmed_url.split('/')[-1]
-            request_uri = f'{self._api_root}/ISteamUser/ResolveVanityURL/v1/?key={self._api_key}&vanityurl={vanity_url}'
+        if url_type == 'id':
+            request_uri = f'{self._api_root}/ISteamUser/ResolveVanityURL/v1/?key={self._api_key}&vanityurl={url_value}'
+
+            steam_id = self.vanity_url_cache.get(url_value.lower())
+            if steam_id is not None:
+                return steam_id
 
             # Parsing the API response.
-            response = requests.get(request_uri)
-            if response.status_code == 200:
+            response = self._get('/ISteamUser/ResolveVanityURL/v1/', request_uri)
+            if response is not None and response.status_code == 200:
                 data = response.json()
 
-                if data['response']['success'] == 1:
-                    return data['response']['steamid']
+                steam_id = data['response']['steamid'] if data['response']['success'] == 1 else ''
+                self.vanity_url_cache.set(url_value.lower(), steam_id)
+                return steam_id
 
         return ''
 
@@ -103,25 +154,81 @@ class SteamAPIHandler:
         :return: A dictionary of the Steam app list. Keys are the Steam App ID, values are the Steam App names.
         """
 
+        # Catching errors part way through the response, so a partial app list is never returned.
+        try:
+            return dict(self.stream_app_list())
+        except (requests.exceptions.RequestException, ValueError):
+            return {}
+
+    def stream_app_list(self, chunk_size: int = 65536) -> Iterator[Tuple[int, str]]:
+        """
+        A function that streams the list of every app from Steam, parsing each app as the response arrives rather
+        than loading the whole response into memory.
+
+        :param chunk_size: The number of bytes to read from the response at a time.
+        :raises requests.exceptions.RequestException: If the connection fails part way through the response.
+        :raises ValueError: If the response is cut off or malformed.
+        :return: An iterator of (Steam App ID, Steam App name) pairs. Apps with an empty name are skipped. If the
+        Steam API could not be reached, or did not return a 200 status code, the iterator is empty.
+        """
+
         # Catching ConnectionErrors (for example, if the Steam API is down for maintenance).
         try:
-            response = requests.get(f'{self._api_root}/ISteamApps/GetAppList/v0002')
+            response = self._get(
+                '/ISteamApps/GetAppList/v0002',
+                f'{self._api_root}/ISteamApps/GetAppList/v0002',
+                stream=True
+            )
         except requests.exceptions.ConnectionError:
-            return {}
+            return
 
-        # Parsing the API response.
-        if response.status_code == 200:
-            apps: dict[int, str] = {}
+        if response is None:
+            return
 
-            for app in json.loads(response.content)['applist']['apps']:
-                if app['name'] == '':
-                    continue
+        with response:
+            if response.status_code == 200:
+                yield from parse_app_list(response.iter_content(chunk_size=chunk_size))
 
-                apps[int(app['appid'])] = str(app['name'])
+    def download_app_list(self, snapshot: CatalogueSnapshot, chunk_size: int = 65536) -> SnapshotStatus:
+        """
+        A function that downloads the list of every app from Steam into a snapshot. The request carries the validators
+        of the snapshot, so an unchanged app list is answered with 304 Not Modified, and a response identical to the
+        snapshot is not parsed.
 
-            return apps
+        :param snapshot: The snapshot to refresh.
+        :param chunk_size: The number of bytes to read from the response at a time.
+        :return: Whether the snapshot was replaced, left unchanged, or could not be refreshed.
+        """
 
-        return {}
+        writer = snapshot.writer()
+        try:
+            response = self._get(
+                '/ISteamApps/GetAppList/v0002',
+                f'{self._api_root}/ISteamApps/GetAppList/v0002',
+                headers=snapshot.conditional_headers(),
+                stream=True
+            )
+            if response is None:
+                writer.abort()
+                return SnapshotStatus.FAILED
+
+            with response:
+                if response.status_code == 304:
+                    writer.abort()
+                    snapshot.mark_not_modified()
+                    return SnapshotStatus.NOT_MODIFIED
+
+                if response.status_code != 200:
+                    writer.abort()
+                    return SnapshotStatus.FAILED
+
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    writer.write(chunk)
+        except requests.exceptions.RequestException:
+            writer.abort()
+            return SnapshotStatus.FAILED
+
+        return writer.commit(response.headers.get('ETag'), response.headers.get('Last-Modified'))
 
     def fetch_owned_games(self, steam_id: str) -> List[int]:
         """
@@ -133,11 +240,11 @@ class SteamAPIHandler:
 
         request_uri = f'{self._api_root}/IPlayerService/GetOwnedGames/v0001/?key={self._api_key}&steamid={steam_id}'
         try:
-            response = requests.get(request_uri)
+            response = self._get('/IPlayerService/GetOwnedGames/v0001/', request_uri)
         except requests.exceptions.ConnectionError:
             return []
 
-        if response.status_code == 200:
+        if response is not None and response.status_code == 200:
             apps = []
             data = response.json()
 
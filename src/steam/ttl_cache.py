@@ -0,0 +1,155 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Tuple, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+CacheLoader = Callable[[K], Tuple[V, float] | None]
+"""
+Function loading an entry from a persistent store, returning the (value, expiry time), or None if the key is not stored.
+"""
+
+CacheSaver = Callable[[K, V, float], None]
+"""
+Function saving an entry, with its expiry time, to a persistent store.
+"""
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded least-recently-used cache whose entries expire after a time to live. Falsy values are treated as negative
+    results (for example, a vanity URL that does not exist) and expire after their own, usually shorter, time to live.
+
+    The cache can be backed by a persistent store through a loader and saver function. Every entry set is written
+    through to the store, and keys missing from memory are looked up in the store, so warm entries survive restarts.
+    Expiry times are Unix times so that they stay meaningful across restarts.
+    """
+
+    def __init__(
+            self,
+            max_size: int,
+            ttl: float,
+            negative_ttl: float | None = None,
+            loader: CacheLoader | None = None,
+            saver: CacheSaver | None = None,
+            clock: Callable[[], float] = time.time
+    ) -> None:
+        """
+        Constructor for the TTLCache class.
+
+        :param max_size: The maximum number of entries held in memory. The least recently used entry is evicted once
+        the cache is full.
+        :param ttl: How long entries stay cached, in seconds.
+        :param negative_ttl: How long falsy entries stay cached, in seconds. Defaults to the ttl.
+        :param loader: Function loading entries missing from memory from a persistent store.
+        :param saver: Function saving entries to a persistent store.
+        :param clock: Function returning the current Unix time, overridable for testing.
+        """
+
+        self.max_size: int = max_size
+        self.ttl: float = ttl
+        self.negative_ttl: float = ttl if negative_ttl is None else negative_ttl
+
+        self._loader: CacheLoader | None = loader
+        self._saver: CacheSaver | None = saver
+        self._clock: Callable[[], float] = clock
+
+        self._entries: OrderedDict[K, Tuple[V, float]] = OrderedDict()
+        """
+        The (value, expiry time) of each entry, least recently used first.
+        """
+
+        self.hits: int = 0
+        """
+        The number of lookups answered by the cache, including the persistent store.
+        """
+
+        self.misses: int = 0
+        """
+        The number of lookups the cache could not answer.
+        """
+
+        self.evictions: int = 0
+        """
+        The number of entries evicted to make room for new entries.
+        """
+
+        self.expirations: int = 0
+        """
+        The number of entries dropped because they had expired.
+        """
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """
+        Looks up an entry. To tell a cached negative result apart from a miss, pass a sentinel as the default.
+
+        :param key: The key to look up.
+        :param default: The value returned on a miss.
+        :return: The cached value, or the default if the key is not cached or has expired.
+        """
+
+        now = self._clock()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            del self._entries[key]
+            self.expirations += 1
+
+        # Falling back to the persistent store, and keeping the entry in memory if it is still fresh.
+        if self._loader is not None:
+            entry = self._loader(key)
+            if entry is not None and entry[1] > now:
+                self._insert(key, entry[0], entry[1])
+                self.hits += 1
+                return entry[0]
+
+        self.misses += 1
+        return default
+
+    def set(self, key: K, value: V) -> None:
+        """
+        Caches an entry, writing it through to the persistent store.
+
+        :param key: The key to cache the value under.
+        :param value: The value to cache. Falsy values expire after the negative ttl.
+        """
+
+        expires_at = self._clock() + (self.ttl if value else self.negative_ttl)
+        self._insert(key, value, expires_at)
+
+        if self._saver is not None:
+            self._saver(key, value, expires_at)
+
+    def _insert(self, key: K, value: V, expires_at: float) -> None:
+        """
+        Inserts an entry into memory, evicting the least recently used entries if the cache is full.
+        """
+
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        :return: The cache counters, and the current number of entries, keyed by name.
+        """
+
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations
+        }